@@ -1,14 +1,21 @@
 """
 FastAPI application entry point for the Vulcan API.
 """
+import asyncio
 import logging
 from fastapi import FastAPI, Depends
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 
 from vulcan.apps.api.config import API_VERSION, API_TITLE, API_DESCRIPTION, ALLOWED_ORIGINS
 from vulcan.apps.api.middleware.auth import get_api_key, verify_api_key
 from vulcan.apps.api.middleware.logging import LoggingMiddleware
 from vulcan.apps.api.routers import code_generation, testing, deployment, status
+from vulcan.config.workflow_config import COMPACTOR_ENABLED, EXECUTION_MODE, WEBHOOK_TIMEOUT
+from vulcan.workflow_engine.metrics import collect_metrics
+from vulcan.workflow_engine.queue.job_queue import JobQueue
+from vulcan.workflow_engine.state.retention import StateCompactor
+from vulcan.workflow_engine.webhooks import webhook_dispatcher
 
 # Configure logging
 logging.basicConfig(
@@ -67,6 +74,35 @@ app.include_router(
     dependencies=[Depends(verify_api_key)],
 )
 
+app.include_router(
+    status.websocket_router,
+    prefix="/api/v1/status",
+    tags=["Status"],
+)
+
+
+@app.on_event("startup")
+async def start_compactor():
+    """Archive expired processes and purge finished jobs in the background."""
+    if COMPACTOR_ENABLED:
+        queue = JobQueue() if EXECUTION_MODE == "queue" else None
+        app.state.compactor = StateCompactor(queue=queue)
+        app.state.compactor_task = asyncio.create_task(app.state.compactor.run())
+
+
+@app.on_event("shutdown")
+async def stop_compactor():
+    """Stop the background compactor."""
+    if getattr(app.state, "compactor", None) is not None:
+        app.state.compactor.stop()
+        await app.state.compactor_task
+
+
+@app.on_event("shutdown")
+async def flush_webhooks():
+    """Give pending webhook deliveries a last chance before exiting."""
+    await asyncio.to_thread(webhook_dispatcher.close, WEBHOOK_TIMEOUT)
+
 
 @app.get("/", tags=["Health"])
 async def root():
@@ -80,6 +116,17 @@ async def health():
     return {"status": "ok", "version": API_VERSION}
 
 
+@app.get(
+    "/metrics",
+    tags=["Monitoring"],
+    response_class=PlainTextResponse,
+    dependencies=[Depends(verify_api_key)],
+)
+async def metrics():
+    """Metrics of the workflow engine in the Prometheus text format."""
+    return PlainTextResponse(await asyncio.to_thread(collect_metrics))
+
+
 def start():
     """Start the FastAPI application with uvicorn."""
     import uvicorn
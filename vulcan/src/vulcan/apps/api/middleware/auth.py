@@ -1,6 +1,8 @@
 """
 Authentication middleware for the Vulcan API.
 """
+import hmac
+
 from fastapi import Header, HTTPException, Depends, status
 from fastapi.security import APIKeyHeader
 from typing import Optional
@@ -12,6 +14,21 @@ from vulcan.apps.api.config import API_KEY, API_KEY_HEADER
 api_key_header = APIKeyHeader(name=API_KEY_HEADER, auto_error=False)
 
 
+def is_valid_api_key(api_key: Optional[str]) -> bool:
+    """
+    Check an API key in constant time.
+    
+    Args:
+        api_key: API key sent by the client
+        
+    Returns:
+        True if the API key is the configured one
+    """
+    if api_key is None:
+        return False
+    return hmac.compare_digest(api_key.encode("utf-8"), API_KEY.encode("utf-8"))
+
+
 async def get_api_key(
     api_key: Optional[str] = Depends(api_key_header),
 ) -> str:
@@ -50,7 +67,7 @@ async def verify_api_key(api_key: str = Depends(get_api_key)) -> bool:
     Raises:
         HTTPException: If the API key is invalid
     """
-    if api_key != API_KEY:
+    if not is_valid_api_key(api_key):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Invalid API key",
@@ -1,8 +1,43 @@
 """
 Request models for the Vulcan API.
 """
+import ipaddress
 from typing import Dict, List, Optional
-from pydantic import BaseModel, Field
+from pydantic import AnyHttpUrl, BaseModel, Field, validator
+
+from vulcan.workflow_engine.webhooks import webhook_dispatcher
+
+
+def validate_callback_url(url: Optional[AnyHttpUrl]) -> Optional[AnyHttpUrl]:
+    """
+    Validate the callback URL of a request.
+
+    Callbacks are only delivered signed, so they require a webhook secret,
+    and may not target loopback or private hosts of the service's network.
+
+    Args:
+        url: Callback URL, if any
+
+    Returns:
+        The callback URL
+
+    Raises:
+        ValueError: If callbacks are disabled or the host is not public
+    """
+    if url is None:
+        return url
+    if not webhook_dispatcher.secret:
+        raise ValueError("Callbacks are disabled: no webhook secret is configured")
+    host = url.host.strip("[]").lower()
+    try:
+        address = ipaddress.ip_address(host)
+    except ValueError:
+        address = None
+    if host == "localhost" or host.endswith(".localhost") or (
+        address is not None and not address.is_global
+    ):
+        raise ValueError("Callback URL must not target a loopback or private host")
+    return url
 
 
 class GenerateCodeRequest(BaseModel):
@@ -26,6 +61,49 @@ class GenerateCodeRequest(BaseModel):
         example=["factorial(5) -> 120", "factorial(0) -> 1"],
     )
 
+    run_tests: bool = Field(
+        False,
+        description="Whether to test the generated code and retry failures on a larger model",
+    )
+
+    candidates: Optional[int] = Field(
+        None,
+        ge=1,
+        le=10,
+        description="Number of candidates generated concurrently, the first passing its tests winning",
+    )
+
+    files: Optional[List[str]] = Field(
+        None,
+        description="Paths of the files to generate, if known",
+        example=["orders/models.py", "orders/service.py", "tests/test_orders.py"],
+    )
+
+    plan_files: Optional[bool] = Field(
+        None,
+        description="Whether to plan the files and generate them concurrently; "
+        "by default, when enough files are expected",
+    )
+
+    repository_url: Optional[str] = Field(
+        None,
+        description="Repository the code is written for; its most relevant code is added to the prompt",
+        example="https://github.com/username/repo.git",
+    )
+
+    repository_branch: Optional[str] = Field(
+        None,
+        description="Branch of the repository; the default branch if omitted",
+    )
+
+    callback_url: Optional[AnyHttpUrl] = Field(
+        None,
+        description="URL notified with a signed POST once the process finishes",
+        example="https://example.com/hooks/vulcan",
+    )
+
+    _check_callback_url = validator("callback_url", allow_reuse=True)(validate_callback_url)
+
 
 class TestCodeRequest(BaseModel):
     """Request model for code testing."""
@@ -43,6 +121,14 @@ class TestCodeRequest(BaseModel):
         description="Whether to generate coverage report",
     )
 
+    callback_url: Optional[AnyHttpUrl] = Field(
+        None,
+        description="URL notified with a signed POST once the process finishes",
+        example="https://example.com/hooks/vulcan",
+    )
+
+    _check_callback_url = validator("callback_url", allow_reuse=True)(validate_callback_url)
+
 
 class DeployCodeRequest(BaseModel):
     """Request model for code deployment."""
@@ -73,6 +159,14 @@ class DeployCodeRequest(BaseModel):
         example="Add factorial function",
     )
 
+    callback_url: Optional[AnyHttpUrl] = Field(
+        None,
+        description="URL notified with a signed POST once the process finishes",
+        example="https://example.com/hooks/vulcan",
+    )
+
+    _check_callback_url = validator("callback_url", allow_reuse=True)(validate_callback_url)
+
 
 class StatusRequest(BaseModel):
     """Request model for checking status."""
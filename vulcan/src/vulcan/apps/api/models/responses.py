@@ -181,6 +181,12 @@ class ProcessStep(BaseModel):
         description="End time of the step",
         example="2023-06-01T12:01:00Z",
     )
+    
+    metadata: Dict[str, Any] = Field(
+        default_factory=dict,
+        description="Additional information about the step, such as the time spent queued for its resource stage",
+        example={"stage": "llm", "queue_time": 0.25},
+    )
 
 
 class StatusResponse(BaseModel):
@@ -232,6 +238,21 @@ class StatusResponse(BaseModel):
         description="Errors that occurred during the process",
         example=["Failed to generate test cases"],
     )
+    
+    resources: Dict[str, Any] = Field(
+        default_factory=dict,
+        description="Resource usage of the run; memory in bytes",
+        example={"worker_id": "host-4242-1a2b3c", "rss_peak": 183500800, "rss_growth": 2097152},
+    )
+    
+    timeline: List[Dict[str, Any]] = Field(
+        default_factory=list,
+        description="Status and step transitions of the process, in order",
+        example=[
+            {"time": "2023-06-01T12:00:00Z", "event": "created", "status": "in_progress"},
+            {"time": "2023-06-01T12:00:01Z", "event": "step_started", "step": "Generate code"},
+        ],
+    )
 
 
 class ErrorResponse(BaseModel):
@@ -1,13 +1,17 @@
 """
 Router for code generation endpoints.
 """
+import asyncio
 import logging
 from fastapi import APIRouter, Depends, HTTPException, status
 
 from vulcan.apps.api.middleware.auth import get_api_key
 from vulcan.apps.api.models.requests import GenerateCodeRequest
 from vulcan.apps.api.models.responses import GenerateCodeResponse, ErrorResponse
+from vulcan.config.workflow_config import EXECUTION_MODE
 from vulcan.core.vulcan_core.models import Requirements
+from vulcan.workflow_engine.worker import enqueue_workflow
+from vulcan.workflow_engine.workflows.code_generation_flow import CodeGenerationWorkflow
 
 
 # Configure logger
@@ -53,11 +57,36 @@ async def generate_code(
             examples=request.examples or [],
         )
         
+        # Hand the workflow over to the workers in queue mode
+        if EXECUTION_MODE == "queue":
+            process_id = await asyncio.to_thread(
+                enqueue_workflow,
+                CodeGenerationWorkflow.process_type,
+                requirements=requirements,
+                run_tests=request.run_tests,
+                candidates=request.candidates,
+                expected_files=request.files or [],
+                plan_files=request.plan_files,
+                repository_url=request.repository_url,
+                repository_branch=request.repository_branch,
+                callback_url=request.callback_url,
+            )
+            return GenerateCodeResponse(success=True, process_id=process_id)
+        
         # Initialize workflow
         workflow = CodeGenerationWorkflow()
         
         # Execute workflow
-        result = await workflow.execute_async(requirements)
+        result = await workflow.execute_async(
+            requirements,
+            run_tests=request.run_tests,
+            candidates=request.candidates,
+            expected_files=request.files or [],
+            plan_files=request.plan_files,
+            repository_url=request.repository_url,
+            repository_branch=request.repository_branch,
+            callback_url=request.callback_url,
+        )
         
         # Create response
         response = GenerateCodeResponse(
@@ -1,12 +1,16 @@
 """
 Router for deployment endpoints.
 """
+import asyncio
 import logging
 from fastapi import APIRouter, Depends, HTTPException, status
 
 from vulcan.apps.api.middleware.auth import get_api_key
 from vulcan.apps.api.models.requests import DeployCodeRequest
 from vulcan.apps.api.models.responses import DeployCodeResponse, ErrorResponse
+from vulcan.config.workflow_config import EXECUTION_MODE
+from vulcan.workflow_engine.worker import enqueue_workflow
+from vulcan.workflow_engine.workflows.deployment_flow import DeploymentWorkflow
 
 
 # Configure logger
@@ -48,6 +52,19 @@ async def deploy_code(
             f"(branch: {request.branch}) with {len(request.code_content)} files"
         )
         
+        # Hand the workflow over to the workers in queue mode
+        if EXECUTION_MODE == "queue":
+            process_id = await asyncio.to_thread(
+                enqueue_workflow,
+                DeploymentWorkflow.process_type,
+                code_content=request.code_content,
+                repository_url=request.repository_url,
+                branch=request.branch,
+                commit_message=request.commit_message,
+                callback_url=request.callback_url,
+            )
+            return DeployCodeResponse(success=True, process_id=process_id)
+        
         # Initialize workflow
         workflow = DeploymentWorkflow()
         
@@ -57,6 +74,7 @@ async def deploy_code(
             repository_url=request.repository_url,
             branch=request.branch,
             commit_message=request.commit_message,
+            callback_url=request.callback_url,
         )
         
         # Create response
@@ -1,19 +1,59 @@
 """
 Router for status endpoints.
 """
+import asyncio
 import logging
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Any, Dict
+from fastapi import APIRouter, Depends, HTTPException, WebSocket, WebSocketDisconnect, status
 
-from vulcan.apps.api.middleware.auth import get_api_key
+from vulcan.apps.api.config import API_KEY_HEADER
+from vulcan.apps.api.middleware.auth import get_api_key, is_valid_api_key
 from vulcan.apps.api.models.requests import StatusRequest
 from vulcan.apps.api.models.responses import StatusResponse, ErrorResponse
+from vulcan.config.workflow_config import EXECUTION_MODE, STATUS_POLL_INTERVAL
+from vulcan.workflow_engine.events import Subscription, event_bus
+from vulcan.workflow_engine.state.workflow_state import WorkflowStateManager
 
 
 # Configure logger
 logger = logging.getLogger("vulcan-api")
 
-# Create router
+# Create routers; the WebSocket router authenticates connections itself
 router = APIRouter()
+websocket_router = APIRouter()
+
+
+def _to_status_response(state) -> StatusResponse:
+    """
+    Build the status response of a process state.
+    
+    Args:
+        state: Process state
+        
+    Returns:
+        Status response
+    """
+    return StatusResponse(
+        process_id=state.process_id,
+        process_type=state.process_type,
+        status=state.status.name.lower(),
+        start_time=state.start_time,
+        end_time=state.end_time,
+        steps=[
+            {
+                "name": step.name,
+                "status": step.status.name.lower(),
+                "start_time": step.start_time,
+                "end_time": step.end_time,
+                "metadata": step.metadata,
+            }
+            for step in state.steps
+        ],
+        artifacts=state.artifacts,
+        errors=state.errors,
+        resources=state.resources,
+        timeline=state.timeline,
+    )
 
 
 @router.get(
@@ -59,26 +99,7 @@ async def get_status(
             )
         
         # Create response
-        response = StatusResponse(
-            process_id=state.process_id,
-            process_type=state.process_type,
-            status=state.status.name.lower(),
-            start_time=state.start_time,
-            end_time=state.end_time,
-            steps=[
-                {
-                    "name": step.name,
-                    "status": step.status.name.lower(),
-                    "start_time": step.start_time,
-                    "end_time": step.end_time,
-                }
-                for step in state.steps
-            ],
-            artifacts=state.artifacts,
-            errors=state.errors,
-        )
-        
-        return response
+        return _to_status_response(state)
     
     except HTTPException:
         raise
@@ -91,6 +112,74 @@ async def get_status(
         )
 
 
+@router.delete(
+    "/{process_id}",
+    response_model=StatusResponse,
+    responses={
+        400: {"model": ErrorResponse},
+        401: {"model": ErrorResponse},
+        403: {"model": ErrorResponse},
+        404: {"model": ErrorResponse},
+        409: {"model": ErrorResponse},
+        500: {"model": ErrorResponse},
+    },
+    summary="Cancel a process",
+    description="Cancel a running code generation, testing, or deployment process",
+)
+async def cancel_process(
+    process_id: str,
+    api_key: str = Depends(get_api_key),
+):
+    """
+    Cancel a running process.
+    
+    The process is moved to the cancelled state at once; its in-flight LLM
+    stream, test subprocess or git operation is aborted by the workflow runner.
+    
+    Args:
+        process_id: ID of the process to cancel
+        api_key: API key for authentication
+        
+    Returns:
+        Status response of the cancelled process
+    """
+    try:
+        logger.info(f"Received cancellation request for process: {process_id}")
+        
+        # Initialize state manager
+        state_manager = WorkflowStateManager()
+        
+        # Check that the process can still be cancelled
+        state = await state_manager.get_state_async(process_id)
+        
+        if not state:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Process not found: {process_id}",
+            )
+        
+        if state.is_terminal:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Process already {state.status.name.lower()}: {process_id}",
+            )
+        
+        # Cancel the process
+        state = await state_manager.request_cancel_async(process_id)
+        
+        return _to_status_response(state)
+    
+    except HTTPException:
+        raise
+    
+    except Exception as e:
+        logger.error(f"Error cancelling process: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error cancelling process: {str(e)}",
+        )
+
+
 @router.post(
     "/",
     response_model=StatusResponse,
@@ -118,4 +207,157 @@ async def check_status(
     Returns:
         Status response
     """
-    return await get_status(request.process_id, api_key)
\ No newline at end of file
+    return await get_status(request.process_id, api_key)
+
+
+async def _send_events(websocket: WebSocket, subscription: Subscription, send_lock: asyncio.Lock):
+    """
+    Forward the events of a subscription to a WebSocket.
+    
+    Args:
+        websocket: WebSocket connection
+        subscription: Subscription of the connection
+        send_lock: Lock serializing the sends on the connection
+    """
+    reported_drops = 0
+    while True:
+        events = await subscription.get()
+        async with send_lock:
+            if subscription.dropped > reported_drops:
+                await websocket.send_json(
+                    {"type": "dropped", "count": subscription.dropped - reported_drops}
+                )
+                reported_drops = subscription.dropped
+            for event in events:
+                await websocket.send_json(
+                    {"type": "event", "process_id": event["process_id"], "event": event}
+                )
+
+
+async def _poll_states(
+    websocket: WebSocket,
+    subscription: Subscription,
+    state_manager: WorkflowStateManager,
+    send_lock: asyncio.Lock,
+    sent_states: Dict[str, Dict[str, Any]],
+):
+    """
+    Send the state of subscribed processes whenever it changes.
+    
+    Used in queue mode, where processes run in workers whose events never
+    reach the event bus of the API. A process is unsubscribed once its
+    terminal state was sent.
+    
+    Args:
+        websocket: WebSocket connection
+        subscription: Subscription of the connection
+        state_manager: Store of the process states
+        send_lock: Lock serializing the sends on the connection
+        sent_states: Last state sent per process ID
+    """
+    while True:
+        await asyncio.sleep(STATUS_POLL_INTERVAL)
+        for process_id in list(subscription.process_ids):
+            state = await state_manager.get_state_async(process_id)
+            if state is None:
+                continue
+            response = _to_status_response(state).dict()
+            if sent_states.get(process_id) != response:
+                sent_states[process_id] = response
+                async with send_lock:
+                    await websocket.send_json(
+                        {"type": "state", "process_id": process_id, "state": response}
+                    )
+            if state.is_terminal:
+                subscription.unsubscribe([process_id])
+                sent_states.pop(process_id, None)
+
+
+@websocket_router.websocket("/ws")
+async def status_websocket(websocket: WebSocket):
+    """
+    Stream the state changes of many processes over one connection.
+    
+    Clients send `{"action": "subscribe" | "unsubscribe", "process_ids": [...]}`.
+    Each subscription is answered with the current state of the process, then
+    its events are pushed as they are recorded. A slow client loses the oldest
+    undelivered events and is told how many with a "dropped" message.
+    
+    In queue mode, processes run in workers whose events never reach the
+    API: instead of events, a "state" message is sent whenever the state of
+    a subscribed process changes, polled every `STATUS_POLL_INTERVAL`
+    seconds, and the process is unsubscribed after its terminal state.
+    
+    The API key is read from the API key header or the `api_key` query
+    parameter, since browsers cannot set headers on WebSocket connections.
+    
+    Args:
+        websocket: WebSocket connection
+    """
+    api_key = websocket.headers.get(API_KEY_HEADER) or websocket.query_params.get("api_key")
+    if not is_valid_api_key(api_key):
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    
+    await websocket.accept()
+    
+    state_manager = WorkflowStateManager()
+    subscription = event_bus.subscribe()
+    send_lock = asyncio.Lock()
+    sender = asyncio.create_task(_send_events(websocket, subscription, send_lock))
+    sent_states: Dict[str, Dict[str, Any]] = {}
+    poller = None
+    if EXECUTION_MODE == "queue":
+        poller = asyncio.create_task(
+            _poll_states(websocket, subscription, state_manager, send_lock, sent_states)
+        )
+    
+    try:
+        while True:
+            try:
+                message = await websocket.receive_json()
+                action = message.get("action")
+                process_ids = [str(process_id) for process_id in message.get("process_ids", [])]
+            except (ValueError, AttributeError):
+                async with send_lock:
+                    await websocket.send_json({"type": "error", "detail": "Invalid message"})
+                continue
+            
+            if action == "subscribe":
+                # Subscribe before reading the state so that no event is missed
+                subscription.subscribe(process_ids)
+                for process_id in process_ids:
+                    state = await state_manager.get_state_async(process_id)
+                    async with send_lock:
+                        if state is None:
+                            subscription.unsubscribe([process_id])
+                            await websocket.send_json(
+                                {"type": "error", "detail": f"Process not found: {process_id}"}
+                            )
+                        else:
+                            sent_states[process_id] = _to_status_response(state).dict()
+                            await websocket.send_json(
+                                {
+                                    "type": "state",
+                                    "process_id": process_id,
+                                    "state": sent_states[process_id],
+                                }
+                            )
+            elif action == "unsubscribe":
+                subscription.unsubscribe(process_ids)
+                for process_id in process_ids:
+                    sent_states.pop(process_id, None)
+            else:
+                async with send_lock:
+                    await websocket.send_json(
+                        {"type": "error", "detail": f"Unknown action: {action}"}
+                    )
+    
+    except WebSocketDisconnect:
+        pass
+    
+    finally:
+        subscription.close()
+        sender.cancel()
+        if poller is not None:
+            poller.cancel()
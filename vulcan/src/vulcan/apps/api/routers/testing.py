@@ -1,12 +1,16 @@
 """
 Router for testing endpoints.
 """
+import asyncio
 import logging
 from fastapi import APIRouter, Depends, HTTPException, status
 
 from vulcan.apps.api.middleware.auth import get_api_key
 from vulcan.apps.api.models.requests import TestCodeRequest
 from vulcan.apps.api.models.responses import TestCodeResponse, ErrorResponse
+from vulcan.config.workflow_config import EXECUTION_MODE
+from vulcan.workflow_engine.worker import enqueue_workflow
+from vulcan.workflow_engine.workflows.testing_flow import TestingWorkflow
 
 
 # Configure logger
@@ -45,6 +49,17 @@ async def run_tests(
     try:
         logger.info(f"Received test code request with {len(request.code_content)} files")
         
+        # Hand the workflow over to the workers in queue mode
+        if EXECUTION_MODE == "queue":
+            process_id = await asyncio.to_thread(
+                enqueue_workflow,
+                TestingWorkflow.process_type,
+                code_content=request.code_content,
+                generate_coverage=request.generate_coverage,
+                callback_url=request.callback_url,
+            )
+            return TestCodeResponse(success=True, process_id=process_id)
+        
         # Initialize workflow
         workflow = TestingWorkflow()
         
@@ -52,6 +67,7 @@ async def run_tests(
         result = await workflow.execute_async(
             code_content=request.code_content,
             generate_coverage=request.generate_coverage,
+            callback_url=request.callback_url,
         )
         
         # Create response
@@ -0,0 +1,52 @@
+"""
+Command implementation for cancelling a process.
+"""
+import argparse
+
+from vulcan.apps.cli.utils.console import print_error, print_info, print_success
+from vulcan.config.workflow_config import WEBHOOK_TIMEOUT
+from vulcan.workflow_engine.state.workflow_state import WorkflowStateManager
+from vulcan.workflow_engine.webhooks import webhook_dispatcher
+
+
+def cancel_command(args: argparse.Namespace) -> int:
+    """
+    Execute the cancel command.
+
+    Args:
+        args: Command line arguments
+
+    Returns:
+        Exit code (0 for success, non-zero for failure)
+    """
+    try:
+        process_id = args.id
+
+        print_info(f"Cancelling process: {process_id}")
+
+        # Initialize workflow state manager
+        state_manager = WorkflowStateManager()
+
+        # Check that the process can still be cancelled
+        state = state_manager.get_state(process_id)
+
+        if not state:
+            print_error(f"No process found with ID: {process_id}")
+            return 1
+
+        if state.is_terminal:
+            print_error(f"Process already {state.status.name.lower()}: {process_id}")
+            return 1
+
+        # Cancel the process
+        state_manager.request_cancel(process_id)
+        # The completion webhook is delivered in the background; flush it
+        # before the command exits
+        webhook_dispatcher.close(WEBHOOK_TIMEOUT)
+
+        print_success(f"Process {process_id} cancelled")
+        return 0
+
+    except Exception as e:
+        print_error(f"Error cancelling process: {str(e)}")
+        return 1
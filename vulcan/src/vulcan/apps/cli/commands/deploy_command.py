@@ -5,8 +5,7 @@ import argparse
 from pathlib import Path
 
 from vulcan.apps.cli.utils.console import print_error, print_info, print_success
-from vulcan.src.packages.github_integration.services.repository_service import RepositoryService
-from vulcan.src.packages.workflow_engine.workflows.deployment_flow import DeploymentWorkflow
+from vulcan.workflow_engine.workflows.deployment_flow import DeploymentWorkflow
 
 
 def deploy_command(args: argparse.Namespace) -> int:
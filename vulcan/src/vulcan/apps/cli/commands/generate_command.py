@@ -8,9 +8,8 @@ from pathlib import Path
 from typing import Dict, Any
 
 from vulcan.apps.cli.utils.console import print_error, print_info, print_success
-from vulcan.src.packages.core.models.code_generation import CodeGeneration, Requirements
-from vulcan.src.packages.llm_services.services.code_generator import CodeGenerator
-from vulcan.src.packages.workflow_engine.workflows.code_generation_flow import CodeGenerationWorkflow
+from vulcan.core.vulcan_core.models import Requirements
+from vulcan.workflow_engine.workflows.code_generation_flow import CodeGenerationWorkflow
 
 
 def generate_command(args: argparse.Namespace) -> int:
@@ -7,8 +7,8 @@ from pathlib import Path
 from typing import Dict, Any, List
 
 from vulcan.apps.cli.utils.console import print_error, print_info, print_success, print_table
-from vulcan.src.packages.core.models.common import CodeStatus
-from vulcan.src.packages.workflow_engine.state.workflow_state import WorkflowStateManager
+from vulcan.core.vulcan_core.models import CodeStatus
+from vulcan.workflow_engine.state.workflow_state import WorkflowStateManager
 
 
 def status_command(args: argparse.Namespace) -> int:
@@ -65,13 +65,20 @@ def status_command(args: argparse.Namespace) -> int:
                     step.end_time or ""
                 ])
             
-            print_table(headers, rows, "Process Steps")
+            print_table(headers, rows, title="Process Steps")
         
         # Print artifacts if available
         if state.artifacts:
             print_info("Artifacts:")
             for artifact in state.artifacts:
-                print_info(f"  - {artifact.name}: {artifact.path}")
+                print_info(f"  - {artifact['name']}: {artifact['path']}")
+        
+        # Print memory usage of queued runs
+        if state.resources.get("rss_peak"):
+            print_info(
+                f"Peak memory: {state.resources['rss_peak'] / (1024 * 1024):.1f} MB "
+                f"(growth {state.resources['rss_growth'] / (1024 * 1024):+.1f} MB)"
+            )
         
         # Print errors if any
         if state.errors:
@@ -5,8 +5,7 @@ import argparse
 from pathlib import Path
 
 from vulcan.apps.cli.utils.console import print_error, print_info, print_success, print_table
-from vulcan.src.packages.testing_framework.services.test_runner import TestRunner
-from vulcan.src.packages.workflow_engine.workflows.testing_flow import TestingWorkflow
+from vulcan.workflow_engine.workflows.testing_flow import TestingWorkflow
 
 
 def test_command(args: argparse.Namespace) -> int:
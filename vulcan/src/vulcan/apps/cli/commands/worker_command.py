@@ -0,0 +1,105 @@
+"""
+Command implementation for running queue workers.
+"""
+import argparse
+import asyncio
+import signal
+from typing import List
+
+from vulcan.apps.cli.utils.console import print_error, print_info, print_success
+from vulcan.config.workflow_config import WEBHOOK_TIMEOUT
+from vulcan.workflow_engine.autoscaler import Autoscaler
+from vulcan.workflow_engine.queue.job_queue import JobQueue
+from vulcan.workflow_engine.webhooks import webhook_dispatcher
+from vulcan.workflow_engine.worker import Worker
+from vulcan.workflow_engine.worker_pool import WorkerPool, worker_args
+
+
+async def _run_until_signal(runner) -> None:
+    # Drain the running jobs on SIGINT/SIGTERM instead of dropping them
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, runner.stop)
+    await runner.run()
+
+
+def _single_worker_args(args: argparse.Namespace) -> List[str]:
+    extra_args = [
+        "--concurrency", str(args.concurrency),
+        "--max-jobs", str(args.max_jobs),
+        "--max-rss-mb", str(args.max_rss_mb),
+    ]
+    if args.queue:
+        extra_args += ["--queue", args.queue]
+    return worker_args(extra_args)
+
+
+def worker_command(args: argparse.Namespace) -> int:
+    """
+    Execute the worker command.
+
+    Without --single, a pool of worker processes is supervised and recycled
+    workers are replaced; with --autoscale, the pool size follows the job
+    queue. With --single, one worker runs in this process.
+
+    Args:
+        args: Command line arguments
+
+    Returns:
+        Exit code (0 for success, non-zero for failure)
+    """
+    try:
+        queue = JobQueue(path=args.queue) if args.queue else JobQueue()
+
+        if not args.single:
+            autoscaler = (
+                Autoscaler(
+                    min_size=args.min_workers,
+                    max_size=args.max_workers,
+                    worker_concurrency=args.concurrency,
+                )
+                if args.autoscale
+                else None
+            )
+            pool = WorkerPool(
+                size=args.processes,
+                args=_single_worker_args(args),
+                autoscaler=autoscaler,
+                queue=queue,
+            )
+
+            if autoscaler:
+                print_info(
+                    f"Starting an autoscaled pool of {autoscaler.min_size}-{autoscaler.max_size} "
+                    "worker processes"
+                )
+            else:
+                print_info(f"Starting a pool of {pool.size} worker processes")
+
+            asyncio.run(_run_until_signal(pool))
+
+            print_success(f"Worker pool stopped after {pool.restarts} worker restarts")
+            return 0
+
+        worker = Worker(
+            queue=queue,
+            worker_id=args.worker_id,
+            concurrency=args.concurrency,
+            max_jobs=args.max_jobs,
+            max_rss_mb=args.max_rss_mb,
+        )
+
+        print_info(f"Starting worker {worker.worker_id} on {queue.path}")
+
+        asyncio.run(_run_until_signal(worker))
+        # Completion webhooks of the last jobs may still be in flight
+        webhook_dispatcher.close(WEBHOOK_TIMEOUT)
+
+        if worker.recycle_reason:
+            print_info(f"Worker recycled after it {worker.recycle_reason}")
+        print_success(f"Worker stopped after {worker.jobs_run} jobs")
+        return 0
+
+    except Exception as e:
+        print_error(f"Error running worker: {str(e)}")
+        return 1
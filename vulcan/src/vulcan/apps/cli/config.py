@@ -11,7 +11,7 @@ CLI_VERSION = "0.1.0"
 # Paths
 ROOT_DIR = Path(__file__).parent.parent.parent.parent.parent
 CONFIG_DIR = ROOT_DIR / "config"
-DEFAULT_OUTPUT_DIR = ROOT_DIR / "output"
+DEFAULT_OUTPUT_DIR = Path(os.environ.get("VULCAN_OUTPUT_DIR", str(ROOT_DIR / "output")))
 
 # Environment
 ENV = os.environ.get("VULCAN_ENV", "development")
@@ -30,7 +30,20 @@ DEFAULT_CONFIG: Dict[str, Any] = {
         "provider": "dust",
         "model": "gpt-4",
         "temperature": 0.7,
-        "max_tokens": 2000,
+        "max_tokens": 8000,
+        "context_window": 0,
+        "max_file_tokens": 6000,
+        "model_tiers": "",
+        "repair_iterations": 2,
+        "candidates": 1,
+        "plan_min_files": 3,
+        "retrieval_top_k": 8,
+        "retrieval_tokens": 2000,
+        "retrieval_signatures": 40,
+        "few_shot_examples": 2,
+        "few_shot_tokens": 1500,
+        "cache": True,
+        "hedge": False,
     },
     "github": {
         "api_url": "https://api.github.com",
@@ -9,8 +9,19 @@ from vulcan.apps.cli.commands.generate_command import generate_command
 from vulcan.apps.cli.commands.test_command import test_command
 from vulcan.apps.cli.commands.deploy_command import deploy_command
 from vulcan.apps.cli.commands.status_command import status_command
+from vulcan.apps.cli.commands.cancel_command import cancel_command
+from vulcan.apps.cli.commands.worker_command import worker_command
 from vulcan.apps.cli.utils.console import print_banner, print_error, print_success
 from vulcan.apps.cli.config import CLI_VERSION
+from vulcan.config.workflow_config import (
+    AUTOSCALE_ENABLED,
+    AUTOSCALE_MAX_WORKERS,
+    AUTOSCALE_MIN_WORKERS,
+    WORKER_CONCURRENCY,
+    WORKER_MAX_JOBS,
+    WORKER_MAX_RSS_MB,
+    WORKER_PROCESSES,
+)
 
 
 def create_parser() -> argparse.ArgumentParser:
@@ -66,6 +77,57 @@ def create_parser() -> argparse.ArgumentParser:
         "id", help="ID of the process to check"
     )
     
+    # Cancel command
+    cancel_parser = subparsers.add_parser(
+        "cancel", help="Cancel a running code generation, testing, or deployment"
+    )
+    cancel_parser.add_argument(
+        "id", help="ID of the process to cancel"
+    )
+    
+    # Worker command
+    worker_parser = subparsers.add_parser(
+        "worker", help="Run a worker executing queued processes"
+    )
+    worker_parser.add_argument(
+        "--concurrency", "-c", type=int, default=WORKER_CONCURRENCY,
+        help="Number of processes run at once",
+    )
+    worker_parser.add_argument(
+        "--queue", "-q", help="Path to the job queue database"
+    )
+    worker_parser.add_argument(
+        "--worker-id", help="Unique ID of the worker"
+    )
+    worker_parser.add_argument(
+        "--processes", "-p", type=int, default=WORKER_PROCESSES,
+        help="Number of worker processes in the pool",
+    )
+    worker_parser.add_argument(
+        "--max-jobs", type=int, default=WORKER_MAX_JOBS,
+        help="Recycle a worker after this many jobs (0 for no limit)",
+    )
+    worker_parser.add_argument(
+        "--max-rss-mb", type=int, default=WORKER_MAX_RSS_MB,
+        help="Recycle a worker above this resident memory (0 for no limit)",
+    )
+    worker_parser.add_argument(
+        "--autoscale", action="store_true", default=AUTOSCALE_ENABLED,
+        help="Size the pool from the depth and wait time of the job queue",
+    )
+    worker_parser.add_argument(
+        "--min-workers", type=int, default=AUTOSCALE_MIN_WORKERS,
+        help="Minimum number of worker processes when autoscaling",
+    )
+    worker_parser.add_argument(
+        "--max-workers", type=int, default=AUTOSCALE_MAX_WORKERS,
+        help="Maximum number of worker processes when autoscaling",
+    )
+    worker_parser.add_argument(
+        "--single", action="store_true",
+        help="Run one worker in this process instead of a supervised pool",
+    )
+    
     return parser
 
 
@@ -91,6 +153,10 @@ def main(args: Optional[List[str]] = None) -> int:
             return deploy_command(parsed_args)
         elif parsed_args.command == "status":
             return status_command(parsed_args)
+        elif parsed_args.command == "cancel":
+            return cancel_command(parsed_args)
+        elif parsed_args.command == "worker":
+            return worker_command(parsed_args)
         else:
             print_error(f"Unknown command: {parsed_args.command}")
             return 1
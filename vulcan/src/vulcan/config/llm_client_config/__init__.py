@@ -0,0 +1,151 @@
+"""
+Configuration for the Vulcan LLM clients.
+"""
+import os
+from pathlib import Path
+from typing import Any, Dict
+
+from vulcan.config.workflow_config import STATE_DIR
+
+# Defaults, kept in line with the "llm" section of the CLI DEFAULT_CONFIG
+LLM_PROVIDER = os.environ.get("VULCAN_LLM_PROVIDER", "dust")
+LLM_MODEL = os.environ.get("VULCAN_LLM_MODEL", "gpt-4")
+LLM_TEMPERATURE = float(os.environ.get("VULCAN_LLM_TEMPERATURE", "0.7"))
+# Ceiling of the completion tokens; requests reserve what their expected output needs
+LLM_MAX_TOKENS = int(os.environ.get("VULCAN_LLM_MAX_TOKENS", "8000"))
+# Model tiers as "model:max_score" pairs from the smallest model up, the last
+# one without a bound (e.g. "gpt-4o-mini:4,gpt-4o:12,gpt-4"); empty disables routing
+LLM_MODEL_TIERS = os.environ.get("VULCAN_LLM_MODEL_TIERS", "")
+
+# Token budget: context window of the model (0: known window of the model)
+# and completion tokens reserved per generated file
+LLM_CONTEXT_WINDOW = int(os.environ.get("VULCAN_LLM_CONTEXT_WINDOW", "0"))
+LLM_OUTPUT_TOKENS_PER_FILE = int(os.environ.get("VULCAN_LLM_OUTPUT_TOKENS_PER_FILE", "1500"))
+LLM_MIN_OUTPUT_TOKENS = int(os.environ.get("VULCAN_LLM_MIN_OUTPUT_TOKENS", "1000"))
+# Size guard: a completion is cut off once a single file exceeds this many tokens
+LLM_MAX_FILE_TOKENS = int(os.environ.get("VULCAN_LLM_MAX_FILE_TOKENS", "6000"))
+
+# Repair of code failing its tests with edits instead of a full regeneration:
+# iterations per model, lines of code shown around each failure location and
+# minimum similarity of the code replaced by a fuzzy-matched edit
+LLM_REPAIR_ITERATIONS = int(os.environ.get("VULCAN_LLM_REPAIR_ITERATIONS", "2"))
+LLM_REPAIR_CONTEXT_LINES = int(os.environ.get("VULCAN_LLM_REPAIR_CONTEXT_LINES", "15"))
+LLM_PATCH_MIN_SIMILARITY = float(os.environ.get("VULCAN_LLM_PATCH_MIN_SIMILARITY", "0.8"))
+
+# Best-of-N: candidates generated concurrently, the first passing its tests
+# wins; candidate i uses the i-th temperature and model (cycled), an empty
+# model list meaning the configured or routed model
+LLM_CANDIDATES = int(os.environ.get("VULCAN_LLM_CANDIDATES", "1"))
+LLM_CANDIDATE_TEMPERATURES = os.environ.get("VULCAN_LLM_CANDIDATE_TEMPERATURES", "0.2,0.7,1.0")
+LLM_CANDIDATE_MODELS = os.environ.get("VULCAN_LLM_CANDIDATE_MODELS", "")
+
+# Requests for at least this many files are planned first, then generated file by file
+LLM_PLAN_MIN_FILES = int(os.environ.get("VULCAN_LLM_PLAN_MIN_FILES", "3"))
+
+# Retrieval of repository code for the prompt context: snippets of
+# LLM_RETRIEVAL_SNIPPET_LINES lines, at most LLM_RETRIEVAL_TOP_K of them within
+# LLM_RETRIEVAL_TOKENS prompt tokens; files are indexed by a pool of
+# LLM_RETRIEVAL_INDEX_WORKERS processes (0: one per CPU)
+LLM_RETRIEVAL_TOP_K = int(os.environ.get("VULCAN_LLM_RETRIEVAL_TOP_K", "8"))
+LLM_RETRIEVAL_TOKENS = int(os.environ.get("VULCAN_LLM_RETRIEVAL_TOKENS", "2000"))
+LLM_RETRIEVAL_SNIPPET_LINES = int(os.environ.get("VULCAN_LLM_RETRIEVAL_SNIPPET_LINES", "40"))
+LLM_RETRIEVAL_MAX_FILE_KB = int(os.environ.get("VULCAN_LLM_RETRIEVAL_MAX_FILE_KB", "512"))
+LLM_RETRIEVAL_INDEX_WORKERS = int(os.environ.get("VULCAN_LLM_RETRIEVAL_INDEX_WORKERS", "0"))
+# Symbol index of the Python code of the checkout: at most
+# LLM_RETRIEVAL_SIGNATURES signatures of the symbols involved are added to the
+# prompt context; the index is kept in LLM_SYMBOL_INDEX_DIR for the last
+# LLM_SYMBOL_INDEX_SNAPSHOTS commits of each checkout
+LLM_RETRIEVAL_SIGNATURES = int(os.environ.get("VULCAN_LLM_RETRIEVAL_SIGNATURES", "40"))
+LLM_SYMBOL_INDEX_DIR = Path(
+    os.environ.get("VULCAN_LLM_SYMBOL_INDEX_DIR", str(STATE_DIR / "symbol_index"))
+)
+LLM_SYMBOL_INDEX_SNAPSHOTS = int(os.environ.get("VULCAN_LLM_SYMBOL_INDEX_SNAPSHOTS", "3"))
+
+# Few-shot examples: the LLM_FEW_SHOT_EXAMPLES past generations whose tests
+# passed for the most similar requirements are added to the prompt within
+# LLM_FEW_SHOT_TOKENS tokens (0 examples: disabled); the last
+# LLM_EXAMPLE_INDEX_MAX_EXAMPLES of them are kept in LLM_EXAMPLE_INDEX_DIR
+LLM_FEW_SHOT_EXAMPLES = int(os.environ.get("VULCAN_LLM_FEW_SHOT_EXAMPLES", "2"))
+LLM_FEW_SHOT_TOKENS = int(os.environ.get("VULCAN_LLM_FEW_SHOT_TOKENS", "1500"))
+LLM_EXAMPLE_INDEX_DIR = Path(
+    os.environ.get("VULCAN_LLM_EXAMPLE_INDEX_DIR", str(STATE_DIR / "example_index"))
+)
+LLM_EXAMPLE_INDEX_MAX_EXAMPLES = int(os.environ.get("VULCAN_LLM_EXAMPLE_INDEX_MAX_EXAMPLES", "5000"))
+
+LLM_CACHE_ENABLED = os.environ.get("VULCAN_LLM_CACHE", "true").lower() == "true"
+
+# Response cache, shared by the workers through its disk level
+LLM_CACHE_DIR = Path(os.environ.get("VULCAN_LLM_CACHE_DIR", str(STATE_DIR / "llm_cache")))
+LLM_CACHE_TTL = float(os.environ.get("VULCAN_LLM_CACHE_TTL", str(7 * 24 * 3600)))  # in seconds
+LLM_CACHE_MEMORY_ENTRIES = int(os.environ.get("VULCAN_LLM_CACHE_MEMORY_ENTRIES", "256"))
+LLM_CACHE_DISK_MB = int(os.environ.get("VULCAN_LLM_CACHE_DISK_MB", "256"))
+
+# HTTP transport shared by the provider clients
+LLM_TIMEOUT = float(os.environ.get("VULCAN_LLM_TIMEOUT", "120"))  # in seconds
+LLM_CONNECT_TIMEOUT = float(os.environ.get("VULCAN_LLM_CONNECT_TIMEOUT", "10"))  # in seconds
+LLM_MAX_CONNECTIONS = int(os.environ.get("VULCAN_LLM_MAX_CONNECTIONS", "32"))
+LLM_KEEPALIVE_EXPIRY = float(os.environ.get("VULCAN_LLM_KEEPALIVE_EXPIRY", "60"))  # in seconds
+LLM_HTTP2 = os.environ.get("VULCAN_LLM_HTTP2", "false").lower() == "true"
+LLM_MAX_RETRIES = int(os.environ.get("VULCAN_LLM_MAX_RETRIES", "4"))
+LLM_BACKOFF_BASE = float(os.environ.get("VULCAN_LLM_BACKOFF_BASE", "1"))  # in seconds
+LLM_BACKOFF_MAX = float(os.environ.get("VULCAN_LLM_BACKOFF_MAX", "30"))  # in seconds
+
+# In-flight provider requests of a process, in total and per provider
+LLM_MAX_CONCURRENT_REQUESTS = int(os.environ.get("VULCAN_LLM_MAX_CONCURRENT_REQUESTS", "16"))
+LLM_MAX_CONCURRENT_REQUESTS_PER_PROVIDER = int(
+    os.environ.get("VULCAN_LLM_MAX_CONCURRENT_REQUESTS_PER_PROVIDER", "8")
+)
+
+# Hedging: a request whose first token is later than the given percentile of
+# recent first-token latencies is also sent to the hedge provider/model
+LLM_HEDGE_ENABLED = os.environ.get("VULCAN_LLM_HEDGE", "false").lower() == "true"
+LLM_HEDGE_PROVIDER = os.environ.get("VULCAN_LLM_HEDGE_PROVIDER", "")  # empty: same provider
+LLM_HEDGE_MODEL = os.environ.get("VULCAN_LLM_HEDGE_MODEL", "")  # empty: same model
+LLM_HEDGE_PERCENTILE = float(os.environ.get("VULCAN_LLM_HEDGE_PERCENTILE", "95"))
+LLM_HEDGE_INITIAL_DELAY = float(os.environ.get("VULCAN_LLM_HEDGE_INITIAL_DELAY", "10"))  # in seconds
+LLM_HEDGE_MIN_DELAY = float(os.environ.get("VULCAN_LLM_HEDGE_MIN_DELAY", "1"))  # in seconds
+LLM_HEDGE_WINDOW = int(os.environ.get("VULCAN_LLM_HEDGE_WINDOW", "200"))
+LLM_HEDGE_MIN_SAMPLES = int(os.environ.get("VULCAN_LLM_HEDGE_MIN_SAMPLES", "20"))
+
+# Dust provider
+DUST_API_URL = os.environ.get("DUST_API_URL", "https://dust.tt")
+DUST_API_KEY = os.environ.get("DUST_API_KEY", "")
+DUST_WORKSPACE_ID = os.environ.get("DUST_WORKSPACE_ID", "")
+
+# Mock provider: distributions are "const:x", "uniform:low,high", "normal:mean,stddev",
+# "lognormal:median,sigma" or "exponential:mean", sampled once per request
+MOCK_LLM_SEED = int(os.environ.get("VULCAN_MOCK_LLM_SEED", "0"))
+# Time to first token, in seconds
+MOCK_LLM_FIRST_TOKEN_LATENCY = os.environ.get("VULCAN_MOCK_LLM_FIRST_TOKEN_LATENCY", "const:0")
+# Tokens per second after the first one; 0 streams without delay
+MOCK_LLM_TOKEN_RATE = os.environ.get("VULCAN_MOCK_LLM_TOKEN_RATE", "const:0")
+MOCK_LLM_ERROR_RATE = float(os.environ.get("VULCAN_MOCK_LLM_ERROR_RATE", "0"))
+# JSON object mapping a text found in the requirements to a canned completion
+MOCK_LLM_RESPONSES_FILE = os.environ.get("VULCAN_MOCK_LLM_RESPONSES_FILE", "")
+
+
+def get_llm_config() -> Dict[str, Any]:
+    """Get the default LLM configuration."""
+    return {
+        "provider": LLM_PROVIDER,
+        "model": LLM_MODEL,
+        "temperature": LLM_TEMPERATURE,
+        "max_tokens": LLM_MAX_TOKENS,
+        "context_window": LLM_CONTEXT_WINDOW,
+        "max_file_tokens": LLM_MAX_FILE_TOKENS,
+        "model_tiers": LLM_MODEL_TIERS,
+        "repair_iterations": LLM_REPAIR_ITERATIONS,
+        "candidates": LLM_CANDIDATES,
+        "candidate_temperatures": LLM_CANDIDATE_TEMPERATURES,
+        "candidate_models": LLM_CANDIDATE_MODELS,
+        "plan_min_files": LLM_PLAN_MIN_FILES,
+        "retrieval_top_k": LLM_RETRIEVAL_TOP_K,
+        "retrieval_tokens": LLM_RETRIEVAL_TOKENS,
+        "retrieval_signatures": LLM_RETRIEVAL_SIGNATURES,
+        "few_shot_examples": LLM_FEW_SHOT_EXAMPLES,
+        "few_shot_tokens": LLM_FEW_SHOT_TOKENS,
+        "cache": LLM_CACHE_ENABLED,
+        "hedge": LLM_HEDGE_ENABLED,
+        "hedge_provider": LLM_HEDGE_PROVIDER,
+        "hedge_model": LLM_HEDGE_MODEL,
+    }
@@ -0,0 +1,119 @@
+"""
+Configuration for the Vulcan workflow engine.
+"""
+import os
+from pathlib import Path
+
+# Paths
+ROOT_DIR = Path(__file__).parent.parent.parent.parent.parent
+STATE_DIR = Path(os.environ.get("VULCAN_STATE_DIR", str(ROOT_DIR / "state")))
+WORKSPACE_DIR = Path(os.environ.get("VULCAN_WORKSPACE_DIR", str(ROOT_DIR / "workspaces")))
+# Persistent repository checkouts live outside WORKSPACE_DIR, whose stale
+# entries are deleted by the compactor
+CHECKOUT_DIR = Path(os.environ.get("VULCAN_CHECKOUT_DIR", str(ROOT_DIR / "checkouts")))
+
+# Cancellation
+CANCEL_POLL_INTERVAL = float(os.environ.get("VULCAN_CANCEL_POLL_INTERVAL", "0.5"))  # in seconds
+
+# Subprocesses (test runs, git operations)
+SUBPROCESS_TIMEOUT = int(os.environ.get("VULCAN_SUBPROCESS_TIMEOUT", "600"))  # in seconds
+SUBPROCESS_KILL_GRACE = float(os.environ.get("VULCAN_SUBPROCESS_KILL_GRACE", "5"))  # in seconds
+
+# Stage concurrency limits (0 disables the limit)
+MAX_CONCURRENT_LLM_CALLS = int(os.environ.get("VULCAN_MAX_CONCURRENT_LLM_CALLS", "8"))
+MAX_CONCURRENT_SANDBOXES = int(os.environ.get("VULCAN_MAX_CONCURRENT_SANDBOXES", "4"))
+MAX_CONCURRENT_PUSHES_PER_REPOSITORY = int(
+    os.environ.get("VULCAN_MAX_CONCURRENT_PUSHES_PER_REPOSITORY", "1")
+)
+
+STAGE_LIMITS = {
+    "llm": MAX_CONCURRENT_LLM_CALLS,
+    "sandbox": MAX_CONCURRENT_SANDBOXES,
+    "github_push": MAX_CONCURRENT_PUSHES_PER_REPOSITORY,
+}
+
+# Execution mode: "inline" runs workflows in the API process, "queue" enqueues
+# them for workers started with `vulcan worker`
+EXECUTION_MODE = os.environ.get("VULCAN_EXECUTION_MODE", "inline")
+
+# Job queue
+QUEUE_PATH = Path(os.environ.get("VULCAN_QUEUE_PATH", str(STATE_DIR / "jobs.sqlite3")))
+JOB_VISIBILITY_TIMEOUT = float(os.environ.get("VULCAN_JOB_VISIBILITY_TIMEOUT", "60"))  # in seconds
+JOB_HEARTBEAT_INTERVAL = float(os.environ.get("VULCAN_JOB_HEARTBEAT_INTERVAL", "15"))  # in seconds
+JOB_MAX_ATTEMPTS = int(os.environ.get("VULCAN_JOB_MAX_ATTEMPTS", "3"))
+JOB_RETRY_DELAY = float(os.environ.get("VULCAN_JOB_RETRY_DELAY", "5"))  # in seconds
+# Done and dead jobs are purged by the compactor once enqueued this long ago
+JOB_RETENTION_DAYS = float(os.environ.get("VULCAN_JOB_RETENTION_DAYS", "7"))
+
+# Workers
+WORKER_CONCURRENCY = int(os.environ.get("VULCAN_WORKER_CONCURRENCY", "1"))
+WORKER_POLL_INTERVAL = float(os.environ.get("VULCAN_WORKER_POLL_INTERVAL", "1"))  # in seconds
+
+# Worker recycling: a worker drains and exits after this many jobs or once its
+# resident memory exceeds the ceiling; the pool then starts a fresh one
+# (0 disables the limit)
+WORKER_PROCESSES = int(os.environ.get("VULCAN_WORKER_PROCESSES", "1"))
+WORKER_MAX_JOBS = int(os.environ.get("VULCAN_WORKER_MAX_JOBS", "200"))
+WORKER_MAX_RSS_MB = int(os.environ.get("VULCAN_WORKER_MAX_RSS_MB", "1024"))
+WORKER_RESTART_DELAY = float(os.environ.get("VULCAN_WORKER_RESTART_DELAY", "1"))  # in seconds
+
+# Memory accounting
+MEMORY_SAMPLE_INTERVAL = float(os.environ.get("VULCAN_MEMORY_SAMPLE_INTERVAL", "0.5"))  # in seconds
+
+# Autoscaling of the worker pool: the pool grows while it is smaller than the
+# workers busy with running jobs plus one per AUTOSCALE_TARGET_DEPTH waiting
+# jobs, or the oldest job waited longer than AUTOSCALE_TARGET_WAIT, and shrinks once load stayed low for
+# AUTOSCALE_SCALE_DOWN_DELAY (WORKER_PROCESSES is the fixed size when disabled)
+AUTOSCALE_ENABLED = os.environ.get("VULCAN_AUTOSCALE_ENABLED", "false").lower() == "true"
+AUTOSCALE_MIN_WORKERS = int(os.environ.get("VULCAN_AUTOSCALE_MIN_WORKERS", "1"))
+AUTOSCALE_MAX_WORKERS = int(os.environ.get("VULCAN_AUTOSCALE_MAX_WORKERS", "8"))
+AUTOSCALE_TARGET_DEPTH = float(os.environ.get("VULCAN_AUTOSCALE_TARGET_DEPTH", "2"))  # jobs per worker
+AUTOSCALE_TARGET_WAIT = float(os.environ.get("VULCAN_AUTOSCALE_TARGET_WAIT", "30"))  # in seconds
+AUTOSCALE_INTERVAL = float(os.environ.get("VULCAN_AUTOSCALE_INTERVAL", "5"))  # in seconds
+AUTOSCALE_SCALE_UP_COOLDOWN = float(os.environ.get("VULCAN_AUTOSCALE_SCALE_UP_COOLDOWN", "15"))  # in seconds
+AUTOSCALE_SCALE_DOWN_DELAY = float(os.environ.get("VULCAN_AUTOSCALE_SCALE_DOWN_DELAY", "300"))  # in seconds
+
+# Metrics
+METRICS_DIR = Path(os.environ.get("VULCAN_METRICS_DIR", str(STATE_DIR / "metrics")))
+
+# Process state: events appended to a process log are folded into a snapshot
+# once this many of them follow the previous snapshot
+STATE_SNAPSHOT_INTERVAL = int(os.environ.get("VULCAN_STATE_SNAPSHOT_INTERVAL", "20"))
+
+# Retention: terminal processes are archived once they ended longer ago than
+# the retention of their type, in days
+PROCESS_RETENTION_DAYS = {
+    "code_generation": float(os.environ.get("VULCAN_RETENTION_CODE_GENERATION_DAYS", "30")),
+    "testing": float(os.environ.get("VULCAN_RETENTION_TESTING_DAYS", "7")),
+    "deployment": float(os.environ.get("VULCAN_RETENTION_DEPLOYMENT_DAYS", "90")),
+}
+DEFAULT_RETENTION_DAYS = float(os.environ.get("VULCAN_RETENTION_DEFAULT_DAYS", "30"))
+ARCHIVE_DIR = Path(os.environ.get("VULCAN_ARCHIVE_DIR", str(STATE_DIR / "archive")))
+
+# Directories of generated code (`output/generation_*`) expire with the
+# code_generation retention; leftover test workspaces after this many hours
+OUTPUT_DIR = Path(os.environ.get("VULCAN_OUTPUT_DIR", str(ROOT_DIR / "output")))
+WORKSPACE_RETENTION_HOURS = float(os.environ.get("VULCAN_WORKSPACE_RETENTION_HOURS", "24"))
+
+# Compactor
+COMPACTOR_ENABLED = os.environ.get("VULCAN_COMPACTOR_ENABLED", "true").lower() == "true"
+COMPACTOR_BATCH_SIZE = int(os.environ.get("VULCAN_COMPACTOR_BATCH_SIZE", "50"))
+COMPACTOR_BATCH_PAUSE = float(os.environ.get("VULCAN_COMPACTOR_BATCH_PAUSE", "0.5"))  # in seconds
+COMPACTOR_INTERVAL = float(os.environ.get("VULCAN_COMPACTOR_INTERVAL", "3600"))  # in seconds
+
+# Event bus: events queued per subscriber before the oldest are dropped
+EVENT_QUEUE_SIZE = int(os.environ.get("VULCAN_EVENT_QUEUE_SIZE", "256"))
+# The events of queued processes stay in the worker processes: status
+# WebSockets poll the state store for them instead
+STATUS_POLL_INTERVAL = float(os.environ.get("VULCAN_STATUS_POLL_INTERVAL", "1"))  # in seconds
+
+# Completion webhooks: no webhook is delivered unless VULCAN_WEBHOOK_SECRET is set
+WEBHOOK_SECRET = os.environ.get("VULCAN_WEBHOOK_SECRET", "")
+WEBHOOK_TIMEOUT = float(os.environ.get("VULCAN_WEBHOOK_TIMEOUT", "10"))  # in seconds
+WEBHOOK_MAX_ATTEMPTS = int(os.environ.get("VULCAN_WEBHOOK_MAX_ATTEMPTS", "5"))
+WEBHOOK_BACKOFF_BASE = float(os.environ.get("VULCAN_WEBHOOK_BACKOFF_BASE", "1"))  # in seconds
+WEBHOOK_BACKOFF_MAX = float(os.environ.get("VULCAN_WEBHOOK_BACKOFF_MAX", "60"))  # in seconds
+WEBHOOK_MAX_CONNECTIONS = int(os.environ.get("VULCAN_WEBHOOK_MAX_CONNECTIONS", "20"))
+WEBHOOK_LOG_PATH = Path(
+    os.environ.get("VULCAN_WEBHOOK_LOG_PATH", str(STATE_DIR / "webhook_deliveries.jsonl"))
+)
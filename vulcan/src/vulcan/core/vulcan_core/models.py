@@ -12,6 +12,7 @@ class CodeStatus(Enum):
     IN_PROGRESS = "in_progress"
     COMPLETED = "completed"
     FAILED = "failed"
+    CANCELLED = "cancelled"
 
 
 @dataclass
@@ -20,6 +21,10 @@ class Requirements:
     description: str
     constraints: List[str] = field(default_factory=list)
     examples: List[str] = field(default_factory=list)
+    # Snippets of the target repository relevant to the requirements
+    context: List[str] = field(default_factory=list)
+    # Past generations of similar requirements whose tests passed
+    few_shot: List[str] = field(default_factory=list)
 
 
 @dataclass
@@ -39,6 +44,10 @@ class CodeMetadata:
     prompt_tokens: int
     completion_tokens: int
     additional_info: Dict[str, str] = field(default_factory=dict)
+    # Why the completion ended, e.g. "stop", "length" or "files_complete"
+    finish_reason: Optional[str] = None
+    # Whether the completion was cut off before its end, by the provider or a size guard
+    truncated: bool = False
 
 
 @dataclass
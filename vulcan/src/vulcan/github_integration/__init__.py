@@ -0,0 +1,3 @@
+"""
+GitHub integration for the Vulcan autonomous coding agent.
+"""
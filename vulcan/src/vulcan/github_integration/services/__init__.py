@@ -0,0 +1,3 @@
+"""
+Services for interacting with GitHub repositories.
+"""
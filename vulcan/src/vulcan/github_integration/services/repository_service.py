@@ -0,0 +1,281 @@
+"""
+Repository service pushing code to GitHub repositories with git.
+"""
+import asyncio
+import base64
+import fcntl
+import hashlib
+import logging
+import os
+import shutil
+import tempfile
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import AsyncIterator, Dict, List, Optional
+
+from vulcan.config.workflow_config import CHECKOUT_DIR, WORKSPACE_DIR
+from vulcan.workflow_engine.cancellation import CancellationToken, run_subprocess
+
+
+logger = logging.getLogger(__name__)
+
+COMMITTER_NAME = "Vulcan"
+COMMITTER_EMAIL = "vulcan@users.noreply.github.com"
+
+
+class RepositoryError(Exception):
+    """Raised when a git operation fails."""
+
+
+@dataclass
+class PushResult:
+    """Outcome of pushing code to a repository."""
+    commit_sha: str
+    deployment_url: str
+    logs: List[str] = field(default_factory=list)
+
+
+def commit_url(repository_url: str, commit_sha: str) -> str:
+    """
+    Build the web URL of a commit.
+
+    Args:
+        repository_url: Clone URL of the repository
+        commit_sha: SHA of the commit
+
+    Returns:
+        The commit URL
+    """
+    base_url = repository_url[:-4] if repository_url.endswith(".git") else repository_url
+    return f"{base_url.rstrip('/')}/commit/{commit_sha}"
+
+
+# Seconds between two attempts to lock a checkout held by another process
+CHECKOUT_LOCK_POLL_INTERVAL = 0.1
+
+
+@asynccontextmanager
+async def checkout_lock(checkout: Path) -> AsyncIterator[None]:
+    """
+    Serialize the updates of a persistent checkout.
+
+    The lock is an flock on a file next to the checkout, so that it holds
+    across the worker processes and event loops sharing the checkout. It is
+    polled rather than waited for, so that no thread blocks on it.
+
+    Args:
+        checkout: Checkout directory
+    """
+    checkout.parent.mkdir(parents=True, exist_ok=True)
+    with open(checkout.with_name(f"{checkout.name}.lock"), "ab") as lock_file:
+        while True:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                break
+            except BlockingIOError:
+                await asyncio.sleep(CHECKOUT_LOCK_POLL_INTERVAL)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+class RepositoryService:
+    """Clones repositories, commits files and pushes them."""
+
+    def __init__(
+        self,
+        token: Optional[str] = None,
+        workspace_dir: Optional[Path] = None,
+        checkout_dir: Optional[Path] = None,
+    ):
+        """
+        Initialize the repository service.
+
+        Args:
+            token: GitHub token used for HTTPS authentication
+            workspace_dir: Directory in which repositories are cloned to push
+            checkout_dir: Directory holding the persistent checkouts
+        """
+        self._token = token or os.environ.get("GITHUB_TOKEN")
+        self.workspace_dir = Path(workspace_dir or WORKSPACE_DIR)
+        self.checkout_dir = Path(checkout_dir or CHECKOUT_DIR)
+
+    def _git_args(self) -> List[str]:
+        args = ["git", "-c", f"user.name={COMMITTER_NAME}", "-c", f"user.email={COMMITTER_EMAIL}"]
+        if self._token:
+            credentials = base64.b64encode(f"x-access-token:{self._token}".encode()).decode()
+            args += ["-c", f"http.extraHeader=Authorization: Basic {credentials}"]
+        return args
+
+    async def _git(
+        self,
+        args: List[str],
+        logs: List[str],
+        cwd: Optional[Path] = None,
+        token: Optional[CancellationToken] = None,
+    ) -> str:
+        logs.append(f"git {' '.join(args)}")
+        exit_code, stdout, stderr = await run_subprocess(
+            self._git_args() + args,
+            cwd=str(cwd) if cwd else None,
+            env={**os.environ, "GIT_TERMINAL_PROMPT": "0"},
+            token=token,
+        )
+        if exit_code != 0:
+            raise RepositoryError(f"git {args[0]} failed: {stderr.strip()}")
+        return stdout.strip()
+
+    async def checkout(
+        self,
+        repository_url: str,
+        branch: Optional[str] = None,
+        token: Optional[CancellationToken] = None,
+    ) -> Path:
+        """
+        Bring a persistent shallow checkout of a repository up to date.
+
+        The checkout is kept across calls in the checkout directory, so that
+        only the files changed upstream are rewritten and indexes of it can
+        be updated incrementally.
+
+        Args:
+            repository_url: Clone URL of the repository
+            branch: Branch to check out; the default branch if omitted
+            token: Cancellation token of the owning process
+
+        Returns:
+            The checkout directory
+
+        Raises:
+            RepositoryError: If a git operation fails
+        """
+        logs: List[str] = []
+        key = hashlib.sha256(f"{repository_url}#{branch or ''}".encode("utf-8")).hexdigest()[:16]
+        checkout = self.checkout_dir / key
+        async with checkout_lock(checkout):
+            if (checkout / ".git").is_dir():
+                await self._git(
+                    ["fetch", "--depth", "1", "origin", branch or "HEAD"], logs, cwd=checkout, token=token
+                )
+                await self._git(["reset", "--hard", "FETCH_HEAD"], logs, cwd=checkout, token=token)
+            else:
+                shutil.rmtree(checkout, ignore_errors=True)
+                branch_args = ["--branch", branch] if branch else []
+                await self._git(
+                    ["clone", "--depth", "1", *branch_args, repository_url, str(checkout)],
+                    logs, token=token,
+                )
+        logger.info(f"Checked out {repository_url} in {checkout}")
+        return checkout
+
+    async def head_commit(
+        self, checkout: Path, token: Optional[CancellationToken] = None
+    ) -> Optional[str]:
+        """
+        Get the commit checked out in a directory.
+
+        Args:
+            checkout: Checkout directory
+            token: Cancellation token of the owning process
+
+        Returns:
+            The commit SHA; None if the directory is no git checkout
+        """
+        try:
+            return await self._git(["rev-parse", "HEAD"], [], cwd=checkout, token=token)
+        except (RepositoryError, OSError):
+            return None
+
+    async def changed_files(
+        self,
+        checkout: Path,
+        base_sha: str,
+        head_sha: str,
+        token: Optional[CancellationToken] = None,
+    ) -> Optional[List[str]]:
+        """
+        List the files changed between two commits of a checkout.
+
+        Args:
+            checkout: Checkout directory
+            base_sha: Older commit
+            head_sha: Newer commit
+            token: Cancellation token of the owning process
+
+        Returns:
+            Paths of the added, changed and deleted files; None if the
+            commits cannot be compared, e.g. the older one was not fetched
+        """
+        try:
+            output = await self._git(
+                ["diff", "--name-only", "--no-renames", base_sha, head_sha], [], cwd=checkout, token=token
+            )
+        except (RepositoryError, OSError):
+            return None
+        return [line for line in output.splitlines() if line]
+
+    async def push_files(
+        self,
+        files: Dict[str, str],
+        repository_url: str,
+        branch: str,
+        commit_message: str,
+        token: Optional[CancellationToken] = None,
+    ) -> PushResult:
+        """
+        Commit files to a branch and push them.
+
+        The running git command is killed if the owning process is cancelled.
+
+        Args:
+            files: Mapping of file paths to content
+            repository_url: Clone URL of the repository
+            branch: Branch to push to; created if it does not exist
+            commit_message: Commit message
+            token: Cancellation token of the owning process
+
+        Returns:
+            The push result
+
+        Raises:
+            RepositoryError: If a git operation fails
+        """
+        logs: List[str] = []
+        self.workspace_dir.mkdir(parents=True, exist_ok=True)
+        checkout = Path(tempfile.mkdtemp(prefix="deploy-", dir=self.workspace_dir))
+
+        try:
+            try:
+                await self._git(
+                    ["clone", "--depth", "1", "--branch", branch, repository_url, str(checkout)],
+                    logs, token=token,
+                )
+            except RepositoryError:
+                logs.append(f"Branch {branch} not found, creating it")
+                shutil.rmtree(checkout, ignore_errors=True)
+                await self._git(["clone", "--depth", "1", repository_url, str(checkout)], logs, token=token)
+                await self._git(["checkout", "-b", branch], logs, cwd=checkout, token=token)
+
+            for file_path, content in files.items():
+                target = (checkout / file_path).resolve()
+                if checkout.resolve() not in target.parents:
+                    raise RepositoryError(f"File path escapes the repository: {file_path}")
+                target.parent.mkdir(parents=True, exist_ok=True)
+                target.write_text(content, encoding="utf-8")
+            logs.append(f"Wrote {len(files)} files")
+
+            await self._git(["add", "--all"], logs, cwd=checkout, token=token)
+            await self._git(["commit", "-m", commit_message], logs, cwd=checkout, token=token)
+            commit_sha = await self._git(["rev-parse", "HEAD"], logs, cwd=checkout, token=token)
+            await self._git(["push", "origin", branch], logs, cwd=checkout, token=token)
+            logs.append(f"Pushed {commit_sha} to {branch}")
+
+            return PushResult(
+                commit_sha=commit_sha,
+                deployment_url=commit_url(repository_url, commit_sha),
+                logs=logs,
+            )
+        finally:
+            shutil.rmtree(checkout, ignore_errors=True)
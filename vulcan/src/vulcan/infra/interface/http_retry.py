@@ -0,0 +1,69 @@
+"""
+Retry policy shared by the HTTP clients.
+"""
+import random
+import time
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+# Statuses worth retrying besides server errors
+RETRYABLE_STATUSES = (408, 425, 429)
+
+
+def is_retryable_status(status_code: int) -> bool:
+    """
+    Check whether a failed request may succeed when sent again.
+
+    Args:
+        status_code: HTTP status of the response
+
+    Returns:
+        True for server errors, timeouts and throttling
+    """
+    return status_code >= 500 or status_code in RETRYABLE_STATUSES
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header.
+
+    Args:
+        value: Header value, in seconds or as an HTTP date
+
+    Returns:
+        The delay in seconds, or None if the header is missing or invalid
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_delay(
+    attempt: int, base: float, maximum: float, retry_after: Optional[float] = None
+) -> float:
+    """
+    Compute the delay before retrying.
+
+    Without Retry-After, the delay is drawn uniformly below an exponentially
+    growing bound ("full jitter"), which spreads the retries of clients that
+    failed together.
+
+    Args:
+        attempt: Number of the attempt that failed, starting at 1
+        base: Bound of the first delay, in seconds
+        maximum: Maximum delay, in seconds
+        retry_after: Delay requested by the server, in seconds
+
+    Returns:
+        The delay, in seconds
+    """
+    if retry_after is not None:
+        return min(retry_after, maximum)
+    return random.uniform(0, min(base * 2 ** (attempt - 1), maximum))
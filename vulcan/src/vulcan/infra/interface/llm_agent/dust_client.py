@@ -0,0 +1,122 @@
+"""
+Client of the Dust assistant API.
+"""
+import json
+import logging
+from typing import Any, AsyncIterator, Dict, Optional
+
+from vulcan.config.llm_client_config import DUST_API_KEY, DUST_API_URL, DUST_WORKSPACE_ID
+from vulcan.infra.interface.llm_agent.http_client import HTTPLLMClient, LLMProviderError
+from vulcan.infra.interface.llm_agent.llm_client import LLMChunk, LLMRequest
+
+
+logger = logging.getLogger(__name__)
+
+
+def find_agent_message(conversation: Dict[str, Any]) -> Optional[str]:
+    """
+    Find the agent message answering the last user message of a conversation.
+
+    Args:
+        conversation: Conversation returned by the Dust API
+
+    Returns:
+        The sId of the agent message, or None if there is none
+    """
+    # Content is a list of message versions per rank; the last version wins
+    for versions in reversed(conversation.get("content", [])):
+        if versions and versions[-1].get("type") == "agent_message":
+            return versions[-1]["sId"]
+    return None
+
+
+class DustClient(HTTPLLMClient):
+    """
+    LLM client backed by Dust agents.
+
+    Each completion opens an unlisted conversation mentioning the agent named
+    by `LLMRequest.model` (e.g. the global "gpt-4" agent) and streams the
+    agent message events. Dust agents carry their own sampling settings, so
+    temperature, max_tokens and stop are not forwarded.
+    """
+
+    provider = "dust"
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        workspace_id: Optional[str] = None,
+        base_url: str = DUST_API_URL,
+        **kwargs: Any,
+    ):
+        """
+        Initialize the client.
+
+        Args:
+            api_key: Dust API key
+            workspace_id: ID of the Dust workspace
+            base_url: Base URL of the Dust API
+            **kwargs: Transport settings of `HTTPLLMClient`
+        """
+        self.workspace_id = workspace_id or DUST_WORKSPACE_ID
+        super().__init__(
+            base_url,
+            headers={"Authorization": f"Bearer {api_key or DUST_API_KEY}"},
+            **kwargs,
+        )
+
+    def _conversations_path(self) -> str:
+        return f"/api/v1/w/{self.workspace_id}/assistant/conversations"
+
+    async def stream(self, request: LLMRequest) -> AsyncIterator[LLMChunk]:
+        """
+        Stream the answer of a Dust agent.
+
+        Args:
+            request: Completion request
+
+        Returns:
+            Async iterator over completion chunks
+        """
+        content = f"{request.system}\n\n{request.prompt}" if request.system else request.prompt
+        created = await self._request_json(
+            "POST",
+            self._conversations_path(),
+            json={
+                "title": None,
+                "visibility": "unlisted",
+                "blocking": False,
+                "message": {
+                    "content": content,
+                    "mentions": [{"configurationId": request.model}],
+                    "context": {"username": "vulcan", "timezone": "UTC"},
+                },
+            },
+        )
+        conversation = created["conversation"]
+        message_id = find_agent_message(conversation)
+        if message_id is None:
+            raise LLMProviderError(f"Dust did not start agent {request.model}")
+
+        events_path = f"{self._conversations_path()}/{conversation['sId']}/messages/{message_id}/events"
+        async with self._stream("GET", events_path) as response:
+            async for line in response.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                payload = line[len("data:"):].strip()
+                if payload == "done":
+                    break
+                event = json.loads(payload).get("data", {})
+                kind = event.get("type")
+
+                if kind == "generation_tokens":
+                    if event.get("classification", "tokens") == "tokens":
+                        yield LLMChunk(text=event["text"])
+                elif kind in ("agent_error", "user_message_error"):
+                    error = event.get("error", {})
+                    raise LLMProviderError(f"Dust agent error: {error.get('message', 'unknown error')}")
+                elif kind == "agent_message_success":
+                    yield LLMChunk(finish_reason="stop")
+                    return
+
+        raise LLMProviderError("Dust event stream ended before the agent message completed")
@@ -0,0 +1,197 @@
+"""
+Pooled HTTP transport of the LLM provider clients.
+"""
+import asyncio
+import importlib.util
+import logging
+import weakref
+from contextlib import AsyncExitStack, asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional
+
+import httpx
+
+from vulcan.config.llm_client_config import (
+    LLM_BACKOFF_BASE,
+    LLM_BACKOFF_MAX,
+    LLM_CONNECT_TIMEOUT,
+    LLM_HTTP2,
+    LLM_KEEPALIVE_EXPIRY,
+    LLM_MAX_CONCURRENT_REQUESTS,
+    LLM_MAX_CONCURRENT_REQUESTS_PER_PROVIDER,
+    LLM_MAX_CONNECTIONS,
+    LLM_MAX_RETRIES,
+    LLM_TIMEOUT,
+)
+from vulcan.infra.interface.http_retry import backoff_delay, is_retryable_status, parse_retry_after
+from vulcan.infra.interface.llm_agent.llm_client import LLMClient
+from vulcan.workflow_engine.concurrency import StageLimiter
+
+
+logger = logging.getLogger(__name__)
+
+# In-flight provider requests of the process, shared by all clients
+request_limiter = StageLimiter(
+    {
+        "llm_requests": LLM_MAX_CONCURRENT_REQUESTS,
+        "llm_provider": LLM_MAX_CONCURRENT_REQUESTS_PER_PROVIDER,
+    }
+)
+
+
+class LLMProviderError(Exception):
+    """Raised when an LLM provider rejects a request or fails repeatedly."""
+
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class HTTPLLMClient(LLMClient):
+    """
+    Base class of the clients talking to a provider over HTTP.
+
+    A client keeps one pooled `httpx.AsyncClient` per event loop, so successive
+    completions reuse kept-alive connections (over HTTP/2 when enabled and `h2` is
+    installed). Requests hold a slot of the process-wide and per-provider
+    limits of `request_limiter` while in flight; connection errors, server
+    errors and throttling are retried with jittered exponential backoff,
+    honouring Retry-After. Once a response is accepted, its body is streamed
+    without retry.
+    """
+
+    provider = "http"
+
+    def __init__(
+        self,
+        base_url: str,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: float = LLM_TIMEOUT,
+        max_connections: int = LLM_MAX_CONNECTIONS,
+        http2: bool = LLM_HTTP2,
+        max_retries: int = LLM_MAX_RETRIES,
+        backoff_base: float = LLM_BACKOFF_BASE,
+        backoff_max: float = LLM_BACKOFF_MAX,
+        limiter: Optional[StageLimiter] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        """
+        Initialize the client; connections are opened on first use.
+
+        Args:
+            base_url: Base URL of the provider API
+            headers: Headers sent with every request (e.g. authentication)
+            timeout: Timeout of reads and writes, in seconds
+            max_connections: Maximum number of pooled connections
+            http2: Whether to negotiate HTTP/2
+            max_retries: Maximum number of retries of a request
+            backoff_base: Bound of the first retry delay, in seconds
+            backoff_max: Maximum retry delay, in seconds
+            limiter: Concurrency limits of the requests
+            transport: HTTP transport, for tests
+        """
+        self.base_url = base_url.rstrip("/")
+        self.headers = dict(headers or {})
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.http2 = http2
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.limiter = limiter or request_limiter
+        self.transport = transport
+        # Pooled connections belong to the event loop that opened them, so
+        # clients are kept per event loop, like the StageLimiter semaphores
+        self._clients = weakref.WeakKeyDictionary()
+
+        if self.http2 and importlib.util.find_spec("h2") is None:
+            logger.warning("HTTP/2 requested but the h2 package is not installed; using HTTP/1.1")
+            self.http2 = False
+
+    def _get_client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None:
+            client = self._clients[loop] = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers=self.headers,
+                timeout=httpx.Timeout(self.timeout, connect=LLM_CONNECT_TIMEOUT),
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                    keepalive_expiry=LLM_KEEPALIVE_EXPIRY,
+                ),
+                http2=self.http2,
+                transport=self.transport,
+            )
+        return client
+
+    @asynccontextmanager
+    async def _stream(self, method: str, path: str, **kwargs: Any) -> AsyncIterator[httpx.Response]:
+        """
+        Send a request and hold its response open for the duration of the block.
+
+        Args:
+            method: HTTP method
+            path: Path relative to the base URL
+            **kwargs: Arguments of `httpx.AsyncClient.build_request`
+
+        Yields:
+            The successful response, body not yet read
+
+        Raises:
+            LLMProviderError: If the provider rejects the request or retries are exhausted
+        """
+        client = self._get_client()
+        for attempt in range(1, self.max_retries + 2):
+            async with AsyncExitStack() as stack:
+                await stack.enter_async_context(self.limiter.acquire("llm_requests"))
+                await stack.enter_async_context(self.limiter.acquire("llm_provider", self.provider))
+
+                retry_after = None
+                try:
+                    response = await client.send(client.build_request(method, path, **kwargs), stream=True)
+                except httpx.TransportError as e:
+                    error = LLMProviderError(f"{self.provider} request failed: {type(e).__name__}: {str(e)}")
+                else:
+                    stack.push_async_callback(response.aclose)
+                    if response.is_success:
+                        yield response
+                        return
+
+                    body = (await response.aread()).decode("utf-8", errors="replace")
+                    error = LLMProviderError(
+                        f"{self.provider} returned HTTP {response.status_code}: {body[:500]}",
+                        status_code=response.status_code,
+                    )
+                    if not is_retryable_status(response.status_code):
+                        raise error
+                    retry_after = parse_retry_after(response.headers.get("Retry-After"))
+
+            if attempt > self.max_retries:
+                raise error
+            delay = backoff_delay(attempt, self.backoff_base, self.backoff_max, retry_after)
+            logger.warning(f"{error}; retrying in {delay:.1f}s (attempt {attempt}/{self.max_retries})")
+            # The slots are released while waiting
+            await asyncio.sleep(delay)
+
+    async def _request_json(self, method: str, path: str, **kwargs: Any) -> Any:
+        """
+        Send a request and decode its JSON response.
+
+        Args:
+            method: HTTP method
+            path: Path relative to the base URL
+            **kwargs: Arguments of `httpx.AsyncClient.build_request`
+
+        Returns:
+            The decoded response body
+        """
+        async with self._stream(method, path, **kwargs) as response:
+            await response.aread()
+            return response.json()
+
+    async def aclose(self) -> None:
+        """Close the pooled connections of the running event loop."""
+        client = self._clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
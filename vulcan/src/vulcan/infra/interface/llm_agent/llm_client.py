@@ -0,0 +1,112 @@
+"""
+Provider-agnostic interface of the LLM clients.
+"""
+from abc import ABC, abstractmethod
+from contextlib import aclosing
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Dict, List, Optional
+
+
+@dataclass
+class LLMRequest:
+    """A completion request sent to an LLM provider."""
+    prompt: str
+    model: str
+    temperature: float = 0.7
+    max_tokens: int = 2000
+    system: Optional[str] = None
+    stop: List[str] = field(default_factory=list)
+
+
+@dataclass
+class LLMUsage:
+    """Token usage reported by an LLM provider."""
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    # Prompt tokens served from the prompt cache of the provider
+    cached_prompt_tokens: int = 0
+
+
+@dataclass
+class LLMChunk:
+    """
+    A piece of a streamed completion.
+
+    The final chunk of a stream carries the usage and finish reason; any
+    chunk may carry information about how the completion was obtained, and
+    the model that produced it when it is not the requested one.
+    """
+    text: str = ""
+    usage: Optional[LLMUsage] = None
+    finish_reason: Optional[str] = None
+    additional_info: Dict[str, str] = field(default_factory=dict)
+    model: Optional[str] = None
+
+
+@dataclass
+class LLMResponse:
+    """A complete LLM completion."""
+    content: str
+    model: str
+    usage: LLMUsage = field(default_factory=LLMUsage)
+    finish_reason: Optional[str] = None
+    additional_info: Dict[str, str] = field(default_factory=dict)
+
+
+class LLMClient(ABC):
+    """
+    Base class of the LLM provider clients.
+
+    Providers implement `stream`; consumers iterate it inside `aclosing` so
+    that cancelling the consuming task also closes the provider connection.
+    """
+
+    provider = "base"
+
+    @abstractmethod
+    def stream(self, request: LLMRequest) -> AsyncIterator[LLMChunk]:
+        """
+        Stream the completion of a request.
+
+        Args:
+            request: Completion request
+
+        Returns:
+            Async iterator over completion chunks
+        """
+
+    async def complete(self, request: LLMRequest) -> LLMResponse:
+        """
+        Get the full completion of a request.
+
+        Args:
+            request: Completion request
+
+        Returns:
+            The completion
+        """
+        parts: List[str] = []
+        model = request.model
+        usage = LLMUsage()
+        finish_reason = None
+        additional_info: Dict[str, str] = {}
+        async with aclosing(self.stream(request)) as chunks:
+            async for chunk in chunks:
+                parts.append(chunk.text)
+                if chunk.model:
+                    model = chunk.model
+                if chunk.usage:
+                    usage = chunk.usage
+                if chunk.finish_reason:
+                    finish_reason = chunk.finish_reason
+                additional_info.update(chunk.additional_info)
+        return LLMResponse(
+            content="".join(parts),
+            model=model,
+            usage=usage,
+            finish_reason=finish_reason,
+            additional_info=additional_info,
+        )
+
+    async def aclose(self) -> None:
+        """Release the resources held by the client."""
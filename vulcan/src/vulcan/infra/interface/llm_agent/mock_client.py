@@ -0,0 +1,260 @@
+"""
+Deterministic mock LLM provider for offline load tests and benchmarks.
+"""
+import asyncio
+import hashlib
+import json
+import random
+import re
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import AsyncIterator, Callable, Dict, List, Optional
+
+from vulcan.config.llm_client_config import (
+    MOCK_LLM_ERROR_RATE,
+    MOCK_LLM_FIRST_TOKEN_LATENCY,
+    MOCK_LLM_RESPONSES_FILE,
+    MOCK_LLM_SEED,
+    MOCK_LLM_TOKEN_RATE,
+)
+from vulcan.infra.interface.llm_agent.http_client import LLMProviderError
+from vulcan.infra.interface.llm_agent.llm_client import LLMChunk, LLMClient, LLMRequest, LLMUsage
+
+
+Distribution = Callable[[random.Random], float]
+
+# A token is a word with its leading whitespace
+TOKEN_PATTERN = re.compile(r"\s*\S+|\s+$")
+
+# Prompt prefixes are cached in blocks of tokens, like the providers' prompt
+# caches; a block is reused only if all the blocks before it are
+PREFIX_CACHE_BLOCK_TOKENS = 64
+PREFIX_CACHE_MAX_BLOCKS = 100_000
+
+# Requests whose attempts are counted; the least recently sent are forgotten
+# and draw as if sent for the first time
+MAX_TRACKED_REQUESTS = 10_000
+
+
+def parse_distribution(spec: str) -> Distribution:
+    """
+    Parse a distribution of non-negative values.
+
+    Args:
+        spec: "const:x", "uniform:low,high", "normal:mean,stddev",
+            "lognormal:median,sigma" or "exponential:mean"
+
+    Returns:
+        Function drawing a value from a random generator
+
+    Raises:
+        ValueError: If the specification is invalid
+    """
+    kind, _, params = spec.partition(":")
+    try:
+        values = [float(value) for value in params.split(",")] if params else []
+    except ValueError:
+        raise ValueError(f"Invalid distribution parameters: {spec}") from None
+    samplers: Dict[str, Callable[..., Distribution]] = {
+        "const": lambda x: lambda rng: x,
+        "uniform": lambda low, high: lambda rng: rng.uniform(low, high),
+        "normal": lambda mean, stddev: lambda rng: rng.gauss(mean, stddev),
+        "lognormal": lambda median, sigma: lambda rng: median * rng.lognormvariate(0, sigma),
+        "exponential": lambda mean: lambda rng: rng.expovariate(1 / mean) if mean else 0.0,
+    }
+    if kind not in samplers:
+        raise ValueError(f"Unsupported distribution: {spec}")
+    try:
+        sample = samplers[kind](*values)
+    except TypeError:
+        raise ValueError(f"Invalid number of distribution parameters: {spec}") from None
+    return lambda rng: max(0.0, sample(rng))
+
+
+def count_tokens(text: str) -> int:
+    """Count the tokens of a text the way the mock provider streams them."""
+    return len(TOKEN_PATTERN.findall(text))
+
+
+def _section(prompt: str, title: str) -> List[str]:
+    match = re.search(rf"^{title}:\n(.*?)(?:\n\n|\Z)", prompt, re.MULTILINE | re.DOTALL)
+    return match.group(1).splitlines() if match else []
+
+
+def render_template(prompt: str) -> str:
+    """
+    Render a completion for a code generation prompt.
+
+    Every requested file (or `main.py`) gets a small module named after the
+    requirements, in the output format expected by the code generator.
+
+    Args:
+        prompt: Code generation prompt
+
+    Returns:
+        The completion
+    """
+    description = " ".join(_section(prompt, "Requirements")) or "Generated code"
+    files = [line[2:] for line in _section(prompt, "Files to generate") if line.startswith("- ")]
+    words = re.findall(r"[a-z0-9]+", description.lower())[:4]
+    name = "_".join(words) if words and not words[0][0].isdigit() else "solution"
+
+    blocks = []
+    for path in files or ["main.py"]:
+        if path.endswith(".py"):
+            content = (
+                f'"""\n{description}\n"""\n\n\n'
+                f"def {name}(*args, **kwargs):\n"
+                f'    """{description}"""\n'
+                f"    return None\n"
+            )
+            language = "python"
+        else:
+            content = f"{description}\n"
+            language = ""
+        blocks.append(f"### File: {path}\n```{language}\n{content}```\n")
+    return "\n".join(blocks)
+
+
+class MockLLMClient(LLMClient):
+    """
+    LLM client answering locally with canned or templated code.
+
+    Latencies and failures are drawn from configurable distributions with a
+    generator seeded by the seed, the request and the number of times the
+    same request was sent, so that a benchmark replays identically whatever
+    the interleaving of concurrent requests. Token counts are reported like
+    a real provider's, so they reach the generation metadata, including the
+    prompt tokens a prefix cache would have served.
+    """
+
+    provider = "mock"
+
+    def __init__(
+        self,
+        seed: int = MOCK_LLM_SEED,
+        first_token_latency: str = MOCK_LLM_FIRST_TOKEN_LATENCY,
+        token_rate: str = MOCK_LLM_TOKEN_RATE,
+        error_rate: float = MOCK_LLM_ERROR_RATE,
+        responses: Optional[Dict[str, str]] = None,
+        prefix_cache_block: int = PREFIX_CACHE_BLOCK_TOKENS,
+    ):
+        """
+        Initialize the client.
+
+        Args:
+            seed: Seed of the random draws
+            first_token_latency: Distribution of the time to first token, in seconds
+            token_rate: Distribution of the tokens per second; 0 streams without delay
+            error_rate: Probability that a request fails
+            responses: Canned completions by a text found in the requirements;
+                read from `MOCK_LLM_RESPONSES_FILE` if omitted
+            prefix_cache_block: Tokens per block of the simulated prompt
+                cache; 0 disables it
+        """
+        self.seed = seed
+        self.first_token_latency = parse_distribution(first_token_latency)
+        self.token_rate = parse_distribution(token_rate)
+        self.error_rate = error_rate
+        if responses is None and MOCK_LLM_RESPONSES_FILE:
+            responses = json.loads(Path(MOCK_LLM_RESPONSES_FILE).read_text(encoding="utf-8"))
+        self.responses = responses or {}
+        self._lock = threading.Lock()
+        self._attempts: "OrderedDict[str, int]" = OrderedDict()
+        self.prefix_cache_block = prefix_cache_block
+        self._prefix_blocks: "OrderedDict[str, None]" = OrderedDict()
+
+    def _random(self, request: LLMRequest) -> random.Random:
+        digest = hashlib.sha256(
+            "\0".join([request.model, request.system or "", request.prompt]).encode("utf-8")
+        ).hexdigest()
+        with self._lock:
+            attempt = self._attempts.pop(digest, 0)
+            self._attempts[digest] = attempt + 1
+            if len(self._attempts) > MAX_TRACKED_REQUESTS:
+                self._attempts.popitem(last=False)
+        return random.Random(f"{self.seed}:{digest}:{attempt}")
+
+    def _cached_tokens(self, request: LLMRequest) -> int:
+        if not self.prefix_cache_block:
+            return 0
+        tokens = TOKEN_PATTERN.findall(request.system or "") + TOKEN_PATTERN.findall(request.prompt)
+        digest = hashlib.sha256(request.model.encode("utf-8")).hexdigest()
+        cached = 0
+        with self._lock:
+            for end in range(self.prefix_cache_block, len(tokens) + 1, self.prefix_cache_block):
+                block = "".join(tokens[end - self.prefix_cache_block:end])
+                # Chained, so that a block digest identifies the whole prefix
+                digest = hashlib.sha256(f"{digest}{block}".encode("utf-8")).hexdigest()
+                if digest in self._prefix_blocks:
+                    self._prefix_blocks.move_to_end(digest)
+                    if cached == end - self.prefix_cache_block:
+                        cached = end
+                else:
+                    self._prefix_blocks[digest] = None
+                    if len(self._prefix_blocks) > PREFIX_CACHE_MAX_BLOCKS:
+                        self._prefix_blocks.popitem(last=False)
+        return cached
+
+    def _completion(self, prompt: str) -> str:
+        requirements = "\n".join(_section(prompt, "Requirements"))
+        for text, completion in self.responses.items():
+            if text in requirements:
+                return completion
+        return render_template(prompt)
+
+    async def stream(self, request: LLMRequest) -> AsyncIterator[LLMChunk]:
+        """
+        Stream the mock completion of a request.
+
+        Args:
+            request: Completion request
+
+        Returns:
+            Async iterator over completion chunks
+
+        Raises:
+            LLMProviderError: For the drawn fraction of failing requests
+        """
+        rng = self._random(request)
+        first_token_latency = self.first_token_latency(rng)
+        token_rate = self.token_rate(rng)
+        failed = rng.random() < self.error_rate
+
+        await asyncio.sleep(first_token_latency)
+        if failed:
+            raise LLMProviderError("mock returned HTTP 503: simulated failure", status_code=503)
+
+        tokens = TOKEN_PATTERN.findall(self._completion(request.prompt))
+        finish_reason = "stop"
+        if len(tokens) > request.max_tokens:
+            tokens, finish_reason = tokens[: request.max_tokens], "length"
+        prompt_tokens = count_tokens(request.prompt) + count_tokens(request.system or "")
+        cached_tokens = self._cached_tokens(request)
+        for index, token in enumerate(tokens):
+            if index and token_rate:
+                await asyncio.sleep(1 / token_rate)
+            # The usage so far is reported with every token, so that streams
+            # closed early by the consumer still count their tokens
+            yield LLMChunk(
+                text=token,
+                usage=LLMUsage(
+                    prompt_tokens=prompt_tokens,
+                    completion_tokens=index + 1,
+                    cached_prompt_tokens=cached_tokens,
+                ),
+            )
+
+        yield LLMChunk(
+            usage=LLMUsage(
+                prompt_tokens=prompt_tokens,
+                completion_tokens=len(tokens),
+                cached_prompt_tokens=cached_tokens,
+            ),
+            finish_reason=finish_reason,
+            additional_info={
+                "mock_first_token_latency": f"{first_token_latency:.3f}",
+                "mock_token_rate": f"{token_rate:.1f}",
+            },
+        )
@@ -0,0 +1,3 @@
+"""
+LLM services for the Vulcan autonomous coding agent.
+"""
@@ -0,0 +1,3 @@
+"""
+Services built on top of the LLM clients.
+"""
@@ -0,0 +1,580 @@
+"""
+Code generation from user requirements with an LLM.
+"""
+import asyncio
+import logging
+import os
+import re
+from contextlib import aclosing
+from functools import partial
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+from vulcan.config.llm_client_config import get_llm_config
+from vulcan.core.vulcan_core.models import (
+    CodeArtifact,
+    CodeGeneration,
+    CodeMetadata,
+    CodeStatus,
+    Requirements,
+)
+from vulcan.infra.interface.llm_agent.llm_client import (
+    LLMClient,
+    LLMRequest,
+    LLMResponse,
+    LLMUsage,
+)
+from vulcan.llm_services.services.llm_provider import create_llm_client
+from vulcan.llm_services.services.model_router import ModelRouter, RoutingDecision
+from vulcan.llm_services.services.prompt_templates import PromptSection, PromptTemplate, bullet_list
+from vulcan.llm_services.services.response_cache import ResponseCache, cache_key, response_cache
+from vulcan.llm_services.services.token_budget import PromptBudget, TokenBudgeter, count_tokens
+from vulcan.workflow_engine.metrics import Metrics
+from vulcan.workflow_engine.state.workflow_state import utc_now
+
+
+logger = logging.getLogger(__name__)
+
+# Sections from the most stable to the most volatile: the repository context
+# is shared by the requests on a repository, the few-shot examples by similar
+# requirements and the plan by the files of a code base
+CODE_GENERATION_TEMPLATE = PromptTemplate(
+    name="code_generation",
+    version=2,
+    system="You are an expert software engineer writing production-quality code.",
+    instructions=(
+        "Write the code meeting the requirements below. "
+        "Output every file as a Markdown heading \"### File: <relative path>\" "
+        "followed by a fenced code block with the full file content. "
+        "Do not add explanations."
+    ),
+    sections=(
+        PromptSection("context", "Relevant code of the repository (reuse its names and conventions)"),
+        PromptSection("few_shot", "Solved tasks similar to the requirements (tests passed)"),
+        PromptSection("description", "Requirements"),
+        PromptSection("constraints", "Constraints"),
+        PromptSection("examples", "Examples"),
+        PromptSection("plan", "Plan of the code base, shared by all files (follow its interfaces exactly)"),
+        PromptSection("files", "Files to generate"),
+    ),
+)
+SYSTEM_PROMPT = CODE_GENERATION_TEMPLATE.system
+
+# Files are output as a "### File: path" heading followed by a fenced code block
+FILE_HEADING_PATTERN = re.compile(r"^#{1,6}\s*File:\s*`?(?P<path>[^\s`]+)`?\s*$")
+FENCE_PATTERN = re.compile(r"^```(?P<language>[\w+#.-]*)")
+
+# Finish reasons of completions closed by the code generator: all expected
+# files were received, prose followed the code, or a size guard was exceeded
+FILES_COMPLETE = "files_complete"
+PROSE_AFTER_CODE = "prose_after_code"
+OUTPUT_LIMIT = "output_limit"
+FILE_SIZE_LIMIT = "file_size_limit"
+# Finish reasons of completions cut off before their end
+TRUNCATED_FINISH_REASONS = {"length", OUTPUT_LIMIT, FILE_SIZE_LIMIT}
+
+# Characters of prose after the last file from which a completion without
+# expected files is closed, as the rest is an explanation of the code
+MAX_TRAILING_PROSE_CHARS = 300
+# Tokens counted locally are approximate: the output guard leaves this margin
+# over `max_tokens` to providers that do not report their usage
+LOCAL_OUTPUT_TOKENS_MARGIN = 1.25
+
+ArtifactCallback = Callable[[CodeArtifact], Awaitable[None]]
+
+# Token usage reported by the providers to the LLM requests of the process
+usage_metrics = Metrics()
+
+LANGUAGE_EXTENSIONS = {
+    ".py": "python",
+    ".js": "javascript",
+    ".ts": "typescript",
+    ".go": "go",
+    ".rs": "rust",
+    ".java": "java",
+    ".md": "markdown",
+    ".json": "json",
+    ".yml": "yaml",
+    ".yaml": "yaml",
+    ".toml": "toml",
+    ".sh": "bash",
+}
+
+
+def build_prompt(
+    requirements: Requirements, expected_files: Sequence[str] = (), plan: str = ""
+) -> str:
+    """
+    Build the code generation prompt for the requirements.
+
+    The parts shared by other requests come first, so that providers can
+    serve them from their prompt cache.
+
+    Args:
+        requirements: User requirements
+        expected_files: Paths of the files to generate, if known
+        plan: File plan of the whole code base, when files are generated separately
+
+    Returns:
+        The prompt
+    """
+    return CODE_GENERATION_TEMPLATE.render(
+        context="\n\n".join(requirements.context),
+        few_shot="\n\n".join(requirements.few_shot),
+        description=requirements.description,
+        constraints=bullet_list(requirements.constraints),
+        examples=bullet_list(requirements.examples),
+        plan=plan,
+        files=bullet_list(expected_files),
+    )
+
+
+def record_usage(
+    provider: str, model: str, usage: LLMUsage, metrics_dir: Optional[Path] = None
+) -> None:
+    """
+    Record the token usage reported for an LLM request in Prometheus metrics.
+
+    The cached prompt tokens measure the hits of the provider prompt cache.
+
+    Args:
+        provider: Provider of the LLM client
+        model: Model of the request
+        usage: Usage reported by the provider
+        metrics_dir: Directory receiving the metric file of the process
+    """
+    if not usage.prompt_tokens:
+        # The provider does not report usage
+        return
+    labels = {"provider": provider, "model": model, "pid": str(os.getpid())}
+    usage_metrics.inc(
+        "vulcan_llm_prompt_tokens_total",
+        usage.prompt_tokens,
+        help_text="Prompt tokens of the LLM requests",
+        **labels,
+    )
+    usage_metrics.inc(
+        "vulcan_llm_cached_prompt_tokens_total",
+        usage.cached_prompt_tokens,
+        help_text="Prompt tokens served from the prompt cache of the provider",
+        **labels,
+    )
+    usage_metrics.inc(
+        "vulcan_llm_completion_tokens_total",
+        usage.completion_tokens,
+        help_text="Completion tokens of the LLM requests",
+        **labels,
+    )
+    try:
+        usage_metrics.write(f"llm_usage-{os.getpid()}", metrics_dir)
+    except OSError as e:
+        logger.error(f"Error writing LLM usage metrics: {str(e)}")
+
+
+def guess_language(file_path: str, fence_language: str = "") -> str:
+    """
+    Guess the language of a file from its fence info string or extension.
+
+    Args:
+        file_path: Path of the file
+        fence_language: Language given on the opening code fence
+
+    Returns:
+        The language name
+    """
+    if fence_language:
+        return fence_language.lower()
+    for extension, language in LANGUAGE_EXTENSIONS.items():
+        if file_path.endswith(extension):
+            return language
+    return "text"
+
+
+class ArtifactStreamParser:
+    """
+    Incremental parser of the file blocks of a completion.
+
+    Text is fed as it is streamed; each file is returned as soon as its
+    closing fence is received. Only complete lines are parsed, so a fence
+    split across chunks is recognized once its line ends.
+    """
+
+    def __init__(self):
+        """Initialize the parser before the first chunk."""
+        self._buffer = ""
+        self._path: Optional[str] = None
+        self._language: Optional[str] = None
+        self._lines: List[str] = []
+        # Files completed, and characters of prose since the last of them
+        self.completed = 0
+        self.trailing_prose = 0
+
+    @property
+    def open_file(self) -> Optional[str]:
+        """Path of the file whose content is being received, if any."""
+        return self._path if self._language is not None else None
+
+    def _parse_line(self, line: str) -> Optional[CodeArtifact]:
+        text = line.rstrip("\r\n")
+        if self._language is not None:
+            if not text.startswith("```"):
+                self._lines.append(line)
+                return None
+            artifact = CodeArtifact(
+                content="".join(self._lines),
+                file_path=self._path,
+                language=guess_language(self._path, self._language),
+            )
+            self._path, self._language, self._lines = None, None, []
+            self.completed += 1
+            self.trailing_prose = 0
+            return artifact
+
+        heading = FILE_HEADING_PATTERN.match(text)
+        if heading:
+            self._path = heading.group("path")
+            self.trailing_prose = 0
+            return None
+        if self._path is not None:
+            fence = FENCE_PATTERN.match(text)
+            if fence:
+                self._language = fence.group("language")
+                return None
+            if text.strip():
+                # Only blank lines may separate a heading from its code block
+                self._path = None
+        self.trailing_prose += len(text.strip())
+        return None
+
+    def feed(self, text: str) -> List[CodeArtifact]:
+        """
+        Parse a chunk of the completion.
+
+        Args:
+            text: Next chunk of text
+
+        Returns:
+            The artifacts completed by the chunk
+        """
+        self._buffer += text
+        *lines, self._buffer = self._buffer.split("\n")
+        artifacts = []
+        for line in lines:
+            artifact = self._parse_line(line + "\n")
+            if artifact is not None:
+                artifacts.append(artifact)
+        return artifacts
+
+    def close(self) -> List[CodeArtifact]:
+        """
+        Parse the last line once the completion ended.
+
+        Returns:
+            The artifact completed by the last line, if any; a file whose
+            closing fence never came is dropped
+        """
+        line, self._buffer = self._buffer, ""
+        artifact = self._parse_line(line) if line else None
+        return [artifact] if artifact is not None else []
+
+
+def parse_artifacts(completion: str) -> List[CodeArtifact]:
+    """
+    Extract the code artifacts from an LLM completion.
+
+    Args:
+        completion: Completion text
+
+    Returns:
+        The artifacts, in order of appearance
+    """
+    parser = ArtifactStreamParser()
+    return parser.feed(completion) + parser.close()
+
+
+class CodeGenerator:
+    """Generates code artifacts for requirements with an LLM."""
+
+    def __init__(
+        self,
+        llm_client: Optional[LLMClient] = None,
+        config: Optional[Dict[str, Any]] = None,
+        cache: Optional[ResponseCache] = None,
+        metrics_dir: Optional[Path] = None,
+    ):
+        """
+        Initialize the code generator.
+
+        Args:
+            llm_client: LLM client; created from the configuration if omitted
+            config: The "llm" configuration section
+            cache: Response cache; the shared cache unless `cache` is disabled
+            metrics_dir: Directory receiving the token usage metrics
+        """
+        self.config = {**get_llm_config(), **(config or {})}
+        self.llm_client = llm_client or create_llm_client(self.config)
+        self.cache = (cache or response_cache) if self.config.get("cache", True) else None
+        self.router = ModelRouter.from_spec(self.config.get("model_tiers") or "")
+        self.metrics_dir = metrics_dir
+
+    def route(
+        self, requirements: Requirements, expected_files: Sequence[str] = ()
+    ) -> Optional[RoutingDecision]:
+        """
+        Choose the model tier of requirements.
+
+        Args:
+            requirements: User requirements
+            expected_files: Paths of the files to generate, if known
+
+        Returns:
+            The routing decision, or None if no model tiers are configured
+        """
+        return self.router.route(requirements, expected_files) if self.router else None
+
+    def _request(
+        self,
+        requirements: Requirements,
+        expected_files: Sequence[str],
+        model: str,
+        temperature: float,
+        plan: str = "",
+    ) -> Tuple[LLMRequest, PromptBudget]:
+        budgeter = TokenBudgeter(
+            model,
+            window=self.config.get("context_window"),
+            max_output_tokens=self.config["max_tokens"],
+        )
+        budget = budgeter.fit(
+            requirements,
+            partial(build_prompt, expected_files=expected_files, plan=plan),
+            expected_files,
+            system=SYSTEM_PROMPT,
+        )
+        request = LLMRequest(
+            prompt=build_prompt(budget.requirements, expected_files, plan),
+            model=model,
+            temperature=temperature,
+            max_tokens=budget.max_tokens,
+            system=SYSTEM_PROMPT,
+        )
+        return request, budget
+
+    def _stop_reason(
+        self,
+        request: LLMRequest,
+        parser: ArtifactStreamParser,
+        expected_files: Sequence[str],
+        remaining: Set[str],
+        usage: LLMUsage,
+        output_tokens: int,
+        file_tokens: int,
+    ) -> Optional[str]:
+        if expected_files and not remaining:
+            return FILES_COMPLETE
+        if (
+            not expected_files
+            and parser.completed
+            and parser.open_file is None
+            and parser.trailing_prose > MAX_TRAILING_PROSE_CHARS
+        ):
+            return PROSE_AFTER_CODE
+        if usage.completion_tokens:
+            if usage.completion_tokens > request.max_tokens:
+                return OUTPUT_LIMIT
+        elif output_tokens > request.max_tokens * LOCAL_OUTPUT_TOKENS_MARGIN:
+            return OUTPUT_LIMIT
+        if file_tokens > self.config["max_file_tokens"]:
+            return FILE_SIZE_LIMIT
+        return None
+
+    async def _stream_completion(
+        self,
+        request: LLMRequest,
+        expected_files: Sequence[str],
+        on_artifact: Optional[ArtifactCallback],
+    ) -> LLMResponse:
+        parts: List[str] = []
+        model = request.model
+        usage = LLMUsage()
+        finish_reason = None
+        additional_info: Dict[str, str] = {}
+        parser = ArtifactStreamParser()
+        remaining = set(expected_files)
+        output_tokens = 0
+        open_file, file_tokens = None, 0
+
+        async with aclosing(self.llm_client.stream(request)) as chunks:
+            async for chunk in chunks:
+                parts.append(chunk.text)
+                if chunk.model:
+                    model = chunk.model
+                if chunk.usage:
+                    usage = chunk.usage
+                if chunk.finish_reason:
+                    finish_reason = chunk.finish_reason
+                additional_info.update(chunk.additional_info)
+                tokens = count_tokens(chunk.text, request.model) if chunk.text else 0
+                output_tokens += tokens
+                for artifact in parser.feed(chunk.text):
+                    remaining.discard(artifact.file_path)
+                    if on_artifact is not None:
+                        await on_artifact(artifact)
+                if parser.open_file != open_file:
+                    open_file, file_tokens = parser.open_file, 0
+                elif open_file is not None:
+                    file_tokens += tokens
+
+                stop_reason = self._stop_reason(
+                    request, parser, expected_files, remaining, usage, output_tokens, file_tokens
+                )
+                if stop_reason is not None:
+                    # Closing the stream stops the generation at the provider
+                    finish_reason = stop_reason
+                    break
+        if finish_reason in TRUNCATED_FINISH_REASONS and parser.open_file is not None:
+            # The file being received when the completion was cut off is dropped
+            additional_info["truncated_file"] = parser.open_file
+            logger.warning(f"Completion cut off ({finish_reason}) in {parser.open_file}")
+        if on_artifact is not None:
+            for artifact in parser.close():
+                await on_artifact(artifact)
+
+        return LLMResponse(
+            content="".join(parts),
+            model=model,
+            usage=usage,
+            finish_reason=finish_reason,
+            additional_info=additional_info,
+        )
+
+    async def generate(
+        self,
+        requirements: Requirements,
+        expected_files: Sequence[str] = (),
+        on_artifact: Optional[ArtifactCallback] = None,
+        routing: Optional[RoutingDecision] = None,
+        model: Optional[str] = None,
+        temperature: Optional[float] = None,
+        use_cache: bool = True,
+        plan: str = "",
+    ) -> CodeGeneration:
+        """
+        Generate code for the requirements.
+
+        The completion is streamed and parsed as it arrives: `on_artifact` is
+        awaited for each file as soon as its code block is complete. The
+        stream is closed once every expected file was received, or, when no
+        files are expected, once prose follows the code; it is cut off when
+        the output exceeds `max_tokens` or a file exceeds `max_file_tokens`,
+        which the metadata records as truncated. Cancelling the calling task
+        closes the provider stream. Responses that produced
+        artifacts are cached, and identical generations running at the same
+        time share one completion; artifacts of a shared or cached response
+        are passed to `on_artifact` once it is available. A shared completion
+        outlives a cancelled caller, but no longer reaches its `on_artifact`.
+
+        When model tiers are configured, the model is chosen by the
+        complexity of the requirements unless `routing` or `model` is given.
+        The prompt is fitted to the context window of the model, and
+        `max_tokens` is sized from the expected files.
+
+        Args:
+            requirements: User requirements
+            expected_files: Paths of the files to generate, if known
+            on_artifact: Coroutine function receiving each completed artifact
+            routing: Model tier to use, e.g. after an escalation
+            model: Model to use, overriding routing
+            temperature: Sampling temperature; the configured one if omitted
+            use_cache: Whether the response cache may answer; independent
+                samples (e.g. competing candidates) bypass it
+            plan: File plan shared with the generations of the other files
+
+        Returns:
+            The code generation aggregate
+        """
+        if model is None:
+            routing = routing or self.route(requirements, expected_files)
+            model = routing.model if routing else self.config["model"]
+        else:
+            routing = None
+        if temperature is None:
+            temperature = self.config["temperature"]
+        request, budget = self._request(requirements, expected_files, model, temperature, plan)
+        detached = False
+
+        async def forward(artifact: CodeArtifact) -> None:
+            # The completion may be shared with other callers and outlive this one
+            if not detached:
+                await on_artifact(artifact)
+
+        compute = partial(
+            self._stream_completion,
+            request,
+            expected_files,
+            forward if on_artifact is not None else None,
+        )
+        additional_info: Dict[str, str] = {}
+        for section, count in budget.dropped.items():
+            additional_info[f"dropped_{section}"] = str(count)
+        if budget.truncated:
+            additional_info["description_truncated"] = "true"
+        if routing:
+            additional_info["model_tier"] = str(routing.tier)
+            additional_info["complexity_score"] = str(routing.score)
+        source = None
+        if self.cache is None or not use_cache:
+            response = await compute()
+        else:
+            key = cache_key(
+                requirements,
+                request.model,
+                request.temperature,
+                CODE_GENERATION_TEMPLATE.key,
+                expected_files,
+                plan,
+            )
+            try:
+                response, source = await self.cache.get_or_compute(
+                    key,
+                    compute,
+                    # Cut-off completions would be served for the whole TTL
+                    cacheable=lambda response: (
+                        response.finish_reason not in TRUNCATED_FINISH_REASONS
+                        and bool(parse_artifacts(response.content))
+                    ),
+                )
+            except asyncio.CancelledError:
+                detached = True
+                raise
+            additional_info["cache_hit"] = "true" if source else "false"
+            if source:
+                additional_info["cache_source"] = source
+
+        if not source:
+            record_usage(self.llm_client.provider, response.model, response.usage, self.metrics_dir)
+            if response.usage.cached_prompt_tokens:
+                additional_info["cached_prompt_tokens"] = str(response.usage.cached_prompt_tokens)
+        artifacts = parse_artifacts(response.content)
+        if source and on_artifact is not None:
+            for artifact in artifacts:
+                await on_artifact(artifact)
+        generation = CodeGeneration(
+            requirements=requirements,
+            artifacts=artifacts,
+            metadata=CodeMetadata(
+                generation_timestamp=utc_now(),
+                model_used=response.model,
+                # Counted locally when the provider does not report usage
+                prompt_tokens=response.usage.prompt_tokens or budget.prompt_tokens,
+                completion_tokens=(
+                    response.usage.completion_tokens or count_tokens(response.content, model)
+                ),
+                additional_info={**response.additional_info, **additional_info},
+                finish_reason=response.finish_reason,
+                truncated=response.finish_reason in TRUNCATED_FINISH_REASONS,
+            ),
+            status=CodeStatus.COMPLETED if artifacts else CodeStatus.FAILED,
+        )
+        logger.info(f"Generated {len(artifacts)} artifacts with {response.model}")
+        return generation
@@ -0,0 +1,393 @@
+"""
+Retrieval of repository code for the prompt context: a BM25 index of the
+snippets of a checkout, with trigram matching of misspelled or partial terms.
+"""
+import heapq
+import logging
+import math
+import os
+import re
+import threading
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Dict, Iterator, List, Sequence, Set, Tuple
+
+from vulcan.config.llm_client_config import (
+    LLM_RETRIEVAL_INDEX_WORKERS,
+    LLM_RETRIEVAL_MAX_FILE_KB,
+    LLM_RETRIEVAL_SNIPPET_LINES,
+)
+
+
+logger = logging.getLogger(__name__)
+
+INDEXED_EXTENSIONS = {
+    ".py", ".pyi", ".js", ".jsx", ".ts", ".tsx", ".java", ".kt", ".go", ".rs", ".rb",
+    ".php", ".c", ".h", ".cc", ".cpp", ".hpp", ".cs", ".swift", ".scala", ".sh",
+    ".sql", ".md", ".rst", ".toml", ".yaml", ".yml", ".json", ".cfg", ".ini",
+}
+IGNORED_DIRECTORIES = {
+    ".git", "__pycache__", ".pytest_cache", ".mypy_cache", ".venv", "venv",
+    "node_modules", "dist", "build", ".tox",
+}
+
+# BM25 parameters
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Query terms missing from the vocabulary are matched to the vocabulary terms
+# sharing enough of their trigrams, weighted by that similarity
+TRIGRAM_MIN_SIMILARITY = 0.3
+TRIGRAM_MAX_EXPANSIONS = 3
+# Only the most selective terms of long queries are scored
+MAX_QUERY_TERMS = 32
+# Files indexed in the calling thread below this count; a pool is not worth starting
+POOL_MIN_FILES = 200
+POOL_BATCH_FILES = 256
+
+_WORD_PATTERN = re.compile(r"[A-Za-z_][A-Za-z0-9_]*|\d+")
+_CAMEL_PATTERN = re.compile(r"[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z]+|[A-Z]+|\d+")
+
+
+@dataclass
+class Snippet:
+    """Lines of a repository file retrieved for the prompt context."""
+    path: str
+    start_line: int
+    end_line: int
+    text: str
+    score: float = 0.0
+
+    def render(self) -> str:
+        """Render the snippet for the generation prompt."""
+        return f"{self.path} (lines {self.start_line}-{self.end_line}):\n```\n{self.text}\n```"
+
+
+# (start line, end line, text, term frequencies) of each snippet of a file
+_Chunk = Tuple[int, int, str, Dict[str, int]]
+
+
+def split_terms(text: str) -> List[str]:
+    """
+    Split text into lowercase search terms.
+
+    Identifiers are kept whole and also split into their snake_case and
+    camelCase words, so that "createOrder" is found by "create_order".
+
+    Args:
+        text: Code or natural language
+
+    Returns:
+        The terms, repeated as often as they occur
+    """
+    terms = []
+    for word in _WORD_PATTERN.findall(text):
+        lowered = word.lower()
+        if len(lowered) > 1:
+            terms.append(lowered)
+        parts = [p.lower() for piece in word.split("_") for p in _CAMEL_PATTERN.findall(piece)]
+        if len(parts) > 1:
+            terms.extend(part for part in parts if len(part) > 1 and part != lowered)
+    return terms
+
+
+def trigrams(term: str) -> Set[str]:
+    """
+    Get the trigrams of a term, padded so that its ends count.
+
+    Args:
+        term: Search term
+
+    Returns:
+        The set of trigrams
+    """
+    padded = f" {term} "
+    return {padded[index:index + 3] for index in range(len(padded) - 2)}
+
+
+def chunk_text(path: str, text: str, snippet_lines: int) -> List[_Chunk]:
+    """
+    Split a file into snippets of consecutive lines and count their terms.
+
+    The terms of the path are counted in every snippet of the file.
+
+    Args:
+        path: Path of the file, relative to the repository
+        text: File content
+        snippet_lines: Lines per snippet
+
+    Returns:
+        The snippets, blank ones left out
+    """
+    path_terms = split_terms(path)
+    lines = text.splitlines()
+    chunks = []
+    for start in range(0, len(lines), snippet_lines):
+        snippet = "\n".join(lines[start:start + snippet_lines])
+        if not snippet.strip():
+            continue
+        terms = Counter(split_terms(snippet))
+        terms.update(path_terms)
+        end = min(start + snippet_lines, len(lines))
+        chunks.append((start + 1, end, snippet, dict(terms)))
+    return chunks
+
+
+def _index_files(
+    root: str, paths: Sequence[str], snippet_lines: int
+) -> List[Tuple[str, List[_Chunk]]]:
+    # Runs in the pool processes: reads and chunks a batch of files
+    indexed = []
+    for path in paths:
+        try:
+            with open(os.path.join(root, path), encoding="utf-8") as file:
+                text = file.read()
+        except (OSError, UnicodeDecodeError):
+            continue
+        indexed.append((path, chunk_text(path, text, snippet_lines)))
+    return indexed
+
+
+def walk_files(
+    root: str, extensions: Set[str], max_bytes: int
+) -> Iterator[Tuple[str, Tuple[int, int]]]:
+    """
+    List the files of a checkout, skipping the ignored directories.
+
+    Args:
+        root: Root directory of the checkout
+        extensions: Extensions of the files to list, with their dot
+        max_bytes: Larger files are skipped
+
+    Yields:
+        Path relative to the root and (mtime in ns, size) of each file
+    """
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        try:
+            entries = list(os.scandir(directory))
+        except OSError:
+            continue
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name not in IGNORED_DIRECTORIES:
+                    stack.append(entry.path)
+            elif entry.is_file(follow_symlinks=False):
+                if os.path.splitext(entry.name)[1].lower() not in extensions:
+                    continue
+                stat = entry.stat(follow_symlinks=False)
+                if stat.st_size <= max_bytes:
+                    relative = os.path.relpath(entry.path, root).replace(os.sep, "/")
+                    yield relative, (stat.st_mtime_ns, stat.st_size)
+
+
+class CodeIndex:
+    """
+    Search index of the code of a repository checkout.
+
+    Files are cut into snippets of consecutive lines, scored against queries
+    with BM25. Updates re-index the files whose modification time or size
+    changed since the last update, in a process pool when there are many.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        snippet_lines: int = LLM_RETRIEVAL_SNIPPET_LINES,
+        max_file_kb: int = LLM_RETRIEVAL_MAX_FILE_KB,
+        workers: int = LLM_RETRIEVAL_INDEX_WORKERS,
+    ):
+        """
+        Initialize an empty index; see update().
+
+        Args:
+            root: Root directory of the checkout
+            snippet_lines: Lines per snippet
+            max_file_kb: Larger files are not indexed, in kilobytes
+            workers: Processes indexing the files (0: one per CPU)
+        """
+        self.root = Path(root)
+        self.snippet_lines = snippet_lines
+        self.max_bytes = max_file_kb * 1024
+        self.workers = workers or os.cpu_count() or 1
+        self._lock = threading.RLock()
+        self._update_lock = threading.Lock()
+        self._snippets: Dict[int, Snippet] = {}
+        self._lengths: Dict[int, int] = {}
+        self._total_length = 0
+        self._postings: Dict[str, Dict[int, int]] = {}
+        self._trigram_terms: Dict[str, Set[str]] = defaultdict(set)
+        # Path -> ((mtime, size), snippet IDs)
+        self._files: Dict[str, Tuple[Tuple[int, int], List[int]]] = {}
+        self._next_id = 0
+
+    def __len__(self) -> int:
+        return len(self._snippets)
+
+    @property
+    def file_count(self) -> int:
+        """Number of indexed files."""
+        return len(self._files)
+
+    def _add(self, path: str, signature: Tuple[int, int], chunks: List[_Chunk]) -> None:
+        ids = []
+        for start, end, text, terms in chunks:
+            snippet_id = self._next_id
+            self._next_id += 1
+            ids.append(snippet_id)
+            self._snippets[snippet_id] = Snippet(path, start, end, text)
+            length = sum(terms.values())
+            self._lengths[snippet_id] = length
+            self._total_length += length
+            for term, frequency in terms.items():
+                postings = self._postings.get(term)
+                if postings is None:
+                    postings = self._postings[term] = {}
+                    for trigram in trigrams(term):
+                        self._trigram_terms[trigram].add(term)
+                postings[snippet_id] = frequency
+        self._files[path] = (signature, ids)
+
+    def _remove(self, path: str) -> None:
+        _, ids = self._files.pop(path)
+        for snippet_id in ids:
+            snippet = self._snippets.pop(snippet_id)
+            self._total_length -= self._lengths.pop(snippet_id)
+            for term in set(split_terms(snippet.text)) | set(split_terms(path)):
+                postings = self._postings.get(term)
+                if postings is None:
+                    continue
+                postings.pop(snippet_id, None)
+                if not postings:
+                    del self._postings[term]
+                    for trigram in trigrams(term):
+                        self._trigram_terms[trigram].discard(term)
+
+    def update(self) -> Tuple[int, int]:
+        """
+        Bring the index in line with the checkout.
+
+        Blocking; run it in a thread from async code.
+
+        Returns:
+            The number of files indexed and removed
+        """
+        with self._update_lock:
+            return self._update()
+
+    def _update(self) -> Tuple[int, int]:
+        files = dict(walk_files(str(self.root), INDEXED_EXTENSIONS, self.max_bytes))
+        with self._lock:
+            removed = [path for path in self._files if path not in files]
+            changed = sorted(
+                path for path, signature in files.items()
+                if path not in self._files or self._files[path][0] != signature
+            )
+        if not removed and not changed:
+            return 0, 0
+
+        if len(changed) < POOL_MIN_FILES or self.workers == 1:
+            indexed = _index_files(str(self.root), changed, self.snippet_lines)
+        else:
+            batches = [
+                changed[index:index + POOL_BATCH_FILES]
+                for index in range(0, len(changed), POOL_BATCH_FILES)
+            ]
+            with ProcessPoolExecutor(max_workers=min(self.workers, len(batches))) as pool:
+                results = pool.map(
+                    _index_files,
+                    [str(self.root)] * len(batches),
+                    batches,
+                    [self.snippet_lines] * len(batches),
+                )
+                indexed = [item for result in results for item in result]
+
+        with self._lock:
+            for path in removed + changed:
+                if path in self._files:
+                    self._remove(path)
+            for path, chunks in indexed:
+                self._add(path, files[path], chunks)
+        logger.info(
+            f"Indexed {len(indexed)} files of {self.root}, removed {len(removed)}: "
+            f"{len(self._files)} files, {len(self._snippets)} snippets"
+        )
+        return len(indexed), len(removed)
+
+    def _expand(self, term: str) -> List[Tuple[str, float]]:
+        if term in self._postings:
+            return [(term, 1.0)]
+        query_trigrams = trigrams(term)
+        shared: Counter = Counter()
+        for trigram in query_trigrams:
+            shared.update(self._trigram_terms.get(trigram, ()))
+        matches = []
+        for candidate, count in shared.items():
+            # A padded term has as many trigrams as characters, repeated ones aside
+            similarity = count / (len(query_trigrams) + len(candidate) - count)
+            if similarity >= TRIGRAM_MIN_SIMILARITY:
+                matches.append((candidate, similarity))
+        return heapq.nlargest(TRIGRAM_MAX_EXPANSIONS, matches, key=lambda match: match[1])
+
+    def _idf(self, term: str) -> float:
+        frequency = len(self._postings[term])
+        return math.log(1 + (len(self._snippets) - frequency + 0.5) / (frequency + 0.5))
+
+    def search(self, query: str, top_k: int = 10) -> List[Snippet]:
+        """
+        Find the snippets most relevant to a query.
+
+        Args:
+            query: Requirements or code to find related snippets for
+            top_k: Maximum number of snippets
+
+        Returns:
+            The snippets by decreasing score; see pack_context() to fit them
+            in a token budget
+        """
+        with self._lock:
+            if not self._snippets:
+                return []
+            weights: Dict[str, float] = {}
+            for term, count in Counter(split_terms(query)).items():
+                for match, similarity in self._expand(term):
+                    weights[match] = max(weights.get(match, 0.0), similarity * count)
+            idfs = {term: self._idf(term) for term in weights}
+            terms = heapq.nlargest(MAX_QUERY_TERMS, weights, key=lambda term: idfs[term])
+
+            average_length = self._total_length / len(self._snippets)
+            scores: Dict[int, float] = defaultdict(float)
+            for term in terms:
+                weight = weights[term] * idfs[term]
+                for snippet_id, frequency in self._postings[term].items():
+                    norm = BM25_K1 * (1 - BM25_B + BM25_B * self._lengths[snippet_id] / average_length)
+                    scores[snippet_id] += weight * frequency * (BM25_K1 + 1) / (frequency + norm)
+
+            ranked = heapq.nlargest(top_k, scores.items(), key=lambda item: item[1])
+            return [replace(self._snippets[snippet_id], score=score) for snippet_id, score in ranked]
+
+
+_indexes: Dict[Path, CodeIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_code_index(root: Path) -> CodeIndex:
+    """
+    Get the index of a checkout, shared by the workflows of the process.
+
+    The index is created empty on first use; call update() before searching.
+
+    Args:
+        root: Root directory of the checkout
+
+    Returns:
+        The index
+    """
+    root = Path(root).resolve()
+    with _indexes_lock:
+        if root not in _indexes:
+            _indexes[root] = CodeIndex(root)
+        return _indexes[root]
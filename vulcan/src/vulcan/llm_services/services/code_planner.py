@@ -0,0 +1,301 @@
+"""
+Planning of multi-file code generation: a shared file manifest with interfaces.
+"""
+import ast
+import json
+import logging
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence
+
+from vulcan.config.llm_client_config import LLM_OUTPUT_TOKENS_PER_FILE, get_llm_config
+from vulcan.core.vulcan_core.models import (
+    CodeArtifact,
+    CodeGeneration,
+    CodeMetadata,
+    CodeStatus,
+    Requirements,
+)
+from vulcan.infra.interface.llm_agent.llm_client import LLMClient, LLMRequest
+from vulcan.llm_services.services.code_generator import SYSTEM_PROMPT, record_usage
+from vulcan.llm_services.services.llm_provider import create_llm_client
+from vulcan.llm_services.services.prompt_templates import PromptSection, PromptTemplate, bullet_list
+from vulcan.llm_services.services.token_budget import count_tokens
+from vulcan.workflow_engine.state.workflow_state import utc_now
+
+
+logger = logging.getLogger(__name__)
+
+PLAN_TEMPLATE = PromptTemplate(
+    name="code_plan",
+    version=1,
+    system=SYSTEM_PROMPT,
+    instructions=(
+        "Plan the files of the code base before any code is written. Answer only with "
+        "a JSON object {\"files\": [{\"path\": ..., \"purpose\": ..., \"exports\": [...]}]}, "
+        "where exports lists the signature of every class, function and constant other "
+        "files may use (e.g. \"def create_order(data: dict) -> Order\"). "
+        "Use relative paths and include the tests."
+    ),
+    sections=(
+        PromptSection("context", "Relevant code of the repository"),
+        PromptSection("description", "Requirements"),
+        PromptSection("constraints", "Constraints"),
+        PromptSection("files", "Files to plan"),
+    ),
+)
+
+_JSON_PATTERN = re.compile(r"\{.*\}", re.DOTALL)
+_NAME_PATTERN = re.compile(r"^(?:async\s+)?(?:(?:def|class)\s+)?([A-Za-z_]\w*)")
+
+
+@dataclass
+class FilePlan:
+    """A planned file and the interface it exposes."""
+    path: str
+    purpose: str = ""
+    exports: List[str] = field(default_factory=list)
+
+
+@dataclass
+class CodePlan:
+    """File manifest shared by the generations of a multi-file request."""
+    files: List[FilePlan]
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+
+    def render(self) -> str:
+        """Render the plan for the generation prompts."""
+        lines = []
+        for file_plan in self.files:
+            purpose = f": {file_plan.purpose}" if file_plan.purpose else ""
+            lines.append(f"- {file_plan.path}{purpose}")
+            lines.extend(f"    {export}" for export in file_plan.exports)
+        return "\n".join(lines)
+
+
+def build_plan_prompt(requirements: Requirements, expected_files: Sequence[str] = ()) -> str:
+    """
+    Build the prompt asking for the file plan of the requirements.
+
+    Args:
+        requirements: User requirements
+        expected_files: Paths of the files to generate, if known
+
+    Returns:
+        The prompt
+    """
+    return PLAN_TEMPLATE.render(
+        context="\n\n".join(requirements.context),
+        description=requirements.description,
+        constraints=bullet_list(requirements.constraints),
+        files=bullet_list(expected_files),
+    )
+
+
+def parse_plan(completion: str, expected_files: Sequence[str] = ()) -> CodePlan:
+    """
+    Parse the file plan of a completion.
+
+    Args:
+        completion: Completion text, possibly with the JSON in a code block
+        expected_files: Paths of the files to generate; missing ones are added
+
+    Returns:
+        The plan
+
+    Raises:
+        ValueError: If the completion holds no valid plan
+    """
+    match = _JSON_PATTERN.search(completion)
+    if match is None:
+        raise ValueError("The plan is not a JSON object")
+    try:
+        data = json.loads(match.group(0))
+        files = [
+            FilePlan(
+                path=str(item["path"]).strip(),
+                purpose=str(item.get("purpose", "")),
+                exports=[str(export) for export in item.get("exports", [])],
+            )
+            for item in data["files"]
+        ]
+    except (json.JSONDecodeError, KeyError, TypeError, AttributeError) as e:
+        raise ValueError(f"Invalid plan: {str(e)}") from None
+
+    paths = {file_plan.path for file_plan in files}
+    files += [FilePlan(path=path) for path in expected_files if path not in paths]
+    if not files:
+        raise ValueError("The plan has no files")
+    return CodePlan(files=files)
+
+
+def _defined_names(tree: ast.Module) -> List[str]:
+    names = []
+    for node in tree.body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            names.append(node.name)
+        elif isinstance(node, (ast.Assign, ast.AnnAssign)):
+            targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+            names.extend(t.id for t in targets if isinstance(t, ast.Name))
+        elif isinstance(node, (ast.Import, ast.ImportFrom)):
+            names.extend((alias.asname or alias.name).split(".")[0] for alias in node.names)
+    return names
+
+
+def _module_name(path: str) -> Optional[str]:
+    if not path.endswith(".py"):
+        return None
+    module = path[:-3].replace("/", ".")
+    return module[: -len(".__init__")] if module.endswith(".__init__") else module
+
+
+def check_consistency(plan: CodePlan, artifacts: Sequence[CodeArtifact]) -> List[str]:
+    """
+    Check separately generated files against their plan and each other.
+
+    Every planned file must be present and parse; a Python file must define
+    its planned exports, and names imported from other generated modules
+    must be defined there.
+
+    Args:
+        plan: File plan
+        artifacts: Generated artifacts
+
+    Returns:
+        Descriptions of the inconsistencies found
+    """
+    issues = []
+    contents = {artifact.file_path: artifact.content for artifact in artifacts}
+    trees: Dict[str, ast.Module] = {}
+    for file_plan in plan.files:
+        if file_plan.path not in contents:
+            issues.append(f"{file_plan.path}: planned file was not generated")
+    for path, content in contents.items():
+        if not path.endswith(".py"):
+            continue
+        try:
+            trees[path] = ast.parse(content)
+        except SyntaxError as e:
+            issues.append(f"{path}: syntax error at line {e.lineno}: {e.msg}")
+
+    defined = {path: set(_defined_names(tree)) for path, tree in trees.items()}
+    for file_plan in plan.files:
+        if file_plan.path not in defined:
+            continue
+        for export in file_plan.exports:
+            match = _NAME_PATTERN.match(export.strip())
+            if match and match.group(1) not in defined[file_plan.path]:
+                issues.append(f"{file_plan.path}: planned export {match.group(1)} is missing")
+
+    modules = {_module_name(path): path for path in defined}
+    for path, tree in trees.items():
+        for node in ast.walk(tree):
+            if not isinstance(node, ast.ImportFrom) or node.module not in modules:
+                continue
+            source = modules[node.module]
+            for alias in node.names:
+                submodule = f"{node.module}.{alias.name}" in modules
+                if alias.name != "*" and not submodule and alias.name not in defined[source]:
+                    issues.append(
+                        f"{path}: imports {alias.name} from {node.module}, which does not define it"
+                    )
+    return issues
+
+
+def merge_generations(
+    requirements: Requirements,
+    plan: CodePlan,
+    generations: Sequence[CodeGeneration],
+) -> CodeGeneration:
+    """
+    Reassemble the generations of the planned files.
+
+    Args:
+        requirements: User requirements
+        plan: File plan
+        generations: Generation of each planned file, in plan order
+
+    Returns:
+        The code generation aggregate of the whole code base
+    """
+    artifacts: Dict[str, CodeArtifact] = {}
+    for file_plan, generation in zip(plan.files, generations):
+        for artifact in generation.artifacts:
+            # A file repeated by another generation keeps its planned version
+            if artifact.file_path == file_plan.path or artifact.file_path not in artifacts:
+                artifacts[artifact.file_path] = artifact
+
+    metadata = [g.metadata for g in generations if g.metadata is not None]
+    return CodeGeneration(
+        requirements=requirements,
+        artifacts=list(artifacts.values()),
+        metadata=CodeMetadata(
+            generation_timestamp=utc_now(),
+            model_used=metadata[0].model_used if metadata else "",
+            prompt_tokens=plan.prompt_tokens + sum(m.prompt_tokens for m in metadata),
+            completion_tokens=plan.completion_tokens + sum(m.completion_tokens for m in metadata),
+            additional_info={"planned_files": str(len(plan.files))},
+            truncated=any(m.truncated for m in metadata),
+        ),
+        status=CodeStatus.COMPLETED if artifacts else CodeStatus.FAILED,
+    )
+
+
+class CodePlanner:
+    """
+    Plans the files of multi-file requirements.
+
+    The plan lists each file with the interface it exposes, so that the
+    files can be generated concurrently, each against the same plan, and
+    still fit together.
+    """
+
+    def __init__(self, llm_client: Optional[LLMClient] = None, config: Optional[Dict[str, Any]] = None):
+        """
+        Initialize the planner.
+
+        Args:
+            llm_client: LLM client; created from the configuration if omitted
+            config: The "llm" configuration section
+        """
+        self.config = {**get_llm_config(), **(config or {})}
+        self.llm_client = llm_client or create_llm_client(self.config)
+
+    async def plan(
+        self,
+        requirements: Requirements,
+        expected_files: Sequence[str] = (),
+        model: Optional[str] = None,
+    ) -> CodePlan:
+        """
+        Ask for the file plan of requirements.
+
+        Args:
+            requirements: User requirements
+            expected_files: Paths of the files to generate, if known
+            model: Model asked for the plan; the configured model if omitted
+
+        Returns:
+            The plan
+
+        Raises:
+            ValueError: If the completion holds no valid plan
+        """
+        model = model or self.config["model"]
+        request = LLMRequest(
+            prompt=build_plan_prompt(requirements, expected_files),
+            model=model,
+            temperature=self.config["temperature"],
+            max_tokens=min(self.config["max_tokens"], LLM_OUTPUT_TOKENS_PER_FILE),
+            system=PLAN_TEMPLATE.system,
+        )
+        response = await self.llm_client.complete(request)
+        record_usage(self.llm_client.provider, response.model, response.usage)
+        plan = parse_plan(response.content, expected_files)
+        plan.prompt_tokens = response.usage.prompt_tokens or count_tokens(request.prompt, model)
+        plan.completion_tokens = (
+            response.usage.completion_tokens or count_tokens(response.content, model)
+        )
+        logger.info(f"Planned {len(plan.files)} files with {model}")
+        return plan
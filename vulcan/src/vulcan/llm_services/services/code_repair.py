@@ -0,0 +1,527 @@
+"""
+Repair of generated code failing its tests with targeted edits.
+"""
+import ast
+import difflib
+import logging
+import re
+from dataclasses import dataclass, replace
+from pathlib import PurePosixPath
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+from vulcan.config.llm_client_config import (
+    LLM_OUTPUT_TOKENS_PER_FILE,
+    LLM_PATCH_MIN_SIMILARITY,
+    LLM_REPAIR_CONTEXT_LINES,
+    get_llm_config,
+)
+from vulcan.core.vulcan_core.models import (
+    CodeArtifact,
+    CodeGeneration,
+    CodeMetadata,
+    CodeStatus,
+    TestResult,
+)
+from vulcan.infra.interface.llm_agent.llm_client import LLMClient, LLMRequest
+from vulcan.llm_services.services.code_generator import (
+    FILE_HEADING_PATTERN,
+    SYSTEM_PROMPT,
+    TRUNCATED_FINISH_REASONS,
+    guess_language,
+    record_usage,
+)
+from vulcan.llm_services.services.llm_provider import create_llm_client
+from vulcan.llm_services.services.prompt_templates import PromptSection, PromptTemplate, bullet_list
+from vulcan.llm_services.services.token_budget import count_tokens
+from vulcan.workflow_engine.state.workflow_state import utc_now
+
+
+logger = logging.getLogger(__name__)
+
+# Failure locations in tracebacks: `File "x.py", line 3` and `x.py:3:`
+LOCATION_PATTERN = re.compile(
+    r'File "(?P<quoted>[^"]+)", line (?P<quoted_line>\d+)|(?P<path>[\w./\\-]+\.\w+):(?P<line>\d+)'
+)
+
+# Failing tests included in a repair prompt, and characters kept of each message
+MAX_FAILURES = 10
+MAX_FAILURE_CHARS = 1000
+
+# The failures change with every attempt while most of the code does not
+REPAIR_TEMPLATE = PromptTemplate(
+    name="code_repair",
+    version=1,
+    system=SYSTEM_PROMPT,
+    instructions=(
+        "Fix the code so that the failing tests pass, changing as little as possible. "
+        "Output only edits. Start the edits of each file with a Markdown heading "
+        "\"### File: <relative path>\" and write each edit as:\n"
+        "<<<<<<< SEARCH\n<current lines, copied exactly>\n=======\n<replacement lines>\n"
+        ">>>>>>> REPLACE\n"
+        "Keep SEARCH blocks short but unique. Do not output whole files or explanations."
+    ),
+    sections=(
+        PromptSection("code"),
+        PromptSection("failures", "Failing tests"),
+    ),
+)
+
+
+@dataclass
+class CodeEdit:
+    """Replacement of a region of a file; an empty search appends to the file."""
+    file_path: Optional[str]
+    search: str
+    replace: str
+
+
+def failure_locations(text: str, paths: Sequence[str]) -> Dict[str, Set[int]]:
+    """
+    Find the lines of the given files referenced by test output.
+
+    Args:
+        text: Test failure messages and output
+        paths: Relative paths of the files
+
+    Returns:
+        Mapping of file paths to referenced line numbers
+    """
+    locations: Dict[str, Set[int]] = {}
+    for match in LOCATION_PATTERN.finditer(text):
+        found = (match.group("quoted") or match.group("path")).replace("\\", "/")
+        line = int(match.group("quoted_line") or match.group("line"))
+        for path in paths:
+            if found == path or found.endswith("/" + path):
+                locations.setdefault(path, set()).add(line)
+    return locations
+
+
+def symbol_ranges(artifact: CodeArtifact) -> Dict[str, List[Tuple[int, int]]]:
+    """
+    Get the line ranges of the functions and classes of a Python artifact.
+
+    Args:
+        artifact: Code artifact
+
+    Returns:
+        Mapping of names to (first, last) line ranges, decorators included;
+        empty for other languages and code that does not parse
+    """
+    if artifact.language != "python":
+        return {}
+    try:
+        tree = ast.parse(artifact.content)
+    except SyntaxError:
+        return {}
+    ranges: Dict[str, List[Tuple[int, int]]] = {}
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            first = min([node.lineno] + [d.lineno for d in node.decorator_list])
+            ranges.setdefault(node.name, []).append((first, node.end_lineno or node.lineno))
+    return ranges
+
+
+def _merge(ranges: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    merged: List[Tuple[int, int]] = []
+    for first, last in sorted(ranges):
+        if merged and first <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], last))
+        else:
+            merged.append((first, last))
+    return merged
+
+
+def relevant_regions(
+    artifacts: Sequence[CodeArtifact], failure_text: str, context_lines: int = LLM_REPAIR_CONTEXT_LINES
+) -> Dict[str, List[Tuple[int, int]]]:
+    """
+    Select the code regions related to test failures.
+
+    A referenced line brings in its enclosing function (or the surrounding
+    `context_lines` when the function is long), and functions or classes
+    named in the failures are included. Without any reference, whole files
+    are selected.
+
+    Args:
+        artifacts: Code artifacts
+        failure_text: Test failure messages and output
+        context_lines: Lines shown around a referenced line
+
+    Returns:
+        Mapping of file paths to merged (first, last) line ranges
+    """
+    locations = failure_locations(failure_text, [a.file_path for a in artifacts])
+    words = set(re.findall(r"[A-Za-z_]\w*", failure_text))
+    max_span = 4 * context_lines
+
+    regions: Dict[str, List[Tuple[int, int]]] = {}
+    for artifact in artifacts:
+        line_count = max(1, len(artifact.content.splitlines()))
+        symbols = symbol_ranges(artifact)
+        ranges = []
+        for line in locations.get(artifact.file_path, ()):
+            if not 1 <= line <= line_count:
+                continue
+            enclosing = [
+                (first, last)
+                for spans in symbols.values()
+                for first, last in spans
+                if first <= line <= last and last - first < max_span
+            ]
+            if enclosing:
+                ranges.append(min(enclosing, key=lambda span: span[1] - span[0]))
+            else:
+                ranges.append((max(1, line - context_lines), min(line_count, line + context_lines)))
+        for name, spans in symbols.items():
+            if name in words:
+                ranges.extend((first, min(last, first + max_span - 1)) for first, last in spans)
+        if ranges:
+            regions[artifact.file_path] = _merge(ranges)
+
+    if not regions:
+        regions = {a.file_path: [(1, max(1, len(a.content.splitlines())))] for a in artifacts}
+    return regions
+
+
+def describe_failures(test_results: Sequence[TestResult], output: str = "") -> List[str]:
+    """
+    Summarize failing tests for a repair prompt.
+
+    Args:
+        test_results: Results of the test run
+        output: Output of the test session, used when no test failed individually
+            (e.g. the tests could not be collected)
+
+    Returns:
+        One line per failing test
+    """
+    failures = [
+        f"{result.test_case.name}: {(result.error_message or 'failed')[:MAX_FAILURE_CHARS]}"
+        for result in test_results
+        if not result.passed
+    ]
+    if not failures and output:
+        failures = [f"Test session failed: {output[-MAX_FAILURE_CHARS:]}"]
+    return failures[:MAX_FAILURES]
+
+
+def build_repair_prompt(
+    artifacts: Sequence[CodeArtifact],
+    failures: Sequence[str],
+    regions: Dict[str, List[Tuple[int, int]]],
+) -> str:
+    """
+    Build the prompt asking for edits fixing failing tests.
+
+    Args:
+        artifacts: Code artifacts
+        failures: Failing tests and their messages
+        regions: Code regions shown, by file path
+
+    Returns:
+        The prompt
+    """
+    blocks = []
+    for artifact in artifacts:
+        lines = artifact.content.splitlines(keepends=True)
+        for first, last in regions.get(artifact.file_path, ()):
+            code = "".join(lines[first - 1:last])
+            if code and not code.endswith("\n"):
+                code += "\n"
+            blocks.append(
+                f"{artifact.file_path}, lines {first}-{last} of {len(lines)}:\n"
+                f"```{artifact.language}\n{code}```"
+            )
+    return REPAIR_TEMPLATE.render(
+        code="\n\n".join(blocks), failures=bullet_list(failures)
+    )
+
+
+def parse_edits(completion: str) -> List[CodeEdit]:
+    """
+    Extract edits from a completion.
+
+    SEARCH/REPLACE blocks and unified diff hunks are accepted; each applies
+    to the file of the preceding "### File:" heading or "+++" diff header.
+
+    Args:
+        completion: Completion text
+
+    Returns:
+        The edits, in order of appearance
+    """
+    edits: List[CodeEdit] = []
+    file_path: Optional[str] = None
+    mode: Optional[str] = None
+    old: List[str] = []
+    new: List[str] = []
+
+    def flush() -> None:
+        if old or new:
+            edits.append(CodeEdit(file_path, "".join(old), "".join(new)))
+
+    for line in completion.splitlines(keepends=True):
+        text = line.rstrip("\r\n")
+        if mode == "search":
+            if text.strip() == "=======":
+                mode = "replace"
+            else:
+                old.append(line)
+            continue
+        if mode == "replace":
+            if text.startswith(">>>>>>>"):
+                flush()
+                mode = None
+            else:
+                new.append(line)
+            continue
+        if mode == "hunk":
+            if text == "" or (text[0] in " -+" and not text.startswith(("---", "+++"))):
+                # Blank context lines often lose their leading space
+                body = line[1:] if text else "\n"
+                if text[:1] != "+":
+                    old.append(body)
+                if text[:1] != "-":
+                    new.append(body)
+                continue
+            flush()
+            mode = None
+
+        heading = FILE_HEADING_PATTERN.match(text)
+        if heading:
+            file_path = heading.group("path")
+        elif text.startswith("+++ "):
+            path = text[4:].split("\t")[0].strip()
+            file_path = path[2:] if path.startswith("b/") else path
+        elif text.startswith("<<<<<<<"):
+            mode, old, new = "search", [], []
+        elif text.startswith("@@"):
+            mode, old, new = "hunk", [], []
+    if mode == "hunk":
+        flush()
+    return edits
+
+
+def _indentation(line: str) -> str:
+    return line[: len(line) - len(line.lstrip())]
+
+
+def _reindent(lines: List[str], old_indent: str, new_indent: str) -> List[str]:
+    if old_indent == new_indent:
+        return lines
+    return [
+        new_indent + line[len(old_indent):] if line.strip() and line.startswith(old_indent) else line
+        for line in lines
+    ]
+
+
+def apply_edit(
+    content: str, search: str, replacement: str, min_similarity: float = LLM_PATCH_MIN_SIMILARITY
+) -> Optional[str]:
+    """
+    Apply an edit to file content, tolerating inexact search text.
+
+    The search text is looked up exactly, then line by line ignoring
+    indentation (the replacement is re-indented to the matched code), then
+    as the most similar run of lines.
+
+    Args:
+        content: File content
+        search: Text to replace; empty to append `replacement`
+        replacement: Replacement text
+        min_similarity: Minimum similarity ratio of a fuzzy match
+
+    Returns:
+        The edited content, or None if the search text was not found
+    """
+    if not search.strip():
+        separator = "" if not content or content.endswith("\n") else "\n"
+        return content + separator + replacement
+    if search in content:
+        return content.replace(search, replacement, 1)
+
+    lines = content.splitlines(keepends=True)
+    search_lines = search.strip("\n").splitlines()
+    replacement_lines = replacement.splitlines(keepends=True)
+    if replacement_lines and not replacement_lines[-1].endswith("\n"):
+        replacement_lines[-1] += "\n"
+
+    def splice(start: int, size: int) -> str:
+        matched = [line for line in lines[start:start + size] if line.strip()]
+        searched = [line for line in search_lines if line.strip()]
+        new_lines = replacement_lines
+        if matched and searched:
+            new_lines = _reindent(
+                replacement_lines, _indentation(searched[0]), _indentation(matched[0])
+            )
+        return "".join(lines[:start] + new_lines + lines[start + size:])
+
+    size = len(search_lines)
+    stripped = [line.strip() for line in lines]
+    target = [line.strip() for line in search_lines]
+    for start in range(len(lines) - size + 1):
+        if stripped[start:start + size] == target:
+            return splice(start, size)
+
+    # The search text is compared to runs of about as many lines
+    matcher = difflib.SequenceMatcher(autojunk=False)
+    matcher.set_seq2("\n".join(target))
+    best: Tuple[float, int, int] = (0.0, 0, 0)
+    for window in {max(1, size - 1), size, size + 1}:
+        for start in range(len(lines) - window + 1):
+            matcher.set_seq1("\n".join(stripped[start:start + window]))
+            if matcher.real_quick_ratio() < min_similarity or matcher.quick_ratio() < min_similarity:
+                continue
+            ratio = matcher.ratio()
+            if ratio > best[0]:
+                best = (ratio, start, window)
+    if best[0] >= min_similarity:
+        return splice(best[1], best[2])
+    return None
+
+
+def is_relative_path(file_path: str) -> bool:
+    """
+    Check that a file path from the model output stays inside the code directory.
+
+    Args:
+        file_path: File path
+
+    Returns:
+        True if the path is relative and never goes up with `..`
+    """
+    path = PurePosixPath(file_path.replace("\\", "/"))
+    return bool(path.parts) and not path.is_absolute() and ".." not in path.parts
+
+
+def apply_edits(
+    artifacts: Sequence[CodeArtifact],
+    edits: Sequence[CodeEdit],
+    min_similarity: float = LLM_PATCH_MIN_SIMILARITY,
+) -> Tuple[List[CodeArtifact], int, List[CodeEdit]]:
+    """
+    Apply edits to code artifacts.
+
+    Edits without a file apply to the only artifact; an edit appending to
+    an unknown file creates it unless its path is absolute or goes up with `..`.
+
+    Args:
+        artifacts: Code artifacts
+        edits: Edits to apply
+        min_similarity: Minimum similarity ratio of a fuzzy match
+
+    Returns:
+        The edited artifacts, the number of edits applied and the edits that
+        could not be applied
+    """
+    contents = {artifact.file_path: artifact.content for artifact in artifacts}
+    applied = 0
+    failed: List[CodeEdit] = []
+    for edit in edits:
+        path = edit.file_path
+        if path is None and len(contents) == 1:
+            path = next(iter(contents))
+        elif path is not None and path not in contents:
+            path = next((p for p in contents if path.endswith("/" + p)), path)
+
+        if path is None or (
+            path not in contents and (edit.search.strip() or not is_relative_path(path))
+        ):
+            failed.append(edit)
+            continue
+        edited = apply_edit(contents.get(path, ""), edit.search, edit.replace, min_similarity)
+        if edited is None:
+            failed.append(edit)
+            continue
+        contents[path] = edited
+        applied += 1
+
+    edited_artifacts = [replace(a, content=contents.pop(a.file_path)) for a in artifacts]
+    edited_artifacts += [
+        CodeArtifact(content=content, file_path=path, language=guess_language(path))
+        for path, content in contents.items()
+    ]
+    return edited_artifacts, applied, failed
+
+
+class CodeRepairer:
+    """
+    Repairs generated code failing its tests with edits.
+
+    Instead of regenerating whole files, the LLM receives the failing tests
+    and the code regions they point to, and answers with SEARCH/REPLACE
+    edits (or unified diff hunks) applied with fuzzy matching. Prompt and
+    completion stay proportional to the failures rather than to the code.
+    """
+
+    def __init__(self, llm_client: Optional[LLMClient] = None, config: Optional[Dict[str, Any]] = None):
+        """
+        Initialize the repairer.
+
+        Args:
+            llm_client: LLM client; created from the configuration if omitted
+            config: The "llm" configuration section
+        """
+        self.config = {**get_llm_config(), **(config or {})}
+        self.llm_client = llm_client or create_llm_client(self.config)
+        self.max_iterations = self.config["repair_iterations"]
+
+    async def repair(
+        self,
+        generation: CodeGeneration,
+        test_results: Sequence[TestResult],
+        output: str = "",
+        model: Optional[str] = None,
+    ) -> CodeGeneration:
+        """
+        Ask for edits fixing failing tests and apply them.
+
+        Args:
+            generation: Generation whose code fails its tests
+            test_results: Results of the test run
+            output: Output of the test session
+            model: Model asked for the edits; the configured model if omitted
+
+        Returns:
+            The generation with edited artifacts; failed if no edit applied
+        """
+        failures = describe_failures(test_results, output)
+        regions = relevant_regions(generation.artifacts, "\n".join(failures) + "\n" + output)
+        model = model or self.config["model"]
+        request = LLMRequest(
+            prompt=build_repair_prompt(generation.artifacts, failures, regions),
+            model=model,
+            temperature=self.config["temperature"],
+            max_tokens=min(self.config["max_tokens"], LLM_OUTPUT_TOKENS_PER_FILE),
+            system=REPAIR_TEMPLATE.system,
+        )
+        response = await self.llm_client.complete(request)
+        record_usage(self.llm_client.provider, response.model, response.usage)
+
+        edits = parse_edits(response.content)
+        artifacts, applied, failed = apply_edits(generation.artifacts, edits)
+        logger.info(f"Applied {applied} of {len(edits)} repair edits with {model}")
+        return CodeGeneration(
+            requirements=generation.requirements,
+            artifacts=artifacts,
+            metadata=CodeMetadata(
+                generation_timestamp=utc_now(),
+                model_used=response.model,
+                prompt_tokens=(
+                    response.usage.prompt_tokens
+                    or count_tokens(request.prompt, model) + count_tokens(REPAIR_TEMPLATE.system, model)
+                ),
+                completion_tokens=(
+                    response.usage.completion_tokens or count_tokens(response.content, model)
+                ),
+                additional_info={
+                    **response.additional_info,
+                    "repair": "true",
+                    "edits_applied": str(applied),
+                    "edits_failed": str(len(failed)),
+                },
+                finish_reason=response.finish_reason,
+                truncated=response.finish_reason in TRUNCATED_FINISH_REASONS,
+            ),
+            status=CodeStatus.COMPLETED if applied else CodeStatus.FAILED,
+        )
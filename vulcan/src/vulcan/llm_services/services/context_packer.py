@@ -0,0 +1,294 @@
+"""
+Packing of retrieved code into the prompt context: snippets are minified,
+deduplicated and selected under a token budget as a 0/1 knapsack.
+"""
+import io
+import logging
+import os
+import re
+import tokenize
+from dataclasses import dataclass, field, replace
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+from vulcan.llm_services.services.code_index import Snippet
+from vulcan.llm_services.services.token_budget import count_tokens
+
+
+logger = logging.getLogger(__name__)
+
+C_STYLE_EXTENSIONS = {
+    ".js", ".jsx", ".ts", ".tsx", ".java", ".kt", ".go", ".rs", ".c", ".h", ".cc",
+    ".cpp", ".hpp", ".cs", ".swift", ".scala", ".php",
+}
+HASH_COMMENT_EXTENSIONS = {".sh", ".rb", ".toml", ".yaml", ".yml", ".cfg", ".ini"}
+# Prose keeps its paragraphs; only runs of blank lines are collapsed
+PROSE_EXTENSIONS = {".md", ".rst", ".txt"}
+
+# Candidates retrieved per packed snippet, so that the knapsack can trade a
+# large snippet for several smaller ones
+CANDIDATES_PER_SNIPPET = 4
+
+# Weights are rounded up to units of budget / KNAPSACK_RESOLUTION tokens, which
+# bounds the size of the dynamic programming table
+KNAPSACK_RESOLUTION = 1000
+
+_C_STYLE_PATTERN = re.compile(
+    r"(\"(?:\\.|[^\"\\\n])*\"|'(?:\\.|[^'\\\n])*'|`(?:\\.|[^`\\])*`)|//[^\n]*|/\*.*?\*/",
+    re.DOTALL,
+)
+_IMPORT_PATTERN = re.compile(r"^\s*(?:import\s|from\s+\S+\s+import\s|#include\s|using\s|require\()")
+
+
+@dataclass
+class PackedContext:
+    """Snippets selected for the prompt context."""
+    snippets: List[Snippet] = field(default_factory=list)
+    # Tokens of the selected snippets as packed and as retrieved
+    tokens: int = 0
+    original_tokens: int = 0
+    # Candidates left out, duplicates included
+    dropped: int = 0
+
+    @property
+    def tokens_saved(self) -> int:
+        """Tokens saved on the selected snippets by minification and deduplication."""
+        return max(0, self.original_tokens - self.tokens)
+
+    def render(self) -> List[str]:
+        """Render the snippets as prompt context entries."""
+        return [snippet.render() for snippet in self.snippets]
+
+
+def _strip_lines(lines: Sequence[str], keep_blank: bool = False) -> str:
+    kept = []
+    for line in lines:
+        line = line.rstrip()
+        if line or (keep_blank and kept and kept[-1]):
+            kept.append(line)
+    return "\n".join(kept).strip("\n")
+
+
+def _minify_python(text: str) -> str:
+    lines = text.splitlines()
+    # Snippets may start in an indented block and dedent below it, which the
+    # tokenizer rejects; the code is tokenized without its indentation
+    indents = [len(line) - len(line.lstrip()) for line in lines]
+    unindented = "\n".join(line.lstrip() for line in lines)
+    removed_rows: Set[int] = set()
+    cuts: Dict[int, int] = {}
+    previous = tokenize.NEWLINE
+    pending_string: Optional[tokenize.TokenInfo] = None
+    try:
+        for token in tokenize.generate_tokens(io.StringIO(unindented).readline):
+            if token.type == tokenize.COMMENT:
+                row = token.start[0]
+                cuts[row] = indents[row - 1] + token.start[1]
+                continue
+            if token.type == tokenize.NL:
+                continue
+            if pending_string is not None:
+                # A string alone in its statement is a docstring
+                if token.type in (tokenize.NEWLINE, tokenize.ENDMARKER):
+                    removed_rows.update(range(pending_string.start[0], pending_string.end[0] + 1))
+                pending_string = None
+            if token.type == tokenize.STRING and previous == tokenize.NEWLINE:
+                pending_string = token
+            previous = token.type
+    except tokenize.TokenError:
+        # Snippets may cut a statement; the rows tokenized so far are minified
+        pass
+
+    minified = []
+    for row, line in enumerate(lines, start=1):
+        if row in removed_rows:
+            continue
+        minified.append(line[: cuts[row]] if row in cuts else line)
+    return _strip_lines(minified)
+
+
+def _minify_c_style(text: str) -> str:
+    stripped = _C_STYLE_PATTERN.sub(lambda match: match.group(1) or "", text)
+    return _strip_lines(stripped.splitlines())
+
+
+def minify(text: str, path: str) -> str:
+    """
+    Remove the comments, docstrings and blank lines of code.
+
+    The rules follow the language of the file: tokenizer-based for Python,
+    "//" and "/* */" comments for C-style languages, full-line "#" comments
+    for shell and configuration files. Prose only loses its runs of blank
+    lines.
+
+    Args:
+        text: Code, possibly an incomplete part of a file
+        path: Path of the file, whose extension gives the language
+
+    Returns:
+        The minified code
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension in (".py", ".pyi"):
+        return _minify_python(text)
+    if extension in C_STYLE_EXTENSIONS:
+        return _minify_c_style(text)
+    if extension in HASH_COMMENT_EXTENSIONS:
+        lines = text.splitlines()
+        return _strip_lines(
+            line for line in lines
+            if not line.lstrip().startswith("#") or line.startswith("#!")
+        )
+    if extension == ".sql":
+        return _strip_lines(line for line in text.splitlines() if not line.lstrip().startswith("--"))
+    return _strip_lines(text.splitlines(), keep_blank=extension in PROSE_EXTENSIONS)
+
+
+def merge_overlapping(snippets: Sequence[Snippet]) -> List[Snippet]:
+    """
+    Merge the snippets of a file whose line ranges overlap or touch.
+
+    A merged snippet keeps the best score of its parts.
+
+    Args:
+        snippets: Snippets, e.g. from several retrievals
+
+    Returns:
+        The merged snippets, in the order of their best part
+    """
+    by_path: Dict[str, List[Snippet]] = {}
+    for snippet in snippets:
+        by_path.setdefault(snippet.path, []).append(snippet)
+
+    merged = []
+    for path_snippets in by_path.values():
+        path_snippets.sort(key=lambda s: s.start_line)
+        current = path_snippets[0]
+        for snippet in path_snippets[1:]:
+            if snippet.start_line > current.end_line + 1:
+                merged.append(current)
+                current = snippet
+                continue
+            lines = current.text.split("\n")
+            extra = snippet.text.split("\n")[current.end_line - snippet.start_line + 1:]
+            current = replace(
+                current,
+                end_line=max(current.end_line, snippet.end_line),
+                text="\n".join(lines + extra),
+                score=max(current.score, snippet.score),
+            )
+        merged.append(current)
+    return sorted(merged, key=lambda s: -s.score)
+
+
+def knapsack(weights: Sequence[int], values: Sequence[float], capacity: int) -> List[int]:
+    """
+    Solve a 0/1 knapsack problem by dynamic programming.
+
+    Args:
+        weights: Weight of each item
+        values: Value of each item
+        capacity: Maximum total weight
+
+    Returns:
+        Indices of the items of maximum total value, in increasing order
+    """
+    if capacity <= 0:
+        return []
+    unit = max(1, -(-capacity // KNAPSACK_RESOLUTION))
+    # Weights are rounded up, so a selection never exceeds the capacity
+    scaled = [-(-weight // unit) for weight in weights]
+    slots = capacity // unit
+    best = [0.0] * (slots + 1)
+    taken: List[List[bool]] = []
+    for weight, value in zip(scaled, values):
+        row = [False] * (slots + 1)
+        for slot in range(slots, weight - 1, -1):
+            candidate = best[slot - weight] + value
+            if candidate > best[slot]:
+                best[slot] = candidate
+                row[slot] = True
+        taken.append(row)
+
+    selected = []
+    slot = slots
+    for index in range(len(scaled) - 1, -1, -1):
+        if taken[index][slot]:
+            selected.append(index)
+            slot -= scaled[index]
+    return sorted(selected)
+
+
+def pack_context(
+    snippets: Sequence[Snippet],
+    token_budget: int,
+    model: str = "",
+    max_snippets: Optional[int] = None,
+) -> PackedContext:
+    """
+    Select the snippets of highest total score that fit a token budget.
+
+    Overlapping snippets are merged and minified; identical snippets are
+    kept once. The selection is a knapsack over the scores, so that several
+    small relevant snippets can beat a large one; the selected snippets then
+    lose the imports already shown by a better selected snippet.
+
+    Args:
+        snippets: Retrieved snippets with their relevance scores
+        token_budget: Maximum tokens of the rendered snippets
+        model: Model whose tokenizer counts the tokens
+        max_snippets: Maximum number of snippets, the best of the knapsack
+            selection; no limit if None
+
+    Returns:
+        The packed context
+    """
+    candidates: List[Tuple[Snippet, Snippet, int]] = []
+    seen_texts: Set[str] = set()
+    for snippet in merge_overlapping(snippets):
+        minified = minify(snippet.text, snippet.path)
+        if not minified or minified in seen_texts:
+            continue
+        seen_texts.add(minified)
+        packed = replace(snippet, text=minified)
+        candidates.append((packed, snippet, count_tokens(packed.render(), model)))
+    selected = knapsack(
+        [tokens for _, _, tokens in candidates],
+        [snippet.score for snippet, _, _ in candidates],
+        token_budget,
+    )
+    # Candidates are in score order: the best of the selection are kept
+    selected = selected[:max_snippets] if max_snippets is not None else selected
+
+    # Imports are only dropped once shown by a snippet actually selected;
+    # snippets only shrink, so the selection still fits the budget
+    packed_snippets: List[Snippet] = []
+    tokens = original_tokens = 0
+    seen_imports: Set[str] = set()
+    for index in selected:
+        packed, snippet, _ = candidates[index]
+        lines = []
+        for line in packed.text.split("\n"):
+            if _IMPORT_PATTERN.match(line):
+                if line.strip() in seen_imports:
+                    continue
+                seen_imports.add(line.strip())
+            lines.append(line)
+        text = "\n".join(lines).strip("\n")
+        if not text:
+            continue
+        packed = replace(packed, text=text)
+        packed_snippets.append(packed)
+        tokens += count_tokens(packed.render(), model)
+        original_tokens += count_tokens(snippet.render(), model)
+    context = PackedContext(
+        snippets=packed_snippets,
+        tokens=tokens,
+        original_tokens=original_tokens,
+        dropped=len(snippets) - len(packed_snippets),
+    )
+    if context.snippets:
+        logger.info(
+            f"Packed {len(context.snippets)} of {len(snippets)} snippets in {context.tokens} "
+            f"tokens, {context.tokens_saved} saved"
+        )
+    return context
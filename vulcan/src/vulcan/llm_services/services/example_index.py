@@ -0,0 +1,334 @@
+"""
+Few-shot examples from past generations whose tests passed, found by a
+MinHash/LSH index of their requirements.
+"""
+import fcntl
+import hashlib
+import json
+import logging
+import operator
+import os
+import struct
+import threading
+from collections import Counter, OrderedDict
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from vulcan.config.llm_client_config import LLM_EXAMPLE_INDEX_DIR, LLM_EXAMPLE_INDEX_MAX_EXAMPLES
+from vulcan.core.vulcan_core.models import CodeArtifact, Requirements
+from vulcan.llm_services.services.code_index import split_terms
+from vulcan.llm_services.services.token_budget import count_tokens
+from vulcan.workflow_engine.state.workflow_state import utc_now
+
+
+logger = logging.getLogger(__name__)
+
+# Signatures of NUM_PERMUTATIONS min-hashes, split in LSH_BANDS bands: two
+# requirements become candidates when all the hashes of a band match, which is
+# likely from a Jaccard similarity of about (1 / LSH_BANDS) ** (1 / rows)
+NUM_PERMUTATIONS = 64
+LSH_BANDS = 32
+# Candidates are ranked by colliding bands; the best are compared by signature
+MAX_RERANKED = 32
+MIN_SIMILARITY = 0.25
+# Buckets keep their most recent examples, which bounds the cost of a lookup
+MAX_BUCKET_SIZE = 64
+# Terms of the requirements hashed; long descriptions are known by their start
+MAX_TERMS = 128
+
+# Common words carrying no meaning about the code asked for
+STOP_WORDS = {
+    "a", "an", "and", "are", "as", "be", "by", "for", "from", "in", "into", "is", "it",
+    "of", "on", "or", "should", "that", "the", "this", "to", "with", "must", "can",
+}
+
+# The min-hashes are the 32-bit words of an extendable-output hash of each
+# shingle: independent hash functions, computed with one call per shingle
+_HASHES = struct.Struct(f"<{NUM_PERMUTATIONS}I")
+_ROWS = NUM_PERMUTATIONS // LSH_BANDS
+
+Signature = Tuple[int, ...]
+
+
+@dataclass
+class Example:
+    """A past generation whose tests passed."""
+    example_id: str
+    description: str
+    artifacts: List[Dict[str, str]]
+    created_at: str = ""
+    signature: List[int] = field(default_factory=list, repr=False)
+
+    def render(self) -> str:
+        """Render the example for the generation prompt."""
+        blocks = [f"Task: {self.description}"]
+        for artifact in self.artifacts:
+            blocks.append(
+                f"### File: {artifact['file_path']}\n"
+                f"```{artifact['language']}\n{artifact['content'].rstrip()}\n```"
+            )
+        return "\n".join(blocks)
+
+
+def shingles(text: str) -> List[str]:
+    """
+    Split requirements into the shingles compared by MinHash.
+
+    Terms are lowercased without stop words; the shingles are the terms and
+    the pairs of consecutive terms, so that word order counts a little.
+
+    Args:
+        text: Requirements text
+
+    Returns:
+        The distinct shingles
+    """
+    terms = [term for term in split_terms(text) if term not in STOP_WORDS][:MAX_TERMS]
+    pairs = [f"{first} {second}" for first, second in zip(terms, terms[1:])]
+    return list(dict.fromkeys(terms + pairs))
+
+
+def minhash(text: str) -> Optional[Signature]:
+    """
+    Compute the MinHash signature of requirements.
+
+    Args:
+        text: Requirements text
+
+    Returns:
+        The signature, or None if the text has no terms
+    """
+    rows = [
+        _HASHES.unpack(hashlib.shake_128(shingle.encode("utf-8")).digest(_HASHES.size))
+        for shingle in shingles(text)
+    ]
+    if not rows:
+        return None
+    return tuple(map(min, zip(*rows)))
+
+
+def similarity(first: Sequence[int], second: Sequence[int]) -> float:
+    """Estimate the Jaccard similarity of two texts from their signatures."""
+    return sum(map(operator.eq, first, second)) / NUM_PERMUTATIONS
+
+
+def _bands(signature: Sequence[int]) -> List[Tuple[int, Tuple[int, ...]]]:
+    return [
+        (band, tuple(signature[band * _ROWS:(band + 1) * _ROWS])) for band in range(LSH_BANDS)
+    ]
+
+
+def requirements_text(requirements: Requirements) -> str:
+    """Text of the requirements an example is found by."""
+    return "\n".join([requirements.description, *requirements.constraints])
+
+
+class ExampleIndex:
+    """
+    Past successful generations indexed by the similarity of their requirements.
+
+    Examples are appended to a JSON lines file shared by the processes; each
+    process loads the lines appended since its last lookup, so the index
+    follows the generations completed elsewhere. Lookups hash the
+    requirements once and only compare the examples sharing an LSH bucket,
+    which keeps them well under a millisecond.
+    """
+
+    def __init__(
+        self,
+        index_dir: Optional[Path] = None,
+        max_examples: int = LLM_EXAMPLE_INDEX_MAX_EXAMPLES,
+    ):
+        """
+        Initialize the index; the examples are loaded on first use.
+
+        Args:
+            index_dir: Directory of the example file
+            max_examples: Number of most recent examples kept
+        """
+        self.path = Path(index_dir or LLM_EXAMPLE_INDEX_DIR) / "examples.jsonl"
+        self.max_examples = max_examples
+        self._lock = threading.Lock()
+        self._examples: "OrderedDict[str, Example]" = OrderedDict()
+        self._buckets: Dict[Tuple[int, Tuple[int, ...]], List[str]] = {}
+        self._file_id: Optional[Tuple[int, int]] = None
+        self._offset = 0
+        self._lines = 0
+
+    @property
+    def example_count(self) -> int:
+        """Number of examples in the index."""
+        return len(self._examples)
+
+    def _insert(self, example: Example) -> None:
+        if example.example_id in self._examples or len(example.signature) != NUM_PERMUTATIONS:
+            return
+        self._examples[example.example_id] = example
+        for key in _bands(example.signature):
+            bucket = self._buckets.setdefault(key, [])
+            bucket.append(example.example_id)
+            if len(bucket) > MAX_BUCKET_SIZE:
+                del bucket[0]
+        while len(self._examples) > self.max_examples:
+            _, evicted = self._examples.popitem(last=False)
+            for key in _bands(evicted.signature):
+                bucket = self._buckets.get(key, [])
+                if evicted.example_id in bucket:
+                    bucket.remove(evicted.example_id)
+                if not bucket:
+                    self._buckets.pop(key, None)
+
+    def _refresh(self) -> None:
+        """Load the examples appended to the file since the last call."""
+        try:
+            stat = self.path.stat()
+        except FileNotFoundError:
+            return
+        file_id = (stat.st_dev, stat.st_ino)
+        if file_id != self._file_id or stat.st_size < self._offset:
+            # The file was compacted by another process
+            self._examples.clear()
+            self._buckets.clear()
+            self._file_id, self._offset, self._lines = file_id, 0, 0
+        if stat.st_size == self._offset:
+            return
+        with open(self.path, "rb") as f:
+            f.seek(self._offset)
+            data = f.read(stat.st_size - self._offset)
+        # A line being appended is read once complete
+        data = data[: data.rfind(b"\n") + 1]
+        self._offset += len(data)
+        for line in data.splitlines():
+            self._lines += 1
+            try:
+                self._insert(Example(**json.loads(line)))
+            except (ValueError, TypeError) as e:
+                logger.warning(f"Skipping invalid example of {self.path}: {str(e)}")
+
+    def _compact(self) -> None:
+        # Rewrites the file with the examples kept, once it holds twice as many
+        tmp_path = self.path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for example in self._examples.values():
+                f.write(json.dumps(asdict(example)) + "\n")
+        os.replace(tmp_path, self.path)
+        stat = self.path.stat()
+        self._file_id = (stat.st_dev, stat.st_ino)
+        self._offset, self._lines = stat.st_size, len(self._examples)
+
+    def add(self, requirements: Requirements, artifacts: Sequence[CodeArtifact]) -> Optional[str]:
+        """
+        Add a generation whose tests passed.
+
+        Args:
+            requirements: Requirements of the generation, without retrieved context
+            artifacts: Generated code
+
+        Returns:
+            The id of the example, or None if the requirements have no terms
+        """
+        text = requirements_text(requirements)
+        signature = minhash(text)
+        if signature is None or not artifacts:
+            return None
+        files = [
+            {"file_path": a.file_path, "language": a.language, "content": a.content}
+            for a in artifacts
+        ]
+        example_id = hashlib.sha256(
+            json.dumps([" ".join(text.split()), files], sort_keys=True).encode("utf-8")
+        ).hexdigest()[:16]
+        example = Example(
+            example_id=example_id,
+            description=requirements.description,
+            artifacts=files,
+            created_at=utc_now(),
+            signature=list(signature),
+        )
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            # The lock is taken on a file of its own, which compaction does not replace
+            with open(self.path.with_suffix(".lock"), "a") as lock:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+                try:
+                    self._refresh()
+                    if example_id in self._examples:
+                        return example_id
+                    with open(self.path, "a", encoding="utf-8") as f:
+                        f.write(json.dumps(asdict(example)) + "\n")
+                    self._refresh()
+                    if self._lines > 2 * self.max_examples:
+                        self._compact()
+                finally:
+                    fcntl.flock(lock, fcntl.LOCK_UN)
+        logger.info(f"Added example {example_id} to the example index")
+        return example_id
+
+    def search(self, requirements: Requirements, top_k: int) -> List[Tuple[Example, float]]:
+        """
+        Find the examples of the most similar requirements.
+
+        Args:
+            requirements: Requirements of the generation
+            top_k: Maximum number of examples
+
+        Returns:
+            The examples with their estimated similarity, the most similar first
+        """
+        signature = minhash(requirements_text(requirements))
+        if signature is None or top_k <= 0:
+            return []
+        with self._lock:
+            self._refresh()
+            collisions: Counter = Counter()
+            for key in _bands(signature):
+                collisions.update(self._buckets.get(key, ()))
+            scored = []
+            for example_id, _ in collisions.most_common(MAX_RERANKED):
+                example = self._examples[example_id]
+                score = similarity(signature, example.signature)
+                if score >= MIN_SIMILARITY:
+                    scored.append((example, score))
+        scored.sort(key=lambda item: -item[1])
+        return scored[:top_k]
+
+    def select(
+        self, requirements: Requirements, top_k: int, token_budget: int, model: str = ""
+    ) -> List[Example]:
+        """
+        Select few-shot examples for requirements within a token budget.
+
+        Examples are taken by decreasing similarity; those that would exceed
+        the budget are skipped.
+
+        Args:
+            requirements: Requirements of the generation
+            top_k: Maximum number of examples
+            token_budget: Maximum tokens of the rendered examples
+            model: Model whose tokenizer counts the tokens
+
+        Returns:
+            The selected examples
+        """
+        selected = []
+        remaining = token_budget
+        for example, _ in self.search(requirements, top_k):
+            tokens = count_tokens(example.render(), model)
+            if tokens <= remaining:
+                selected.append(example)
+                remaining -= tokens
+        return selected
+
+
+_index: Optional[ExampleIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_example_index() -> ExampleIndex:
+    """Get the example index shared by the workflows of the process."""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = ExampleIndex()
+        return _index
@@ -0,0 +1,249 @@
+"""
+Hedged LLM requests: a slow first token triggers a second, racing request.
+"""
+import asyncio
+import logging
+import math
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import replace
+from pathlib import Path
+from typing import AsyncIterator, Deque, Dict, Optional, Tuple
+
+from vulcan.config.llm_client_config import (
+    LLM_HEDGE_INITIAL_DELAY,
+    LLM_HEDGE_MIN_DELAY,
+    LLM_HEDGE_MIN_SAMPLES,
+    LLM_HEDGE_PERCENTILE,
+    LLM_HEDGE_WINDOW,
+)
+from vulcan.infra.interface.llm_agent.llm_client import LLMChunk, LLMClient, LLMRequest
+from vulcan.workflow_engine.metrics import Metrics
+
+
+logger = logging.getLogger(__name__)
+
+
+class LatencyTracker:
+    """Rolling windows of first-token latencies per model deriving the hedging delay."""
+
+    def __init__(
+        self,
+        window: int = LLM_HEDGE_WINDOW,
+        percentile: float = LLM_HEDGE_PERCENTILE,
+        initial_delay: float = LLM_HEDGE_INITIAL_DELAY,
+        min_delay: float = LLM_HEDGE_MIN_DELAY,
+        min_samples: int = LLM_HEDGE_MIN_SAMPLES,
+    ):
+        """
+        Initialize the tracker.
+
+        Args:
+            window: Number of latencies kept per model
+            percentile: Percentile of the latencies used as delay, in percent
+            initial_delay: Delay used until `min_samples` latencies are known, in seconds
+            min_delay: Lower bound of the delay, in seconds
+            min_samples: Number of latencies needed to use the percentile
+        """
+        self.percentile = percentile
+        self.initial_delay = initial_delay
+        self.min_delay = min_delay
+        self.min_samples = min_samples
+        self.window = window
+        self._lock = threading.Lock()
+        self._latencies: Dict[str, Deque[float]] = {}
+
+    def record(self, latency: float, model: str = "") -> None:
+        """Record the first-token latency of a request to a model, in seconds."""
+        with self._lock:
+            self._latencies.setdefault(model, deque(maxlen=self.window)).append(latency)
+
+    def delay(self, model: str = "") -> float:
+        """Get the time to wait for a first token of a model before hedging, in seconds."""
+        with self._lock:
+            latencies = sorted(self._latencies.get(model, ()))
+        if len(latencies) < self.min_samples:
+            return self.initial_delay
+        # Nearest-rank percentile
+        rank = max(1, math.ceil(self.percentile / 100 * len(latencies)))
+        return max(self.min_delay, latencies[rank - 1])
+
+
+async def _first_chunk(stream: AsyncIterator[LLMChunk]) -> Optional[LLMChunk]:
+    try:
+        return await stream.__anext__()
+    except StopAsyncIteration:
+        return None
+
+
+async def _discard(task: asyncio.Task, stream: AsyncIterator[LLMChunk]) -> None:
+    # The generator cannot be closed while the task is running it
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+    await stream.aclose()
+
+
+class HedgedLLMClient(LLMClient):
+    """
+    Client hedging a primary client with a secondary one.
+
+    When the primary has not produced a first chunk within the configured
+    percentile of its recent first-token latencies, the request is also sent
+    to the secondary client, optionally with another model. The first of the
+    two to produce a chunk is streamed and the other one is cancelled, which
+    closes its provider connection; the first chunk names the model of the
+    secondary when it wins. Latencies are tracked per model. Request, hedge
+    and win counts are kept in Prometheus metrics so that the percentile can
+    be tuned.
+    """
+
+    provider = "hedged"
+
+    def __init__(
+        self,
+        primary: LLMClient,
+        secondary: Optional[LLMClient] = None,
+        hedge_model: Optional[str] = None,
+        tracker: Optional[LatencyTracker] = None,
+        metrics_dir: Optional[Path] = None,
+    ):
+        """
+        Initialize the client.
+
+        Args:
+            primary: Client receiving every request
+            secondary: Client receiving the hedged requests; the primary if omitted
+            hedge_model: Model of the hedged requests; the requested model if omitted
+            tracker: First-token latencies of the models
+            metrics_dir: Directory receiving the metric file of the process
+        """
+        self.primary = primary
+        self.secondary = secondary or primary
+        self.hedge_model = hedge_model or None
+        self.tracker = tracker or LatencyTracker()
+        self.metrics = Metrics()
+        self.metrics_dir = metrics_dir
+        self.requests = 0
+        self.hedged = 0
+        self.wins = 0
+
+    @property
+    def hedge_rate(self) -> float:
+        """Fraction of the requests that were hedged."""
+        return self.hedged / self.requests if self.requests else 0.0
+
+    @property
+    def win_rate(self) -> float:
+        """Fraction of the hedged requests answered first by the secondary."""
+        return self.wins / self.hedged if self.hedged else 0.0
+
+    def _record(self, hedged: bool, winner: str) -> None:
+        self.requests += 1
+        self.hedged += hedged
+        self.wins += winner == "secondary"
+        labels = {"provider": self.primary.provider, "pid": str(os.getpid())}
+        self.metrics.inc("vulcan_llm_requests_total", help_text="LLM requests", **labels)
+        if hedged:
+            self.metrics.inc(
+                "vulcan_llm_hedged_requests_total",
+                help_text="LLM requests also sent to the hedge provider",
+                **labels,
+            )
+        if winner == "secondary":
+            self.metrics.inc(
+                "vulcan_llm_hedge_wins_total",
+                help_text="Hedged LLM requests answered first by the hedge provider",
+                **labels,
+            )
+
+    def _write_metrics(self) -> None:
+        try:
+            self.metrics.write(f"llm_hedging-{os.getpid()}", self.metrics_dir)
+        except OSError as e:
+            logger.error(f"Error writing hedging metrics: {str(e)}")
+
+    async def stream(self, request: LLMRequest) -> AsyncIterator[LLMChunk]:
+        """
+        Stream the completion of the first client to respond.
+
+        Args:
+            request: Completion request
+
+        Returns:
+            Async iterator over completion chunks
+        """
+        started = time.monotonic()
+        primary = self.primary.stream(request)
+        primary_task = asyncio.ensure_future(_first_chunk(primary))
+        contenders: Dict[asyncio.Task, Tuple[str, AsyncIterator[LLMChunk]]] = {
+            primary_task: ("primary", primary)
+        }
+        winner_stream = None
+        hedge_request = replace(request, model=self.hedge_model or request.model)
+        hedged_at = started
+        try:
+            done, _ = await asyncio.wait({primary_task}, timeout=self.tracker.delay(request.model))
+            hedged = not done
+            if hedged:
+                hedged_at = time.monotonic()
+                secondary = self.secondary.stream(hedge_request)
+                contenders[asyncio.ensure_future(_first_chunk(secondary))] = ("secondary", secondary)
+                logger.info(
+                    f"Hedging {self.primary.provider} request after {time.monotonic() - started:.1f}s"
+                )
+
+            winner, first, error = None, None, None
+            pending = set(contenders)
+            while pending and winner is None:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                # The primary wins ties
+                for task in sorted(done, key=lambda t: contenders[t][0] != "primary"):
+                    if task.exception() is None:
+                        winner, first = contenders[task][0], task.result()
+                        break
+                    error = error or task.exception()
+            if winner is None:
+                raise error
+
+            now = time.monotonic()
+            # Latency of the primary, or a lower bound of it when it lost: not
+            # recording slow primaries would drift the delay towards fast ones
+            self.tracker.record(now - started, request.model)
+            if winner == "secondary":
+                self.tracker.record(now - hedged_at, hedge_request.model)
+            self._record(hedged, winner)
+            # The metric file is rewritten from a thread, off the event loop
+            await asyncio.to_thread(self._write_metrics)
+
+            for task, (name, stream) in contenders.items():
+                if name == winner:
+                    winner_stream = stream
+                else:
+                    await _discard(task, stream)
+            contenders.clear()
+
+            if first is None:
+                return
+            if hedged:
+                info = {"hedged": "true", "hedge_winner": winner}
+                if winner == "secondary" and self.hedge_model:
+                    info["hedge_model"] = self.hedge_model
+                first = replace(first, additional_info={**first.additional_info, **info})
+                if winner == "secondary":
+                    first = replace(first, model=hedge_request.model)
+            yield first
+            async for chunk in winner_stream:
+                yield chunk
+        finally:
+            for task, (_, stream) in contenders.items():
+                await _discard(task, stream)
+            if winner_stream is not None:
+                await winner_stream.aclose()
+
+    async def aclose(self) -> None:
+        """Release the resources held by both clients."""
+        await self.primary.aclose()
+        if self.secondary is not self.primary:
+            await self.secondary.aclose()
@@ -0,0 +1,81 @@
+"""
+Selection of the LLM client from the `llm.provider` configuration.
+"""
+from functools import lru_cache
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from vulcan.config.llm_client_config import get_llm_config
+from vulcan.infra.interface.llm_agent.dust_client import DustClient
+from vulcan.infra.interface.llm_agent.llm_client import LLMClient
+from vulcan.infra.interface.llm_agent.mock_client import MockLLMClient
+from vulcan.llm_services.services.hedging import HedgedLLMClient
+
+
+# Provider name -> factory building a client from the "llm" configuration
+PROVIDERS: Dict[str, Callable[[Dict[str, Any]], LLMClient]] = {}
+
+# (provider, hedge provider, hedge model) -> hedged client, shared so that
+# first-token latencies accumulate across generations
+_hedged_clients: Dict[Tuple[str, str, str], HedgedLLMClient] = {}
+
+
+def register_provider(name: str, factory: Callable[[Dict[str, Any]], LLMClient]) -> None:
+    """
+    Register an LLM provider.
+
+    Args:
+        name: Provider name used in `llm.provider`
+        factory: Function building a client from the "llm" configuration
+    """
+    PROVIDERS[name] = factory
+
+
+def create_llm_client(config: Optional[Dict[str, Any]] = None) -> LLMClient:
+    """
+    Create the LLM client selected by the configuration.
+
+    With `hedge` enabled, the client is wrapped so that slow requests are
+    also sent to `hedge_provider` (default: the same provider), optionally
+    with `hedge_model`.
+
+    Args:
+        config: The "llm" configuration section
+
+    Returns:
+        The LLM client
+
+    Raises:
+        ValueError: If the provider is not supported
+    """
+    config = {**get_llm_config(), **(config or {})}
+    provider = config["provider"]
+    if provider not in PROVIDERS:
+        raise ValueError(f"Unsupported LLM provider: {provider}")
+    if not config.get("hedge"):
+        return PROVIDERS[provider](config)
+
+    hedge_provider = config.get("hedge_provider") or provider
+    if hedge_provider not in PROVIDERS:
+        raise ValueError(f"Unsupported LLM hedge provider: {hedge_provider}")
+    key = (provider, hedge_provider, config.get("hedge_model") or "")
+    if key not in _hedged_clients:
+        primary = PROVIDERS[provider](config)
+        secondary = PROVIDERS[hedge_provider](config) if hedge_provider != provider else primary
+        _hedged_clients[key] = HedgedLLMClient(primary, secondary, hedge_model=key[2])
+    return _hedged_clients[key]
+
+
+@lru_cache(maxsize=None)
+def _dust_client() -> DustClient:
+    # One client per process, so that generations reuse pooled connections
+    return DustClient()
+
+
+@lru_cache(maxsize=None)
+def _mock_client() -> MockLLMClient:
+    # Shared so that repeated requests draw the successive values of their sequence
+    return MockLLMClient()
+
+
+register_provider("dust", lambda config: _dust_client())
+register_provider("mock", lambda config: _mock_client())
@@ -0,0 +1,149 @@
+"""
+Routing of code generation requests to model tiers by estimated complexity.
+"""
+import logging
+import math
+from dataclasses import dataclass
+from typing import List, Optional, Sequence
+
+from vulcan.core.vulcan_core.models import Requirements
+
+
+logger = logging.getLogger(__name__)
+
+# Words of description counted as one point of complexity
+WORDS_PER_POINT = 40
+
+
+@dataclass
+class ModelTier:
+    """A model and the highest complexity score it is routed."""
+    model: str
+    max_score: float = math.inf
+
+
+@dataclass
+class RoutingDecision:
+    """Model chosen for a request."""
+    model: str
+    tier: int
+    score: float
+
+
+def complexity_score(requirements: Requirements, expected_files: Sequence[str] = ()) -> float:
+    """
+    Estimate the complexity of requirements with cheap local heuristics.
+
+    Args:
+        requirements: User requirements
+        expected_files: Paths of the files to generate, if known
+
+    Returns:
+        The score; a one-line request without constraints scores about 1
+    """
+    words = len(requirements.description.split())
+    return round(
+        1
+        + words / WORDS_PER_POINT
+        + len(requirements.constraints)
+        + 0.5 * len(requirements.examples)
+        + 2 * max(0, len(expected_files) - 1),
+        2,
+    )
+
+
+def parse_tiers(spec: str) -> List[ModelTier]:
+    """
+    Parse model tiers given as "model:max_score" pairs.
+
+    Args:
+        spec: Comma-separated tiers from the smallest model up; the last tier
+            may omit its bound (e.g. "gpt-4o-mini:4,gpt-4o:12,gpt-4")
+
+    Returns:
+        The tiers, the last one unbounded
+
+    Raises:
+        ValueError: If a bound is not a number or the bounds do not increase
+    """
+    tiers = []
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        model, _, bound = item.rpartition(":") if ":" in item else (item, "", "")
+        try:
+            tiers.append(ModelTier(model=model, max_score=float(bound) if bound else math.inf))
+        except ValueError:
+            raise ValueError(f"Invalid bound of model tier {item!r}") from None
+    if tiers:
+        tiers[-1].max_score = math.inf
+    if any(a.max_score >= b.max_score for a, b in zip(tiers, tiers[1:])):
+        raise ValueError(f"Model tier bounds must increase: {spec}")
+    return tiers
+
+
+class ModelRouter:
+    """
+    Routes each request to the smallest model tier whose bound covers its
+    complexity score, and escalates to the next tier on demand.
+    """
+
+    def __init__(self, tiers: List[ModelTier]):
+        """
+        Initialize the router.
+
+        Args:
+            tiers: Model tiers from the smallest model up
+        """
+        if not tiers:
+            raise ValueError("At least one model tier is required")
+        self.tiers = tiers
+
+    @classmethod
+    def from_spec(cls, spec: str) -> Optional["ModelRouter"]:
+        """
+        Create a router from a tier specification.
+
+        Args:
+            spec: Tiers in the format of `parse_tiers`
+
+        Returns:
+            The router, or None if the specification is empty
+        """
+        tiers = parse_tiers(spec)
+        return cls(tiers) if tiers else None
+
+    def route(
+        self, requirements: Requirements, expected_files: Sequence[str] = ()
+    ) -> RoutingDecision:
+        """
+        Choose the model of a request.
+
+        Args:
+            requirements: User requirements
+            expected_files: Paths of the files to generate, if known
+
+        Returns:
+            The routing decision
+        """
+        score = complexity_score(requirements, expected_files)
+        for index, tier in enumerate(self.tiers):
+            if score <= tier.max_score:
+                logger.info(f"Routing request of complexity {score} to {tier.model}")
+                return RoutingDecision(model=tier.model, tier=index, score=score)
+        # Unreachable: the last tier is unbounded
+        return RoutingDecision(model=self.tiers[-1].model, tier=len(self.tiers) - 1, score=score)
+
+    def escalate(self, decision: RoutingDecision) -> Optional[RoutingDecision]:
+        """
+        Move a request to the next larger model.
+
+        Args:
+            decision: Current routing decision
+
+        Returns:
+            The decision for the next tier, or None if the model is the largest
+        """
+        if decision.tier + 1 >= len(self.tiers):
+            return None
+        tier = decision.tier + 1
+        logger.info(f"Escalating request from {decision.model} to {self.tiers[tier].model}")
+        return RoutingDecision(model=self.tiers[tier].model, tier=tier, score=decision.score)
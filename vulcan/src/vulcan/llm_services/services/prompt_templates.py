@@ -0,0 +1,79 @@
+"""
+Versioned prompt templates laid out for the prompt caches of the providers.
+
+Providers reuse the computation of the longest prompt prefix they have
+already processed, so the prompts are assembled from the most stable part
+to the most volatile one: system prompt, instructions, repository context,
+then the requirements and the files of the request.
+"""
+import hashlib
+from dataclasses import dataclass, field
+from typing import Dict, Sequence, Tuple
+
+
+@dataclass(frozen=True)
+class PromptSection:
+    """A section of a prompt, rendered under its title unless empty."""
+    name: str
+    title: str = ""
+
+
+@dataclass(frozen=True)
+class PromptTemplate:
+    """
+    Prompt made of fixed instructions followed by sections.
+
+    Sections are declared from the most stable (shared by many requests) to
+    the most volatile one and empty sections are left out, so requests
+    sharing their first sections share a prompt prefix. The headings are
+    compiled once; `key` identifies the template in cache keys and covers
+    its content as well as its version, so that editing a template
+    invalidates the responses cached for it.
+    """
+    name: str
+    version: int
+    system: str
+    instructions: str
+    sections: Tuple[PromptSection, ...] = ()
+    key: str = field(init=False, compare=False)
+    _headings: Dict[str, str] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        headings = {
+            section.name: f"{section.title}:\n" if section.title else ""
+            for section in self.sections
+        }
+        content = "\0".join(
+            [self.system, self.instructions, *(f"{name}\0{heading}" for name, heading in headings.items())]
+        )
+        digest = hashlib.sha256(content.encode("utf-8")).hexdigest()[:12]
+        object.__setattr__(self, "_headings", headings)
+        object.__setattr__(self, "key", f"{self.name}-v{self.version}-{digest}")
+
+    def render(self, **sections: str) -> str:
+        """
+        Render the prompt.
+
+        Args:
+            **sections: Text of the sections by name; missing or empty
+                sections are left out
+
+        Returns:
+            The prompt
+
+        Raises:
+            ValueError: If a section is not declared by the template
+        """
+        unknown = sorted(set(sections) - set(self._headings))
+        if unknown:
+            raise ValueError(f"Unknown sections of the {self.name} prompt: {', '.join(unknown)}")
+        parts = [self.instructions]
+        for name, heading in self._headings.items():
+            if sections.get(name):
+                parts.append(heading + sections[name])
+        return "\n\n".join(parts)
+
+
+def bullet_list(items: Sequence[str]) -> str:
+    """Render items as a Markdown list."""
+    return "\n".join(f"- {item}" for item in items)
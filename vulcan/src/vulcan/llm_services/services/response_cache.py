@@ -0,0 +1,330 @@
+"""
+Two-level cache of LLM responses with coalescing of identical requests.
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, Optional, Sequence, Tuple
+
+from vulcan.config.llm_client_config import (
+    LLM_CACHE_DIR,
+    LLM_CACHE_DISK_MB,
+    LLM_CACHE_MEMORY_ENTRIES,
+    LLM_CACHE_TTL,
+)
+from vulcan.core.vulcan_core.models import Requirements
+from vulcan.infra.interface.llm_agent.llm_client import LLMResponse, LLMUsage
+
+
+logger = logging.getLogger(__name__)
+
+# The size of the disk level is tracked from the writes of the process and
+# measured again every DISK_RESCAN_INTERVAL writes, to count other processes
+DISK_RESCAN_INTERVAL = 100
+
+
+def normalize_text(text: str) -> str:
+    """Collapse runs of whitespace and strip the ends of a text."""
+    return " ".join(text.split())
+
+
+def normalize_requirements(requirements: Requirements) -> Dict[str, object]:
+    """
+    Normalize requirements so that formatting-only differences share a key.
+
+    Args:
+        requirements: User requirements
+
+    Returns:
+        JSON-compatible normalized requirements
+    """
+    normalized: Dict[str, object] = {
+        "description": normalize_text(requirements.description),
+        "constraints": [c for c in map(normalize_text, requirements.constraints) if c],
+        "examples": [e for e in map(normalize_text, requirements.examples) if e],
+    }
+    if requirements.context:
+        # Code is whitespace-sensitive and kept as is
+        normalized["context"] = list(requirements.context)
+    if requirements.few_shot:
+        normalized["few_shot"] = list(requirements.few_shot)
+    return normalized
+
+
+def cache_key(
+    requirements: Requirements,
+    model: str,
+    temperature: float,
+    template_version: str,
+    expected_files: Sequence[str] = (),
+    plan: str = "",
+) -> str:
+    """
+    Compute the cache key of a code generation.
+
+    Args:
+        requirements: User requirements
+        model: Model the completion is requested from
+        temperature: Sampling temperature
+        template_version: Version of the prompt template
+        expected_files: Paths of the files requested in the prompt
+        plan: File plan shared by the generations of a multi-file request
+
+    Returns:
+        Hex digest identifying the generation
+    """
+    data = {
+        "requirements": normalize_requirements(requirements),
+        "model": model,
+        "temperature": temperature,
+        "template_version": template_version,
+    }
+    if expected_files:
+        data["expected_files"] = list(expected_files)
+    if plan:
+        data["plan"] = plan
+    return hashlib.sha256(json.dumps(data, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def _response_to_dict(response: LLMResponse) -> Dict[str, object]:
+    return asdict(response)
+
+
+def _response_from_dict(data: Dict[str, object]) -> LLMResponse:
+    return LLMResponse(**{**data, "usage": LLMUsage(**data["usage"])})
+
+
+class ResponseCache:
+    """
+    LLM responses cached in memory and on disk.
+
+    The memory level is a per-process LRU; the disk level is one JSON file
+    per key, shared by the API and the workers. Entries expire after `ttl`
+    seconds, and the least recently written files are evicted once the disk
+    level exceeds `max_disk_bytes`; its size is tracked in memory, so the
+    directory is only scanned when the limit is reached or every
+    `DISK_RESCAN_INTERVAL` writes. Identical requests running at the same
+    time in a process share a single LLM call.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[Path] = None,
+        ttl: float = LLM_CACHE_TTL,
+        max_memory_entries: int = LLM_CACHE_MEMORY_ENTRIES,
+        max_disk_bytes: int = LLM_CACHE_DISK_MB * 1024 * 1024,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir: Directory of the disk level
+            ttl: Lifetime of an entry, in seconds
+            max_memory_entries: Maximum number of entries kept in memory
+            max_disk_bytes: Maximum size of the disk level, in bytes
+        """
+        self.cache_dir = Path(cache_dir or LLM_CACHE_DIR)
+        self.ttl = ttl
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_bytes = max_disk_bytes
+        self._lock = threading.Lock()
+        self._memory: "OrderedDict[str, Tuple[float, LLMResponse]]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._waiters: Dict[str, int] = {}
+        self._disk_bytes: Optional[int] = None
+        self._puts_since_scan = 0
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def _remember(self, key: str, expires_at: float, response: LLMResponse) -> None:
+        with self._lock:
+            self._memory[key] = (expires_at, response)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_memory_entries:
+                self._memory.popitem(last=False)
+
+    def _get_memory(self, key: str, now: float) -> Optional[LLMResponse]:
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= now:
+                del self._memory[key]
+                return None
+            self._memory.move_to_end(key)
+            return entry[1]
+
+    def get(self, key: str) -> Tuple[Optional[LLMResponse], Optional[str]]:
+        """
+        Look a response up, memory first.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            The response and the level it was found in ("memory" or "disk"),
+            or (None, None) on a miss
+        """
+        now = time.time()
+        response = self._get_memory(key, now)
+        if response is not None:
+            return response, "memory"
+
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data["expires_at"] <= now:
+                path.unlink(missing_ok=True)
+                return None, None
+            response = _response_from_dict(data["response"])
+        except FileNotFoundError:
+            return None, None
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Ignoring unreadable cache entry {path}: {str(e)}")
+            return None, None
+
+        self._remember(key, data["expires_at"], response)
+        return response, "disk"
+
+    def put(self, key: str, response: LLMResponse) -> None:
+        """
+        Store a response in both levels.
+
+        Args:
+            key: Cache key
+            response: Response to store
+        """
+        expires_at = time.time() + self.ttl
+        self._remember(key, expires_at, response)
+
+        path = self._path(key)
+        tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"expires_at": expires_at, "response": _response_to_dict(response)}, f)
+            size = tmp_path.stat().st_size
+            try:
+                size -= path.stat().st_size
+            except FileNotFoundError:
+                pass
+            os.replace(tmp_path, path)
+            with self._lock:
+                self._puts_since_scan += 1
+                if self._disk_bytes is not None:
+                    self._disk_bytes += size
+                rescan = (
+                    self._disk_bytes is None
+                    or self._disk_bytes > self.max_disk_bytes
+                    or self._puts_since_scan >= DISK_RESCAN_INTERVAL
+                )
+            if rescan:
+                self._evict_disk()
+        except OSError as e:
+            logger.error(f"Error writing cache entry {path}: {str(e)}")
+
+    def _evict_disk(self) -> None:
+        entries = []
+        total = 0
+        for path in self.cache_dir.glob("*/*.json"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+        if total <= self.max_disk_bytes:
+            self._set_disk_bytes(total)
+            return
+
+        # Files are written once, so the oldest mtime is the closest to expiry
+        entries.sort()
+        evicted = 0
+        for _, size, path in entries:
+            if total <= self.max_disk_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            evicted += 1
+        self._set_disk_bytes(total)
+        logger.info(f"Evicted {evicted} LLM cache entries")
+
+    def _set_disk_bytes(self, total: int) -> None:
+        with self._lock:
+            self._disk_bytes = total
+            self._puts_since_scan = 0
+
+    async def get_or_compute(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[LLMResponse]],
+        cacheable: Optional[Callable[[LLMResponse], bool]] = None,
+    ) -> Tuple[LLMResponse, Optional[str]]:
+        """
+        Get a cached response, or compute it once for all concurrent callers.
+
+        The computation runs in its own task: it is cancelled only when every
+        caller waiting for it was cancelled.
+
+        Args:
+            key: Cache key
+            compute: Coroutine function producing the response on a miss
+            cacheable: Predicate deciding whether a computed response is stored
+
+        Returns:
+            The response and where it came from ("memory", "disk",
+            "coalesced"), or None as source if it was computed for this caller
+        """
+        response = self._get_memory(key, time.time())
+        if response is not None:
+            return response, "memory"
+
+        # Join the lookup in flight, if any, before touching the disk
+        task = self._inflight.get(key)
+        leader = task is None
+        if leader:
+            task = asyncio.ensure_future(self._lookup_or_compute(key, compute, cacheable))
+            self._inflight[key] = task
+
+        self._waiters[key] = self._waiters.get(key, 0) + 1
+        try:
+            response, level = await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if self._waiters.get(key) == 1 and not task.done():
+                task.cancel()
+            raise
+        finally:
+            self._waiters[key] -= 1
+            if not self._waiters[key]:
+                del self._waiters[key]
+        return response, level or (None if leader else "coalesced")
+
+    async def _lookup_or_compute(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[LLMResponse]],
+        cacheable: Optional[Callable[[LLMResponse], bool]],
+    ) -> Tuple[LLMResponse, Optional[str]]:
+        try:
+            response, level = await asyncio.to_thread(self.get, key)
+            if response is not None:
+                return response, level
+            response = await compute()
+            if cacheable is None or cacheable(response):
+                await asyncio.to_thread(self.put, key, response)
+            return response, None
+        finally:
+            self._inflight.pop(key, None)
+
+
+# Cache of the current process
+response_cache = ResponseCache()
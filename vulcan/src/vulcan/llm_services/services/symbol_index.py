@@ -0,0 +1,530 @@
+"""
+Symbol index of the Python code of a repository checkout: definitions with
+their signatures, imports and call references, kept per commit.
+"""
+import ast
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from vulcan.config.llm_client_config import (
+    LLM_RETRIEVAL_INDEX_WORKERS,
+    LLM_RETRIEVAL_MAX_FILE_KB,
+    LLM_SYMBOL_INDEX_DIR,
+    LLM_SYMBOL_INDEX_SNAPSHOTS,
+)
+from vulcan.llm_services.services import code_index
+from vulcan.llm_services.services.code_index import walk_files
+
+
+logger = logging.getLogger(__name__)
+
+PYTHON_EXTENSIONS = {".py", ".pyi"}
+# Bumped when the snapshot format changes, invalidating the stored snapshots
+SNAPSHOT_VERSION = 1
+
+_IDENTIFIER_PATTERN = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+
+
+@dataclass
+class Symbol:
+    """A class, function, method or constant defined in a module."""
+    name: str
+    qualname: str
+    kind: str
+    path: str
+    line: int
+    signature: str
+    decorators: List[str] = field(default_factory=list)
+    summary: str = ""
+
+
+@dataclass
+class FileSymbols:
+    """Symbols, imports and call references of a Python file."""
+    path: str
+    symbols: List[Symbol] = field(default_factory=list)
+    # Imported modules and module.name of imported names, absolute
+    imports: List[str] = field(default_factory=list)
+    # Names of the functions and methods called
+    calls: List[str] = field(default_factory=list)
+    # (mtime in ns, size) of the parsed file
+    signature: Optional[Tuple[int, int]] = None
+
+
+def module_name(path: str) -> str:
+    """
+    Get the dotted module name of a Python file.
+
+    A leading "src/" directory is left out, as in the src layout.
+
+    Args:
+        path: Path relative to the repository
+
+    Returns:
+        The module name
+    """
+    module = re.sub(r"\.pyi?$", "", path)
+    if module.startswith("src/"):
+        module = module[len("src/"):]
+    module = module.replace("/", ".")
+    return module[: -len(".__init__")] if module.endswith(".__init__") else module
+
+
+def _signature(node: ast.AST) -> str:
+    if isinstance(node, ast.ClassDef):
+        bases = [ast.unparse(base) for base in node.bases]
+        bases += [ast.unparse(keyword) for keyword in node.keywords]
+        return f"class {node.name}({', '.join(bases)})" if bases else f"class {node.name}"
+    prefix = "async def" if isinstance(node, ast.AsyncFunctionDef) else "def"
+    returns = f" -> {ast.unparse(node.returns)}" if node.returns else ""
+    return f"{prefix} {node.name}({ast.unparse(node.args)}){returns}"
+
+
+def _summary(node: ast.AST) -> str:
+    docstring = ast.get_docstring(node) or ""
+    return docstring.strip().splitlines()[0] if docstring.strip() else ""
+
+
+def _definition(node: ast.AST, path: str, qualname: str, kind: str) -> Symbol:
+    return Symbol(
+        name=node.name,
+        qualname=qualname,
+        kind=kind,
+        path=path,
+        line=node.lineno,
+        signature=_signature(node),
+        decorators=[ast.unparse(decorator) for decorator in node.decorator_list],
+        summary=_summary(node),
+    )
+
+
+def parse_symbols(path: str, source: str) -> FileSymbols:
+    """
+    Extract the symbols, imports and calls of a Python file.
+
+    Args:
+        path: Path relative to the repository
+        source: File content
+
+    Returns:
+        The symbols of the file; none if it does not parse
+    """
+    result = FileSymbols(path=path)
+    try:
+        tree = ast.parse(source)
+    except (SyntaxError, ValueError):
+        return result
+
+    functions = (ast.FunctionDef, ast.AsyncFunctionDef)
+    for node in tree.body:
+        if isinstance(node, functions):
+            result.symbols.append(_definition(node, path, node.name, "function"))
+        elif isinstance(node, ast.ClassDef):
+            result.symbols.append(_definition(node, path, node.name, "class"))
+            for member in node.body:
+                if isinstance(member, functions):
+                    qualname = f"{node.name}.{member.name}"
+                    result.symbols.append(_definition(member, path, qualname, "method"))
+        elif isinstance(node, (ast.Assign, ast.AnnAssign)):
+            targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+            for target in targets:
+                if isinstance(target, ast.Name) and target.id.isupper():
+                    result.symbols.append(Symbol(
+                        name=target.id,
+                        qualname=target.id,
+                        kind="constant",
+                        path=path,
+                        line=node.lineno,
+                        signature=ast.unparse(node).splitlines()[0][:120],
+                    ))
+
+    package = module_name(path).split(".")
+    if not path.endswith("__init__.py"):
+        package = package[:-1]
+    imports: Set[str] = set()
+    calls: Set[str] = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            imports.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            base = package[: len(package) - node.level + 1] if node.level else []
+            module = ".".join(base + ([node.module] if node.module else []))
+            imports.update(f"{module}.{alias.name}" for alias in node.names if alias.name != "*")
+        elif isinstance(node, ast.Call):
+            if isinstance(node.func, ast.Name):
+                calls.add(node.func.id)
+            elif isinstance(node.func, ast.Attribute):
+                calls.add(node.func.attr)
+    result.imports = sorted(imports)
+    result.calls = sorted(calls)
+    return result
+
+
+def _parse_files(root: str, paths: Sequence[str]) -> List[FileSymbols]:
+    # Runs in the pool processes: parses a batch of files
+    parsed = []
+    for path in paths:
+        full_path = os.path.join(root, path)
+        try:
+            with open(full_path, encoding="utf-8") as file:
+                source = file.read()
+            stat = os.stat(full_path)
+        except (OSError, UnicodeDecodeError):
+            continue
+        file_symbols = parse_symbols(path, source)
+        file_symbols.signature = (stat.st_mtime_ns, stat.st_size)
+        parsed.append(file_symbols)
+    return parsed
+
+
+def render_stubs(symbols: Sequence[Symbol]) -> str:
+    """
+    Render symbols as Python stubs, grouped by file and class.
+
+    Args:
+        symbols: Symbols to render
+
+    Returns:
+        The stubs
+    """
+    by_path: Dict[str, List[Symbol]] = defaultdict(list)
+    for symbol in symbols:
+        by_path[symbol.path].append(symbol)
+
+    blocks = []
+    for path, path_symbols in by_path.items():
+        lines = [f"# {path}"]
+        classes = {s.name for s in path_symbols if s.kind == "class"}
+        current_class = None
+        for symbol in sorted(path_symbols, key=lambda s: s.line):
+            owner = symbol.qualname.split(".")[0] if symbol.kind == "method" else None
+            if owner is not None and owner != current_class and owner not in classes:
+                lines.append(f"class {owner}:")
+            current_class = symbol.name if symbol.kind == "class" else owner
+            indent = "    " if owner else ""
+            lines.extend(f"{indent}@{decorator}" for decorator in symbol.decorators)
+            if symbol.kind == "constant":
+                lines.append(symbol.signature)
+                continue
+            comment = f"  # {symbol.summary}" if symbol.summary else ""
+            body = "" if symbol.kind == "class" else " ..."
+            lines.append(f"{indent}{symbol.signature}:{body}{comment}")
+        blocks.append("\n".join(lines))
+    return "\n\n".join(blocks)
+
+
+class SymbolIndex:
+    """
+    Symbol index of the Python files of a repository checkout.
+
+    The index is stored per commit, so that a checkout indexed before is
+    loaded instead of parsed, and a new commit only re-parses the files
+    changed since the indexed one.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        index_dir: Path = LLM_SYMBOL_INDEX_DIR,
+        snapshots: int = LLM_SYMBOL_INDEX_SNAPSHOTS,
+        max_file_kb: int = LLM_RETRIEVAL_MAX_FILE_KB,
+        workers: int = LLM_RETRIEVAL_INDEX_WORKERS,
+    ):
+        """
+        Initialize an empty index; see load() and update().
+
+        Args:
+            root: Root directory of the checkout
+            index_dir: Directory in which the snapshots of the index are stored
+            snapshots: Snapshots kept per checkout, the most recent ones
+            max_file_kb: Larger files are not indexed, in kilobytes
+            workers: Processes parsing the files (0: one per CPU)
+        """
+        self.root = Path(root)
+        key = hashlib.sha256(str(self.root.resolve()).encode("utf-8")).hexdigest()[:16]
+        self.snapshot_dir = Path(index_dir) / key
+        self.snapshots = snapshots
+        self.max_bytes = max_file_kb * 1024
+        self.workers = workers or os.cpu_count() or 1
+        self.commit_sha: Optional[str] = None
+        # Updates parse under _update_lock; readers only wait for the swap
+        self._lock = threading.RLock()
+        self._update_lock = threading.Lock()
+        self._files: Dict[str, FileSymbols] = {}
+        self._definitions: Dict[str, List[Symbol]] = defaultdict(list)
+        self._callers: Dict[str, Set[str]] = defaultdict(set)
+        self._modules: Dict[str, str] = {}
+
+    @property
+    def file_count(self) -> int:
+        """Number of indexed files."""
+        return len(self._files)
+
+    def _add(self, file_symbols: FileSymbols) -> None:
+        self._files[file_symbols.path] = file_symbols
+        self._modules[module_name(file_symbols.path)] = file_symbols.path
+        for symbol in file_symbols.symbols:
+            self._definitions[symbol.name].append(symbol)
+        for name in file_symbols.calls:
+            self._callers[name].add(file_symbols.path)
+
+    def _remove(self, path: str) -> None:
+        file_symbols = self._files.pop(path)
+        self._modules.pop(module_name(path), None)
+        for symbol in file_symbols.symbols:
+            remaining = [s for s in self._definitions[symbol.name] if s.path != path]
+            if remaining:
+                self._definitions[symbol.name] = remaining
+            else:
+                del self._definitions[symbol.name]
+        for name in file_symbols.calls:
+            self._callers[name].discard(path)
+            if not self._callers[name]:
+                del self._callers[name]
+
+    def _parse(self, paths: List[str]) -> List[FileSymbols]:
+        if len(paths) < code_index.POOL_MIN_FILES or self.workers == 1:
+            return _parse_files(str(self.root), paths)
+        size = code_index.POOL_BATCH_FILES
+        batches = [paths[index:index + size] for index in range(0, len(paths), size)]
+        with ProcessPoolExecutor(max_workers=min(self.workers, len(batches))) as pool:
+            results = pool.map(_parse_files, [str(self.root)] * len(batches), batches)
+            return [file_symbols for result in results for file_symbols in result]
+
+    def _snapshot_path(self, commit_sha: str) -> Path:
+        return self.snapshot_dir / f"{commit_sha}.json"
+
+    def _stored_snapshots(self) -> List[Path]:
+        # Most recent first; other processes may delete snapshots meanwhile
+        stored = []
+        for path in self.snapshot_dir.glob("*.json"):
+            try:
+                stored.append((path.stat().st_mtime, path))
+            except FileNotFoundError:
+                continue
+        return [path for _, path in sorted(stored, reverse=True)]
+
+    def _read_snapshot(self, path: Path) -> bool:
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return False
+        if data.get("version") != SNAPSHOT_VERSION:
+            return False
+        self._files.clear()
+        self._definitions.clear()
+        self._callers.clear()
+        self._modules.clear()
+        for item in data["files"]:
+            symbols = [Symbol(**symbol) for symbol in item.pop("symbols")]
+            signature = tuple(item.pop("signature")) if item.get("signature") else None
+            self._add(FileSymbols(symbols=symbols, signature=signature, **item))
+        self.commit_sha = data["commit_sha"]
+        return True
+
+    def _write_snapshot(self) -> None:
+        with self._lock:
+            data = {
+                "version": SNAPSHOT_VERSION,
+                "commit_sha": self.commit_sha,
+                "files": [asdict(file_symbols) for file_symbols in self._files.values()],
+            }
+        self.snapshot_dir.mkdir(parents=True, exist_ok=True)
+        path = self._snapshot_path(self.commit_sha)
+        # Unique per writer, as processes sharing the checkout store the same commit
+        temporary = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        temporary.write_text(json.dumps(data), encoding="utf-8")
+        os.replace(temporary, path)
+        for old in self._stored_snapshots()[self.snapshots:]:
+            old.unlink(missing_ok=True)
+
+    def load(self, commit_sha: Optional[str] = None) -> bool:
+        """
+        Load the stored snapshot of a commit.
+
+        An empty index loads the most recent snapshot of the checkout instead
+        if the commit has none, so that update() only re-parses the files
+        changed since.
+
+        Blocking; run it in a thread from async code.
+
+        Args:
+            commit_sha: Commit checked out; None if the checkout is no git repository
+
+        Returns:
+            Whether the index is now that of the commit
+        """
+        with self._update_lock, self._lock:
+            if commit_sha is not None and commit_sha == self.commit_sha:
+                return True
+            if commit_sha is not None and self._read_snapshot(self._snapshot_path(commit_sha)):
+                return True
+            if not self._files and self.snapshot_dir.is_dir():
+                for path in self._stored_snapshots():
+                    if self._read_snapshot(path):
+                        break
+            return False
+
+    def update(
+        self, commit_sha: Optional[str] = None, changed: Optional[Iterable[str]] = None
+    ) -> Tuple[int, int]:
+        """
+        Bring the index in line with the checkout and store its snapshot.
+
+        Blocking; run it in a thread from async code.
+
+        Args:
+            commit_sha: Commit checked out; None if the checkout is no git repository
+            changed: Paths changed since the indexed commit, e.g. from git diff;
+                found from file modification times and sizes if omitted or if
+                the index is empty
+
+        Returns:
+            The number of files parsed and removed
+        """
+        with self._update_lock:
+            # Only this update changes the files meanwhile, so they are read
+            # and parsed without blocking the readers
+            if commit_sha is not None and commit_sha == self.commit_sha:
+                return 0, 0
+            if changed is not None and self._files:
+                candidates = sorted({p for p in changed if os.path.splitext(p)[1] in PYTHON_EXTENSIONS})
+                present = [p for p in candidates if (self.root / p).is_file()]
+                removed = [p for p in candidates if p not in present and p in self._files]
+            else:
+                files = dict(walk_files(str(self.root), PYTHON_EXTENSIONS, self.max_bytes))
+                present = sorted(
+                    path for path, signature in files.items()
+                    if path not in self._files or self._files[path].signature != signature
+                )
+                removed = [path for path in self._files if path not in files]
+
+            parsed = self._parse(present)
+            with self._lock:
+                for path in removed + present:
+                    if path in self._files:
+                        self._remove(path)
+                for file_symbols in parsed:
+                    self._add(file_symbols)
+                self.commit_sha = commit_sha
+            if commit_sha is not None:
+                self._write_snapshot()
+        logger.info(
+            f"Parsed {len(parsed)} Python files of {self.root}, removed {len(removed)}: "
+            f"{len(self._files)} files indexed at {commit_sha or 'working tree'}"
+        )
+        return len(parsed), len(removed)
+
+    def lookup(self, name: str) -> List[Symbol]:
+        """
+        Find the definitions of a name.
+
+        Args:
+            name: Name of a class, function, method or constant
+
+        Returns:
+            The symbols defined with that name
+        """
+        with self._lock:
+            return list(self._definitions.get(name, ()))
+
+    def callers(self, name: str) -> List[str]:
+        """
+        Find the files calling a function or method.
+
+        Args:
+            name: Name of the function or method
+
+        Returns:
+            Paths of the files with a call to that name
+        """
+        with self._lock:
+            return sorted(self._callers.get(name, ()))
+
+    def symbols_of(self, path: str) -> List[Symbol]:
+        """
+        Get the symbols defined in a file.
+
+        Args:
+            path: Path relative to the repository
+
+        Returns:
+            The symbols; none if the file is not indexed
+        """
+        with self._lock:
+            file_symbols = self._files.get(path)
+            return list(file_symbols.symbols) if file_symbols else []
+
+    def relevant(self, text: str, paths: Sequence[str] = (), limit: int = 40) -> List[Symbol]:
+        """
+        Select the symbols generated code is likely to touch.
+
+        These are the symbols of the given files, those the files import
+        from the repository, and those named in the text; classes come with
+        their methods.
+
+        Args:
+            text: Requirements naming symbols
+            paths: Files to be generated or changed
+            limit: Maximum number of symbols
+
+        Returns:
+            The symbols, the most specific first
+        """
+        with self._lock:
+            selected: Dict[Tuple[str, str], Symbol] = {}
+
+            def add(symbols: Iterable[Symbol]) -> None:
+                for symbol in symbols:
+                    selected.setdefault((symbol.path, symbol.qualname), symbol)
+                    if symbol.kind == "class":
+                        for member in self._files[symbol.path].symbols:
+                            if member.qualname.startswith(f"{symbol.name}."):
+                                selected.setdefault((member.path, member.qualname), member)
+
+            for path in paths:
+                if path not in self._files:
+                    continue
+                add(symbol for symbol in self._files[path].symbols if symbol.kind != "method")
+                for imported in self._files[path].imports:
+                    module, _, name = imported.rpartition(".")
+                    if module in self._modules:
+                        add(s for s in self._files[self._modules[module]].symbols if s.name == name)
+            for name in dict.fromkeys(_IDENTIFIER_PATTERN.findall(text)):
+                if len(name) < 3:
+                    continue
+                add(s for s in self._definitions.get(name, ()) if s.kind != "method")
+            return list(selected.values())[:limit]
+
+
+_indexes: Dict[Path, SymbolIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_symbol_index(root: Path) -> SymbolIndex:
+    """
+    Get the symbol index of a checkout, shared by the workflows of the process.
+
+    The index is created empty on first use; call load() and update() before
+    looking symbols up.
+
+    Args:
+        root: Root directory of the checkout
+
+    Returns:
+        The index
+    """
+    root = Path(root).resolve()
+    with _indexes_lock:
+        if root not in _indexes:
+            _indexes[root] = SymbolIndex(root)
+        return _indexes[root]
@@ -0,0 +1,257 @@
+"""
+Token counting and budgeting of code generation prompts.
+"""
+import logging
+import math
+import re
+from dataclasses import dataclass, field, replace
+from functools import lru_cache
+from typing import Any, Callable, Dict, Optional, Sequence
+
+from vulcan.config.llm_client_config import (
+    LLM_CONTEXT_WINDOW,
+    LLM_MAX_TOKENS,
+    LLM_MIN_OUTPUT_TOKENS,
+    LLM_OUTPUT_TOKENS_PER_FILE,
+)
+from vulcan.core.vulcan_core.models import Requirements
+
+
+logger = logging.getLogger(__name__)
+
+# Context windows of known models, matched by the longest prefix of the model name
+MODEL_CONTEXT_WINDOWS = {
+    "gpt-3.5-turbo": 16385,
+    "gpt-4": 8192,
+    "gpt-4-32k": 32768,
+    "gpt-4-turbo": 128000,
+    "gpt-4o": 128000,
+    "gpt-4.1": 1047576,
+    "o1": 200000,
+    "o3": 200000,
+    "claude": 200000,
+    "mistral-large": 128000,
+}
+DEFAULT_CONTEXT_WINDOW = 8192
+
+# Sections of the requirements trimmed to fit a budget, the least important first
+TRIM_ORDER = ("few_shot", "context", "examples", "constraints")
+
+# Approximation of a BPE tokenizer: words split in chunks of 4 characters,
+# other characters one token each
+_WORD_PATTERN = re.compile(r"\w+|[^\w\s]")
+
+
+def context_window(model: str) -> int:
+    """
+    Get the context window of a model.
+
+    Args:
+        model: Model name
+
+    Returns:
+        The number of tokens of the context window
+    """
+    prefixes = [prefix for prefix in MODEL_CONTEXT_WINDOWS if model.startswith(prefix)]
+    return MODEL_CONTEXT_WINDOWS[max(prefixes, key=len)] if prefixes else DEFAULT_CONTEXT_WINDOW
+
+
+@lru_cache(maxsize=None)
+def _encoding(model: str) -> Any:
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("cl100k_base")
+
+
+@lru_cache(maxsize=4096)
+def count_tokens(text: str, model: str = "") -> int:
+    """
+    Count the tokens of a text.
+
+    The tokenizer of the model is used when `tiktoken` is installed;
+    otherwise the count is a slight overestimate. Counts are cached, as the
+    same constraints and examples recur across prompts.
+
+    Args:
+        text: Text to count
+        model: Model whose tokenizer is used
+
+    Returns:
+        The number of tokens
+    """
+    encoding = _encoding(model)
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    return sum(math.ceil(len(piece) / 4) for piece in _WORD_PATTERN.findall(text))
+
+
+def truncate_tokens(text: str, max_tokens: int, model: str = "") -> str:
+    """
+    Cut a text to a number of tokens, at a word boundary.
+
+    Args:
+        text: Text to cut
+        max_tokens: Maximum number of tokens
+        model: Model whose tokenizer is used
+
+    Returns:
+        The longest prefix of whole words within the budget
+    """
+    words = text.split(" ")
+    low, high = 0, len(words)
+    while low < high:
+        middle = (low + high + 1) // 2
+        if count_tokens(" ".join(words[:middle]), model) <= max_tokens:
+            low = middle
+        else:
+            high = middle - 1
+    return " ".join(words[:low])
+
+
+@dataclass
+class PromptBudget:
+    """Requirements fitted to the token budget of a model."""
+    requirements: Requirements
+    prompt_tokens: int
+    max_tokens: int
+    dropped: Dict[str, int] = field(default_factory=dict)
+    truncated: bool = False
+
+
+class TokenBudgeter:
+    """
+    Fits prompts into the context window of a model.
+
+    The completion of a request is reserved a number of tokens derived from
+    the files it is expected to produce, bounded by the configured ceiling.
+    The prompt gets the rest of the context window: when it does not fit,
+    the few-shot examples, the retrieved context, the examples and then the
+    constraints are dropped from the last one, and as a last resort the
+    description is truncated. Sizes are measured on the rendered prompt,
+    with its separators and section headings.
+    """
+
+    def __init__(
+        self,
+        model: str,
+        window: Optional[int] = None,
+        max_output_tokens: int = LLM_MAX_TOKENS,
+        output_tokens_per_file: int = LLM_OUTPUT_TOKENS_PER_FILE,
+        min_output_tokens: int = LLM_MIN_OUTPUT_TOKENS,
+    ):
+        """
+        Initialize the budgeter.
+
+        Args:
+            model: Model the prompts are sent to
+            window: Context window, in tokens; the known window of the model if omitted
+            max_output_tokens: Ceiling of the completion tokens
+            output_tokens_per_file: Completion tokens reserved per expected file
+            min_output_tokens: Completion tokens reserved at least
+        """
+        self.model = model
+        self.window = window or LLM_CONTEXT_WINDOW or context_window(model)
+        self.max_output_tokens = max_output_tokens
+        self.output_tokens_per_file = output_tokens_per_file
+        self.min_output_tokens = min_output_tokens
+
+    def output_tokens(self, expected_files: Sequence[str] = ()) -> int:
+        """
+        Get the completion tokens to reserve for a request.
+
+        Args:
+            expected_files: Paths of the files to generate, if known
+
+        Returns:
+            The `max_tokens` of the request
+        """
+        expected = self.output_tokens_per_file * max(1, len(expected_files))
+        return min(
+            self.max_output_tokens,
+            max(self.min_output_tokens, expected),
+            self.window // 2,
+        )
+
+    def fit(
+        self,
+        requirements: Requirements,
+        render: Callable[[Requirements], str],
+        expected_files: Sequence[str] = (),
+        system: str = "",
+    ) -> PromptBudget:
+        """
+        Trim requirements until their prompt fits the budget.
+
+        Args:
+            requirements: User requirements
+            render: Function building the prompt of requirements
+            expected_files: Paths of the files to generate, if known
+            system: System prompt sent along
+
+        Returns:
+            The fitted requirements, the tokens of their prompt with the
+            system prompt and the completion tokens to reserve
+        """
+        max_tokens = self.output_tokens(expected_files)
+        system_tokens = count_tokens(system, self.model)
+        budget = self.window - max_tokens - system_tokens
+        tokens = count_tokens(render(requirements), self.model)
+        if tokens <= budget:
+            return PromptBudget(
+                requirements, prompt_tokens=tokens + system_tokens, max_tokens=max_tokens
+            )
+
+        kept = {section: list(getattr(requirements, section)) for section in TRIM_ORDER}
+        dropped: Dict[str, int] = {}
+        for section in TRIM_ORDER:
+            if tokens <= budget:
+                break
+            items = kept[section]
+            measured: Dict[int, int] = {}
+
+            def measure(count: int) -> int:
+                if count not in measured:
+                    trimmed = replace(requirements, **{**kept, section: items[:count]})
+                    measured[count] = count_tokens(render(trimmed), self.model)
+                return measured[count]
+
+            # Binary search of the most leading items that fit, none if even
+            # dropping them all is not enough
+            low, high = 0, max(0, len(items) - 1)
+            while low < high:
+                middle = (low + high + 1) // 2
+                if measure(middle) <= budget:
+                    low = middle
+                else:
+                    high = middle - 1
+            if low < len(items):
+                dropped[section] = len(items) - low
+                kept[section] = items[:low]
+                tokens = measure(low)
+        fitted = replace(requirements, **kept)
+
+        truncated = tokens > budget
+        if truncated:
+            description_tokens = count_tokens(fitted.description, self.model)
+            allowed = max(0, description_tokens - (tokens - budget))
+            fitted = replace(
+                fitted, description=truncate_tokens(fitted.description, allowed, self.model)
+            )
+            tokens = count_tokens(render(fitted), self.model)
+
+        logger.warning(
+            f"Prompt trimmed to {tokens} tokens for {self.model}: dropped {dropped or 'nothing'}"
+            f"{', truncated the description' if truncated else ''}"
+        )
+        return PromptBudget(
+            fitted,
+            prompt_tokens=tokens + system_tokens,
+            max_tokens=max_tokens,
+            dropped=dropped,
+            truncated=truncated,
+        )
@@ -0,0 +1,3 @@
+"""
+Testing framework for the Vulcan autonomous coding agent.
+"""
@@ -0,0 +1,3 @@
+"""
+Services for running tests on generated code.
+"""
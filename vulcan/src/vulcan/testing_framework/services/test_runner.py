@@ -0,0 +1,180 @@
+"""
+Test runner executing pytest on code in a subprocess.
+"""
+import json
+import logging
+import sys
+import tempfile
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Optional
+
+from vulcan.config.workflow_config import SUBPROCESS_TIMEOUT
+from vulcan.core.vulcan_core.models import TestCase, TestCoverage, TestResult
+from vulcan.workflow_engine.cancellation import CancellationToken, run_subprocess
+
+
+logger = logging.getLogger(__name__)
+
+# pytest exit codes meaning the test session itself ran
+PYTEST_RAN_EXIT_CODES = (0, 1, 5)
+
+
+@dataclass
+class TestRunReport:
+    """Outcome of a test run."""
+    exit_code: int
+    test_results: List[TestResult] = field(default_factory=list)
+    coverage: Optional[TestCoverage] = None
+    output: str = ""
+
+    @property
+    def ran(self) -> bool:
+        """Whether the test session ran (regardless of test outcomes)."""
+        return self.exit_code in PYTEST_RAN_EXIT_CODES
+
+    @property
+    def passed(self) -> bool:
+        """Whether tests ran and all of them passed; no collected test is no pass."""
+        return (
+            self.ran
+            and bool(self.test_results)
+            and all(result.passed for result in self.test_results)
+        )
+
+
+def parse_junit_report(report_path: Path) -> List[TestResult]:
+    """
+    Parse a JUnit XML report produced by pytest.
+
+    Args:
+        report_path: Path to the report
+
+    Returns:
+        The test results
+    """
+    if not report_path.exists():
+        return []
+
+    results = []
+    for testcase in ET.parse(report_path).getroot().iter("testcase"):
+        failure = testcase.find("failure")
+        if failure is None:
+            failure = testcase.find("error")
+        skipped = testcase.find("skipped") is not None
+
+        error_message = None
+        if failure is not None:
+            error_message = failure.get("message") or (failure.text or "").strip()
+
+        results.append(
+            TestResult(
+                test_case=TestCase(
+                    name=testcase.get("name", ""),
+                    description=testcase.get("classname", ""),
+                    input_data={},
+                    expected_output={},
+                ),
+                passed=failure is None,
+                actual_output={"outcome": "skipped" if skipped else "executed"},
+                error_message=error_message,
+                execution_time=float(testcase.get("time", 0.0)),
+            )
+        )
+    return results
+
+
+def parse_coverage_report(report_path: Path) -> Optional[TestCoverage]:
+    """
+    Parse a JSON coverage report produced by coverage.py.
+
+    Args:
+        report_path: Path to the report
+
+    Returns:
+        The coverage, or None if no report was produced
+    """
+    if not report_path.exists():
+        return None
+
+    with open(report_path, "r", encoding="utf-8") as f:
+        report = json.load(f)
+
+    totals = report.get("totals", {})
+    statements = totals.get("num_statements", 0)
+    branches = totals.get("num_branches", 0)
+
+    functions = covered_functions = 0
+    file_coverage = {}
+    for file_path, data in report.get("files", {}).items():
+        file_coverage[file_path] = data.get("summary", {}).get("percent_covered", 0.0)
+        for function in data.get("functions", {}).values():
+            functions += 1
+            if function.get("summary", {}).get("covered_lines", 0) > 0:
+                covered_functions += 1
+
+    return TestCoverage(
+        line_coverage=100.0 * totals.get("covered_lines", 0) / statements if statements else 100.0,
+        branch_coverage=100.0 * totals.get("covered_branches", 0) / branches if branches else 100.0,
+        function_coverage=100.0 * covered_functions / functions if functions else 0.0,
+        file_coverage=file_coverage,
+    )
+
+
+class TestRunner:
+    """Runs the tests of a code base with pytest."""
+
+    def __init__(self, timeout: float = SUBPROCESS_TIMEOUT):
+        """
+        Initialize the test runner.
+
+        Args:
+            timeout: Maximum duration of a test run in seconds
+        """
+        self.timeout = timeout
+
+    async def run(
+        self,
+        code_path: Path,
+        generate_coverage: bool = False,
+        token: Optional[CancellationToken] = None,
+    ) -> TestRunReport:
+        """
+        Run the tests found under a path.
+
+        The pytest subprocess is killed if the owning process is cancelled.
+
+        Args:
+            code_path: File or directory to test
+            generate_coverage: Whether to measure coverage
+            token: Cancellation token of the owning process
+
+        Returns:
+            The test run report
+        """
+        code_path = Path(code_path).resolve()
+        cwd = code_path if code_path.is_dir() else code_path.parent
+
+        with tempfile.TemporaryDirectory(prefix="vulcan-tests-") as report_dir:
+            junit_path = Path(report_dir) / "junit.xml"
+            coverage_path = Path(report_dir) / "coverage.json"
+
+            args = [
+                sys.executable, "-m", "pytest", str(code_path),
+                "-q", "-p", "no:cacheprovider", f"--junitxml={junit_path}",
+            ]
+            if generate_coverage:
+                args += [f"--cov={cwd}", "--cov-branch", f"--cov-report=json:{coverage_path}"]
+
+            logger.info(f"Running tests in {code_path}")
+            exit_code, stdout, stderr = await run_subprocess(
+                args, cwd=str(cwd), token=token, timeout=self.timeout
+            )
+
+            return TestRunReport(
+                exit_code=exit_code,
+                test_results=parse_junit_report(junit_path),
+                coverage=parse_coverage_report(coverage_path) if generate_coverage else None,
+                output=stdout + stderr,
+            )
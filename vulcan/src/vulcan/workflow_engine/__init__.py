@@ -0,0 +1,3 @@
+"""
+Workflow engine for the Vulcan autonomous coding agent.
+"""
@@ -0,0 +1,170 @@
+"""
+Queue-driven sizing of the worker pool.
+"""
+import logging
+import math
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Optional
+
+from vulcan.config.workflow_config import (
+    AUTOSCALE_MAX_WORKERS,
+    AUTOSCALE_MIN_WORKERS,
+    AUTOSCALE_SCALE_DOWN_DELAY,
+    AUTOSCALE_SCALE_UP_COOLDOWN,
+    AUTOSCALE_TARGET_DEPTH,
+    AUTOSCALE_TARGET_WAIT,
+    WORKER_CONCURRENCY,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ScalingDecision:
+    """A change of the pool size and the load that caused it."""
+    timestamp: float
+    previous_size: int
+    size: int
+    reason: str
+    queue_depth: int
+    oldest_wait: float
+    running: int = 0
+
+    @property
+    def direction(self) -> str:
+        """Direction of the change: "up" or "down"."""
+        return "up" if self.size > self.previous_size else "down"
+
+
+class Autoscaler:
+    """
+    Computes the size of the worker pool from the running and waiting jobs.
+
+    The pool keeps the workers busy with running jobs and adds one worker per
+    `target_depth` waiting jobs; it scales up as soon as it is smaller than
+    that or the oldest job waited longer than `target_wait`, at most once per
+    `scale_up_cooldown`. It scales down one worker at a time, and only
+    after the load stayed below the targets for `scale_down_delay`, so that a
+    short lull during a burst does not shed capacity.
+    """
+
+    def __init__(
+        self,
+        min_size: int = AUTOSCALE_MIN_WORKERS,
+        max_size: int = AUTOSCALE_MAX_WORKERS,
+        target_depth: float = AUTOSCALE_TARGET_DEPTH,
+        target_wait: float = AUTOSCALE_TARGET_WAIT,
+        scale_up_cooldown: float = AUTOSCALE_SCALE_UP_COOLDOWN,
+        scale_down_delay: float = AUTOSCALE_SCALE_DOWN_DELAY,
+        history_size: int = 100,
+        worker_concurrency: int = WORKER_CONCURRENCY,
+    ):
+        """
+        Initialize the autoscaler.
+
+        Args:
+            min_size: Minimum number of workers
+            max_size: Maximum number of workers
+            target_depth: Number of waiting jobs per worker tolerated
+            target_wait: Wait time of the oldest job tolerated, in seconds
+            scale_up_cooldown: Minimum delay between two scale-ups, in seconds
+            scale_down_delay: Duration of low load before a scale-down, in seconds
+            history_size: Number of past decisions kept
+            worker_concurrency: Number of jobs a worker runs at once
+        """
+        if not 0 < min_size <= max_size:
+            raise ValueError(f"Invalid pool size range: {min_size}-{max_size}")
+        self.min_size = min_size
+        self.max_size = max_size
+        self.target_depth = target_depth
+        self.target_wait = target_wait
+        self.scale_up_cooldown = scale_up_cooldown
+        self.scale_down_delay = scale_down_delay
+        self.worker_concurrency = max(1, worker_concurrency)
+        self.decisions: Deque[ScalingDecision] = deque(maxlen=history_size)
+        self._last_scale_up = -math.inf
+        self._low_load_since: Optional[float] = None
+
+    def desired_size(self, queue_depth: int, oldest_wait: float, size: int, running: int = 0) -> int:
+        """
+        Get the pool size the load calls for, ignoring cooldowns.
+
+        Args:
+            queue_depth: Number of waiting jobs
+            oldest_wait: Wait time of the oldest job, in seconds
+            size: Current pool size
+            running: Number of jobs leased by the workers
+
+        Returns:
+            Desired pool size within the bounds
+        """
+        if not self.target_depth:
+            return min(self.max_size, max(self.min_size, size))
+        desired = math.ceil(running / self.worker_concurrency) + math.ceil(queue_depth / self.target_depth)
+        if oldest_wait > self.target_wait:
+            desired = max(desired, size + 1)
+        return min(self.max_size, max(self.min_size, desired))
+
+    def decide(
+        self,
+        queue_depth: int,
+        oldest_wait: float,
+        size: int,
+        now: Optional[float] = None,
+        running: int = 0,
+    ) -> Optional[ScalingDecision]:
+        """
+        Decide whether to resize the pool.
+
+        Args:
+            queue_depth: Number of waiting jobs
+            oldest_wait: Wait time of the oldest job, in seconds
+            size: Current pool size
+            now: Current monotonic time
+            running: Number of jobs leased by the workers
+
+        Returns:
+            The scaling decision, or None to keep the current size
+        """
+        now = time.monotonic() if now is None else now
+        desired = self.desired_size(queue_depth, oldest_wait, size, running)
+
+        if size < self.min_size or desired > size:
+            self._low_load_since = None
+            if size >= self.min_size and now - self._last_scale_up < self.scale_up_cooldown:
+                return None
+            self._last_scale_up = now
+            new_size = max(desired, self.min_size)
+            reason = (
+                f"oldest job waited {oldest_wait:.0f}s"
+                if oldest_wait > self.target_wait
+                else f"{running} jobs running, {queue_depth} waiting"
+            )
+        elif desired < size:
+            # Hysteresis: shrink only after the load stayed low for a while
+            if self._low_load_since is None:
+                self._low_load_since = now
+            if now - self._low_load_since < self.scale_down_delay:
+                return None
+            self._low_load_since = now
+            new_size = size - 1
+            reason = f"load low for {self.scale_down_delay:.0f}s"
+        else:
+            self._low_load_since = None
+            return None
+
+        decision = ScalingDecision(
+            timestamp=time.time(),
+            previous_size=size,
+            size=new_size,
+            reason=reason,
+            queue_depth=queue_depth,
+            oldest_wait=oldest_wait,
+            running=running,
+        )
+        self.decisions.append(decision)
+        logger.info(f"Scaling worker pool {decision.direction} from {size} to {new_size}: {reason}")
+        return decision
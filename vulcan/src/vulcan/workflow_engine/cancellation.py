@@ -0,0 +1,249 @@
+"""
+Cooperative cancellation of running processes.
+"""
+import asyncio
+import logging
+import os
+import signal
+import threading
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from vulcan.config.workflow_config import SUBPROCESS_KILL_GRACE, SUBPROCESS_TIMEOUT
+
+
+logger = logging.getLogger(__name__)
+
+
+class ProcessCancelledError(Exception):
+    """Raised when work is interrupted because its process was cancelled."""
+
+    def __init__(self, process_id: str):
+        super().__init__(f"Process cancelled: {process_id}")
+        self.process_id = process_id
+
+
+class CancellationToken:
+    """
+    Cancellation signal shared by all the work of one process.
+
+    Components doing in-flight work (LLM streams, test subprocesses, git
+    operations) register callbacks that abort that work. Callbacks may be
+    invoked from any thread, so those touching an event loop must hop onto
+    it with `call_soon_threadsafe`.
+    """
+
+    def __init__(self, process_id: str):
+        """
+        Initialize the token.
+
+        Args:
+            process_id: ID of the process the token belongs to
+        """
+        self.process_id = process_id
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._callbacks: List[Callable[[], None]] = []
+
+    @property
+    def cancelled(self) -> bool:
+        """Whether cancellation was requested."""
+        return self._event.is_set()
+
+    def cancel(self) -> bool:
+        """
+        Request cancellation and run the registered callbacks once.
+
+        Returns:
+            True if this call cancelled the token, False if it already was
+        """
+        with self._lock:
+            if self._event.is_set():
+                return False
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                logger.error(f"Cancellation callback failed for {self.process_id}: {str(e)}")
+        return True
+
+    def add_callback(self, callback: Callable[[], None]) -> Callable[[], None]:
+        """
+        Register a callback run on cancellation.
+
+        The callback runs immediately if the token is already cancelled.
+
+        Args:
+            callback: Function aborting some in-flight work
+
+        Returns:
+            A function unregistering the callback
+        """
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return lambda: self._remove_callback(callback)
+        callback()
+        return lambda: None
+
+    def _remove_callback(self, callback: Callable[[], None]) -> None:
+        with self._lock:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
+
+    def raise_if_cancelled(self) -> None:
+        """
+        Raise if cancellation was requested.
+
+        Raises:
+            ProcessCancelledError: If the token is cancelled
+        """
+        if self.cancelled:
+            raise ProcessCancelledError(self.process_id)
+
+
+class CancellationRegistry:
+    """Registry of the tokens of processes running in this interpreter."""
+
+    def __init__(self):
+        self._tokens: Dict[str, CancellationToken] = {}
+        self._lock = threading.Lock()
+
+    def register(self, process_id: str) -> CancellationToken:
+        """
+        Create and register the token of a process.
+
+        Args:
+            process_id: ID of the process
+
+        Returns:
+            The process token
+        """
+        with self._lock:
+            token = self._tokens.get(process_id)
+            if token is None:
+                token = self._tokens[process_id] = CancellationToken(process_id)
+            return token
+
+    def unregister(self, process_id: str) -> None:
+        """
+        Forget the token of a process.
+
+        Args:
+            process_id: ID of the process
+        """
+        with self._lock:
+            self._tokens.pop(process_id, None)
+
+    def get(self, process_id: str) -> Optional[CancellationToken]:
+        """
+        Get the token of a running process.
+
+        Args:
+            process_id: ID of the process
+
+        Returns:
+            The token, or None if the process does not run here
+        """
+        with self._lock:
+            return self._tokens.get(process_id)
+
+    def cancel(self, process_id: str) -> bool:
+        """
+        Cancel a process running in this interpreter.
+
+        Args:
+            process_id: ID of the process
+
+        Returns:
+            True if a running process was cancelled
+        """
+        token = self.get(process_id)
+        return token.cancel() if token else False
+
+
+cancellation_registry = CancellationRegistry()
+
+
+def _signal_process_group(process: asyncio.subprocess.Process, sig: int) -> None:
+    if process.returncode is not None:
+        return
+    try:
+        os.killpg(process.pid, sig)
+    except (AttributeError, ProcessLookupError, PermissionError):
+        try:
+            process.send_signal(sig)
+        except ProcessLookupError:
+            pass
+
+
+async def _terminate(process: asyncio.subprocess.Process) -> None:
+    _signal_process_group(process, signal.SIGTERM)
+    try:
+        await asyncio.wait_for(process.wait(), SUBPROCESS_KILL_GRACE)
+    except asyncio.TimeoutError:
+        _signal_process_group(process, signal.SIGKILL)
+        await process.wait()
+
+
+async def run_subprocess(
+    args: Sequence[str],
+    cwd: Optional[str] = None,
+    env: Optional[Dict[str, str]] = None,
+    token: Optional[CancellationToken] = None,
+    timeout: float = SUBPROCESS_TIMEOUT,
+) -> Tuple[int, str, str]:
+    """
+    Run a subprocess that is killed, with its children, on cancellation.
+
+    Args:
+        args: Command and arguments
+        cwd: Working directory
+        env: Environment variables
+        token: Cancellation token of the owning process
+        timeout: Maximum run time in seconds
+
+    Returns:
+        Tuple of exit code, stdout and stderr
+
+    Raises:
+        ProcessCancelledError: If the token is cancelled while the command runs
+        asyncio.TimeoutError: If the command exceeds the timeout
+    """
+    if token:
+        token.raise_if_cancelled()
+
+    process = await asyncio.create_subprocess_exec(
+        *args,
+        cwd=cwd,
+        env=env,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        start_new_session=True,
+    )
+
+    remove_callback: Callable[[], None] = lambda: None
+    if token:
+        loop = asyncio.get_running_loop()
+        remove_callback = token.add_callback(
+            lambda: loop.call_soon_threadsafe(_signal_process_group, process, signal.SIGKILL)
+        )
+
+    try:
+        stdout, stderr = await asyncio.wait_for(process.communicate(), timeout)
+    except (asyncio.CancelledError, asyncio.TimeoutError):
+        await asyncio.shield(_terminate(process))
+        raise
+    finally:
+        remove_callback()
+
+    if token:
+        token.raise_if_cancelled()
+
+    return (
+        process.returncode,
+        stdout.decode("utf-8", errors="replace"),
+        stderr.decode("utf-8", errors="replace"),
+    )
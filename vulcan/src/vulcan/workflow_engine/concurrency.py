@@ -0,0 +1,86 @@
+"""
+Stage-aware concurrency limits of the workflow engine.
+"""
+import asyncio
+import time
+import weakref
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional
+
+from vulcan.config.workflow_config import STAGE_LIMITS
+
+
+class StageLimiter:
+    """
+    Bounds the number of concurrent operations per resource stage.
+
+    Each stage (LLM calls, test sandboxes, GitHub pushes) has its own
+    semaphore. Stages used with a key, such as pushes keyed by repository,
+    get one semaphore per key. Stages without a configured limit are not
+    throttled.
+    """
+
+    def __init__(self, limits: Optional[Dict[str, int]] = None):
+        """
+        Initialize the limiter.
+
+        Args:
+            limits: Maximum concurrency per stage name
+        """
+        self.limits = dict(STAGE_LIMITS if limits is None else limits)
+        # asyncio semaphores are bound to the loop they first wait on, so
+        # they are kept per event loop and keyed by (stage, key), like the
+        # counts of held slots
+        self._semaphores = weakref.WeakKeyDictionary()
+        self._held = weakref.WeakKeyDictionary()
+
+    def _semaphore(self, stage: str, key: Optional[str]) -> Optional[asyncio.Semaphore]:
+        limit = self.limits.get(stage)
+        if not limit or limit <= 0:
+            return None
+        semaphores = self._semaphores.setdefault(asyncio.get_running_loop(), {})
+        if (stage, key) not in semaphores:
+            semaphores[(stage, key)] = asyncio.Semaphore(limit)
+        return semaphores[(stage, key)]
+
+    def in_use(self, stage: str, key: Optional[str] = None) -> int:
+        """
+        Get the number of slots of a stage currently held.
+
+        Args:
+            stage: Stage name
+            key: Optional resource key within the stage
+
+        Returns:
+            Number of held slots
+        """
+        return self._held.get(asyncio.get_running_loop(), {}).get((stage, key), 0)
+
+    @asynccontextmanager
+    async def acquire(self, stage: str, key: Optional[str] = None) -> AsyncIterator[float]:
+        """
+        Hold a slot of a stage for the duration of the block.
+
+        Args:
+            stage: Stage name
+            key: Optional resource key within the stage
+
+        Yields:
+            Time spent waiting for the slot, in seconds
+        """
+        semaphore = self._semaphore(stage, key)
+        if semaphore is None:
+            yield 0.0
+            return
+
+        held = self._held.setdefault(asyncio.get_running_loop(), {})
+        start = time.monotonic()
+        async with semaphore:
+            held[(stage, key)] = held.get((stage, key), 0) + 1
+            try:
+                yield time.monotonic() - start
+            finally:
+                held[(stage, key)] -= 1
+
+
+stage_limiter = StageLimiter()
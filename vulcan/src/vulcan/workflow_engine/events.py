@@ -0,0 +1,161 @@
+"""
+In-process publish/subscribe of process state changes.
+"""
+import asyncio
+import logging
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, List, Optional, Set
+
+from vulcan.config.workflow_config import EVENT_QUEUE_SIZE
+
+
+logger = logging.getLogger(__name__)
+
+
+class Subscription:
+    """
+    Bounded queue of events delivered to one consumer.
+
+    Publishing never waits on the consumer: when the queue is full the oldest
+    event is dropped and counted, so a slow consumer loses history instead of
+    slowing down the workflows.
+    """
+
+    def __init__(self, bus: "EventBus", maxsize: int = EVENT_QUEUE_SIZE):
+        """
+        Initialize the subscription on the running event loop.
+
+        Args:
+            bus: Bus the subscription belongs to
+            maxsize: Maximum number of queued events
+        """
+        self.bus = bus
+        self.process_ids: Set[str] = set()
+        self.dropped = 0
+        self._events: Deque[Dict[str, Any]] = deque(maxlen=maxsize)
+        self._loop = asyncio.get_running_loop()
+        self._ready = asyncio.Event()
+        self._closed = False
+
+    def _put(self, event: Dict[str, Any]) -> None:
+        if self._closed:
+            return
+        if len(self._events) == self._events.maxlen:
+            self.dropped += 1
+        self._events.append(event)
+        self._ready.set()
+
+    def put(self, event: Dict[str, Any]) -> None:
+        """
+        Queue an event from any thread.
+
+        Args:
+            event: Event to deliver
+        """
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+        if running_loop is self._loop:
+            self._put(event)
+        elif not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._put, event)
+
+    async def get(self) -> List[Dict[str, Any]]:
+        """
+        Wait for events.
+
+        Returns:
+            All queued events, oldest first
+        """
+        while not self._events:
+            self._ready.clear()
+            await self._ready.wait()
+        events = list(self._events)
+        self._events.clear()
+        return events
+
+    def subscribe(self, process_ids: Iterable[str]) -> None:
+        """Add process IDs to the subscription."""
+        self.bus._add(self, process_ids)
+
+    def unsubscribe(self, process_ids: Iterable[str]) -> None:
+        """Remove process IDs from the subscription."""
+        self.bus._remove(self, process_ids)
+
+    def close(self) -> None:
+        """Detach the subscription from the bus."""
+        self._closed = True
+        self.bus._remove(self, list(self.process_ids))
+
+
+class EventBus:
+    """
+    Routes events of a process to the subscriptions of that process.
+
+    Subscriptions are indexed by process ID, so publishing costs one queue
+    append per subscriber of the process, whatever the total number of
+    subscriptions.
+    """
+
+    def __init__(self):
+        """Initialize a bus without subscriptions."""
+        self._lock = threading.Lock()
+        self._subscribers: Dict[str, Set[Subscription]] = {}
+
+    def subscribe(
+        self, process_ids: Iterable[str] = (), maxsize: int = EVENT_QUEUE_SIZE
+    ) -> Subscription:
+        """
+        Create a subscription; must be called from the consumer's event loop.
+
+        Args:
+            process_ids: Process IDs to subscribe to
+            maxsize: Maximum number of queued events
+
+        Returns:
+            The subscription
+        """
+        subscription = Subscription(self, maxsize)
+        subscription.subscribe(process_ids)
+        return subscription
+
+    def _add(self, subscription: Subscription, process_ids: Iterable[str]) -> None:
+        with self._lock:
+            for process_id in process_ids:
+                self._subscribers.setdefault(process_id, set()).add(subscription)
+                subscription.process_ids.add(process_id)
+
+    def _remove(self, subscription: Subscription, process_ids: Iterable[str]) -> None:
+        with self._lock:
+            for process_id in process_ids:
+                subscribers = self._subscribers.get(process_id)
+                if subscribers is not None:
+                    subscribers.discard(subscription)
+                    if not subscribers:
+                        del self._subscribers[process_id]
+                subscription.process_ids.discard(process_id)
+
+    def subscriber_count(self, process_id: Optional[str] = None) -> int:
+        """Get the number of subscriptions, optionally of one process."""
+        with self._lock:
+            if process_id is not None:
+                return len(self._subscribers.get(process_id, ()))
+            return len({s for subscribers in self._subscribers.values() for s in subscribers})
+
+    def publish(self, event: Dict[str, Any]) -> None:
+        """
+        Deliver an event to the subscribers of its process; never blocks.
+
+        Args:
+            event: Event with at least a "process_id"
+        """
+        with self._lock:
+            subscribers = list(self._subscribers.get(event["process_id"], ()))
+        for subscription in subscribers:
+            subscription.put(event)
+
+
+# Bus of the current process
+event_bus = EventBus()
@@ -0,0 +1,83 @@
+"""
+Memory accounting of workflow runs.
+"""
+import asyncio
+import os
+import resource
+import sys
+from typing import Any, Dict, Optional
+
+from vulcan.config.workflow_config import MEMORY_SAMPLE_INTERVAL
+
+
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def current_rss() -> int:
+    """
+    Get the resident set size of the current process.
+
+    Reads /proc on Linux; elsewhere falls back to the peak RSS reported by
+    getrusage, which over-estimates once memory has been released.
+
+    Returns:
+        Resident memory in bytes
+    """
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * PAGE_SIZE
+    except (OSError, IndexError, ValueError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+class MemorySampler:
+    """
+    Async context manager tracking the RSS of the process while a job runs.
+
+    The RSS is sampled at a fixed interval, so short spikes between two
+    samples are missed. When several jobs run concurrently in one worker, each
+    sampler observes the memory of the whole process.
+    """
+
+    def __init__(self, interval: float = MEMORY_SAMPLE_INTERVAL):
+        """
+        Initialize the sampler.
+
+        Args:
+            interval: Delay between two samples, in seconds
+        """
+        self.interval = interval
+        self.rss_start = 0
+        self.rss_end = 0
+        self.rss_peak = 0
+        self._task: Optional[asyncio.Task] = None
+
+    def _sample(self) -> int:
+        rss = current_rss()
+        self.rss_peak = max(self.rss_peak, rss)
+        return rss
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            self._sample()
+
+    async def __aenter__(self) -> "MemorySampler":
+        self.rss_start = self._sample()
+        self._task = asyncio.ensure_future(self._run())
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self._task.cancel()
+        self.rss_end = self._sample()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Summarize the samples, in bytes."""
+        return {
+            "rss_start": self.rss_start,
+            "rss_end": self.rss_end,
+            "rss_peak": self.rss_peak,
+            "rss_growth": self.rss_end - self.rss_start,
+        }
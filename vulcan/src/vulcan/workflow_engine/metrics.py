@@ -0,0 +1,150 @@
+"""
+Metrics of the workflow engine in the Prometheus text format.
+
+Workers and the worker pool run outside of the API process, so each component
+writes its metrics to a file in the metrics directory and the API serves the
+concatenation of those files.
+"""
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from vulcan.config.workflow_config import METRICS_DIR
+
+
+LabelSet = Tuple[Tuple[str, str], ...]
+
+
+def _format_labels(labels: LabelSet) -> str:
+    if not labels:
+        return ""
+    pairs = []
+    for name, value in labels:
+        escaped = value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        pairs.append(f'{name}="{escaped}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+class Metrics:
+    """Thread-safe set of counters and gauges."""
+
+    def __init__(self):
+        """Initialize an empty metric set."""
+        self._lock = threading.Lock()
+        self._types: Dict[str, str] = {}
+        self._help: Dict[str, str] = {}
+        self._values: Dict[str, Dict[LabelSet, float]] = {}
+
+    def _register(self, name: str, metric_type: str, help_text: str) -> None:
+        if self._types.setdefault(name, metric_type) != metric_type:
+            raise ValueError(f"Metric {name} is already registered as a {self._types[name]}")
+        if help_text:
+            self._help[name] = help_text
+        self._values.setdefault(name, {})
+
+    def inc(self, name: str, value: float = 1, help_text: str = "", **labels: str) -> None:
+        """
+        Increment a counter.
+
+        Args:
+            name: Metric name
+            value: Increment
+            help_text: Description of the metric
+            **labels: Label values
+        """
+        key = tuple(sorted((k, str(v)) for k, v in labels.items()))
+        with self._lock:
+            self._register(name, "counter", help_text)
+            self._values[name][key] = self._values[name].get(key, 0) + value
+
+    def set(self, name: str, value: float, help_text: str = "", **labels: str) -> None:
+        """
+        Set a gauge.
+
+        Args:
+            name: Metric name
+            value: Value
+            help_text: Description of the metric
+            **labels: Label values
+        """
+        key = tuple(sorted((k, str(v)) for k, v in labels.items()))
+        with self._lock:
+            self._register(name, "gauge", help_text)
+            self._values[name][key] = value
+
+    def get(self, name: str, **labels: str) -> Optional[float]:
+        """
+        Get the value of a metric.
+
+        Args:
+            name: Metric name
+            **labels: Label values
+
+        Returns:
+            The value, or None if it was never recorded
+        """
+        key = tuple(sorted((k, str(v)) for k, v in labels.items()))
+        with self._lock:
+            return self._values.get(name, {}).get(key)
+
+    def render(self) -> str:
+        """Render the metrics in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            for name in sorted(self._values):
+                if name in self._help:
+                    lines.append(f"# HELP {name} {self._help[name]}")
+                lines.append(f"# TYPE {name} {self._types[name]}")
+                for labels, value in sorted(self._values[name].items()):
+                    lines.append(f"{name}{_format_labels(labels)} {value:g}")
+        return "\n".join(lines) + "\n" if lines else ""
+
+    def write(self, component: str, metrics_dir: Optional[Path] = None) -> Path:
+        """
+        Atomically write the metrics to the file of a component.
+
+        Args:
+            component: Name of the component (e.g. "worker_pool")
+            metrics_dir: Directory holding the metric files
+
+        Returns:
+            Path to the written file
+        """
+        metrics_dir = Path(metrics_dir or METRICS_DIR)
+        metrics_dir.mkdir(parents=True, exist_ok=True)
+        path = metrics_dir / f"{component}.prom"
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(self.render(), encoding="utf-8")
+        os.replace(tmp_path, path)
+        return path
+
+
+def collect_metrics(metrics_dir: Optional[Path] = None) -> str:
+    """
+    Merge the metric files of all components.
+
+    Components running in several processes write one file per process; the
+    samples of a metric are grouped under a single HELP and TYPE header.
+
+    Args:
+        metrics_dir: Directory holding the metric files
+
+    Returns:
+        Metrics in the Prometheus text exposition format
+    """
+    metrics_dir = Path(metrics_dir or METRICS_DIR)
+    if not metrics_dir.is_dir():
+        return ""
+
+    families: Dict[str, List[str]] = {}
+    for path in sorted(metrics_dir.glob("*.prom")):
+        for line in path.read_text(encoding="utf-8").splitlines():
+            if line.startswith("# "):
+                lines = families.setdefault(line.split(" ", 3)[2], [])
+                if line not in lines:
+                    lines.append(line)
+            elif line:
+                families.setdefault(re.split(r"[{ ]", line, 1)[0], []).append(line)
+    return "".join(line + "\n" for lines in families.values() for line in lines)
@@ -0,0 +1,3 @@
+"""
+Durable job queue of the Vulcan workflow engine.
+"""
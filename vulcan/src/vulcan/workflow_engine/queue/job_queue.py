@@ -0,0 +1,343 @@
+"""
+SQLite-backed durable job queue with leases and visibility timeouts.
+"""
+import json
+import logging
+import sqlite3
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from vulcan.config.workflow_config import (
+    JOB_MAX_ATTEMPTS,
+    JOB_RETRY_DELAY,
+    JOB_VISIBILITY_TIMEOUT,
+    QUEUE_PATH,
+)
+
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    job_type TEXT NOT NULL,
+    process_id TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    enqueued_at REAL NOT NULL,
+    available_at REAL NOT NULL,
+    leased_by TEXT,
+    lease_expires_at REAL,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_ready ON jobs (status, available_at, enqueued_at);
+"""
+
+# Job statuses
+QUEUED = "queued"
+LEASED = "leased"
+DONE = "done"
+DEAD = "dead"
+
+
+@dataclass
+class Job:
+    """A workflow execution waiting in or leased from the queue."""
+    job_id: str
+    job_type: str
+    process_id: str
+    payload: Dict[str, Any] = field(default_factory=dict)
+    status: str = QUEUED
+    attempts: int = 0
+    enqueued_at: float = 0.0
+    leased_by: Optional[str] = None
+    lease_expires_at: Optional[float] = None
+    error: Optional[str] = None
+
+    @classmethod
+    def from_row(cls, row: sqlite3.Row) -> "Job":
+        """Build a job from a database row."""
+        return cls(
+            job_id=row["job_id"],
+            job_type=row["job_type"],
+            process_id=row["process_id"],
+            payload=json.loads(row["payload"]),
+            status=row["status"],
+            attempts=row["attempts"],
+            enqueued_at=row["enqueued_at"],
+            leased_by=row["leased_by"],
+            lease_expires_at=row["lease_expires_at"],
+            error=row["error"],
+        )
+
+
+class JobQueue:
+    """
+    Durable queue of workflow jobs stored in SQLite.
+
+    A leased job is invisible to other workers until its lease expires. Workers
+    extend the lease with heartbeats while a job runs; a job whose worker died
+    becomes visible again after the visibility timeout and is retried until it
+    runs out of attempts.
+    """
+
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        visibility_timeout: float = JOB_VISIBILITY_TIMEOUT,
+        max_attempts: int = JOB_MAX_ATTEMPTS,
+        retry_delay: float = JOB_RETRY_DELAY,
+    ):
+        """
+        Initialize the queue, creating the database if needed.
+
+        Args:
+            path: Path to the SQLite database
+            visibility_timeout: Lease duration in seconds
+            max_attempts: Maximum number of times a job is leased
+            retry_delay: Delay before a failed job becomes visible again, in seconds
+        """
+        self.path = Path(path or QUEUE_PATH)
+        self.visibility_timeout = visibility_timeout
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript(SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        connection.row_factory = sqlite3.Row
+        try:
+            yield connection
+        finally:
+            connection.close()
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        with self._connect() as connection:
+            # IMMEDIATE takes the write lock up front so that two workers
+            # can never lease the same job.
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                yield connection
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            connection.execute("COMMIT")
+
+    def enqueue(self, job_type: str, process_id: str, payload: Dict[str, Any]) -> Job:
+        """
+        Add a job to the queue.
+
+        Args:
+            job_type: Type of workflow to run
+            process_id: ID of the process the job executes
+            payload: JSON-serializable workflow arguments
+
+        Returns:
+            The queued job
+        """
+        now = time.time()
+        job = Job(
+            job_id=str(uuid.uuid4()),
+            job_type=job_type,
+            process_id=process_id,
+            payload=payload,
+            enqueued_at=now,
+        )
+        with self._transaction() as connection:
+            connection.execute(
+                "INSERT INTO jobs (job_id, job_type, process_id, payload, status, "
+                "enqueued_at, available_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (job.job_id, job_type, process_id, json.dumps(payload), QUEUED, now, now),
+            )
+        return job
+
+    def lease(self, worker_id: str) -> Optional[Job]:
+        """
+        Lease the oldest visible job.
+
+        Args:
+            worker_id: ID of the leasing worker
+
+        Returns:
+            The leased job, or None if no job is visible
+        """
+        now = time.time()
+        with self._transaction() as connection:
+            row = connection.execute(
+                "SELECT * FROM jobs WHERE "
+                "(status = ? AND available_at <= ?) "
+                "OR (status = ? AND lease_expires_at < ? AND attempts < ?) "
+                "ORDER BY enqueued_at LIMIT 1",
+                (QUEUED, now, LEASED, now, self.max_attempts),
+            ).fetchone()
+            if row is None:
+                return None
+
+            expires_at = now + self.visibility_timeout
+            connection.execute(
+                "UPDATE jobs SET status = ?, leased_by = ?, lease_expires_at = ?, "
+                "attempts = attempts + 1 WHERE job_id = ?",
+                (LEASED, worker_id, expires_at, row["job_id"]),
+            )
+
+        job = Job.from_row(row)
+        job.status = LEASED
+        job.leased_by = worker_id
+        job.lease_expires_at = expires_at
+        job.attempts += 1
+        return job
+
+    def heartbeat(self, job_id: str, worker_id: str) -> bool:
+        """
+        Extend the lease of a running job.
+
+        Args:
+            job_id: ID of the job
+            worker_id: ID of the worker holding the lease
+
+        Returns:
+            False if the worker no longer holds the lease
+        """
+        with self._transaction() as connection:
+            cursor = connection.execute(
+                "UPDATE jobs SET lease_expires_at = ? "
+                "WHERE job_id = ? AND status = ? AND leased_by = ?",
+                (time.time() + self.visibility_timeout, job_id, LEASED, worker_id),
+            )
+            return cursor.rowcount == 1
+
+    def complete(self, job_id: str, worker_id: str) -> bool:
+        """
+        Mark a leased job as done.
+
+        Args:
+            job_id: ID of the job
+            worker_id: ID of the worker holding the lease
+
+        Returns:
+            False if the worker no longer holds the lease
+        """
+        with self._transaction() as connection:
+            cursor = connection.execute(
+                "UPDATE jobs SET status = ?, lease_expires_at = NULL "
+                "WHERE job_id = ? AND status = ? AND leased_by = ?",
+                (DONE, job_id, LEASED, worker_id),
+            )
+            return cursor.rowcount == 1
+
+    def fail(self, job_id: str, worker_id: str, error: str) -> bool:
+        """
+        Release a leased job after an error, retrying it if attempts remain.
+
+        Args:
+            job_id: ID of the job
+            worker_id: ID of the worker holding the lease
+            error: Error message
+
+        Returns:
+            True if the job will be retried
+        """
+        with self._transaction() as connection:
+            row = connection.execute(
+                "SELECT attempts FROM jobs WHERE job_id = ? AND status = ? AND leased_by = ?",
+                (job_id, LEASED, worker_id),
+            ).fetchone()
+            if row is None:
+                return False
+            retry = row["attempts"] < self.max_attempts
+            connection.execute(
+                "UPDATE jobs SET status = ?, available_at = ?, lease_expires_at = NULL, "
+                "leased_by = NULL, error = ? WHERE job_id = ?",
+                (QUEUED if retry else DEAD, time.time() + self.retry_delay, error, job_id),
+            )
+            return retry
+
+    def reap_expired(self) -> List[Job]:
+        """
+        Give up on leased jobs whose lease expired after their last attempt.
+
+        Returns:
+            The jobs moved to the dead status
+        """
+        now = time.time()
+        with self._transaction() as connection:
+            rows = connection.execute(
+                "SELECT * FROM jobs WHERE status = ? AND lease_expires_at < ? AND attempts >= ?",
+                (LEASED, now, self.max_attempts),
+            ).fetchall()
+            for row in rows:
+                connection.execute(
+                    "UPDATE jobs SET status = ?, error = ? WHERE job_id = ?",
+                    (DEAD, "Lease expired after the last attempt", row["job_id"]),
+                )
+        return [Job.from_row(row) for row in rows]
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """
+        Get a job.
+
+        Args:
+            job_id: ID of the job
+
+        Returns:
+            The job, or None if it does not exist
+        """
+        with self._connect() as connection:
+            row = connection.execute("SELECT * FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return Job.from_row(row) if row else None
+
+    def purge(self, older_than: float, limit: int = 1000) -> int:
+        """
+        Delete done and dead jobs.
+
+        Args:
+            older_than: Age of the jobs deleted, from their enqueueing, in seconds
+            limit: Maximum number of jobs deleted
+
+        Returns:
+            The number of deleted jobs
+        """
+        with self._transaction() as connection:
+            cursor = connection.execute(
+                "DELETE FROM jobs WHERE job_id IN ("
+                "SELECT job_id FROM jobs WHERE status IN (?, ?) AND enqueued_at < ? LIMIT ?)",
+                (DONE, DEAD, time.time() - older_than, limit),
+            )
+            return cursor.rowcount
+
+    def depth(self) -> int:
+        """Get the number of visible jobs waiting to be leased."""
+        with self._connect() as connection:
+            return connection.execute(
+                "SELECT COUNT(*) FROM jobs WHERE status = ? AND available_at <= ?",
+                (QUEUED, time.time()),
+            ).fetchone()[0]
+
+    def running(self) -> int:
+        """Get the number of leased jobs whose lease is still held."""
+        with self._connect() as connection:
+            return connection.execute(
+                "SELECT COUNT(*) FROM jobs WHERE status = ? AND lease_expires_at >= ?",
+                (LEASED, time.time()),
+            ).fetchone()[0]
+
+    def oldest_wait(self) -> float:
+        """Get how long the oldest visible queued job has been waiting, in seconds."""
+        now = time.time()
+        with self._connect() as connection:
+            oldest = connection.execute(
+                "SELECT MIN(enqueued_at) FROM jobs WHERE status = ? AND available_at <= ?",
+                (QUEUED, now),
+            ).fetchone()[0]
+        return max(0.0, now - oldest) if oldest is not None else 0.0
@@ -0,0 +1,3 @@
+"""
+Process state tracking for the Vulcan workflow engine.
+"""
@@ -0,0 +1,256 @@
+"""
+Retention of process states and generated files.
+"""
+import asyncio
+import gzip
+import json
+import logging
+import shutil
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from vulcan.config.workflow_config import (
+    ARCHIVE_DIR,
+    COMPACTOR_BATCH_PAUSE,
+    COMPACTOR_BATCH_SIZE,
+    COMPACTOR_INTERVAL,
+    DEFAULT_RETENTION_DAYS,
+    JOB_RETENTION_DAYS,
+    OUTPUT_DIR,
+    PROCESS_RETENTION_DAYS,
+    WORKSPACE_DIR,
+    WORKSPACE_RETENTION_HOURS,
+)
+from vulcan.workflow_engine.queue.job_queue import JobQueue
+from vulcan.workflow_engine.state.workflow_state import ProcessState, WorkflowStateManager
+
+
+logger = logging.getLogger(__name__)
+
+DAY = 24 * 3600
+
+
+def parse_time(timestamp: str) -> float:
+    """
+    Convert a timestamp produced by `utc_now` to seconds since the epoch.
+
+    Args:
+        timestamp: ISO 8601 timestamp
+
+    Returns:
+        Seconds since the epoch
+    """
+    return datetime.fromisoformat(timestamp.replace("Z", "+00:00")).timestamp()
+
+
+class StateCompactor:
+    """
+    Archives expired processes and deletes stale generated files.
+
+    A terminal process expires once it ended longer ago than the retention of
+    its type. Expired processes are appended, with their full event log, to a
+    gzip-compressed JSONL archive per process type and day, then removed from
+    the live store. Done and dead jobs of the job queue, if any, are deleted
+    once enqueued longer ago than `job_retention_days`. Work is done in
+    batches of `batch_size` entries with a pause in between, so that a large
+    backlog never holds the store for long.
+    """
+
+    def __init__(
+        self,
+        state_manager: Optional[WorkflowStateManager] = None,
+        archive_dir: Optional[Path] = None,
+        retention_days: Optional[Dict[str, float]] = None,
+        default_retention_days: float = DEFAULT_RETENTION_DAYS,
+        output_dir: Optional[Path] = None,
+        workspace_dir: Optional[Path] = None,
+        workspace_retention_hours: float = WORKSPACE_RETENTION_HOURS,
+        batch_size: int = COMPACTOR_BATCH_SIZE,
+        batch_pause: float = COMPACTOR_BATCH_PAUSE,
+        interval: float = COMPACTOR_INTERVAL,
+        queue: Optional[JobQueue] = None,
+        job_retention_days: float = JOB_RETENTION_DAYS,
+    ):
+        """
+        Initialize the compactor.
+
+        Args:
+            state_manager: Store of the process states
+            archive_dir: Directory receiving the archives
+            retention_days: Retention per process type, in days
+            default_retention_days: Retention of other process types, in days
+            output_dir: Directory holding the `generation_*` output directories
+            workspace_dir: Directory holding the test workspaces
+            workspace_retention_hours: Age after which a workspace is stale, in hours
+            batch_size: Number of entries examined per batch
+            batch_pause: Pause between two batches, in seconds
+            interval: Pause between two passes over the store, in seconds
+            queue: Job queue whose finished jobs are purged
+            job_retention_days: Retention of the finished jobs, in days
+        """
+        self.state_manager = state_manager or WorkflowStateManager()
+        self.archive_dir = Path(archive_dir or ARCHIVE_DIR)
+        self.retention_days = PROCESS_RETENTION_DAYS if retention_days is None else retention_days
+        self.default_retention_days = default_retention_days
+        self.output_dir = Path(output_dir or OUTPUT_DIR)
+        self.workspace_dir = Path(workspace_dir or WORKSPACE_DIR)
+        self.workspace_retention_hours = workspace_retention_hours
+        self.batch_size = batch_size
+        self.batch_pause = batch_pause
+        self.interval = interval
+        self.queue = queue
+        self.job_retention_days = job_retention_days
+        self.archived = 0
+        self.deleted_directories = 0
+        self.purged_jobs = 0
+        self._stopping = asyncio.Event()
+
+    def retention_seconds(self, process_type: str) -> float:
+        """Get the retention of a process type, in seconds."""
+        return self.retention_days.get(process_type, self.default_retention_days) * DAY
+
+    def is_expired(self, state: ProcessState, now: float) -> bool:
+        """
+        Check whether a process can be archived.
+
+        Args:
+            state: Process state
+            now: Current time, in seconds since the epoch
+
+        Returns:
+            True if the process is terminal and its retention elapsed
+        """
+        return (
+            state.is_terminal
+            and state.end_time is not None
+            and now - parse_time(state.end_time) > self.retention_seconds(state.process_type)
+        )
+
+    def _candidates(self) -> Iterator[Tuple[str, Optional[Path]]]:
+        # Processes first, then the generated directories
+        for process_id in self.state_manager.iter_process_ids():
+            yield process_id, None
+        for directory in (self.output_dir, self.workspace_dir):
+            if directory.is_dir():
+                for path in directory.iterdir():
+                    if path.is_dir():
+                        yield "", path
+
+    def _directory_expired(self, path: Path, now: float) -> bool:
+        if path.parent == self.workspace_dir:
+            max_age = self.workspace_retention_hours * 3600
+        elif path.name.startswith("generation_"):
+            max_age = self.retention_seconds("code_generation")
+        else:
+            return False
+        return now - path.stat().st_mtime > max_age
+
+    def _archive(self, states: List[ProcessState], now: float) -> None:
+        groups: Dict[Path, List[str]] = {}
+        for state in states:
+            day = datetime.fromtimestamp(parse_time(state.end_time), timezone.utc).strftime("%Y-%m-%d")
+            path = self.archive_dir / f"{state.process_type}-{day}.jsonl.gz"
+            record = {
+                "state": state.to_dict(),
+                "events": self.state_manager.read_events(state.process_id),
+                "archived_at": now,
+            }
+            groups.setdefault(path, []).append(json.dumps(record))
+
+        self.archive_dir.mkdir(parents=True, exist_ok=True)
+        for path, lines in groups.items():
+            # Each batch appends one gzip member; readers see a single stream
+            with gzip.open(path, "at", encoding="utf-8") as f:
+                f.write("\n".join(lines) + "\n")
+
+        for state in states:
+            self.state_manager.delete_process(state.process_id)
+        self.archived += len(states)
+
+    def run_batch(self, candidates: Iterator[Tuple[str, Optional[Path]]]) -> bool:
+        """
+        Examine the next batch of entries.
+
+        Args:
+            candidates: Iterator over the entries of the current pass
+
+        Returns:
+            False once the pass is complete
+        """
+        now = time.time()
+        expired: List[ProcessState] = []
+        examined = 0
+        for process_id, path in candidates:
+            try:
+                if path is not None:
+                    if self._directory_expired(path, now):
+                        shutil.rmtree(path, ignore_errors=True)
+                        self.deleted_directories += 1
+                        logger.info(f"Deleted stale directory {path}")
+                else:
+                    state = self.state_manager.get_state(process_id)
+                    if state is not None and self.is_expired(state, now):
+                        expired.append(state)
+            except (OSError, ValueError) as e:
+                logger.error(f"Error examining {path or process_id} for retention: {str(e)}")
+
+            examined += 1
+            if examined >= self.batch_size:
+                break
+
+        if expired:
+            self._archive(expired, now)
+            logger.info(f"Archived {len(expired)} expired processes")
+        return examined >= self.batch_size
+
+    def purge_jobs(self) -> bool:
+        """
+        Delete the next batch of expired jobs from the job queue.
+
+        Returns:
+            False once no expired job is left
+        """
+        if self.queue is None:
+            return False
+        purged = self.queue.purge(self.job_retention_days * DAY, limit=self.batch_size)
+        if purged:
+            self.purged_jobs += purged
+            logger.info(f"Purged {purged} finished jobs")
+        return purged >= self.batch_size
+
+    def run_pass(self) -> None:
+        """Run a complete pass without pausing between batches."""
+        candidates = self._candidates()
+        while self.run_batch(candidates):
+            pass
+        while self.purge_jobs():
+            pass
+
+    def stop(self) -> None:
+        """Stop the background loop after the current batch."""
+        self._stopping.set()
+
+    async def _sleep(self, delay: float) -> None:
+        try:
+            await asyncio.wait_for(self._stopping.wait(), delay)
+        except asyncio.TimeoutError:
+            pass
+
+    async def run(self) -> None:
+        """Compact the store in the background until stopped."""
+        while not self._stopping.is_set():
+            candidates = self._candidates()
+            try:
+                while not self._stopping.is_set():
+                    if not await asyncio.to_thread(self.run_batch, candidates):
+                        break
+                    await self._sleep(self.batch_pause)
+                while not self._stopping.is_set():
+                    if not await asyncio.to_thread(self.purge_jobs):
+                        break
+                    await self._sleep(self.batch_pause)
+            except Exception as e:
+                logger.error(f"Error compacting the process store: {str(e)}")
+            await self._sleep(self.interval)
@@ -0,0 +1,584 @@
+"""
+Persistent state of code generation, testing, and deployment processes.
+
+The state of a process is event-sourced: every step and status transition is
+appended to the event log of the process, and the state is rebuilt by folding
+the events over the latest snapshot. Snapshots are rewritten every
+STATE_SNAPSHOT_INTERVAL events, so reads replay a short tail and updates only
+append a line.
+"""
+import asyncio
+import fcntl
+import json
+import logging
+import os
+import threading
+import uuid
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from vulcan.config.workflow_config import STATE_DIR, STATE_SNAPSHOT_INTERVAL
+from vulcan.core.vulcan_core.models import CodeStatus
+from vulcan.workflow_engine import events
+from vulcan.workflow_engine.events import EventBus
+
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_STATUSES = (CodeStatus.COMPLETED, CodeStatus.FAILED, CodeStatus.CANCELLED)
+
+# Events still applied once a process reached a terminal status
+POST_TERMINAL_EVENTS = ("resources",)
+
+
+def utc_now() -> str:
+    """Return the current UTC time as an ISO 8601 string."""
+    return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+@dataclass
+class ProcessStep:
+    """A single step of a process."""
+    name: str
+    status: CodeStatus
+    start_time: str
+    end_time: Optional[str] = None
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class ProcessState:
+    """State of a code generation, testing, or deployment process."""
+    process_id: str
+    process_type: str
+    status: CodeStatus
+    start_time: str
+    end_time: Optional[str] = None
+    steps: List[ProcessStep] = field(default_factory=list)
+    artifacts: List[Dict[str, Any]] = field(default_factory=list)
+    errors: List[str] = field(default_factory=list)
+    resources: Dict[str, Any] = field(default_factory=dict)
+    timeline: List[Dict[str, Any]] = field(default_factory=list)
+    callback_url: Optional[str] = None
+
+    @property
+    def is_terminal(self) -> bool:
+        """Whether the process has reached a terminal status."""
+        return self.status in TERMINAL_STATUSES
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize the state to a JSON-compatible dictionary."""
+        data = asdict(self)
+        data["status"] = self.status.value
+        for step in data["steps"]:
+            step["status"] = step["status"].value
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ProcessState":
+        """Deserialize a state produced by `to_dict`."""
+        steps = [
+            ProcessStep(**{**step, "status": CodeStatus(step["status"])})
+            for step in data.get("steps", [])
+        ]
+        return cls(
+            process_id=data["process_id"],
+            process_type=data["process_type"],
+            status=CodeStatus(data["status"]),
+            start_time=data["start_time"],
+            end_time=data.get("end_time"),
+            steps=steps,
+            artifacts=data.get("artifacts", []),
+            errors=data.get("errors", []),
+            resources=data.get("resources", {}),
+            timeline=data.get("timeline", []),
+            callback_url=data.get("callback_url"),
+        )
+
+
+def apply_event(state: Optional[ProcessState], event: Dict[str, Any]) -> Optional[ProcessState]:
+    """
+    Fold an event into a process state.
+
+    Terminal states are final: apart from resource usage, events recorded after
+    a terminal status (e.g. by a workflow that was cancelled from another
+    process) are ignored.
+
+    Args:
+        state: State before the event; None before the "created" event
+        event: Event read from the log
+
+    Returns:
+        The state after the event
+    """
+    kind = event["type"]
+    time = event["time"]
+
+    if kind == "created":
+        return ProcessState(
+            process_id=event["process_id"],
+            process_type=event["process_type"],
+            status=CodeStatus(event["status"]),
+            start_time=time,
+            timeline=[{"time": time, "event": "created", "status": event["status"]}],
+            callback_url=event.get("callback_url"),
+        )
+    if state is None or (state.is_terminal and kind not in POST_TERMINAL_EVENTS):
+        return state
+
+    if kind == "status":
+        status = CodeStatus(event["status"])
+        if status in TERMINAL_STATUSES:
+            for step in state.steps:
+                if step.end_time is None:
+                    step.status = status
+                    step.end_time = time
+                    state.timeline.append(
+                        {"time": time, "event": "step_ended", "step": step.name, "status": status.value}
+                    )
+            state.end_time = time
+        state.status = status
+        state.timeline.append({"time": time, "event": "status", "status": status.value})
+    elif kind == "step_started":
+        state.steps.append(
+            ProcessStep(name=event["step"], status=CodeStatus.IN_PROGRESS, start_time=time)
+        )
+        state.timeline.append({"time": time, "event": "step_started", "step": event["step"]})
+    elif kind == "step_ended":
+        for step in reversed(state.steps):
+            if step.name == event["step"] and step.end_time is None:
+                step.status = CodeStatus(event["status"])
+                step.end_time = time
+                state.timeline.append(
+                    {"time": time, "event": "step_ended", "step": step.name, "status": event["status"]}
+                )
+                break
+    elif kind == "step_metadata":
+        for step in reversed(state.steps):
+            if step.name == event["step"] and step.end_time is None:
+                step.metadata.update(event["metadata"])
+                break
+    elif kind == "artifact":
+        state.artifacts.append(event["artifact"])
+    elif kind == "error":
+        state.errors.append(event["error"])
+    elif kind == "resources":
+        state.resources.update(event["resources"])
+    else:
+        logger.warning(f"Ignoring unknown event type {kind} of process {state.process_id}")
+
+    return state
+
+
+class WorkflowStateManager:
+    """
+    File-backed store of process states.
+
+    Each process has an append-only event log (`<id>.events.jsonl`) and a
+    snapshot (`<id>.json`) recording the log offset it covers, so that the
+    API, the CLI and workflow runners in other processes share the same view.
+    Writers serialize on an advisory lock of the log. Cancellation requests
+    are additionally recorded as a marker file, which running workflows poll
+    without contending on the log.
+    """
+
+    def __init__(
+        self,
+        state_dir: Optional[Path] = None,
+        snapshot_interval: int = STATE_SNAPSHOT_INTERVAL,
+        event_bus: Optional[EventBus] = None,
+    ):
+        """
+        Initialize the state manager.
+
+        Args:
+            state_dir: Directory holding the process states
+            snapshot_interval: Number of events after which a snapshot is written
+            event_bus: Bus the recorded events are published to
+        """
+        self.state_dir = Path(state_dir or STATE_DIR)
+        self.snapshot_interval = snapshot_interval
+        self.event_bus = event_bus or events.event_bus
+
+    def _snapshot_path(self, process_id: str) -> Path:
+        return self.state_dir / f"{process_id}.json"
+
+    def _log_path(self, process_id: str) -> Path:
+        return self.state_dir / f"{process_id}.events.jsonl"
+
+    def _cancel_path(self, process_id: str) -> Path:
+        return self.state_dir / f"{process_id}.cancel"
+
+    def _load(self, process_id: str) -> Tuple[Optional[ProcessState], int, int]:
+        """Rebuild a state; returns it with the log offset it covers and the tail length."""
+        state, offset = None, 0
+        try:
+            with open(self._snapshot_path(process_id), "r", encoding="utf-8") as f:
+                data = json.load(f)
+            offset = data.pop("log_offset", 0)
+            state = ProcessState.from_dict(data)
+        except FileNotFoundError:
+            pass
+
+        tail = 0
+        try:
+            with open(self._log_path(process_id), "rb") as f:
+                f.seek(offset)
+                for line in f:
+                    # A line without newline is a write still in progress
+                    if not line.endswith(b"\n"):
+                        break
+                    state = apply_event(state, json.loads(line))
+                    offset += len(line)
+                    tail += 1
+        except FileNotFoundError:
+            pass
+
+        return state, offset, tail
+
+    def _write_snapshot(self, state: ProcessState, log_offset: int) -> None:
+        path = self._snapshot_path(state.process_id)
+        tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({**state.to_dict(), "log_offset": log_offset}, f)
+        os.replace(tmp_path, path)
+
+    @contextmanager
+    def _locked_log(self, process_id: str) -> Iterator[Any]:
+        self.state_dir.mkdir(parents=True, exist_ok=True)
+        with open(self._log_path(process_id), "ab") as log:
+            fcntl.flock(log, fcntl.LOCK_EX)
+            try:
+                yield log
+            finally:
+                fcntl.flock(log, fcntl.LOCK_UN)
+
+    def _append(self, process_id: str, *events: Dict[str, Any]) -> Optional[ProcessState]:
+        """Append events to the log of a process and return the resulting state."""
+        now = utc_now()
+        events = tuple({"time": now, **event} for event in events)
+        creating = events[0]["type"] == "created"
+
+        # Do not leave an empty log behind for unknown processes
+        if not creating and not (
+            self._log_path(process_id).exists() or self._snapshot_path(process_id).exists()
+        ):
+            return None
+
+        with self._locked_log(process_id) as log:
+            state, offset, tail = self._load(process_id)
+            if (state is None) != creating:
+                return state
+            # Late updates from a cancelled workflow must not resurrect it
+            if state is not None and state.is_terminal and not any(
+                event["type"] in POST_TERMINAL_EVENTS for event in events
+            ):
+                return state
+
+            was_terminal = state is not None and state.is_terminal
+            for event in events:
+                state = apply_event(state, event)
+            data = "".join(json.dumps(event) + "\n" for event in events).encode("utf-8")
+            log.write(data)
+            log.flush()
+
+            if tail + len(events) >= self.snapshot_interval:
+                self._write_snapshot(state, offset + len(data))
+
+        for event in events:
+            self.event_bus.publish({"process_id": process_id, **event})
+        if state.callback_url and state.is_terminal and not was_terminal:
+            self._notify(state)
+        return state
+
+    def _notify(self, state: ProcessState) -> None:
+        """Queue the completion webhook of a process that just finished."""
+        from vulcan.workflow_engine.webhooks import webhook_dispatcher
+
+        webhook_dispatcher.submit(
+            state.callback_url,
+            {
+                "event": "process.finished",
+                "process_id": state.process_id,
+                "process_type": state.process_type,
+                "status": state.status.value,
+                "start_time": state.start_time,
+                "end_time": state.end_time,
+                "artifacts": state.artifacts,
+                "errors": state.errors,
+            },
+        )
+
+    def create_process(
+        self,
+        process_type: str,
+        process_id: Optional[str] = None,
+        status: CodeStatus = CodeStatus.IN_PROGRESS,
+        callback_url: Optional[str] = None,
+    ) -> ProcessState:
+        """
+        Create and persist a new process.
+
+        Args:
+            process_type: Type of the process (e.g. "code_generation")
+            process_id: Optional explicit process ID
+            status: Initial status; NOT_STARTED for queued processes
+            callback_url: URL notified once the process reaches a terminal status
+
+        Returns:
+            The created process state
+        """
+        process_id = process_id or str(uuid.uuid4())
+        event = {
+            "type": "created",
+            "process_id": process_id,
+            "process_type": process_type,
+            "status": status.value,
+        }
+        if callback_url:
+            event["callback_url"] = str(callback_url)
+        return self._append(process_id, event)
+
+    def start_process(self, process_id: str) -> Optional[ProcessState]:
+        """
+        Move a queued process to in progress.
+
+        Args:
+            process_id: ID of the process
+
+        Returns:
+            The updated process state; unchanged if it already is terminal
+        """
+        return self._append(process_id, {"type": "status", "status": CodeStatus.IN_PROGRESS.value})
+
+    def get_state(self, process_id: str) -> Optional[ProcessState]:
+        """
+        Get the state of a process.
+
+        Args:
+            process_id: ID of the process
+
+        Returns:
+            The process state, or None if the process does not exist
+        """
+        state, _, _ = self._load(process_id)
+        return state
+
+    def compact(self, process_id: str) -> Optional[ProcessState]:
+        """
+        Write a snapshot covering the whole event log of a process.
+
+        Args:
+            process_id: ID of the process
+
+        Returns:
+            The process state, or None if the process does not exist
+        """
+        if not self._log_path(process_id).exists():
+            return self.get_state(process_id)
+        with self._locked_log(process_id):
+            state, offset, tail = self._load(process_id)
+            if state is not None and tail:
+                self._write_snapshot(state, offset)
+        return state
+
+    def iter_process_ids(self) -> Iterator[str]:
+        """
+        Iterate lazily over the IDs of the stored processes.
+
+        Yields:
+            Process IDs, in directory order
+        """
+        if not self.state_dir.is_dir():
+            return
+        with os.scandir(self.state_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith(".events.jsonl"):
+                    yield entry.name[: -len(".events.jsonl")]
+                elif entry.name.endswith(".json") and not self._log_path(entry.name[:-5]).exists():
+                    # Snapshot written before the event log existed
+                    yield entry.name[:-5]
+
+    def read_events(self, process_id: str) -> List[Dict[str, Any]]:
+        """
+        Read the whole event log of a process.
+
+        Args:
+            process_id: ID of the process
+
+        Returns:
+            The events, oldest first
+        """
+        try:
+            with open(self._log_path(process_id), "rb") as f:
+                return [json.loads(line) for line in f if line.endswith(b"\n")]
+        except FileNotFoundError:
+            return []
+
+    def delete_process(self, process_id: str) -> None:
+        """
+        Delete the event log, snapshot and cancellation marker of a process.
+
+        Args:
+            process_id: ID of the process
+        """
+        with self._locked_log(process_id):
+            for path in (
+                self._snapshot_path(process_id),
+                self._cancel_path(process_id),
+                self._log_path(process_id),
+            ):
+                path.unlink(missing_ok=True)
+
+    def start_step(self, process_id: str, name: str) -> Optional[ProcessState]:
+        """
+        Record the start of a step.
+
+        Args:
+            process_id: ID of the process
+            name: Name of the step
+
+        Returns:
+            The updated process state
+        """
+        return self._append(process_id, {"type": "step_started", "step": name})
+
+    def end_step(
+        self, process_id: str, name: str, status: CodeStatus = CodeStatus.COMPLETED
+    ) -> Optional[ProcessState]:
+        """
+        Record the end of the most recent step with the given name.
+
+        Args:
+            process_id: ID of the process
+            name: Name of the step
+            status: Final status of the step
+
+        Returns:
+            The updated process state
+        """
+        return self._append(process_id, {"type": "step_ended", "step": name, "status": status.value})
+
+    def update_step_metadata(
+        self, process_id: str, name: str, metadata: Dict[str, Any]
+    ) -> Optional[ProcessState]:
+        """
+        Merge metadata into the most recent running step with the given name.
+
+        Args:
+            process_id: ID of the process
+            name: Name of the step
+            metadata: Metadata to merge
+
+        Returns:
+            The updated process state
+        """
+        return self._append(process_id, {"type": "step_metadata", "step": name, "metadata": metadata})
+
+    def add_artifact(self, process_id: str, artifact: Dict[str, Any]) -> Optional[ProcessState]:
+        """
+        Record an artifact produced by a process.
+
+        Args:
+            process_id: ID of the process
+            artifact: Artifact description (at least "name" and "path")
+
+        Returns:
+            The updated process state
+        """
+        return self._append(process_id, {"type": "artifact", "artifact": artifact})
+
+    def add_error(self, process_id: str, error: str) -> Optional[ProcessState]:
+        """
+        Record an error that occurred during a process.
+
+        Args:
+            process_id: ID of the process
+            error: Error message
+
+        Returns:
+            The updated process state
+        """
+        return self._append(process_id, {"type": "error", "error": error})
+
+    def record_resources(
+        self, process_id: str, resources: Dict[str, Any]
+    ) -> Optional[ProcessState]:
+        """
+        Merge resource usage of a run into the process state.
+
+        Resource usage is measured around the whole run, so it is accepted
+        after the process reached a terminal status.
+
+        Args:
+            process_id: ID of the process
+            resources: Resource usage (e.g. RSS in bytes, worker ID)
+
+        Returns:
+            The updated process state
+        """
+        return self._append(process_id, {"type": "resources", "resources": resources})
+
+    def finish(self, process_id: str, status: CodeStatus) -> Optional[ProcessState]:
+        """
+        Move a process to a terminal status.
+
+        Steps still in progress are closed with the same status.
+
+        Args:
+            process_id: ID of the process
+            status: Terminal status
+
+        Returns:
+            The updated process state
+        """
+        return self._append(process_id, {"type": "status", "status": status.value})
+
+    def request_cancel(self, process_id: str) -> Optional[ProcessState]:
+        """
+        Cancel a process.
+
+        The process is moved to the cancelled terminal state immediately and a
+        cancellation marker is left for the workflow runner, which may live in
+        another process, to stop its in-flight work.
+
+        Args:
+            process_id: ID of the process
+
+        Returns:
+            The process state after the request, or None if the process does not exist
+        """
+        from vulcan.workflow_engine.cancellation import cancellation_registry
+
+        state = self.get_state(process_id)
+        if state is None or state.is_terminal:
+            return state
+
+        self._cancel_path(process_id).touch()
+        cancellation_registry.cancel(process_id)
+        state = self.finish(process_id, CodeStatus.CANCELLED)
+        logger.info(f"Cancellation requested for process {process_id}")
+        return state
+
+    def is_cancel_requested(self, process_id: str) -> bool:
+        """
+        Check whether cancellation of a process was requested.
+
+        Args:
+            process_id: ID of the process
+
+        Returns:
+            True if the process should stop
+        """
+        return self._cancel_path(process_id).exists()
+
+    async def get_state_async(self, process_id: str) -> Optional[ProcessState]:
+        """Asynchronous variant of `get_state`."""
+        return await asyncio.to_thread(self.get_state, process_id)
+
+    async def request_cancel_async(self, process_id: str) -> Optional[ProcessState]:
+        """Asynchronous variant of `request_cancel`."""
+        return await asyncio.to_thread(self.request_cancel, process_id)
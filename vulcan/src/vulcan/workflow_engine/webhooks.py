@@ -0,0 +1,268 @@
+"""
+Delivery of completion webhooks.
+"""
+import asyncio
+import concurrent.futures
+import hashlib
+import hmac
+import json
+import logging
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, Optional, Set
+
+import httpx
+
+from vulcan.config.workflow_config import (
+    WEBHOOK_BACKOFF_BASE,
+    WEBHOOK_BACKOFF_MAX,
+    WEBHOOK_LOG_PATH,
+    WEBHOOK_MAX_ATTEMPTS,
+    WEBHOOK_MAX_CONNECTIONS,
+    WEBHOOK_SECRET,
+    WEBHOOK_TIMEOUT,
+)
+from vulcan.infra.interface.http_retry import backoff_delay, is_retryable_status, parse_retry_after
+
+
+logger = logging.getLogger(__name__)
+
+
+def sign_payload(secret: str, timestamp: str, body: bytes) -> str:
+    """
+    Compute the signature of a webhook body.
+
+    Receivers recompute it over `<timestamp>.<body>` and compare it with the
+    X-Vulcan-Signature header; the timestamp lets them reject replays.
+
+    Args:
+        secret: Shared secret
+        timestamp: Value of the X-Vulcan-Timestamp header
+        body: Raw request body
+
+    Returns:
+        The signature, as "sha256=<hex digest>"
+    """
+    digest = hmac.new(
+        secret.encode("utf-8"), timestamp.encode("utf-8") + b"." + body, hashlib.sha256
+    ).hexdigest()
+    return f"sha256={digest}"
+
+
+class WebhookDispatcher:
+    """
+    Delivers webhooks in the background with retries.
+
+    Deliveries run on a dedicated event loop thread sharing one pooled HTTP
+    client, so that callers (workflows, the state store) never wait on
+    receivers. Network errors, server errors and throttling are retried with
+    exponential backoff and jitter, honouring Retry-After; other client
+    errors are final. Every attempt is appended to a JSONL delivery log.
+    Without a secret, payloads could not be authenticated by the receivers
+    and are not delivered.
+    """
+
+    def __init__(
+        self,
+        secret: str = WEBHOOK_SECRET,
+        max_attempts: int = WEBHOOK_MAX_ATTEMPTS,
+        backoff_base: float = WEBHOOK_BACKOFF_BASE,
+        backoff_max: float = WEBHOOK_BACKOFF_MAX,
+        timeout: float = WEBHOOK_TIMEOUT,
+        max_connections: int = WEBHOOK_MAX_CONNECTIONS,
+        log_path: Optional[Path] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        """
+        Initialize the dispatcher; its thread starts with the first delivery.
+
+        Args:
+            secret: Secret the payloads are signed with; empty to deliver nothing
+            max_attempts: Maximum number of attempts per delivery
+            backoff_base: Delay before the first retry, in seconds
+            backoff_max: Maximum delay between two attempts, in seconds
+            timeout: Timeout of one attempt, in seconds
+            max_connections: Maximum number of pooled connections
+            log_path: Path of the delivery log
+            transport: HTTP transport, for tests
+        """
+        self.secret = secret
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.log_path = Path(log_path or WEBHOOK_LOG_PATH)
+        self.transport = transport
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._client: Optional[httpx.AsyncClient] = None
+        self._pending: Set[concurrent.futures.Future] = set()
+
+    def _ensure_started(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(
+                    target=self._loop.run_forever, name="webhook-dispatcher", daemon=True
+                )
+                self._thread.start()
+            return self._loop
+
+    def _get_client(self) -> httpx.AsyncClient:
+        # Created on the dispatcher loop, which owns its connections
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                ),
+                transport=self.transport,
+            )
+        return self._client
+
+    def submit(self, url: str, payload: Dict[str, Any]) -> concurrent.futures.Future:
+        """
+        Queue a delivery; never blocks on the receiver.
+
+        Args:
+            url: URL to POST the payload to
+            payload: JSON payload, with an "event" name
+
+        Returns:
+            Future resolving to True once delivered, False once abandoned
+        """
+        if not self.secret:
+            logger.error(
+                f"Not delivering {payload.get('event', '')} webhook to {url}: "
+                f"VULCAN_WEBHOOK_SECRET is not set"
+            )
+            future: concurrent.futures.Future = concurrent.futures.Future()
+            future.set_result(False)
+            return future
+        loop = self._ensure_started()
+        future = asyncio.run_coroutine_threadsafe(self.deliver(str(url), payload), loop)
+        with self._lock:
+            self._pending.add(future)
+        future.add_done_callback(self._discard)
+        return future
+
+    def _discard(self, future: concurrent.futures.Future) -> None:
+        with self._lock:
+            self._pending.discard(future)
+
+    def _log(self, record: Dict[str, Any]) -> None:
+        try:
+            self.log_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.log_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record) + "\n")
+        except OSError as e:
+            logger.error(f"Error writing webhook delivery log: {str(e)}")
+
+    async def deliver(self, url: str, payload: Dict[str, Any]) -> bool:
+        """
+        Deliver a payload, retrying until it is accepted or abandoned.
+
+        Args:
+            url: URL to POST the payload to
+            payload: JSON payload, with an "event" name
+
+        Returns:
+            True if the receiver accepted the payload
+        """
+        client = self._get_client()
+        delivery_id = str(uuid.uuid4())
+        event = payload.get("event", "")
+        body = json.dumps(payload).encode("utf-8")
+
+        for attempt in range(1, self.max_attempts + 1):
+            timestamp = str(int(time.time()))
+            headers = {
+                "Content-Type": "application/json",
+                "User-Agent": "vulcan-webhooks",
+                "X-Vulcan-Event": event,
+                "X-Vulcan-Delivery": delivery_id,
+                "X-Vulcan-Timestamp": timestamp,
+                "X-Vulcan-Signature": sign_payload(self.secret, timestamp, body),
+            }
+            record = {
+                "delivery_id": delivery_id,
+                "event": event,
+                "process_id": payload.get("process_id"),
+                "url": url,
+                "attempt": attempt,
+                "time": time.time(),
+                "status_code": None,
+                "error": None,
+            }
+
+            delivered, retryable, retry_after = False, True, None
+            started = time.monotonic()
+            try:
+                response = await client.post(url, content=body, headers=headers)
+                record["status_code"] = response.status_code
+                delivered = response.is_success
+                retryable = is_retryable_status(response.status_code)
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            except httpx.HTTPError as e:
+                record["error"] = f"{type(e).__name__}: {str(e)}"
+            record["duration"] = round(time.monotonic() - started, 3)
+
+            if delivered:
+                record["outcome"] = "delivered"
+            elif retryable and attempt < self.max_attempts:
+                record["outcome"] = "retrying"
+            else:
+                record["outcome"] = "failed"
+            await asyncio.to_thread(self._log, record)
+
+            if record["outcome"] == "delivered":
+                logger.info(f"Delivered {event} webhook {delivery_id} to {url}")
+                return True
+            if record["outcome"] == "failed":
+                break
+            await asyncio.sleep(
+                backoff_delay(attempt, self.backoff_base, self.backoff_max, retry_after)
+            )
+
+        logger.error(
+            f"Abandoned {event} webhook {delivery_id} to {url} after {attempt} attempts"
+        )
+        return False
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """
+        Wait for pending deliveries, then stop the dispatcher thread.
+
+        Args:
+            timeout: Maximum time to wait for pending deliveries, in seconds
+        """
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            pending = list(self._pending)
+        if loop is None:
+            return
+        concurrent.futures.wait(pending, timeout=timeout)
+        for future in pending:
+            future.cancel()
+
+        async def _close_client():
+            if self._client is not None:
+                await self._client.aclose()
+                self._client = None
+
+        asyncio.run_coroutine_threadsafe(_close_client(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+        with self._lock:
+            self._loop = None
+            self._thread = None
+
+
+# Dispatcher of the current process
+webhook_dispatcher = WebhookDispatcher()
@@ -0,0 +1,266 @@
+"""
+Workers draining the job queue of the workflow engine.
+"""
+import asyncio
+import logging
+import os
+import socket
+import uuid
+from dataclasses import asdict
+from typing import Any, Dict, Optional, Set
+
+from vulcan.config.workflow_config import (
+    JOB_HEARTBEAT_INTERVAL,
+    WORKER_CONCURRENCY,
+    WORKER_MAX_JOBS,
+    WORKER_MAX_RSS_MB,
+    WORKER_POLL_INTERVAL,
+)
+from vulcan.core.vulcan_core.models import CodeStatus, Requirements
+from vulcan.workflow_engine.memory import MemorySampler, current_rss
+from vulcan.workflow_engine.queue.job_queue import Job, JobQueue
+from vulcan.workflow_engine.state.workflow_state import WorkflowStateManager
+from vulcan.workflow_engine.workflows.base import BaseWorkflow
+from vulcan.workflow_engine.workflows.code_generation_flow import CodeGenerationWorkflow
+from vulcan.workflow_engine.workflows.deployment_flow import DeploymentWorkflow
+from vulcan.workflow_engine.workflows.testing_flow import TestingWorkflow
+
+
+logger = logging.getLogger(__name__)
+
+# Job type -> workflow class
+JOB_WORKFLOWS = {
+    CodeGenerationWorkflow.process_type: CodeGenerationWorkflow,
+    TestingWorkflow.process_type: TestingWorkflow,
+    DeploymentWorkflow.process_type: DeploymentWorkflow,
+}
+
+
+def encode_payload(job_type: str, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Convert workflow arguments to a JSON-serializable job payload.
+
+    Args:
+        job_type: Type of workflow
+        kwargs: Keyword arguments of the workflow
+
+    Returns:
+        The job payload
+    """
+    payload = dict(kwargs)
+    if isinstance(payload.get("requirements"), Requirements):
+        payload["requirements"] = asdict(payload["requirements"])
+    for key in ("code_path", "output_dir"):
+        if payload.get(key) is not None:
+            payload[key] = str(payload[key])
+    return payload
+
+
+def decode_payload(job_type: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Convert a job payload back to workflow arguments.
+
+    Args:
+        job_type: Type of workflow
+        payload: Job payload
+
+    Returns:
+        Keyword arguments of the workflow
+    """
+    kwargs = dict(payload)
+    if job_type == CodeGenerationWorkflow.process_type:
+        kwargs["requirements"] = Requirements(**kwargs["requirements"])
+    return kwargs
+
+
+def enqueue_workflow(
+    job_type: str,
+    queue: Optional[JobQueue] = None,
+    state_manager: Optional[WorkflowStateManager] = None,
+    callback_url: Optional[str] = None,
+    **kwargs: Any,
+) -> str:
+    """
+    Create a queued process and enqueue the job running it.
+
+    Args:
+        job_type: Type of workflow ("code_generation", "testing", "deployment")
+        queue: Job queue
+        state_manager: Store for the process state
+        callback_url: URL notified once the process reaches a terminal status
+        **kwargs: Keyword arguments of the workflow
+
+    Returns:
+        ID of the created process
+    """
+    if job_type not in JOB_WORKFLOWS:
+        raise ValueError(f"Unknown job type: {job_type}")
+
+    queue = queue or JobQueue()
+    state_manager = state_manager or WorkflowStateManager()
+
+    state = state_manager.create_process(
+        job_type, status=CodeStatus.NOT_STARTED, callback_url=callback_url
+    )
+    queue.enqueue(job_type, state.process_id, encode_payload(job_type, kwargs))
+    logger.info(f"Enqueued {job_type} process {state.process_id}")
+    return state.process_id
+
+
+class Worker:
+    """
+    Leases jobs from the queue and runs their workflows.
+
+    Up to `concurrency` jobs run at once. Leases are kept alive with
+    heartbeats, and a job whose lease was lost (and may already run on
+    another worker) is abandoned without being completed. A worker that stops is drained: it leases no new job and
+    finishes the running ones. A worker stops by itself once it ran
+    `max_jobs` jobs or its RSS exceeds `max_rss_mb`, so that a supervising
+    pool can replace it with a fresh process.
+    """
+
+    def __init__(
+        self,
+        queue: Optional[JobQueue] = None,
+        state_manager: Optional[WorkflowStateManager] = None,
+        worker_id: Optional[str] = None,
+        concurrency: int = WORKER_CONCURRENCY,
+        poll_interval: float = WORKER_POLL_INTERVAL,
+        heartbeat_interval: float = JOB_HEARTBEAT_INTERVAL,
+        max_jobs: int = WORKER_MAX_JOBS,
+        max_rss_mb: int = WORKER_MAX_RSS_MB,
+    ):
+        """
+        Initialize the worker.
+
+        Args:
+            queue: Job queue
+            state_manager: Store for the process state
+            worker_id: Unique ID of the worker
+            concurrency: Maximum number of jobs running at once
+            poll_interval: Delay between polls of an empty queue, in seconds
+            heartbeat_interval: Delay between lease extensions, in seconds
+            max_jobs: Number of jobs after which the worker recycles (0 for no limit)
+            max_rss_mb: RSS ceiling above which the worker recycles (0 for no limit)
+        """
+        self.queue = queue or JobQueue()
+        self.state_manager = state_manager or WorkflowStateManager()
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.heartbeat_interval = heartbeat_interval
+        self.max_jobs = max_jobs
+        self.max_rss = max_rss_mb * 1024 * 1024
+        self.jobs_run = 0
+        self.jobs_completed = 0
+        self.recycle_reason: Optional[str] = None
+        self._stopping = asyncio.Event()
+
+    def stop(self) -> None:
+        """Stop leasing jobs; running jobs are finished."""
+        self._stopping.set()
+
+    async def _heartbeat(self, job: Job, workflow: BaseWorkflow) -> None:
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            if not await asyncio.to_thread(self.queue.heartbeat, job.job_id, self.worker_id):
+                logger.warning(
+                    f"Worker {self.worker_id} lost the lease of job {job.job_id}, abandoning its run"
+                )
+                workflow.abandon()
+                return
+
+    def _check_recycle(self) -> None:
+        if self.max_jobs and self.jobs_run >= self.max_jobs:
+            self.recycle_reason = f"ran {self.jobs_run} jobs"
+        elif self.max_rss and current_rss() > self.max_rss:
+            self.recycle_reason = f"RSS of {current_rss() // (1024 * 1024)} MB"
+        else:
+            return
+        logger.info(f"Recycling worker {self.worker_id}: {self.recycle_reason}")
+        self.stop()
+
+    async def run_job(self, job: Job) -> Any:
+        """
+        Run the workflow of a leased job.
+
+        The memory of the worker is sampled during the run and recorded in the
+        resources of the process.
+
+        Args:
+            job: Leased job
+
+        Returns:
+            The workflow result, or None if the job crashed or its lease was lost
+        """
+        workflow = JOB_WORKFLOWS[job.job_type](state_manager=self.state_manager)
+        heartbeat = asyncio.ensure_future(self._heartbeat(job, workflow))
+        sampler = MemorySampler()
+        try:
+            async with sampler:
+                result = await workflow.execute_queued_async(
+                    job.process_id, **decode_payload(job.job_type, job.payload)
+                )
+        except asyncio.CancelledError:
+            if not workflow.abandoned:
+                raise
+            logger.warning(f"Job {job.job_id} abandoned by worker {self.worker_id}")
+            return None
+        except Exception as e:
+            logger.error(f"Job {job.job_id} crashed on worker {self.worker_id}: {str(e)}")
+            if not await asyncio.to_thread(self.queue.fail, job.job_id, self.worker_id, str(e)):
+                await asyncio.to_thread(self.state_manager.add_error, job.process_id, str(e))
+                await asyncio.to_thread(
+                    self.state_manager.finish, job.process_id, CodeStatus.FAILED
+                )
+            return None
+        finally:
+            heartbeat.cancel()
+            self.jobs_run += 1
+            await asyncio.to_thread(
+                self.state_manager.record_resources,
+                job.process_id,
+                {"worker_id": self.worker_id, **sampler.to_dict()},
+            )
+            self._check_recycle()
+
+        await asyncio.to_thread(self.queue.complete, job.job_id, self.worker_id)
+        self.jobs_completed += 1
+        return result
+
+    def _fail_dead_jobs(self) -> None:
+        for job in self.queue.reap_expired():
+            logger.error(f"Job {job.job_id} abandoned after {job.attempts} attempts")
+            self.state_manager.add_error(job.process_id, "Worker lost after the last attempt")
+            self.state_manager.finish(job.process_id, CodeStatus.FAILED)
+
+    async def run(self) -> None:
+        """Drain the queue until stopped or recycled."""
+        logger.info(f"Worker {self.worker_id} started (concurrency {self.concurrency})")
+        running: Set[asyncio.Future] = set()
+        leased = 0
+
+        while not self._stopping.is_set() or running:
+            if not self._stopping.is_set():
+                await asyncio.to_thread(self._fail_dead_jobs)
+                while len(running) < self.concurrency and not (
+                    self.max_jobs and leased >= self.max_jobs
+                ):
+                    job = await asyncio.to_thread(self.queue.lease, self.worker_id)
+                    if job is None:
+                        break
+                    leased += 1
+                    running.add(asyncio.ensure_future(self.run_job(job)))
+
+            if running:
+                _, running = await asyncio.wait(
+                    running, timeout=self.poll_interval, return_when=asyncio.FIRST_COMPLETED
+                )
+                running = set(running)
+            else:
+                try:
+                    await asyncio.wait_for(self._stopping.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+
+        logger.info(f"Worker {self.worker_id} stopped after {self.jobs_run} jobs")
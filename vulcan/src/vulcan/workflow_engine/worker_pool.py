@@ -0,0 +1,191 @@
+"""
+Supervisor keeping a pool of worker processes alive.
+"""
+import asyncio
+import logging
+import signal
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from vulcan.config.workflow_config import (
+    AUTOSCALE_INTERVAL,
+    WORKER_PROCESSES,
+    WORKER_RESTART_DELAY,
+)
+from vulcan.workflow_engine.autoscaler import Autoscaler
+from vulcan.workflow_engine.metrics import Metrics
+from vulcan.workflow_engine.queue.job_queue import JobQueue
+
+
+logger = logging.getLogger(__name__)
+
+
+def worker_args(extra_args: Optional[List[str]] = None) -> List[str]:
+    """
+    Build the command line starting a single worker process.
+
+    Args:
+        extra_args: Additional arguments of the worker command
+
+    Returns:
+        Command line arguments
+    """
+    return [sys.executable, "-m", "vulcan.apps.cli.main", "worker", "--single", *(extra_args or [])]
+
+
+class WorkerPool:
+    """
+    Runs worker processes and replaces those that exit.
+
+    Workers exit by themselves when they are recycled (after a number of jobs
+    or above a memory ceiling) or when they crash; either way the pool starts
+    a fresh process in their slot. Stopping the pool forwards SIGTERM so that
+    every worker drains its running jobs before exiting.
+
+    With an autoscaler, the pool size follows the depth and wait time of the
+    job queue; workers removed by a scale-down are drained the same way.
+    """
+
+    def __init__(
+        self,
+        size: int = WORKER_PROCESSES,
+        args: Optional[List[str]] = None,
+        restart_delay: float = WORKER_RESTART_DELAY,
+        autoscaler: Optional[Autoscaler] = None,
+        queue: Optional[JobQueue] = None,
+        interval: float = AUTOSCALE_INTERVAL,
+        metrics: Optional[Metrics] = None,
+        metrics_dir: Optional[Path] = None,
+    ):
+        """
+        Initialize the pool.
+
+        Args:
+            size: Number of worker processes; the initial size when autoscaling
+            args: Command line of a worker process
+            restart_delay: Delay before replacing a worker that exited, in seconds
+            autoscaler: Optional autoscaler resizing the pool
+            queue: Job queue observed by the autoscaler
+            interval: Delay between two scaling evaluations, in seconds
+            metrics: Metrics of the pool
+            metrics_dir: Directory the metrics are written to
+        """
+        if autoscaler is not None:
+            size = min(max(size, autoscaler.min_size), autoscaler.max_size)
+        self.size = size
+        self.args = args or worker_args()
+        self.restart_delay = restart_delay
+        self.autoscaler = autoscaler
+        self.queue = queue
+        self.interval = interval
+        self.metrics = metrics or Metrics()
+        self.metrics_dir = metrics_dir
+        self.restarts = 0
+        self._processes: Dict[int, asyncio.subprocess.Process] = {}
+        self._slots: Dict[int, asyncio.Task] = {}
+        self._stopping = asyncio.Event()
+
+    def stop(self) -> None:
+        """Drain and stop all workers."""
+        self._stopping.set()
+        for process in self._processes.values():
+            if process.returncode is None:
+                process.send_signal(signal.SIGTERM)
+
+    def resize(self, size: int) -> None:
+        """
+        Change the number of worker processes.
+
+        Args:
+            size: New number of worker processes
+        """
+        self.size = size
+        for slot in range(size):
+            if slot not in self._slots:
+                self._slots[slot] = asyncio.ensure_future(self._run_slot(slot))
+        for slot, process in self._processes.items():
+            if slot >= size and process.returncode is None:
+                process.send_signal(signal.SIGTERM)
+
+    async def _run_slot(self, slot: int) -> None:
+        try:
+            while not self._stopping.is_set() and slot < self.size:
+                process = await asyncio.create_subprocess_exec(*self.args)
+                self._processes[slot] = process
+                if self._stopping.is_set() or slot >= self.size:
+                    process.send_signal(signal.SIGTERM)
+                logger.info(f"Started worker process {process.pid} in slot {slot}")
+
+                code = await process.wait()
+                if self._stopping.is_set() or slot >= self.size:
+                    break
+
+                logger.info(f"Worker process {process.pid} exited with code {code}, replacing it")
+                self.restarts += 1
+                self.metrics.inc(
+                    "vulcan_worker_pool_restarts_total",
+                    help_text="Worker processes replaced after they exited",
+                )
+                try:
+                    await asyncio.wait_for(self._stopping.wait(), self.restart_delay)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            self._processes.pop(slot, None)
+            self._slots.pop(slot, None)
+
+    def _record_metrics(
+        self, queue_depth: int, running: int, oldest_wait: float, desired_size: int
+    ) -> None:
+        self.metrics.set("vulcan_worker_pool_size", self.size, help_text="Worker processes in the pool")
+        self.metrics.set(
+            "vulcan_worker_pool_desired_size", desired_size,
+            help_text="Pool size called for by the current load",
+        )
+        self.metrics.set("vulcan_job_queue_depth", queue_depth, help_text="Jobs waiting to be leased")
+        self.metrics.set("vulcan_job_queue_running", running, help_text="Jobs leased by the workers")
+        self.metrics.set(
+            "vulcan_job_queue_oldest_wait_seconds", oldest_wait,
+            help_text="Wait time of the oldest waiting job",
+        )
+        self.metrics.write("worker_pool", self.metrics_dir)
+
+    async def autoscale(self) -> None:
+        """Evaluate the queue once and resize the pool if needed."""
+        queue_depth = await asyncio.to_thread(self.queue.depth)
+        running = await asyncio.to_thread(self.queue.running)
+        oldest_wait = await asyncio.to_thread(self.queue.oldest_wait)
+
+        decision = self.autoscaler.decide(queue_depth, oldest_wait, self.size, running=running)
+        if decision is not None:
+            self.metrics.inc(
+                "vulcan_worker_pool_scaling_decisions_total",
+                help_text="Resizes of the worker pool",
+                direction=decision.direction,
+            )
+            self.metrics.set(
+                "vulcan_worker_pool_last_scaling_timestamp_seconds", decision.timestamp,
+                help_text="Time of the last resize of the worker pool",
+                direction=decision.direction,
+            )
+            self.resize(decision.size)
+
+        desired_size = self.autoscaler.desired_size(queue_depth, oldest_wait, self.size, running)
+        await asyncio.to_thread(self._record_metrics, queue_depth, running, oldest_wait, desired_size)
+
+    async def run(self) -> None:
+        """Run the pool until stopped."""
+        self.resize(self.size)
+        while not self._stopping.is_set():
+            if self.autoscaler is not None:
+                try:
+                    await self.autoscale()
+                except Exception as e:
+                    logger.error(f"Error autoscaling the worker pool: {str(e)}")
+            try:
+                await asyncio.wait_for(self._stopping.wait(), self.interval)
+            except asyncio.TimeoutError:
+                pass
+
+        await asyncio.gather(*list(self._slots.values()))
@@ -0,0 +1,3 @@
+"""
+Workflow definitions for the Vulcan workflow engine.
+"""
@@ -0,0 +1,217 @@
+"""
+Base class for the Vulcan workflows.
+"""
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+
+from vulcan.config.workflow_config import CANCEL_POLL_INTERVAL
+from vulcan.core.vulcan_core.models import CodeStatus
+from vulcan.workflow_engine.cancellation import (
+    CancellationToken,
+    ProcessCancelledError,
+    cancellation_registry,
+)
+from vulcan.workflow_engine import concurrency
+from vulcan.workflow_engine.concurrency import StageLimiter
+from vulcan.workflow_engine.state.workflow_state import WorkflowStateManager
+
+
+logger = logging.getLogger(__name__)
+
+
+class BaseWorkflow:
+    """
+    Base class of the code generation, testing, and deployment workflows.
+
+    Subclasses implement `_run` and `_failure_result`. The base class records
+    the process state, runs the workflow body as a task that is cancelled as
+    soon as the process is cancelled, and maps the outcome to a terminal status.
+    """
+
+    process_type = "process"
+
+    def __init__(
+        self,
+        state_manager: Optional[WorkflowStateManager] = None,
+        stage_limiter: Optional[StageLimiter] = None,
+    ):
+        """
+        Initialize the workflow.
+
+        Args:
+            state_manager: Store for the process state
+            stage_limiter: Concurrency limits of the resource stages
+        """
+        self.state_manager = state_manager or WorkflowStateManager()
+        self.stage_limiter = stage_limiter or concurrency.stage_limiter
+        self.process_id: Optional[str] = None
+        self.token: Optional[CancellationToken] = None
+        self.abandoned = False
+        self._task: Optional[asyncio.Future] = None
+
+    async def _run(self, *args: Any, **kwargs: Any) -> Any:
+        """Run the workflow body and return its result."""
+        raise NotImplementedError
+
+    def _failure_result(self, error_message: str) -> Any:
+        """Build the result returned when the workflow fails or is cancelled."""
+        raise NotImplementedError
+
+    @asynccontextmanager
+    async def step(
+        self, name: str, stage: Optional[str] = None, key: Optional[str] = None
+    ) -> AsyncIterator[None]:
+        """
+        Record a step of the workflow around the wrapped block.
+
+        Steps bound to a resource stage first wait for a slot of that stage;
+        the time spent queued is recorded in the step metadata. The state
+        store is written from a thread, so that its file locks and I/O never
+        block the event loop while slots are held.
+
+        Args:
+            name: Name of the step
+            stage: Resource stage the step uses (e.g. "llm", "sandbox")
+            key: Resource key within the stage (e.g. the repository URL)
+        """
+        await asyncio.to_thread(self.state_manager.start_step, self.process_id, name)
+        try:
+            if stage is None:
+                yield
+            else:
+                async with self.stage_limiter.acquire(stage, key) as queue_time:
+                    await asyncio.to_thread(
+                        self.state_manager.update_step_metadata,
+                        self.process_id,
+                        name,
+                        {"stage": stage, "queue_time": round(queue_time, 3)},
+                    )
+                    yield
+        except (asyncio.CancelledError, ProcessCancelledError):
+            raise
+        except BaseException:
+            await asyncio.to_thread(
+                self.state_manager.end_step, self.process_id, name, CodeStatus.FAILED
+            )
+            raise
+        await asyncio.to_thread(
+            self.state_manager.end_step, self.process_id, name, CodeStatus.COMPLETED
+        )
+
+    def abandon(self) -> None:
+        """
+        Stop the run without recording a terminal status.
+
+        Used once the process belongs to another runner, e.g. when a worker
+        lost the lease of its job; the awaiting caller gets a CancelledError.
+        """
+        self.abandoned = True
+        if self._task is not None:
+            self._task.cancel()
+
+    async def _watch_remote_cancellation(self) -> None:
+        # Cancellation requested from another interpreter (CLI, other API node)
+        # only leaves a marker in the state store.
+        while not self.token.cancelled:
+            requested = await asyncio.to_thread(
+                self.state_manager.is_cancel_requested, self.process_id
+            )
+            if requested:
+                self.token.cancel()
+                return
+            await asyncio.sleep(CANCEL_POLL_INTERVAL)
+
+    async def execute_async(
+        self, *args: Any, callback_url: Optional[str] = None, **kwargs: Any
+    ) -> Any:
+        """
+        Execute the workflow.
+
+        Args:
+            callback_url: URL notified once the process reaches a terminal status
+
+        Returns:
+            The workflow result; failures and cancellation are reported in it
+        """
+        state = await asyncio.to_thread(
+            self.state_manager.create_process, self.process_type, callback_url=callback_url
+        )
+        self.process_id = state.process_id
+        return await self._execute(args, kwargs)
+
+    async def execute_queued_async(self, process_id: str, **kwargs: Any) -> Any:
+        """
+        Execute the workflow for a process created when its job was enqueued.
+
+        Args:
+            process_id: ID of the queued process
+
+        Returns:
+            The workflow result; failures and cancellation are reported in it
+        """
+        self.process_id = process_id
+        state = await asyncio.to_thread(self.state_manager.start_process, process_id)
+        if state is None:
+            state = await asyncio.to_thread(
+                self.state_manager.create_process, self.process_type, process_id
+            )
+        if state.is_terminal:
+            # Cancelled while waiting in the queue
+            return self._failure_result(f"Process already {state.status.name.lower()}")
+        return await self._execute((), kwargs)
+
+    async def _execute(self, args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> Any:
+        self.token = cancellation_registry.register(self.process_id)
+
+        loop = asyncio.get_running_loop()
+        task = self._task = asyncio.ensure_future(self._run(*args, **kwargs))
+        remove_callback = self.token.add_callback(
+            lambda: loop.call_soon_threadsafe(task.cancel)
+        )
+        watcher = asyncio.ensure_future(self._watch_remote_cancellation())
+
+        try:
+            result = await task
+        except (asyncio.CancelledError, ProcessCancelledError):
+            if self.abandoned:
+                raise asyncio.CancelledError()
+            if not self.token.cancelled:
+                # The caller itself was cancelled; the process is abandoned.
+                await asyncio.to_thread(
+                    self.state_manager.finish, self.process_id, CodeStatus.CANCELLED
+                )
+                raise
+            logger.info(f"{self.process_type} process {self.process_id} cancelled")
+            await asyncio.to_thread(
+                self.state_manager.finish, self.process_id, CodeStatus.CANCELLED
+            )
+            return self._failure_result("Process cancelled")
+        except Exception as e:
+            logger.error(f"{self.process_type} process {self.process_id} failed: {str(e)}")
+            await asyncio.to_thread(self.state_manager.add_error, self.process_id, str(e))
+            await asyncio.to_thread(
+                self.state_manager.finish, self.process_id, CodeStatus.FAILED
+            )
+            return self._failure_result(str(e))
+        finally:
+            self._task = None
+            watcher.cancel()
+            remove_callback()
+            cancellation_registry.unregister(self.process_id)
+
+        if not result.success and result.error_message:
+            await asyncio.to_thread(
+                self.state_manager.add_error, self.process_id, result.error_message
+            )
+        await asyncio.to_thread(
+            self.state_manager.finish,
+            self.process_id,
+            CodeStatus.COMPLETED if result.success else CodeStatus.FAILED,
+        )
+        return result
+
+    def execute(self, *args: Any, **kwargs: Any) -> Any:
+        """Synchronous variant of `execute_async`."""
+        return asyncio.run(self.execute_async(*args, **kwargs))
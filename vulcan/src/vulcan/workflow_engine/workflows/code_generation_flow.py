@@ -0,0 +1,577 @@
+"""
+Workflow generating code from user requirements.
+"""
+import asyncio
+import logging
+import os
+import shutil
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+from vulcan.config.workflow_config import WORKSPACE_DIR
+from vulcan.core.vulcan_core.models import (
+    CodeArtifact,
+    CodeGeneration,
+    CodeMetadata,
+    CodeStatus,
+    Requirements,
+    TestResult,
+)
+from vulcan.github_integration.services.repository_service import RepositoryService
+from vulcan.llm_services.services.code_generator import ArtifactCallback, CodeGenerator
+from vulcan.llm_services.services.code_index import get_code_index
+from vulcan.llm_services.services.code_planner import (
+    CodePlanner,
+    FilePlan,
+    check_consistency,
+    merge_generations,
+)
+from vulcan.llm_services.services.code_repair import CodeRepairer
+from vulcan.llm_services.services.context_packer import (
+    CANDIDATES_PER_SNIPPET,
+    PackedContext,
+    pack_context,
+)
+from vulcan.llm_services.services.example_index import Example, ExampleIndex, get_example_index
+from vulcan.llm_services.services.model_router import RoutingDecision
+from vulcan.llm_services.services.symbol_index import get_symbol_index, render_stubs
+from vulcan.llm_services.services.token_budget import count_tokens
+from vulcan.testing_framework.services.test_runner import TestRunner, TestRunReport
+from vulcan.workflow_engine.concurrency import StageLimiter
+from vulcan.workflow_engine.state.workflow_state import WorkflowStateManager
+from vulcan.workflow_engine.workflows.base import BaseWorkflow
+from vulcan.workflow_engine.workflows.testing_flow import TestingResult, TestingWorkflow, write_workspace
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CodeGenerationResult:
+    """Result of the code generation workflow."""
+    success: bool
+    process_id: str
+    artifacts: List[CodeArtifact] = field(default_factory=list)
+    metadata: Optional[CodeMetadata] = None
+    test_results: List[TestResult] = field(default_factory=list)
+    error_message: Optional[str] = None
+
+
+def write_file(path: Path, content: str) -> None:
+    """
+    Write a generated file, creating its parent directories.
+
+    Args:
+        path: Destination path
+        content: File content
+    """
+    os.makedirs(path.parent, exist_ok=True)
+    path.write_text(content, encoding="utf-8")
+
+
+def candidate_variants(
+    count: int, temperatures: str, models: str = ""
+) -> List[Tuple[Optional[str], Optional[float]]]:
+    """
+    Get the model and temperature of each best-of-N candidate.
+
+    Args:
+        count: Number of candidates
+        temperatures: Comma-separated temperatures, cycled over the candidates
+        models: Comma-separated models, cycled over the candidates; empty for
+            the configured or routed model
+
+    Returns:
+        (model, temperature) pairs; None stands for the default
+    """
+    temperature_list = [float(t) for t in temperatures.split(",") if t.strip()] or [None]
+    model_list = [m.strip() for m in models.split(",") if m.strip()] or [None]
+    return [
+        (model_list[index % len(model_list)], temperature_list[index % len(temperature_list)])
+        for index in range(count)
+    ]
+
+
+def _as_report(result: TestingResult) -> TestRunReport:
+    # Exit code 1 (tests failed) and 2 (session failed) keep `ran` meaningful
+    return TestRunReport(
+        exit_code=0 if result.all_passed else 1 if result.success else 2,
+        test_results=result.test_results,
+        output=result.error_message or "",
+    )
+
+
+class CodeGenerationWorkflow(BaseWorkflow):
+    """Generates code for requirements and optionally writes it to disk."""
+
+    process_type = "code_generation"
+
+    def __init__(
+        self,
+        code_generator: Optional[CodeGenerator] = None,
+        state_manager: Optional[WorkflowStateManager] = None,
+        stage_limiter: Optional[StageLimiter] = None,
+        test_runner: Optional[TestRunner] = None,
+        workspace_dir: Optional[Path] = None,
+        code_repairer: Optional[CodeRepairer] = None,
+        code_planner: Optional[CodePlanner] = None,
+        repository_service: Optional[RepositoryService] = None,
+        example_index: Optional[ExampleIndex] = None,
+    ):
+        """
+        Initialize the workflow.
+
+        Args:
+            code_generator: Code generator; created from the configuration if omitted
+            state_manager: Store for the process state
+            stage_limiter: Concurrency limits of the resource stages
+            test_runner: Test runner of the generated code
+            workspace_dir: Directory in which generated code is tested
+            code_repairer: Repairer of failing code; shares the code generator's
+                client and configuration if omitted
+            code_planner: Planner of multi-file generations; shares the code
+                generator's client and configuration if omitted
+            repository_service: Service checking out the repositories code is
+                generated for
+            example_index: Past generations whose tests passed, used as
+                few-shot examples; the index shared by the process if omitted
+        """
+        super().__init__(state_manager, stage_limiter)
+        self._code_generator = code_generator
+        self._code_repairer = code_repairer
+        self._code_planner = code_planner
+        self._repository_service = repository_service
+        self._example_index = example_index
+        self.test_runner = test_runner or TestRunner()
+        self.workspace_dir = Path(workspace_dir or WORKSPACE_DIR)
+
+    @property
+    def code_generator(self) -> CodeGenerator:
+        """The code generator, created on first use."""
+        if self._code_generator is None:
+            self._code_generator = CodeGenerator()
+        return self._code_generator
+
+    @property
+    def code_repairer(self) -> CodeRepairer:
+        """The code repairer, created on first use."""
+        if self._code_repairer is None:
+            self._code_repairer = CodeRepairer(
+                self.code_generator.llm_client, self.code_generator.config
+            )
+        return self._code_repairer
+
+    @property
+    def code_planner(self) -> CodePlanner:
+        """The code planner, created on first use."""
+        if self._code_planner is None:
+            self._code_planner = CodePlanner(
+                self.code_generator.llm_client, self.code_generator.config
+            )
+        return self._code_planner
+
+    @property
+    def repository_service(self) -> RepositoryService:
+        """The repository service, created on first use."""
+        if self._repository_service is None:
+            self._repository_service = RepositoryService(workspace_dir=self.workspace_dir)
+        return self._repository_service
+
+    @property
+    def example_index(self) -> ExampleIndex:
+        """The few-shot example index, the shared one unless given."""
+        if self._example_index is None:
+            self._example_index = get_example_index()
+        return self._example_index
+
+    def _failure_result(self, error_message: str) -> CodeGenerationResult:
+        return CodeGenerationResult(
+            success=False, process_id=self.process_id, error_message=error_message
+        )
+
+    async def _test(self, generation: CodeGeneration, step_name: str) -> TestRunReport:
+        code_content = {artifact.file_path: artifact.content for artifact in generation.artifacts}
+        workspace = None
+        try:
+            async with self.step(step_name, stage="sandbox"):
+                workspace = await asyncio.to_thread(write_workspace, code_content, self.workspace_dir)
+                return await self.test_runner.run(workspace, token=self.token)
+        finally:
+            if workspace is not None:
+                shutil.rmtree(workspace, ignore_errors=True)
+
+    async def _retrieve_context(
+        self,
+        requirements: Requirements,
+        expected_files: Sequence[str],
+        context_dir: Optional[Path],
+        repository_url: Optional[str],
+        repository_branch: Optional[str],
+    ) -> Tuple[Requirements, PackedContext]:
+        config = self.code_generator.config
+        async with self.step("Retrieve context"):
+            if repository_url is not None:
+                context_dir = await self.repository_service.checkout(
+                    repository_url, repository_branch, token=self.token
+                )
+            query = "\n".join([requirements.description, *requirements.constraints, *expected_files])
+
+            # Exact signatures of the symbols involved come first, as they are
+            # much smaller than the modules defining them
+            symbol_index = get_symbol_index(context_dir)
+            commit_sha = await self.repository_service.head_commit(context_dir, token=self.token)
+            changed = None
+            if not await asyncio.to_thread(symbol_index.load, commit_sha):
+                if commit_sha is not None and symbol_index.commit_sha is not None:
+                    changed = await self.repository_service.changed_files(
+                        context_dir, symbol_index.commit_sha, commit_sha, token=self.token
+                    )
+                await asyncio.to_thread(symbol_index.update, commit_sha, changed)
+            symbols = await asyncio.to_thread(
+                symbol_index.relevant, query, expected_files, config["retrieval_signatures"]
+            )
+            context = []
+            tokens = config["retrieval_tokens"]
+            if symbols:
+                stubs = f"Signatures:\n```python\n{render_stubs(symbols)}\n```"
+                context.append(stubs)
+                tokens -= count_tokens(stubs, config["model"])
+
+            # Only the files changed since the last generation are indexed again
+            index = get_code_index(context_dir)
+            await asyncio.to_thread(index.update)
+            top_k = config["retrieval_top_k"]
+            snippets = await asyncio.to_thread(
+                index.search, query, top_k=top_k * CANDIDATES_PER_SNIPPET
+            )
+            packed = pack_context(
+                snippets,
+                max(0, tokens),
+                model=config["model"],
+                max_snippets=top_k,
+            )
+            context.extend(packed.render())
+            await asyncio.to_thread(
+                self.state_manager.update_step_metadata,
+                self.process_id,
+                "Retrieve context",
+                {
+                    "commit_sha": commit_sha,
+                    "indexed_files": index.file_count,
+                    "symbols": [f"{s.path}:{s.qualname}" for s in symbols],
+                    "snippets": [
+                        f"{s.path}:{s.start_line}-{s.end_line}" for s in packed.snippets
+                    ],
+                    "context_tokens_saved": packed.tokens_saved,
+                },
+            )
+        return replace(requirements, context=context), packed
+
+    async def _generate_planned(
+        self,
+        requirements: Requirements,
+        expected_files: Sequence[str],
+        routing: Optional[RoutingDecision],
+        on_artifact: Optional[ArtifactCallback],
+    ) -> Optional[CodeGeneration]:
+        try:
+            async with self.step("Plan files", stage="llm"):
+                plan = await self.code_planner.plan(
+                    requirements, expected_files, model=routing.model if routing else None
+                )
+                await asyncio.to_thread(
+                    self.state_manager.update_step_metadata,
+                    self.process_id,
+                    "Plan files",
+                    {"files": [f.path for f in plan.files]},
+                )
+        except ValueError as e:
+            logger.warning(f"Planning failed, generating all files at once: {str(e)}")
+            return None
+
+        plan_text = plan.render()
+
+        async def generate_file(file_plan: FilePlan) -> CodeGeneration:
+            async with self.step(f"Generate {file_plan.path}", stage="llm"):
+                return await self.code_generator.generate(
+                    requirements,
+                    expected_files=[file_plan.path],
+                    on_artifact=on_artifact,
+                    routing=routing,
+                    plan=plan_text,
+                )
+
+        # Files are generated concurrently, each against the shared plan
+        tasks = [asyncio.ensure_future(generate_file(file_plan)) for file_plan in plan.files]
+        try:
+            generations = await asyncio.gather(*tasks)
+        finally:
+            # The other files are abandoned if one fails
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        generation = merge_generations(requirements, plan, generations)
+
+        async with self.step("Check consistency"):
+            issues = check_consistency(plan, generation.artifacts)
+            await asyncio.to_thread(
+                self.state_manager.update_step_metadata,
+                self.process_id,
+                "Check consistency",
+                {"issues": issues},
+            )
+        if issues:
+            logger.warning(f"Planned files are inconsistent: {'; '.join(issues)}")
+            generation.metadata.additional_info["consistency_issues"] = str(len(issues))
+        return generation
+
+    async def _race(
+        self,
+        requirements: Requirements,
+        expected_files: Sequence[str],
+        routing: Optional[RoutingDecision],
+        count: int,
+    ) -> Tuple[CodeGeneration, Optional[TestRunReport]]:
+        config = self.code_generator.config
+        variants = candidate_variants(
+            count, config["candidate_temperatures"], config["candidate_models"]
+        )
+
+        async def attempt(
+            index: int, model: Optional[str], temperature: Optional[float]
+        ) -> Tuple[int, CodeGeneration, Optional[TestingResult]]:
+            step_name = f"Generate candidate {index}"
+            try:
+                async with self.step(step_name, stage="llm"):
+                    generation = await self.code_generator.generate(
+                        requirements,
+                        expected_files=expected_files,
+                        routing=routing,
+                        model=model,
+                        temperature=temperature,
+                        use_cache=False,
+                    )
+                if not generation.artifacts:
+                    return index, generation, None
+
+                step_name = f"Test candidate {index}"
+                testing = TestingWorkflow(
+                    test_runner=self.test_runner,
+                    state_manager=self.state_manager,
+                    stage_limiter=self.stage_limiter,
+                    workspace_dir=self.workspace_dir,
+                )
+                async with self.step(step_name):
+                    code_content = {a.file_path: a.content for a in generation.artifacts}
+                    result = await testing.execute_async(code_content=code_content)
+                    await asyncio.to_thread(
+                        self.state_manager.update_step_metadata,
+                        self.process_id,
+                        step_name,
+                        {"testing_process_id": testing.process_id},
+                    )
+                return index, generation, result
+            except asyncio.CancelledError:
+                # Another candidate won; its testing process is cancelled with it
+                await asyncio.to_thread(
+                    self.state_manager.end_step, self.process_id, step_name, CodeStatus.CANCELLED
+                )
+                raise
+
+        tasks = [
+            asyncio.ensure_future(attempt(index, model, temperature))
+            for index, (model, temperature) in enumerate(variants, start=1)
+        ]
+        best: Optional[Tuple[int, int, CodeGeneration, Optional[TestRunReport]]] = None
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                try:
+                    index, generation, result = await next_done
+                except Exception as e:
+                    logger.warning(f"Code generation candidate failed: {str(e)}")
+                    continue
+                report = _as_report(result) if result is not None else None
+                generation.metadata.additional_info["candidate"] = str(index)
+                if result is not None and result.all_passed:
+                    logger.info(f"Candidate {index} of {count} passed its tests first")
+                    return generation, report
+                passing = sum(r.passed for r in result.test_results) if result else -1
+                if best is None or passing > best[0]:
+                    best = (passing, index, generation, report)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        if best is None:
+            raise RuntimeError("All code generation candidates failed")
+        return best[2], best[3]
+
+    async def _run(
+        self,
+        requirements: Requirements,
+        output_dir: Optional[Path] = None,
+        expected_files: Sequence[str] = (),
+        run_tests: bool = False,
+        candidates: Optional[int] = None,
+        plan_files: Optional[bool] = None,
+        context_dir: Optional[Path] = None,
+        repository_url: Optional[str] = None,
+        repository_branch: Optional[str] = None,
+    ) -> CodeGenerationResult:
+        written = set()
+
+        async def write_artifact(artifact: CodeArtifact) -> None:
+            # Files are written while the rest of the completion streams;
+            # their paths come from the model output
+            root = Path(output_dir).resolve()
+            path = (root / artifact.file_path).resolve()
+            if root not in path.parents:
+                raise ValueError(
+                    f"File path escapes the output directory: {artifact.file_path}"
+                )
+            await asyncio.to_thread(write_file, path, artifact.content)
+            # Repaired and escalated generations overwrite the previous files
+            if path not in written:
+                written.add(path)
+                await asyncio.to_thread(
+                    self.state_manager.add_artifact,
+                    self.process_id,
+                    {"name": artifact.file_path, "path": str(path)},
+                )
+
+        task = requirements
+        few_shot_examples = self.code_generator.config["few_shot_examples"]
+        examples: List[Example] = []
+        if few_shot_examples > 0 and not requirements.few_shot:
+            # Sub-millisecond lookup, so no step of its own is recorded
+            examples = await asyncio.to_thread(
+                self.example_index.select,
+                requirements,
+                few_shot_examples,
+                self.code_generator.config["few_shot_tokens"],
+                self.code_generator.config["model"],
+            )
+            requirements = replace(requirements, few_shot=[e.render() for e in examples])
+
+        packed: Optional[PackedContext] = None
+        if context_dir is not None or repository_url is not None:
+            requirements, packed = await self._retrieve_context(
+                requirements, expected_files, context_dir, repository_url, repository_branch
+            )
+
+        routing = self.code_generator.route(requirements, expected_files)
+        tier_label = ""
+        report: Optional[TestRunReport] = None
+        candidates = candidates or self.code_generator.config["candidates"]
+        if candidates > 1:
+            # Candidates race to pass their tests; only the winner is written
+            run_tests = True
+            generation, report = await self._race(requirements, expected_files, routing, candidates)
+            if output_dir is not None:
+                for artifact in generation.artifacts:
+                    await write_artifact(artifact)
+        else:
+            if plan_files is None:
+                plan_files = len(expected_files) >= self.code_generator.config["plan_min_files"]
+            generation = None
+            if plan_files:
+                generation = await self._generate_planned(
+                    requirements,
+                    expected_files,
+                    routing,
+                    write_artifact if output_dir is not None else None,
+                )
+            if generation is None:
+                async with self.step("Generate code", stage="llm"):
+                    generation = await self.code_generator.generate(
+                        requirements,
+                        expected_files=expected_files,
+                        on_artifact=write_artifact if output_dir is not None else None,
+                        routing=routing,
+                    )
+
+        repairs = 0
+        while run_tests and generation.artifacts:
+            if report is None:
+                repair_label = f" after repair {repairs}" if repairs else ""
+                report = await self._test(generation, f"Run tests{tier_label}{repair_label}")
+            passed = report.passed
+            if passed:
+                break
+
+            # Failures are first repaired with edits, then regenerated in full
+            # by the next larger model tier, if any
+            if repairs < self.code_repairer.max_iterations:
+                repairs += 1
+                async with self.step(f"Repair code{tier_label} {repairs}", stage="llm"):
+                    repaired = await self.code_repairer.repair(
+                        generation,
+                        report.test_results,
+                        output=report.output,
+                        model=routing.model if routing else None,
+                    )
+                if repaired.status == CodeStatus.COMPLETED:
+                    generation, report = repaired, None
+                    if output_dir is not None:
+                        for artifact in generation.artifacts:
+                            await write_artifact(artifact)
+                    continue
+
+            routing = self.code_generator.router.escalate(routing) if routing else None
+            if routing is None:
+                break
+            repairs = 0
+            tier_label = f" with {routing.model}"
+            async with self.step(f"Generate code{tier_label}", stage="llm"):
+                generation = await self.code_generator.generate(
+                    requirements,
+                    expected_files=expected_files,
+                    on_artifact=write_artifact if output_dir is not None else None,
+                    routing=routing,
+                )
+            report = None
+
+        if not generation.artifacts:
+            return self._failure_result("No code artifacts were generated")
+
+        if packed is not None:
+            generation.metadata.additional_info.update({
+                "context_tokens": str(packed.tokens),
+                "context_tokens_saved": str(packed.tokens_saved),
+            })
+
+        if examples:
+            generation.metadata.additional_info["few_shot_examples"] = ",".join(
+                example.example_id for example in examples
+            )
+
+        if run_tests and report.passed and few_shot_examples > 0:
+            # Only generations with passing tests are examples, never ones whose
+            # tests were not collected; the requirements are indexed as asked,
+            # without the added context
+            await asyncio.to_thread(self.example_index.add, task, generation.artifacts)
+
+        if output_dir is None:
+            for artifact in generation.artifacts:
+                await asyncio.to_thread(
+                    self.state_manager.add_artifact,
+                    self.process_id,
+                    {"name": artifact.file_path, "path": artifact.file_path},
+                )
+
+        result = CodeGenerationResult(
+            success=True,
+            process_id=self.process_id,
+            artifacts=generation.artifacts,
+            metadata=generation.metadata,
+        )
+        if run_tests:
+            result.test_results = report.test_results
+            if not passed:
+                result.success = False
+                result.error_message = (
+                    f"Tests of the generated code failed with exit code {report.exit_code}"
+                )
+        return result
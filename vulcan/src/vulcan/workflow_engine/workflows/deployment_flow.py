@@ -0,0 +1,103 @@
+"""
+Workflow deploying code to a GitHub repository.
+"""
+import asyncio
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from vulcan.github_integration.services.repository_service import RepositoryService
+from vulcan.workflow_engine.concurrency import StageLimiter
+from vulcan.workflow_engine.state.workflow_state import WorkflowStateManager
+from vulcan.workflow_engine.workflows.base import BaseWorkflow
+
+
+IGNORED_DIRECTORIES = {".git", "__pycache__", ".pytest_cache", ".venv", "node_modules"}
+
+
+@dataclass
+class DeploymentResult:
+    """Result of the deployment workflow."""
+    success: bool
+    process_id: str
+    deployment_url: Optional[str] = None
+    logs: List[str] = field(default_factory=list)
+    error_message: Optional[str] = None
+
+
+def read_code_content(code_path: Path) -> Dict[str, str]:
+    """
+    Read the files to deploy from a file or directory.
+
+    Args:
+        code_path: File or directory
+
+    Returns:
+        Mapping of relative file paths to content
+    """
+    code_path = Path(code_path)
+    if code_path.is_file():
+        return {code_path.name: code_path.read_text(encoding="utf-8")}
+
+    content = {}
+    for path in sorted(code_path.rglob("*")):
+        relative = path.relative_to(code_path)
+        if path.is_file() and not IGNORED_DIRECTORIES.intersection(relative.parts):
+            content[relative.as_posix()] = path.read_text(encoding="utf-8")
+    return content
+
+
+class DeploymentWorkflow(BaseWorkflow):
+    """Commits code to a branch of a GitHub repository and pushes it."""
+
+    process_type = "deployment"
+
+    def __init__(
+        self,
+        repository_service: Optional[RepositoryService] = None,
+        state_manager: Optional[WorkflowStateManager] = None,
+        stage_limiter: Optional[StageLimiter] = None,
+    ):
+        """
+        Initialize the workflow.
+
+        Args:
+            repository_service: Service performing the git operations
+            state_manager: Store for the process state
+            stage_limiter: Concurrency limits of the resource stages
+        """
+        super().__init__(state_manager, stage_limiter)
+        self.repository_service = repository_service or RepositoryService()
+
+    def _failure_result(self, error_message: str) -> DeploymentResult:
+        return DeploymentResult(success=False, process_id=self.process_id, error_message=error_message)
+
+    async def _run(
+        self,
+        repository_url: str,
+        code_path: Optional[Path] = None,
+        code_content: Optional[Dict[str, str]] = None,
+        branch: str = "main",
+        commit_message: str = "Deploy code via Vulcan",
+    ) -> DeploymentResult:
+        if code_content is None:
+            if code_path is None:
+                return self._failure_result("Either a code path or code content is required")
+            code_content = read_code_content(code_path)
+
+        async with self.step("Push to repository", stage="github_push", key=repository_url):
+            push = await self.repository_service.push_files(
+                code_content, repository_url, branch, commit_message, token=self.token
+            )
+
+        await asyncio.to_thread(
+            self.state_manager.add_artifact,
+            self.process_id,
+            {"name": push.commit_sha, "path": push.deployment_url},
+        )
+        return DeploymentResult(
+            success=True,
+            process_id=self.process_id,
+            deployment_url=push.deployment_url,
+            logs=push.logs,
+        )
@@ -0,0 +1,121 @@
+"""
+Workflow running tests on code.
+"""
+import shutil
+import tempfile
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from vulcan.config.workflow_config import WORKSPACE_DIR
+from vulcan.core.vulcan_core.models import TestCoverage, TestResult
+from vulcan.testing_framework.services.test_runner import TestRunner
+from vulcan.workflow_engine.concurrency import StageLimiter
+from vulcan.workflow_engine.state.workflow_state import WorkflowStateManager
+from vulcan.workflow_engine.workflows.base import BaseWorkflow
+
+
+@dataclass
+class TestingResult:
+    """Result of the testing workflow."""
+    success: bool
+    process_id: str
+    test_results: List[TestResult] = field(default_factory=list)
+    coverage: Optional[TestCoverage] = None
+    error_message: Optional[str] = None
+
+    @property
+    def all_passed(self) -> bool:
+        """Whether tests ran and all of them passed; no collected test is no pass."""
+        return (
+            self.success
+            and bool(self.test_results)
+            and all(result.passed for result in self.test_results)
+        )
+
+
+def write_workspace(code_content: Dict[str, str], workspace_dir: Path) -> Path:
+    """
+    Write code content to a fresh workspace directory.
+
+    Args:
+        code_content: Mapping of file paths to content
+        workspace_dir: Parent directory of the workspaces
+
+    Returns:
+        Path to the workspace
+    """
+    workspace_dir.mkdir(parents=True, exist_ok=True)
+    workspace = Path(tempfile.mkdtemp(prefix="testing-", dir=workspace_dir)).resolve()
+    for file_path, content in code_content.items():
+        target = (workspace / file_path).resolve()
+        if workspace not in target.parents:
+            raise ValueError(f"File path escapes the workspace: {file_path}")
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_text(content, encoding="utf-8")
+    return workspace
+
+
+class TestingWorkflow(BaseWorkflow):
+    """Runs the tests of code given as a path or as file contents."""
+
+    process_type = "testing"
+
+    def __init__(
+        self,
+        test_runner: Optional[TestRunner] = None,
+        state_manager: Optional[WorkflowStateManager] = None,
+        stage_limiter: Optional[StageLimiter] = None,
+        workspace_dir: Optional[Path] = None,
+    ):
+        """
+        Initialize the workflow.
+
+        Args:
+            test_runner: Test runner
+            state_manager: Store for the process state
+            stage_limiter: Concurrency limits of the resource stages
+            workspace_dir: Directory in which code content is materialized
+        """
+        super().__init__(state_manager, stage_limiter)
+        self.test_runner = test_runner or TestRunner()
+        self.workspace_dir = Path(workspace_dir or WORKSPACE_DIR)
+
+    def _failure_result(self, error_message: str) -> TestingResult:
+        return TestingResult(success=False, process_id=self.process_id, error_message=error_message)
+
+    async def _run(
+        self,
+        code_path: Optional[Path] = None,
+        generate_coverage: bool = False,
+        code_content: Optional[Dict[str, str]] = None,
+    ) -> TestingResult:
+        if code_path is None and code_content is None:
+            return self._failure_result("Either a code path or code content is required")
+
+        workspace = None
+        try:
+            if code_content is not None:
+                async with self.step("Prepare workspace"):
+                    workspace = write_workspace(code_content, self.workspace_dir)
+                code_path = workspace
+
+            async with self.step("Run tests", stage="sandbox"):
+                report = await self.test_runner.run(
+                    Path(code_path), generate_coverage=generate_coverage, token=self.token
+                )
+        finally:
+            if workspace is not None:
+                shutil.rmtree(workspace, ignore_errors=True)
+
+        if not report.ran:
+            return self._failure_result(
+                f"Test session failed with exit code {report.exit_code}: {report.output[-2000:]}"
+            )
+
+        return TestingResult(
+            success=True,
+            process_id=self.process_id,
+            test_results=report.test_results,
+            coverage=report.coverage,
+        )
@@ -10,6 +10,7 @@ from vulcan.apps.api.models.requests import (
     DeployCodeRequest,
     StatusRequest,
 )
+from vulcan.workflow_engine.webhooks import webhook_dispatcher
 
 
 def test_generate_code_request_valid():
@@ -141,4 +142,28 @@ def test_status_request_invalid():
     """Test that an invalid StatusRequest raises a validation error."""
     # Try to create an invalid request (missing required field)
     with pytest.raises(ValidationError):
-        StatusRequest()
\ No newline at end of file
+        StatusRequest()
+
+def test_callback_url_requires_webhook_secret(monkeypatch):
+    """Test that callbacks are refused when they could not be signed."""
+    monkeypatch.setattr(webhook_dispatcher, "secret", "")
+    with pytest.raises(ValidationError, match="no webhook secret"):
+        TestCodeRequest(code_content={}, callback_url="https://example.com/hooks/vulcan")
+
+    monkeypatch.setattr(webhook_dispatcher, "secret", "secret")
+    request = TestCodeRequest(code_content={}, callback_url="https://example.com/hooks/vulcan")
+    assert request.callback_url == "https://example.com/hooks/vulcan"
+
+
+@pytest.mark.parametrize(
+    "url",
+    ["http://localhost:8000/hook", "http://127.0.0.1/hook", "http://[::1]/hook",
+     "http://10.0.0.7/hook", "http://169.254.169.254/latest"],
+)
+def test_callback_url_rejects_internal_hosts(monkeypatch, url):
+    """Test that callbacks may not target loopback or private hosts."""
+    monkeypatch.setattr(webhook_dispatcher, "secret", "secret")
+    with pytest.raises(ValidationError, match="loopback or private host"):
+        DeployCodeRequest(
+            code_content={}, repository_url="https://github.com/a/b.git", callback_url=url
+        )
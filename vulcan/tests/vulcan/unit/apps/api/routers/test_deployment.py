@@ -64,6 +64,7 @@ async def test_deploy_code_success(mock_workflow_class):
         repository_url=request.repository_url,
         branch=request.branch,
         commit_message=request.commit_message,
+        callback_url=None,
     )
     
     # Assert that the response is as expected
@@ -10,7 +10,7 @@ import sys
 import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../../../../src')))
 
-from vulcan.apps.api.routers.status import router, get_status, check_status
+from vulcan.apps.api.routers.status import router, get_status, check_status, cancel_process
 from vulcan.apps.api.models.requests import StatusRequest
 from vulcan.apps.api.models.responses import StatusResponse, ProcessStep
 
@@ -284,3 +284,175 @@ def test_check_status_endpoint(test_client):
         assert len(data["artifacts"]) == 1
         assert data["artifacts"][0]["name"] == "factorial.py"
         assert len(data["errors"]) == 0
+
+
+@pytest.mark.asyncio
+@patch("vulcan.apps.api.routers.status.WorkflowStateManager")
+async def test_cancel_process_success(mock_state_manager_class):
+    """Test that cancel_process cancels a running process."""
+    # Set up mocks
+    mock_state_manager = MagicMock()
+    mock_state_manager_class.return_value = mock_state_manager
+
+    running_state = MagicMock()
+    running_state.is_terminal = False
+
+    cancelled_state = MagicMock()
+    cancelled_state.process_id = "abcd1234"
+    cancelled_state.process_type = "testing"
+    cancelled_state.status.name = "CANCELLED"
+    cancelled_state.start_time = "2023-06-01T12:00:00Z"
+    cancelled_state.end_time = "2023-06-01T12:01:00Z"
+    cancelled_state.steps = []
+    cancelled_state.artifacts = []
+    cancelled_state.errors = []
+    cancelled_state.timeline = []
+
+    mock_state_manager.get_state_async = AsyncMock(return_value=running_state)
+    mock_state_manager.request_cancel_async = AsyncMock(return_value=cancelled_state)
+
+    # Call cancel_process
+    response = await cancel_process("abcd1234", "test-api-key")
+
+    # Assert that the cancellation was requested
+    mock_state_manager.request_cancel_async.assert_called_once_with("abcd1234")
+
+    # Assert that the response reports the cancelled state
+    assert response.process_id == "abcd1234"
+    assert response.status == "cancelled"
+    assert response.end_time == "2023-06-01T12:01:00Z"
+
+
+@pytest.mark.asyncio
+@patch("vulcan.apps.api.routers.status.WorkflowStateManager")
+async def test_cancel_process_not_found(mock_state_manager_class):
+    """Test that cancel_process raises an exception when the process is not found."""
+    # Set up mocks
+    mock_state_manager = MagicMock()
+    mock_state_manager_class.return_value = mock_state_manager
+    mock_state_manager.get_state_async = AsyncMock(return_value=None)
+
+    # Call cancel_process and expect an exception
+    with pytest.raises(HTTPException) as excinfo:
+        await cancel_process("abcd1234", "test-api-key")
+
+    # Assert that the exception has the expected status code and detail
+    assert excinfo.value.status_code == status.HTTP_404_NOT_FOUND
+    assert "Process not found: abcd1234" in excinfo.value.detail
+
+
+@pytest.mark.asyncio
+@patch("vulcan.apps.api.routers.status.WorkflowStateManager")
+async def test_cancel_process_already_finished(mock_state_manager_class):
+    """Test that cancel_process refuses to cancel a finished process."""
+    # Set up mocks
+    mock_state_manager = MagicMock()
+    mock_state_manager_class.return_value = mock_state_manager
+
+    finished_state = MagicMock()
+    finished_state.is_terminal = True
+    finished_state.status.name = "COMPLETED"
+    mock_state_manager.get_state_async = AsyncMock(return_value=finished_state)
+    mock_state_manager.request_cancel_async = AsyncMock()
+
+    # Call cancel_process and expect an exception
+    with pytest.raises(HTTPException) as excinfo:
+        await cancel_process("abcd1234", "test-api-key")
+
+    # Assert that the cancellation was not requested
+    mock_state_manager.request_cancel_async.assert_not_called()
+
+    # Assert that the exception has the expected status code and detail
+    assert excinfo.value.status_code == status.HTTP_409_CONFLICT
+    assert "Process already completed: abcd1234" in excinfo.value.detail
+
+
+def test_status_websocket_streams_subscribed_processes(tmp_path):
+    """Test that the WebSocket sends the state and then the events of subscribed processes."""
+    from fastapi import FastAPI
+    from vulcan.apps.api.config import API_KEY
+    from vulcan.apps.api.routers.status import websocket_router
+    from vulcan.workflow_engine.state.workflow_state import WorkflowStateManager
+    
+    app = FastAPI()
+    app.include_router(websocket_router)
+    client = TestClient(app)
+    
+    state_manager = WorkflowStateManager(tmp_path)
+    watched = state_manager.create_process("testing")
+    other = state_manager.create_process("testing")
+    
+    with patch(
+        "vulcan.apps.api.routers.status.WorkflowStateManager", return_value=state_manager
+    ):
+        with client.websocket_connect(f"/ws?api_key={API_KEY}") as websocket:
+            websocket.send_json({"action": "subscribe", "process_ids": [watched.process_id, "missing"]})
+            
+            message = websocket.receive_json()
+            assert message["type"] == "state"
+            assert message["state"]["status"] == "in_progress"
+            assert websocket.receive_json() == {
+                "type": "error", "detail": "Process not found: missing"
+            }
+            
+            state_manager.start_step(other.process_id, "Run tests")
+            state_manager.start_step(watched.process_id, "Run tests")
+            
+            message = websocket.receive_json()
+            assert message["type"] == "event"
+            assert message["process_id"] == watched.process_id
+            assert message["event"]["type"] == "step_started"
+            assert message["event"]["step"] == "Run tests"
+
+
+def test_status_websocket_rejects_invalid_api_key():
+    """Test that WebSocket connections without a valid API key are refused."""
+    from fastapi import FastAPI
+    from starlette.websockets import WebSocketDisconnect
+    from vulcan.apps.api.routers.status import websocket_router
+    
+    app = FastAPI()
+    app.include_router(websocket_router)
+    client = TestClient(app)
+    
+    with pytest.raises(WebSocketDisconnect):
+        with client.websocket_connect("/ws?api_key=wrong") as websocket:
+            websocket.receive_json()
+
+
+def test_status_websocket_polls_queued_processes(tmp_path):
+    """Test that in queue mode the states recorded by workers are sent until terminal."""
+    from fastapi import FastAPI
+    from vulcan.apps.api.config import API_KEY
+    from vulcan.apps.api.routers.status import websocket_router
+    from vulcan.core.vulcan_core.models import CodeStatus
+    from vulcan.workflow_engine.events import EventBus
+    from vulcan.workflow_engine.state.workflow_state import WorkflowStateManager
+    
+    app = FastAPI()
+    app.include_router(websocket_router)
+    client = TestClient(app)
+    
+    state_manager = WorkflowStateManager(tmp_path)
+    # The worker publishes its events to a bus the API does not see
+    worker_state_manager = WorkflowStateManager(tmp_path, event_bus=EventBus())
+    process = state_manager.create_process("testing")
+    
+    with patch(
+        "vulcan.apps.api.routers.status.WorkflowStateManager", return_value=state_manager
+    ), patch("vulcan.apps.api.routers.status.EXECUTION_MODE", "queue"), patch(
+        "vulcan.apps.api.routers.status.STATUS_POLL_INTERVAL", 0.01
+    ):
+        with client.websocket_connect(f"/ws?api_key={API_KEY}") as websocket:
+            websocket.send_json({"action": "subscribe", "process_ids": [process.process_id]})
+            assert websocket.receive_json()["state"]["status"] == "in_progress"
+            
+            worker_state_manager.start_step(process.process_id, "Run tests")
+            message = websocket.receive_json()
+            assert message["type"] == "state"
+            assert [step["name"] for step in message["state"]["steps"]] == ["Run tests"]
+            
+            worker_state_manager.finish(process.process_id, CodeStatus.COMPLETED)
+            message = websocket.receive_json()
+            assert message["type"] == "state"
+            assert message["state"]["status"] == "completed"
@@ -77,6 +77,7 @@ async def test_run_tests_success(mock_workflow_class):
     mock_workflow.execute_async.assert_called_once_with(
         code_content=request.code_content,
         generate_coverage=request.generate_coverage,
+        callback_url=None,
     )
     
     # Assert that the response is as expected
@@ -138,6 +139,7 @@ async def test_run_tests_failure(mock_workflow_class):
     mock_workflow.execute_async.assert_called_once_with(
         code_content=request.code_content,
         generate_coverage=request.generate_coverage,
+        callback_url=None,
     )
     
     # Assert that the response is as expected
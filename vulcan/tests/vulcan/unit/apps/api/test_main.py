@@ -6,6 +6,7 @@ from unittest.mock import patch, MagicMock
 from fastapi import FastAPI
 from fastapi.testclient import TestClient
 
+from vulcan.apps.api.config import API_KEY
 from vulcan.apps.api.main import app, root, health, start
 
 
@@ -80,3 +81,15 @@ def test_health_endpoint():
     assert response.status_code == 200
     assert response.json() == {"status": "ok", "version": "0.1.0"}
 
+
+
+def test_metrics_endpoint():
+    """Test that the metrics endpoint serves the collected metrics."""
+    client = TestClient(app)
+    
+    with patch("vulcan.apps.api.main.collect_metrics", return_value="vulcan_job_queue_depth 2\n"):
+        response = client.get("/metrics", headers={"X-API-Key": API_KEY})
+    
+    assert response.status_code == 200
+    assert response.text == "vulcan_job_queue_depth 2\n"
+    assert client.get("/metrics").status_code == 401
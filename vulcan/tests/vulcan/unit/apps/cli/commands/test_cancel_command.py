@@ -0,0 +1,102 @@
+"""
+Unit tests for the Vulcan CLI cancel command.
+"""
+from unittest.mock import patch, MagicMock
+
+from vulcan.apps.cli.commands.cancel_command import cancel_command
+from vulcan.core.vulcan_core.models import CodeStatus
+
+
+@patch("vulcan.apps.cli.commands.cancel_command.print_info")
+@patch("vulcan.apps.cli.commands.cancel_command.print_success")
+@patch("vulcan.apps.cli.commands.cancel_command.webhook_dispatcher")
+@patch("vulcan.apps.cli.commands.cancel_command.WorkflowStateManager")
+def test_cancel_command_success(
+    mock_state_manager_class,
+    mock_webhook_dispatcher,
+    mock_print_success,
+    mock_print_info,
+):
+    """Test that cancel_command cancels a running process."""
+    # Set up mocks
+    mock_args = MagicMock()
+    mock_args.id = "process-id"
+
+    mock_state = MagicMock()
+    mock_state.is_terminal = False
+
+    mock_state_manager = MagicMock()
+    mock_state_manager.get_state.return_value = mock_state
+    mock_state_manager_class.return_value = mock_state_manager
+
+    # Call cancel_command
+    result = cancel_command(mock_args)
+
+    # Assert that the cancellation was requested
+    mock_state_manager.request_cancel.assert_called_once_with("process-id")
+    # Assert that the completion webhook was flushed before exiting
+    mock_webhook_dispatcher.close.assert_called_once()
+    mock_print_success.assert_called_once_with("Process process-id cancelled")
+
+    # Assert that the result is 0 (success)
+    assert result == 0
+
+
+@patch("vulcan.apps.cli.commands.cancel_command.print_info")
+@patch("vulcan.apps.cli.commands.cancel_command.print_error")
+@patch("vulcan.apps.cli.commands.cancel_command.WorkflowStateManager")
+def test_cancel_command_process_not_found(
+    mock_state_manager_class,
+    mock_print_error,
+    mock_print_info,
+):
+    """Test that cancel_command handles the case when the process is not found."""
+    # Set up mocks
+    mock_args = MagicMock()
+    mock_args.id = "process-id"
+
+    mock_state_manager = MagicMock()
+    mock_state_manager.get_state.return_value = None
+    mock_state_manager_class.return_value = mock_state_manager
+
+    # Call cancel_command
+    result = cancel_command(mock_args)
+
+    # Assert that print_error was called with the expected message
+    mock_print_error.assert_called_once_with("No process found with ID: process-id")
+    mock_state_manager.request_cancel.assert_not_called()
+
+    # Assert that the result is 1 (failure)
+    assert result == 1
+
+
+@patch("vulcan.apps.cli.commands.cancel_command.print_info")
+@patch("vulcan.apps.cli.commands.cancel_command.print_error")
+@patch("vulcan.apps.cli.commands.cancel_command.WorkflowStateManager")
+def test_cancel_command_process_finished(
+    mock_state_manager_class,
+    mock_print_error,
+    mock_print_info,
+):
+    """Test that cancel_command refuses to cancel a finished process."""
+    # Set up mocks
+    mock_args = MagicMock()
+    mock_args.id = "process-id"
+
+    mock_state = MagicMock()
+    mock_state.is_terminal = True
+    mock_state.status = CodeStatus.COMPLETED
+
+    mock_state_manager = MagicMock()
+    mock_state_manager.get_state.return_value = mock_state
+    mock_state_manager_class.return_value = mock_state_manager
+
+    # Call cancel_command
+    result = cancel_command(mock_args)
+
+    # Assert that print_error was called with the expected message
+    mock_print_error.assert_called_once_with("Process already completed: process-id")
+    mock_state_manager.request_cancel.assert_not_called()
+
+    # Assert that the result is 1 (failure)
+    assert result == 1
@@ -7,7 +7,7 @@ from pathlib import Path
 from unittest.mock import patch, MagicMock
 
 from vulcan.apps.cli.commands.status_command import status_command
-from vulcan.src.packages.core.models.common import CodeStatus
+from vulcan.core.vulcan_core.models import CodeStatus
 
 
 @patch("vulcan.apps.cli.commands.status_command.print_info")
@@ -63,6 +63,7 @@ def test_status_command_basic_info(
     mock_state.end_time = "2023-06-01T12:05:00Z"
     mock_state.steps = []
     mock_state.artifacts = []
+    mock_state.resources = {}
     mock_state.errors = []
     
     mock_state_manager = MagicMock()
@@ -121,6 +122,7 @@ def test_status_command_with_steps(
     mock_state.end_time = None
     mock_state.steps = [mock_step1, mock_step2]
     mock_state.artifacts = []
+    mock_state.resources = {}
     mock_state.errors = []
     
     mock_state_manager = MagicMock()
@@ -152,21 +154,17 @@ def test_status_command_with_artifacts(
     mock_args = MagicMock()
     mock_args.id = "process-id"
     
-    mock_artifact1 = MagicMock()
-    mock_artifact1.name = "add.py"
-    mock_artifact1.path = "/output/add.py"
-    
-    mock_artifact2 = MagicMock()
-    mock_artifact2.name = "test_add.py"
-    mock_artifact2.path = "/output/test_add.py"
-    
     mock_state = MagicMock()
     mock_state.process_type = "code_generation"
     mock_state.status = CodeStatus.COMPLETED
     mock_state.start_time = "2023-06-01T12:00:00Z"
     mock_state.end_time = "2023-06-01T12:05:00Z"
     mock_state.steps = []
-    mock_state.artifacts = [mock_artifact1, mock_artifact2]
+    mock_state.artifacts = [
+        {"name": "add.py", "path": "/output/add.py"},
+        {"name": "test_add.py", "path": "/output/test_add.py"},
+    ]
+    mock_state.resources = {}
     mock_state.errors = []
     
     mock_state_manager = MagicMock()
@@ -205,6 +203,7 @@ def test_status_command_with_errors(
     mock_state.end_time = "2023-06-01T12:05:00Z"
     mock_state.steps = []
     mock_state.artifacts = []
+    mock_state.resources = {}
     mock_state.errors = ["Failed to parse requirements", "Invalid syntax in generated code"]
     
     mock_state_manager = MagicMock()
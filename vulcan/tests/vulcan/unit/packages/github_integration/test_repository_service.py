@@ -0,0 +1,62 @@
+"""
+Unit tests for the repository service.
+"""
+import asyncio
+import fcntl
+import subprocess
+
+import pytest
+
+from vulcan.github_integration.services.repository_service import (
+    RepositoryService,
+    checkout_lock,
+)
+
+
+def make_repository(path):
+    """Create a git repository with one commit and return its URL."""
+    path.mkdir()
+    (path / "main.py").write_text("VALUE = 1\n")
+    git = ["git", "-c", "user.name=test", "-c", "user.email=test@example.com"]
+    subprocess.run(git + ["init", "-q"], cwd=path, check=True)
+    subprocess.run(git + ["add", "--all"], cwd=path, check=True)
+    subprocess.run(git + ["commit", "-q", "-m", "Initial commit"], cwd=path, check=True)
+    return f"file://{path}"
+
+
+@pytest.mark.asyncio
+async def test_checkout_is_kept_outside_the_workspaces(tmp_path):
+    """Test that persistent checkouts are not in the directory swept for stale workspaces."""
+    url = make_repository(tmp_path / "origin")
+    service = RepositoryService(
+        workspace_dir=tmp_path / "workspaces", checkout_dir=tmp_path / "checkouts"
+    )
+
+    checkout = await service.checkout(url)
+
+    assert checkout.parent == tmp_path / "checkouts"
+    assert (checkout / "main.py").read_text() == "VALUE = 1\n"
+    assert not (tmp_path / "workspaces").exists()
+
+
+@pytest.mark.asyncio
+async def test_checkout_lock_waits_for_other_holders(tmp_path):
+    """Test that a checkout is not updated while another process holds its lock."""
+    checkout = tmp_path / "checkouts" / "repository"
+    entered = asyncio.Event()
+
+    async def update():
+        async with checkout_lock(checkout):
+            entered.set()
+
+    (tmp_path / "checkouts").mkdir()
+    # A separate open file description conflicts like another process would
+    with open(tmp_path / "checkouts" / "repository.lock", "ab") as held:
+        fcntl.flock(held, fcntl.LOCK_EX)
+        task = asyncio.ensure_future(update())
+        await asyncio.sleep(0.3)
+        assert not entered.is_set()
+        fcntl.flock(held, fcntl.LOCK_UN)
+
+    await asyncio.wait_for(task, 2)
+    assert entered.is_set()
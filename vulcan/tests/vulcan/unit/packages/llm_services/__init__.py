@@ -0,0 +1,3 @@
+"""
+Unit tests for the llm_services package.
+"""
\ No newline at end of file
@@ -0,0 +1,228 @@
+"""
+Unit tests for the code generator.
+"""
+import pytest
+
+from vulcan.core.vulcan_core.models import CodeStatus, Requirements
+from vulcan.infra.interface.llm_agent.llm_client import LLMChunk, LLMClient, LLMUsage
+from vulcan.llm_services.services.code_generator import (
+    FILE_SIZE_LIMIT,
+    FILES_COMPLETE,
+    OUTPUT_LIMIT,
+    PROSE_AFTER_CODE,
+    ArtifactStreamParser,
+    CodeGenerator,
+    build_prompt,
+    parse_artifacts,
+)
+
+
+COMPLETION = (
+    "### File: factorial.py\n"
+    "```python\n"
+    "def factorial(n):\n"
+    "    return 1 if n == 0 else n * factorial(n - 1)\n"
+    "```\n\n"
+    "### File: README.md\n"
+    "```\n"
+    "Factorial\n"
+    "```\n"
+)
+
+
+class StaticLLMClient(LLMClient):
+    """LLM client streaming a fixed completion."""
+
+    provider = "static"
+
+    async def stream(self, request):
+        for line in COMPLETION.splitlines(keepends=True):
+            yield LLMChunk(text=line)
+        yield LLMChunk(usage=LLMUsage(prompt_tokens=12, completion_tokens=34), finish_reason="stop")
+
+
+def test_build_prompt_includes_requirements():
+    """Test that the prompt contains the description, constraints and examples."""
+    prompt = build_prompt(
+        Requirements(
+            description="Factorial function",
+            constraints=["Must include type hints"],
+            examples=["factorial(5) -> 120"],
+        )
+    )
+
+    assert "Factorial function" in prompt
+    assert "- Must include type hints" in prompt
+    assert "- factorial(5) -> 120" in prompt
+
+
+def test_parse_artifacts():
+    """Test that file blocks are extracted from a completion."""
+    artifacts = parse_artifacts(COMPLETION)
+
+    assert [a.file_path for a in artifacts] == ["factorial.py", "README.md"]
+    assert artifacts[0].language == "python"
+    assert artifacts[0].content.startswith("def factorial(n):")
+    assert artifacts[1].language == "markdown"
+
+
+@pytest.mark.asyncio
+async def test_generate_records_metadata():
+    """Test that generate returns artifacts and token usage."""
+    generator = CodeGenerator(llm_client=StaticLLMClient(), config={"model": "test-model"})
+
+    generation = await generator.generate(Requirements(description="Factorial function"))
+
+    assert generation.status == CodeStatus.COMPLETED
+    assert len(generation.artifacts) == 2
+    assert generation.metadata.model_used == "test-model"
+    assert generation.metadata.prompt_tokens == 12
+    assert generation.metadata.completion_tokens == 34
+
+
+def test_stream_parser_handles_split_chunks():
+    """Test that files are completed as soon as their closing fence is received."""
+    parser = ArtifactStreamParser()
+    completed = []
+    for index, char in enumerate(COMPLETION):
+        for artifact in parser.feed(char):
+            completed.append((artifact.file_path, index))
+    completed += [(artifact.file_path, None) for artifact in parser.close()]
+
+    assert [path for path, _ in completed] == ["factorial.py", "README.md"]
+    # The first file is complete long before the end of the completion
+    assert completed[0][1] < COMPLETION.index("### File: README.md")
+    assert parse_artifacts(COMPLETION)[0].content == (
+        "def factorial(n):\n    return 1 if n == 0 else n * factorial(n - 1)\n"
+    )
+
+
+def test_stream_parser_drops_unterminated_file():
+    """Test that a file cut off by the end of the stream is not returned."""
+    parser = ArtifactStreamParser()
+    artifacts = parser.feed("### File: a.py\n```python\nprint(1)\n```\n### File: b.py\n```\nprint(")
+
+    assert [a.file_path for a in artifacts] == ["a.py"]
+    assert parser.open_file == "b.py"
+    assert parser.close() == []
+
+
+@pytest.mark.asyncio
+async def test_generate_streams_artifacts_and_stops_early():
+    """Test that artifacts are delivered while streaming and the stream stops once complete."""
+    events = []
+
+    class TrackingLLMClient(StaticLLMClient):
+        async def stream(self, request):
+            try:
+                async for chunk in super().stream(request):
+                    events.append(("chunk", chunk.text))
+                    yield chunk
+            finally:
+                events.append(("closed", None))
+
+    async def on_artifact(artifact):
+        events.append(("artifact", artifact.file_path))
+
+    generator = CodeGenerator(
+        llm_client=TrackingLLMClient(), config={"model": "test-model", "cache": False}
+    )
+
+    generation = await generator.generate(
+        Requirements(description="Factorial function"),
+        expected_files=["factorial.py"],
+        on_artifact=on_artifact,
+    )
+
+    assert [a.file_path for a in generation.artifacts] == ["factorial.py"]
+    assert events.index(("artifact", "factorial.py")) == events.index(("closed", None)) - 1
+    assert ("chunk", "### File: README.md\n") not in events
+
+
+class ScriptedLLMClient(LLMClient):
+    """LLM client streaming given lines, recording how many were sent."""
+
+    provider = "scripted"
+
+    def __init__(self, lines, finish_reason="stop"):
+        self.lines = lines
+        self.finish_reason = finish_reason
+        self.sent = 0
+
+    async def stream(self, request):
+        for line in self.lines:
+            self.sent += 1
+            yield LLMChunk(text=line)
+        yield LLMChunk(finish_reason=self.finish_reason)
+
+
+@pytest.mark.asyncio
+async def test_generate_stops_at_prose_after_code():
+    """Test that an explanation following the code is not streamed to its end."""
+    explanation = ["This function computes the factorial of n recursively. " * 3 + "\n"] * 20
+    client = ScriptedLLMClient(COMPLETION.splitlines(keepends=True) + explanation)
+    generator = CodeGenerator(llm_client=client, config={"cache": False})
+
+    generation = await generator.generate(Requirements(description="Factorial function"))
+
+    assert [a.file_path for a in generation.artifacts] == ["factorial.py", "README.md"]
+    assert generation.metadata.finish_reason == PROSE_AFTER_CODE
+    assert not generation.metadata.truncated
+    assert client.sent < len(client.lines)
+
+
+@pytest.mark.asyncio
+async def test_generate_keeps_short_prose_between_files():
+    """Test that a sentence introducing the next file does not stop the stream."""
+    lines = COMPLETION.splitlines(keepends=True)
+    lines.insert(5, "The README documents the function.\n")
+    generator = CodeGenerator(llm_client=ScriptedLLMClient(lines), config={"cache": False})
+
+    generation = await generator.generate(Requirements(description="Factorial function"))
+
+    assert [a.file_path for a in generation.artifacts] == ["factorial.py", "README.md"]
+    assert generation.metadata.finish_reason == "stop"
+
+
+@pytest.mark.asyncio
+async def test_generate_cuts_off_runaway_file():
+    """Test that a file over the size guard is dropped and recorded as truncated."""
+    runaway = ["### File: loop.py\n", "```python\n"] + ["x = x + 1\n"] * 500 + ["```\n"]
+    client = ScriptedLLMClient(COMPLETION.splitlines(keepends=True)[:5] + runaway)
+    generator = CodeGenerator(llm_client=client, config={"cache": False, "max_file_tokens": 200})
+
+    generation = await generator.generate(Requirements(description="Factorial function"))
+
+    assert [a.file_path for a in generation.artifacts] == ["factorial.py"]
+    assert generation.metadata.finish_reason == FILE_SIZE_LIMIT
+    assert generation.metadata.truncated
+    assert generation.metadata.additional_info["truncated_file"] == "loop.py"
+    assert client.sent < len(client.lines)
+
+    # Without usage reported, the output is guarded by the tokens counted locally
+    client = ScriptedLLMClient(runaway)
+    generator = CodeGenerator(llm_client=client, config={"cache": False, "max_tokens": 40})
+    generation = await generator.generate(Requirements(description="Factorial function"))
+    assert generation.metadata.finish_reason == OUTPUT_LIMIT
+    assert generation.metadata.truncated
+    assert client.sent < 30
+
+
+@pytest.mark.asyncio
+async def test_generate_records_provider_truncation():
+    """Test that a completion ended by the provider token limit is recorded as truncated."""
+    lines = COMPLETION.splitlines(keepends=True)[:-1]
+    generator = CodeGenerator(
+        llm_client=ScriptedLLMClient(lines, finish_reason="length"), config={"cache": False}
+    )
+
+    generation = await generator.generate(Requirements(description="Factorial function"))
+
+    assert generation.metadata.truncated
+    assert generation.metadata.additional_info["truncated_file"] == "README.md"
+
+    complete = await CodeGenerator(
+        llm_client=ScriptedLLMClient(COMPLETION.splitlines(keepends=True)), config={"cache": False}
+    ).generate(Requirements(description="Factorial function"), expected_files=["factorial.py"])
+    assert complete.metadata.finish_reason == FILES_COMPLETE
+    assert not complete.metadata.truncated
@@ -0,0 +1,136 @@
+"""
+Unit tests for the retrieval index of repository code.
+"""
+import os
+import time
+
+import pytest
+
+from vulcan.core.vulcan_core.models import Requirements
+from vulcan.infra.interface.llm_agent.llm_client import LLMChunk, LLMClient
+from vulcan.llm_services.services import code_index
+from vulcan.llm_services.services.code_generator import CodeGenerator
+from vulcan.llm_services.services.code_index import CodeIndex, split_terms
+from vulcan.workflow_engine.concurrency import StageLimiter
+from vulcan.workflow_engine.state.workflow_state import WorkflowStateManager
+from vulcan.workflow_engine.workflows.code_generation_flow import CodeGenerationWorkflow
+
+
+ORDERS = (
+    "class OrderRepository:\n"
+    "    def save_order(self, order):\n"
+    "        self.orders[order.id] = order\n"
+)
+INVOICES = (
+    "def render_invoice(invoice):\n"
+    "    return f'Invoice {invoice.number}'\n"
+)
+
+
+class RecordingLLMClient(LLMClient):
+    """LLM client recording the prompts it is sent."""
+
+    provider = "recording"
+
+    def __init__(self):
+        self.prompts = []
+
+    async def stream(self, request):
+        self.prompts.append(request.prompt)
+        yield LLMChunk(text="### File: main.py\n```python\nprint('hello')\n```\n", finish_reason="stop")
+
+
+@pytest.fixture
+def repository(tmp_path):
+    root = tmp_path / "repository"
+    (root / "shop").mkdir(parents=True)
+    (root / "shop" / "orders.py").write_text(ORDERS)
+    (root / "shop" / "invoices.py").write_text(INVOICES)
+    (root / "node_modules").mkdir()
+    (root / "node_modules" / "orders.js").write_text("const saveOrder = 1;\n")
+    return root
+
+
+def test_split_terms_splits_identifiers():
+    """Test that identifiers are indexed whole and by word."""
+    assert split_terms("saveOrder(order_id)") == [
+        "saveorder", "save", "order", "order_id", "order", "id"
+    ]
+
+
+def test_search_ranks_matching_snippets(repository):
+    """Test that the snippets sharing the query terms come first."""
+    index = CodeIndex(repository)
+    assert index.update() == (2, 0)
+
+    results = index.search("Save an order to the repository")
+
+    assert [snippet.path for snippet in results] == ["shop/orders.py"]
+    assert results[0].start_line == 1
+    assert "def save_order" in results[0].render()
+
+
+def test_trigrams_match_misspelled_terms(repository):
+    """Test that terms missing from the vocabulary match similar ones."""
+    index = CodeIndex(repository)
+    index.update()
+
+    assert [snippet.path for snippet in index.search("invoise")] == ["shop/invoices.py"]
+
+
+def test_updates_reindex_changed_files_only(repository):
+    """Test that updates only index changed, new and deleted files."""
+    index = CodeIndex(repository)
+    index.update()
+    assert index.update() == (0, 0)
+
+    orders = repository / "shop" / "orders.py"
+    orders.write_text("def cancel_shipment(shipment):\n    shipment.cancel()\n")
+    os.utime(orders, ns=(time.time_ns() + 10**9, time.time_ns() + 10**9))
+    (repository / "shop" / "invoices.py").unlink()
+
+    assert index.update() == (1, 1)
+    assert index.file_count == 1
+    assert index.search("render_invoice") == []
+    assert [snippet.path for snippet in index.search("shipment")] == ["shop/orders.py"]
+
+
+def test_pool_indexing_matches_inline(tmp_path, monkeypatch):
+    """Test that files indexed in a process pool are found like inline ones."""
+    for number in range(6):
+        (tmp_path / f"module_{number}.py").write_text(f"def handler_{number}():\n    pass\n")
+    monkeypatch.setattr(code_index, "POOL_MIN_FILES", 2)
+    monkeypatch.setattr(code_index, "POOL_BATCH_FILES", 2)
+
+    index = CodeIndex(tmp_path, workers=2)
+
+    assert index.update() == (6, 0)
+    results = index.search("handler_4")
+    assert len(results) == 6
+    assert results[0].path == "module_4.py"
+
+
+@pytest.mark.asyncio
+async def test_workflow_adds_retrieved_context(repository, tmp_path):
+    """Test that the retrieved snippets are added to the generation prompt."""
+    client = RecordingLLMClient()
+    workflow = CodeGenerationWorkflow(
+        code_generator=CodeGenerator(llm_client=client, config={"cache": False}),
+        state_manager=WorkflowStateManager(state_dir=tmp_path / "state"),
+        stage_limiter=StageLimiter({}),
+        workspace_dir=tmp_path / "workspaces",
+    )
+
+    result = await workflow.execute_async(
+        Requirements(description="Add a function listing the saved orders"),
+        context_dir=repository,
+    )
+
+    assert result.success
+    assert "Relevant code of the repository" in client.prompts[0]
+    assert "def save_order" in client.prompts[0]
+    state = workflow.state_manager.get_state(result.process_id)
+    assert state.steps[0].name == "Retrieve context"
+    assert state.steps[0].metadata["snippets"] == ["shop/orders.py:1-3"]
+    assert int(result.metadata.additional_info["context_tokens"]) > 0
+    assert "context_tokens_saved" in result.metadata.additional_info
@@ -0,0 +1,173 @@
+"""
+Unit tests for planned multi-file code generation.
+"""
+import asyncio
+import json
+
+import pytest
+
+from vulcan.core.vulcan_core.models import CodeArtifact, Requirements
+from vulcan.infra.interface.llm_agent.llm_client import LLMChunk, LLMClient
+from vulcan.llm_services.services.code_generator import CodeGenerator
+from vulcan.llm_services.services.code_planner import (
+    CodePlan,
+    FilePlan,
+    check_consistency,
+    parse_plan,
+)
+from vulcan.workflow_engine.concurrency import StageLimiter
+from vulcan.workflow_engine.state.workflow_state import WorkflowStateManager
+from vulcan.workflow_engine.workflows.code_generation_flow import CodeGenerationWorkflow
+
+
+PLAN = {
+    "files": [
+        {"path": "models.py", "purpose": "Data model", "exports": ["class Order"]},
+        {"path": "service.py", "purpose": "Logic", "exports": ["def create_order(data: dict) -> Order"]},
+    ]
+}
+
+CODE = {
+    "models.py": "class Order:\n    pass\n",
+    "service.py": "from models import Order\n\n\ndef create_order(data: dict) -> Order:\n    return Order()\n",
+    "test_service.py": "from service import create_order\n\n\ndef test_create():\n    assert create_order({})\n",
+}
+
+
+class PlanningLLMClient(LLMClient):
+    """LLM client answering plan requests with a plan and file requests with their code."""
+
+    provider = "planning"
+
+    def __init__(self):
+        self.prompts = []
+        self.running = 0
+        self.max_running = 0
+
+    async def stream(self, request):
+        self.prompts.append(request.prompt)
+        if "JSON object" in request.prompt:
+            yield LLMChunk(text=f"```json\n{json.dumps(PLAN)}\n```", finish_reason="stop")
+            return
+        path = next(path for path in CODE if f"- {path}\n" in request.prompt.split("Files to generate:")[1] + "\n")
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        await asyncio.sleep(0.05)
+        self.running -= 1
+        yield LLMChunk(text=f"### File: {path}\n```python\n{CODE[path]}```\n", finish_reason="stop")
+
+
+def test_parse_plan_adds_expected_files():
+    """Test that the plan is read from a code block and completed with the expected files."""
+    plan = parse_plan(f"Here it is:\n```json\n{json.dumps(PLAN)}\n```", ["service.py", "test_service.py"])
+
+    assert [file_plan.path for file_plan in plan.files] == ["models.py", "service.py", "test_service.py"]
+    assert plan.files[1].exports == ["def create_order(data: dict) -> Order"]
+    assert "    class Order" in plan.render()
+
+    with pytest.raises(ValueError):
+        parse_plan("no plan")
+    with pytest.raises(ValueError):
+        parse_plan('{"files": 3}')
+
+
+def test_check_consistency():
+    """Test that missing files, exports and imported names are reported."""
+    plan = CodePlan(files=[
+        FilePlan("models.py", exports=["class Order", "def total(order) -> int"]),
+        FilePlan("service.py"),
+        FilePlan("README.md"),
+    ])
+    artifacts = [
+        CodeArtifact(CODE["models.py"], "models.py", "python"),
+        CodeArtifact("from models import Order, Invoice\n", "service.py", "python"),
+    ]
+
+    issues = check_consistency(plan, artifacts)
+
+    assert issues == [
+        "README.md: planned file was not generated",
+        "models.py: planned export total is missing",
+        "service.py: imports Invoice from models, which does not define it",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_workflow_generates_planned_files_concurrently(tmp_path):
+    """Test that planned files are generated concurrently and merged."""
+    client = PlanningLLMClient()
+    workflow = CodeGenerationWorkflow(
+        code_generator=CodeGenerator(llm_client=client, config={"cache": False, "plan_min_files": 3}),
+        state_manager=WorkflowStateManager(state_dir=tmp_path / "state"),
+        stage_limiter=StageLimiter({}),
+        workspace_dir=tmp_path / "workspaces",
+    )
+
+    result = await workflow.execute_async(
+        Requirements(description="Orders"),
+        output_dir=tmp_path / "out",
+        expected_files=["models.py", "service.py", "test_service.py"],
+    )
+
+    assert result.success
+    assert len(client.prompts) == 4
+    assert client.max_running == 3
+    assert "class Order" in client.prompts[1]
+    assert sorted(artifact.file_path for artifact in result.artifacts) == sorted(CODE)
+    assert (tmp_path / "out" / "service.py").read_text() == CODE["service.py"]
+    assert result.metadata.additional_info["planned_files"] == "3"
+    assert "consistency_issues" not in result.metadata.additional_info
+    state = workflow.state_manager.get_state(result.process_id)
+    assert [step.name for step in state.steps][0] == "Plan files"
+    assert state.steps[-1].name == "Check consistency"
+    assert state.steps[-1].metadata["issues"] == []
+
+
+class FailingFileLLMClient(PlanningLLMClient):
+    """Planning LLM client failing the generation of models.py."""
+
+    def __init__(self):
+        super().__init__()
+        self.opened = 0
+        self.closed = 0
+
+    async def stream(self, request):
+        if "JSON object" in request.prompt:
+            async for chunk in super().stream(request):
+                yield chunk
+            return
+        if "- models.py" in request.prompt.split("Files to generate:")[1]:
+            raise RuntimeError("provider error")
+        self.opened += 1
+        try:
+            await asyncio.sleep(5)
+            yield LLMChunk(finish_reason="stop")
+        finally:
+            # Closing a provider connection takes a few round trips
+            await asyncio.sleep(0.05)
+            self.closed += 1
+
+
+@pytest.mark.asyncio
+async def test_failed_file_cancels_the_other_files(tmp_path):
+    """Test that the other file generations are finished when the workflow fails."""
+    client = FailingFileLLMClient()
+    workflow = CodeGenerationWorkflow(
+        code_generator=CodeGenerator(llm_client=client, config={"cache": False, "plan_min_files": 3}),
+        state_manager=WorkflowStateManager(state_dir=tmp_path / "state"),
+        stage_limiter=StageLimiter({}),
+        workspace_dir=tmp_path / "workspaces",
+    )
+
+    result = await asyncio.wait_for(
+        workflow.execute_async(
+            Requirements(description="Orders"),
+            expected_files=["models.py", "service.py", "test_service.py"],
+        ),
+        2,
+    )
+
+    assert not result.success
+    # Generations cancelled before their stream opened have nothing to close
+    assert client.opened >= 1
+    assert client.closed == client.opened
@@ -0,0 +1,213 @@
+"""
+Unit tests for the patch-based repair of failing code.
+"""
+import pytest
+
+from vulcan.core.vulcan_core.models import (
+    CodeArtifact,
+    CodeGeneration,
+    CodeStatus,
+    Requirements,
+    TestCase,
+    TestResult,
+)
+from vulcan.infra.interface.llm_agent.llm_client import LLMChunk, LLMClient
+from vulcan.llm_services.services.code_generator import CodeGenerator
+from vulcan.llm_services.services.code_repair import (
+    CodeEdit,
+    CodeRepairer,
+    apply_edit,
+    apply_edits,
+    parse_edits,
+    relevant_regions,
+)
+from vulcan.testing_framework.services.test_runner import TestRunReport
+from vulcan.workflow_engine.concurrency import StageLimiter
+from vulcan.workflow_engine.state.workflow_state import WorkflowStateManager
+from vulcan.workflow_engine.workflows.code_generation_flow import CodeGenerationWorkflow
+
+
+MODULE = (
+    "import math\n"
+    "\n"
+    "\n"
+    "class Shapes:\n"
+    "    def area(self, radius):\n"
+    "        return math.pi * radius\n"
+    "\n"
+    "    def perimeter(self, radius):\n"
+    "        return 2 * math.pi * radius\n"
+)
+
+EDIT = (
+    "### File: shapes.py\n"
+    "<<<<<<< SEARCH\n"
+    "        return math.pi * radius\n"
+    "=======\n"
+    "        return math.pi * radius ** 2\n"
+    ">>>>>>> REPLACE\n"
+)
+
+FAILURE = TestResult(
+    test_case=TestCase("test_area", "", {}, {}),
+    passed=False,
+    actual_output={},
+    error_message="assert 3.14 == 12.56",
+)
+
+
+class ScriptedLLMClient(LLMClient):
+    """LLM client answering with scripted completions and recording prompts."""
+
+    provider = "scripted"
+
+    def __init__(self, *completions):
+        self.completions = list(completions)
+        self.prompts = []
+
+    async def stream(self, request):
+        self.prompts.append(request.prompt)
+        yield LLMChunk(text=self.completions.pop(0), finish_reason="stop")
+
+
+class AreaTestRunner:
+    """Test runner passing once the area is squared."""
+
+    def __init__(self):
+        self.runs = 0
+
+    async def run(self, code_path, generate_coverage=False, token=None):
+        self.runs += 1
+        passed = "radius ** 2" in (code_path / "shapes.py").read_text()
+        return TestRunReport(
+            exit_code=0 if passed else 1,
+            test_results=[FAILURE if not passed else TestResult(FAILURE.test_case, True, {})],
+            output="" if passed else "shapes.py:6: AssertionError",
+        )
+
+
+def test_parse_search_replace_and_unified_diff():
+    """Test that both edit formats are parsed with their files."""
+    diff = (
+        "--- a/shapes.py\n"
+        "+++ b/shapes.py\n"
+        "@@ -5,2 +5,2 @@\n"
+        "     def area(self, radius):\n"
+        "-        return math.pi * radius\n"
+        "+        return math.pi * radius ** 2\n"
+    )
+
+    edits = parse_edits(EDIT) + parse_edits(diff)
+
+    assert [edit.file_path for edit in edits] == ["shapes.py", "shapes.py"]
+    assert edits[0].replace == "        return math.pi * radius ** 2\n"
+    assert edits[1].search == "    def area(self, radius):\n        return math.pi * radius\n"
+    for edit in edits:
+        assert "radius ** 2" in apply_edit(MODULE, edit.search, edit.replace)
+
+
+def test_fuzzy_matching():
+    """Test that edits with wrong indentation or small typos still apply."""
+    unindented = apply_edit(MODULE, "return math.pi * radius\n", "return math.pi * radius ** 2\n")
+    assert "        return math.pi * radius ** 2\n" in unindented
+
+    typo = apply_edit(
+        MODULE,
+        "    def area(self, radius):\n        return math.pi*radius\n",
+        "    def area(self, radius):\n        return math.pi * radius ** 2\n",
+    )
+    assert "        return math.pi * radius ** 2\n" in typo
+    assert typo.count("def area") == 1
+
+    assert apply_edit(MODULE, "def volume(self):\n    pass\n", "") is None
+
+
+def test_apply_edits_reports_failures():
+    """Test that unmatched edits are reported and new files created."""
+    artifacts = [CodeArtifact(MODULE, "shapes.py", "python")]
+    edits = [
+        CodeEdit(None, "return 2 * math.pi * radius", "return math.tau * radius"),
+        CodeEdit("shapes.py", "nothing like this at all", "x"),
+        CodeEdit("test_shapes.py", "", "def test_ok():\n    pass\n"),
+    ]
+
+    edited, applied, failed = apply_edits(artifacts, edits)
+
+    assert applied == 2
+    assert failed == [edits[1]]
+    assert "math.tau" in edited[0].content
+    assert edited[1].file_path == "test_shapes.py"
+
+
+def test_apply_edits_rejects_unsafe_new_files():
+    """Test that new files are never created outside the code directory."""
+    artifacts = [CodeArtifact(MODULE, "shapes.py", "python")]
+    edits = [
+        CodeEdit("/tmp/evil.py", "", "x = 1\n"),
+        CodeEdit("../../up.py", "", "x = 1\n"),
+        CodeEdit("pkg/../../up.py", "", "x = 1\n"),
+    ]
+
+    edited, applied, failed = apply_edits(artifacts, edits)
+
+    assert applied == 0
+    assert failed == edits
+    assert [a.file_path for a in edited] == ["shapes.py"]
+
+
+def test_regions_follow_failure_locations():
+    """Test that only the failing function is selected."""
+    artifacts = [CodeArtifact(MODULE, "shapes.py", "python")]
+
+    regions = relevant_regions(artifacts, 'File "/tmp/ws/shapes.py", line 6, in area')
+
+    assert regions == {"shapes.py": [(5, 6)]}
+    assert relevant_regions(artifacts, "boom") == {"shapes.py": [(1, 9)]}
+
+
+@pytest.mark.asyncio
+async def test_repair_sends_regions_and_applies_edits():
+    """Test that a repair sends the failing region only and edits the code."""
+    client = ScriptedLLMClient(EDIT)
+    repairer = CodeRepairer(client, config={"model": "gpt-4"})
+    generation = CodeGeneration(
+        requirements=Requirements(description="Shapes"),
+        artifacts=[CodeArtifact(MODULE, "shapes.py", "python")],
+    )
+
+    repaired = await repairer.repair(generation, [FAILURE], output="shapes.py:6: AssertionError")
+
+    assert repaired.status == CodeStatus.COMPLETED
+    assert "radius ** 2" in repaired.artifacts[0].content
+    assert "def area" in client.prompts[0]
+    assert "def perimeter" not in client.prompts[0]
+    assert "assert 3.14 == 12.56" in client.prompts[0]
+    assert repaired.metadata.additional_info["edits_applied"] == "1"
+    assert repaired.metadata.completion_tokens > 0
+
+
+@pytest.mark.asyncio
+async def test_workflow_repairs_failing_code(tmp_path):
+    """Test that failing tests trigger a repair instead of a regeneration."""
+    client = ScriptedLLMClient(f"### File: shapes.py\n```python\n{MODULE}```\n", EDIT)
+    runner = AreaTestRunner()
+    workflow = CodeGenerationWorkflow(
+        code_generator=CodeGenerator(llm_client=client, config={"cache": False}),
+        state_manager=WorkflowStateManager(state_dir=tmp_path / "state"),
+        stage_limiter=StageLimiter({}),
+        test_runner=runner,
+        workspace_dir=tmp_path / "workspaces",
+    )
+
+    result = await workflow.execute_async(
+        Requirements(description="Shapes"), output_dir=tmp_path / "out", run_tests=True
+    )
+
+    assert result.success
+    assert runner.runs == 2
+    assert len(client.prompts) == 2
+    assert "radius ** 2" in (tmp_path / "out" / "shapes.py").read_text()
+    state = workflow.state_manager.get_state(result.process_id)
+    assert [step.name for step in state.steps] == [
+        "Generate code", "Run tests", "Repair code 1", "Run tests after repair 1"
+    ]
@@ -0,0 +1,105 @@
+"""
+Unit tests for the packing of retrieved code into the prompt context.
+"""
+from vulcan.llm_services.services.code_index import Snippet
+from vulcan.llm_services.services.context_packer import (
+    knapsack,
+    merge_overlapping,
+    minify,
+    pack_context,
+)
+from vulcan.llm_services.services.token_budget import count_tokens
+
+
+PYTHON = (
+    "        return total  # cents\n"
+    "\n"
+    "    def pay(self, amount):\n"
+    '        """\n'
+    "        Pay the order.\n"
+    '        """\n'
+    "        # Amounts are in cents\n"
+    '        label = "# not a comment"\n'
+    "\n"
+    "        return charge(amount, label)\n"
+)
+
+
+def test_minify_python_keeps_code_only():
+    """Test that comments, docstrings and blank lines are removed from partial code."""
+    assert minify(PYTHON, "shop/orders.py") == (
+        "        return total\n"
+        "    def pay(self, amount):\n"
+        '        label = "# not a comment"\n'
+        "        return charge(amount, label)"
+    )
+
+
+def test_minify_other_languages():
+    """Test the comment rules of C-style, configuration and prose files."""
+    javascript = '// Header\nconst url = "http://x"; /* inline */\n\nfunction f() {} // done\n'
+    assert minify(javascript, "app.js") == 'const url = "http://x";\nfunction f() {}'
+    assert minify("# Settings\nname: app\n\n  # nested\nport: 80\n", "app.yaml") == "name: app\nport: 80"
+    assert minify("Title\n\n\n\nText\n", "README.md") == "Title\n\nText"
+
+
+def test_merge_overlapping_snippets():
+    """Test that overlapping snippets of a file are merged with their best score."""
+    snippets = [
+        Snippet("a.py", 1, 3, "one\ntwo\nthree", score=1.0),
+        Snippet("a.py", 3, 5, "three\nfour\nfive", score=2.0),
+        Snippet("a.py", 9, 9, "nine", score=0.5),
+        Snippet("b.py", 1, 1, "bee", score=3.0),
+    ]
+
+    merged = merge_overlapping(snippets)
+
+    assert [(s.path, s.start_line, s.end_line, s.score) for s in merged] == [
+        ("b.py", 1, 1, 3.0), ("a.py", 1, 5, 2.0), ("a.py", 9, 9, 0.5)
+    ]
+    assert merged[1].text == "one\ntwo\nthree\nfour\nfive"
+
+
+def test_knapsack_beats_greedy():
+    """Test that two smaller items are preferred to the single best one."""
+    assert knapsack([60, 50, 50], [10.0, 8.0, 8.0], 100) == [1, 2]
+    assert knapsack([60, 50], [10.0, 8.0], 0) == []
+    assert knapsack([5000, 3000], [2.0, 1.0], 4000) == [1]
+
+
+def test_pack_context_deduplicates_and_fits_budget():
+    """Test that packing removes repeated imports and duplicates within the budget."""
+    first = "import os\n\n# Reads the file\ndef read(path):\n    return open(path).read()"
+    second = "import os\nimport json\n\ndef load(path):\n    return json.loads(read(path))"
+    snippets = [
+        Snippet("io_utils.py", 1, 5, first, score=3.0),
+        Snippet("loader.py", 1, 5, second, score=2.0),
+        Snippet("vendored/io_utils.py", 1, 5, first, score=1.0),
+    ]
+
+    packed = pack_context(snippets, token_budget=1000)
+
+    assert [snippet.path for snippet in packed.snippets] == ["io_utils.py", "loader.py"]
+    assert packed.snippets[1].text == "import json\ndef load(path):\n    return json.loads(read(path))"
+    assert packed.tokens == sum(count_tokens(entry) for entry in packed.render())
+    assert packed.tokens_saved > 0
+    assert packed.dropped == 1
+
+    small = pack_context(snippets, token_budget=count_tokens(packed.render()[0]))
+    assert [snippet.path for snippet in small.snippets] == ["io_utils.py"]
+    assert len(pack_context(snippets, token_budget=1000, max_snippets=1).snippets) == 1
+
+
+def test_pack_context_keeps_imports_of_unselected_snippets():
+    """Test that imports are only dropped when a selected snippet shows them."""
+    large = "import os\n\ndef read(path):\n" + "    path = os.path.abspath(path)\n" * 40
+    small = "import os\n\ndef exists(path):\n    return os.path.exists(path)"
+    snippets = [
+        Snippet("io_utils.py", 1, 42, large, score=3.0),
+        Snippet("paths.py", 1, 4, small, score=2.0),
+    ]
+
+    packed = pack_context(snippets, token_budget=count_tokens(snippets[1].render()))
+
+    assert [snippet.path for snippet in packed.snippets] == ["paths.py"]
+    assert packed.snippets[0].text.startswith("import os\n")
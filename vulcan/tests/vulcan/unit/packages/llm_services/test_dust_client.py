@@ -0,0 +1,165 @@
+"""
+Unit tests for the pooled HTTP transport and the Dust client.
+"""
+import asyncio
+import gc
+import json
+
+import httpx
+import pytest
+
+from vulcan.infra.interface.llm_agent.dust_client import DustClient
+from vulcan.infra.interface.llm_agent.http_client import LLMProviderError
+from vulcan.infra.interface.llm_agent.llm_client import LLMRequest
+from vulcan.llm_services.services.llm_provider import create_llm_client
+from vulcan.workflow_engine.concurrency import StageLimiter
+
+
+CONVERSATION = {
+    "conversation": {
+        "sId": "c1",
+        "content": [
+            [{"type": "user_message", "sId": "u1"}],
+            [{"type": "agent_message", "sId": "a1"}],
+        ],
+    }
+}
+
+EVENTS = "".join(
+    f"data: {json.dumps({'eventId': str(index), 'data': data})}\n\n"
+    for index, data in enumerate(
+        [
+            {"type": "generation_tokens", "classification": "chain_of_thought", "text": "Hmm"},
+            {"type": "generation_tokens", "classification": "tokens", "text": "Hello"},
+            {"type": "generation_tokens", "classification": "tokens", "text": " world"},
+            {"type": "agent_message_success"},
+        ]
+    )
+)
+
+
+def make_client(handler, **kwargs):
+    """Create a Dust client answered by a mock transport."""
+    options = {"max_retries": 2, "backoff_base": 0, "limiter": StageLimiter({})}
+    options.update(kwargs)
+    return DustClient(
+        api_key="key",
+        workspace_id="w1",
+        base_url="https://dust.example.com",
+        transport=httpx.MockTransport(handler),
+        **options,
+    )
+
+
+def dust_handler(received, failures=()):
+    """Serve a conversation, after answering with the given failure statuses."""
+    failures = list(failures)
+
+    def handler(request):
+        received.append(request)
+        if failures:
+            return httpx.Response(failures.pop(0), headers={"Retry-After": "0"}, text="busy")
+        if request.method == "POST":
+            return httpx.Response(200, json=CONVERSATION)
+        return httpx.Response(200, text=EVENTS, headers={"Content-Type": "text/event-stream"})
+
+    return handler
+
+
+@pytest.mark.asyncio
+async def test_completion_streams_agent_tokens():
+    """Test that the agent answer is streamed without chain of thought."""
+    received = []
+    client = make_client(dust_handler(received))
+
+    response = await client.complete(LLMRequest(prompt="Say hello", model="gpt-4", system="Be brief"))
+
+    assert response.content == "Hello world"
+    assert response.finish_reason == "stop"
+    create, events = received
+    assert create.headers["Authorization"] == "Bearer key"
+    assert create.url.path == "/api/v1/w/w1/assistant/conversations"
+    message = json.loads(create.content)["message"]
+    assert message["mentions"] == [{"configurationId": "gpt-4"}]
+    assert message["content"] == "Be brief\n\nSay hello"
+    assert events.url.path == "/api/v1/w/w1/assistant/conversations/c1/messages/a1/events"
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_throttling_is_retried():
+    """Test that throttled and failing requests are retried."""
+    received = []
+    client = make_client(dust_handler(received, failures=[429, 503]))
+
+    response = await client.complete(LLMRequest(prompt="Say hello", model="gpt-4"))
+
+    assert response.content == "Hello world"
+    assert len(received) == 4
+
+
+@pytest.mark.asyncio
+async def test_client_errors_are_not_retried():
+    """Test that rejected requests fail at once and exhausted retries fail."""
+    received = []
+    with pytest.raises(LLMProviderError) as excinfo:
+        await make_client(dust_handler(received, failures=[401])).complete(
+            LLMRequest(prompt="Say hello", model="gpt-4")
+        )
+    assert excinfo.value.status_code == 401
+    assert len(received) == 1
+
+    received.clear()
+    with pytest.raises(LLMProviderError):
+        await make_client(dust_handler(received, failures=[500] * 3)).complete(
+            LLMRequest(prompt="Say hello", model="gpt-4")
+        )
+    assert len(received) == 3
+
+
+@pytest.mark.asyncio
+async def test_provider_concurrency_is_limited():
+    """Test that in-flight requests of a provider are bounded."""
+    in_flight = 0
+    peak = 0
+
+    async def handler(request):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.02)
+        in_flight -= 1
+        return httpx.Response(200, json={"ok": True})
+
+    client = make_client(handler, limiter=StageLimiter({"llm_requests": 4, "llm_provider": 2}))
+
+    await asyncio.gather(*(client._request_json("GET", "/ping") for _ in range(6)))
+
+    assert peak == 2
+
+
+def test_dust_client_is_shared():
+    """Test that the dust provider reuses one pooled client."""
+    assert create_llm_client({"provider": "dust"}) is create_llm_client({"provider": "dust"})
+
+
+def test_pooled_clients_are_kept_per_event_loop():
+    """Test that each event loop uses its own pool, released with the loop."""
+    client = make_client(dust_handler([]))
+
+    async def pooled():
+        return client._get_client()
+
+    first_loop, second_loop = asyncio.new_event_loop(), asyncio.new_event_loop()
+    first = first_loop.run_until_complete(pooled())
+    second = second_loop.run_until_complete(pooled())
+
+    assert second is not first
+    assert first_loop.run_until_complete(pooled()) is first
+    first_loop.run_until_complete(client.aclose())
+    assert first.is_closed and not second.is_closed
+    first_loop.close()
+    second_loop.close()
+    del first_loop, second_loop
+    gc.collect()
+    assert len(client._clients) == 0
@@ -0,0 +1,145 @@
+"""
+Unit tests for the few-shot example index of past generations.
+"""
+import pytest
+
+from vulcan.core.vulcan_core.models import CodeArtifact, Requirements, TestCase, TestResult
+from vulcan.infra.interface.llm_agent.llm_client import LLMChunk, LLMClient
+from vulcan.llm_services.services.code_generator import CodeGenerator
+from vulcan.llm_services.services.example_index import ExampleIndex, minhash, similarity
+from vulcan.testing_framework.services.test_runner import TestRunReport
+from vulcan.workflow_engine.concurrency import StageLimiter
+from vulcan.workflow_engine.state.workflow_state import WorkflowStateManager
+from vulcan.workflow_engine.workflows.code_generation_flow import CodeGenerationWorkflow
+
+
+FACTORIAL = [CodeArtifact(content="def factorial(n):\n    return 1\n", file_path="math.py", language="python")]
+
+
+class RecordingLLMClient(LLMClient):
+    """LLM client recording the prompts it is sent."""
+
+    provider = "recording"
+
+    def __init__(self):
+        self.prompts = []
+
+    async def stream(self, request):
+        self.prompts.append(request.prompt)
+        yield LLMChunk(text="### File: main.py\n```python\nprint('hello')\n```\n", finish_reason="stop")
+
+
+class PassingTestRunner:
+    """Test runner whose tests always pass."""
+
+    async def run(self, code_path, generate_coverage=False, token=None):
+        return TestRunReport(exit_code=0, test_results=[TestResult(TestCase("test_main", "", {}, {}), True, {})])
+
+
+class EmptyTestRunner:
+    """Test runner collecting no test."""
+
+    async def run(self, code_path, generate_coverage=False, token=None):
+        return TestRunReport(exit_code=5)
+
+
+def test_similar_requirements_have_similar_signatures():
+    """Test that signatures estimate the similarity of the requirement terms."""
+    factorial = minhash("Create a factorial function")
+
+    assert similarity(factorial, minhash("create the FACTORIAL function")) == 1.0
+    assert similarity(factorial, minhash("Write a factorial function with memoization")) > 0.2
+    assert similarity(factorial, minhash("Parse a CSV report of invoices")) < 0.1
+    assert minhash("the of a") is None
+
+
+def test_search_follows_other_processes(tmp_path):
+    """Test that examples added by another index on the same file are found."""
+    writer = ExampleIndex(tmp_path)
+    reader = ExampleIndex(tmp_path)
+    assert reader.search(Requirements(description="Create a factorial function"), 2) == []
+
+    example_id = writer.add(Requirements(description="Create a factorial function"), FACTORIAL)
+    writer.add(Requirements(description="Parse a CSV report of invoices"), FACTORIAL)
+    assert writer.add(Requirements(description="Create a factorial  function"), FACTORIAL) == example_id
+
+    results = reader.search(Requirements(description="Write a recursive factorial function"), 2)
+    assert [example.example_id for example, _ in results] == [example_id]
+    assert reader.example_count == 2
+    assert results[0][0].render() == (
+        "Task: Create a factorial function\n"
+        "### File: math.py\n```python\ndef factorial(n):\n    return 1\n```"
+    )
+
+
+def test_select_respects_token_budget(tmp_path):
+    """Test that examples beyond the token budget are skipped."""
+    index = ExampleIndex(tmp_path)
+    large = [CodeArtifact(content="x = 1\n" * 500, file_path="big.py", language="python")]
+    index.add(Requirements(description="Create a factorial function of integers"), large)
+    index.add(Requirements(description="Create a factorial function"), FACTORIAL)
+    requirements = Requirements(description="Create a factorial function")
+
+    assert [e.description for e in index.select(requirements, 2, token_budget=100)] == [
+        "Create a factorial function"
+    ]
+    assert len(index.select(requirements, 2, token_budget=10_000)) == 2
+    assert index.select(requirements, 2, token_budget=5) == []
+
+
+def test_oldest_examples_are_evicted_and_compacted(tmp_path):
+    """Test that the index keeps its most recent examples, on disk as well."""
+    index = ExampleIndex(tmp_path, max_examples=2)
+    for subject in ["orders", "invoices", "payments", "refunds", "shipments"]:
+        index.add(Requirements(description=f"Create the handler of {subject}"), FACTORIAL)
+
+    assert index.example_count == 2
+    assert len(index.path.read_text().splitlines()) <= 4
+    reloaded = ExampleIndex(tmp_path, max_examples=2)
+    results = reloaded.search(Requirements(description="Create the handler of shipments"), 5)
+    assert [example.description for example, _ in results] == [
+        "Create the handler of shipments", "Create the handler of refunds"
+    ]
+    assert reloaded.example_count == 2
+
+
+@pytest.mark.asyncio
+async def test_workflow_learns_from_passing_generations(tmp_path):
+    """Test that a passing generation becomes a few-shot example of a similar one."""
+    client = RecordingLLMClient()
+    workflow = CodeGenerationWorkflow(
+        code_generator=CodeGenerator(llm_client=client, config={"cache": False}),
+        state_manager=WorkflowStateManager(state_dir=tmp_path / "state"),
+        stage_limiter=StageLimiter({}),
+        test_runner=PassingTestRunner(),
+        workspace_dir=tmp_path / "workspaces",
+        example_index=ExampleIndex(tmp_path / "examples"),
+    )
+
+    first = await workflow.execute_async(Requirements(description="Print a greeting"), run_tests=True)
+    second = await workflow.execute_async(Requirements(description="Print a greeting twice"))
+
+    assert first.success and second.success
+    assert "Solved tasks similar" not in client.prompts[0]
+    assert "Task: Print a greeting\n### File: main.py" in client.prompts[1]
+    assert second.metadata.additional_info["few_shot_examples"] == workflow.example_index.search(
+        Requirements(description="Print a greeting"), 1
+    )[0][0].example_id
+
+
+@pytest.mark.asyncio
+async def test_workflow_ignores_generations_without_tests(tmp_path):
+    """Test that a generation whose tests were not collected is no example."""
+    workflow = CodeGenerationWorkflow(
+        code_generator=CodeGenerator(llm_client=RecordingLLMClient(), config={"cache": False}),
+        state_manager=WorkflowStateManager(state_dir=tmp_path / "state"),
+        stage_limiter=StageLimiter({}),
+        test_runner=EmptyTestRunner(),
+        workspace_dir=tmp_path / "workspaces",
+        example_index=ExampleIndex(tmp_path / "examples"),
+    )
+
+    result = await workflow.execute_async(Requirements(description="Print a greeting"), run_tests=True)
+
+    assert not result.success
+    assert workflow.example_index.example_count == 0
@@ -0,0 +1,149 @@
+"""
+Unit tests for hedged LLM requests.
+"""
+import asyncio
+
+import pytest
+
+from vulcan.core.vulcan_core.models import Requirements
+from vulcan.infra.interface.llm_agent.llm_client import LLMChunk, LLMClient, LLMRequest
+from vulcan.llm_services.services.code_generator import CodeGenerator
+from vulcan.llm_services.services.hedging import HedgedLLMClient, LatencyTracker
+from vulcan.llm_services.services.llm_provider import create_llm_client
+from vulcan.workflow_engine.metrics import collect_metrics
+
+
+class DelayedLLMClient(LLMClient):
+    """LLM client answering with its name after a delay."""
+
+    def __init__(self, name, delay, error=None):
+        self.provider = name
+        self.delay = delay
+        self.error = error
+        self.models = []
+        self.closed = 0
+
+    async def stream(self, request):
+        self.models.append(request.model)
+        try:
+            await asyncio.sleep(self.delay)
+            if self.error:
+                raise self.error
+            yield LLMChunk(text=self.provider)
+            yield LLMChunk(text="!", finish_reason="stop")
+        finally:
+            self.closed += 1
+
+
+def make_client(primary, secondary, tmp_path, **kwargs):
+    """Create a hedged client hedging after 50ms."""
+    return HedgedLLMClient(
+        primary,
+        secondary,
+        tracker=LatencyTracker(initial_delay=0.05, min_delay=0),
+        metrics_dir=tmp_path,
+        **kwargs,
+    )
+
+
+REQUEST = LLMRequest(prompt="Hello", model="gpt-4")
+
+
+@pytest.mark.asyncio
+async def test_fast_primary_is_not_hedged(tmp_path):
+    """Test that no second request is sent when the primary answers in time."""
+    primary, secondary = DelayedLLMClient("primary", 0), DelayedLLMClient("secondary", 0)
+    client = make_client(primary, secondary, tmp_path)
+
+    response = await client.complete(REQUEST)
+
+    assert response.content == "primary!"
+    assert "hedged" not in response.additional_info
+    assert secondary.models == []
+    assert client.hedge_rate == 0
+
+
+@pytest.mark.asyncio
+async def test_slow_primary_is_hedged_and_cancelled(tmp_path):
+    """Test that the hedge answers and the slow primary is closed."""
+    primary, secondary = DelayedLLMClient("primary", 5), DelayedLLMClient("secondary", 0)
+    client = make_client(primary, secondary, tmp_path, hedge_model="gpt-4o")
+
+    response = await asyncio.wait_for(client.complete(REQUEST), 2)
+
+    assert response.content == "secondary!"
+    assert response.model == "gpt-4o"
+    assert response.additional_info == {
+        "hedged": "true", "hedge_winner": "secondary", "hedge_model": "gpt-4o",
+    }
+    assert secondary.models == ["gpt-4o"]
+    # The winner's latency is recorded for its own model
+    assert client.tracker._latencies["gpt-4o"][0] < 0.05 <= client.tracker._latencies["gpt-4"][0]
+    assert primary.closed == 1
+    assert (client.hedge_rate, client.win_rate) == (1, 1)
+
+    text = collect_metrics(tmp_path)
+    assert "vulcan_llm_hedged_requests_total{" in text
+    assert "vulcan_llm_hedge_wins_total{" in text
+
+
+@pytest.mark.asyncio
+async def test_generation_reports_the_winning_model(tmp_path):
+    """Test that a generation answered by the hedge reports the hedge model."""
+    primary, secondary = DelayedLLMClient("primary", 5), DelayedLLMClient("secondary", 0)
+    client = make_client(primary, secondary, tmp_path, hedge_model="gpt-4o")
+    generator = CodeGenerator(llm_client=client, config={"cache": False, "model": "gpt-4"})
+
+    generation = await asyncio.wait_for(generator.generate(Requirements(description="Hi")), 2)
+
+    assert generation.metadata.model_used == "gpt-4o"
+
+
+@pytest.mark.asyncio
+async def test_primary_can_win_after_hedging(tmp_path):
+    """Test that a primary answering before the hedge wins the race."""
+    primary, secondary = DelayedLLMClient("primary", 0.1), DelayedLLMClient("secondary", 5)
+    client = make_client(primary, secondary, tmp_path)
+
+    response = await asyncio.wait_for(client.complete(REQUEST), 2)
+
+    assert response.content == "primary!"
+    assert response.model == "gpt-4"
+    assert response.additional_info["hedge_winner"] == "primary"
+    assert secondary.closed == 1
+    assert (client.hedge_rate, client.win_rate) == (1, 0)
+
+
+@pytest.mark.asyncio
+async def test_failing_contender_is_ignored(tmp_path):
+    """Test that the race is won by the contender that does not fail."""
+    primary = DelayedLLMClient("primary", 0.1, error=RuntimeError("overloaded"))
+    secondary = DelayedLLMClient("secondary", 0.2)
+    client = make_client(primary, secondary, tmp_path)
+
+    response = await asyncio.wait_for(client.complete(REQUEST), 2)
+
+    assert response.content == "secondary!"
+
+
+def test_delay_follows_percentile():
+    """Test that the hedging delay is the percentile of recent latencies."""
+    tracker = LatencyTracker(window=100, percentile=90, initial_delay=5, min_delay=0, min_samples=10)
+    assert tracker.delay() == 5
+
+    for latency in range(1, 101):
+        tracker.record(latency / 100)
+
+    assert tracker.delay() == 0.9
+    assert tracker.delay("gpt-4o") == 5
+
+
+def test_hedged_client_is_shared():
+    """Test that the hedged client is reused so latencies accumulate."""
+    config = {"provider": "dust", "hedge": True, "hedge_model": "gpt-4o"}
+
+    client = create_llm_client(config)
+
+    assert isinstance(client, HedgedLLMClient)
+    assert client is create_llm_client(config)
+    assert client.secondary is client.primary
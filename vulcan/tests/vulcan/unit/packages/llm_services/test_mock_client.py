@@ -0,0 +1,100 @@
+"""
+Unit tests for the mock LLM provider.
+"""
+import random
+
+import pytest
+
+from vulcan.core.vulcan_core.models import Requirements
+from vulcan.infra.interface.llm_agent.http_client import LLMProviderError
+from vulcan.infra.interface.llm_agent.llm_client import LLMRequest
+from vulcan.infra.interface.llm_agent import mock_client
+from vulcan.infra.interface.llm_agent.mock_client import MockLLMClient, parse_distribution
+from vulcan.llm_services.services.code_generator import CodeGenerator, build_prompt
+from vulcan.llm_services.services.llm_provider import create_llm_client
+
+
+REQUIREMENTS = Requirements(description="Create a factorial function")
+
+
+def make_request(requirements=REQUIREMENTS, expected_files=(), **kwargs):
+    """Create the code generation request of requirements."""
+    return LLMRequest(prompt=build_prompt(requirements, expected_files), model="mock", **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_generation_from_template():
+    """Test that templated code is generated for the expected files with token counts."""
+    generator = CodeGenerator(llm_client=MockLLMClient(), config={"cache": False})
+
+    generation = await generator.generate(REQUIREMENTS, expected_files=["factorial.py", "README.md"])
+
+    assert [a.file_path for a in generation.artifacts] == ["factorial.py", "README.md"]
+    assert "def create_a_factorial_function(" in generation.artifacts[0].content
+    compile(generation.artifacts[0].content, "factorial.py", "exec")
+    assert generation.metadata.prompt_tokens > 0
+    assert generation.metadata.completion_tokens > 0
+
+
+@pytest.mark.asyncio
+async def test_canned_responses_and_truncation():
+    """Test that canned completions are matched and cut at max_tokens."""
+    client = MockLLMClient(responses={"factorial": "one two three four"})
+
+    response = await client.complete(make_request())
+    assert response.content == "one two three four"
+    assert response.usage.completion_tokens == 4
+
+    response = await client.complete(make_request(max_tokens=2))
+    assert response.content == "one two"
+    assert response.finish_reason == "length"
+
+
+@pytest.mark.asyncio
+async def test_draws_are_reproducible():
+    """Test that two clients with the same seed fail the same requests."""
+    outcomes = []
+    for _ in range(2):
+        client = MockLLMClient(seed=7, error_rate=0.5, first_token_latency="uniform:0,0.001")
+        run = []
+        for index in range(10):
+            request = make_request(Requirements(description=f"Function {index % 3}"))
+            try:
+                await client.complete(request)
+                run.append(True)
+            except LLMProviderError as e:
+                assert e.status_code == 503
+                run.append(False)
+        outcomes.append(run)
+
+    assert outcomes[0] == outcomes[1]
+    assert True in outcomes[0] and False in outcomes[0]
+
+
+@pytest.mark.asyncio
+async def test_attempt_counts_are_bounded(monkeypatch):
+    """Test that the attempts of the least recent requests are forgotten."""
+    monkeypatch.setattr(mock_client, "MAX_TRACKED_REQUESTS", 3)
+    client = MockLLMClient(first_token_latency="uniform:0,0.001")
+    for index in range(5):
+        await client.complete(make_request(Requirements(description=f"Function {index}")))
+    await client.complete(make_request(Requirements(description="Function 2")))
+
+    assert len(client._attempts) == 3
+    assert list(client._attempts.values()) == [1, 1, 2]
+
+
+def test_parse_distribution():
+    """Test that distributions are parsed and never negative."""
+    rng = random.Random(0)
+    assert parse_distribution("const:2")(rng) == 2
+    assert 1 <= parse_distribution("uniform:1,2")(rng) <= 2
+    assert all(parse_distribution("normal:0,1")(rng) >= 0 for _ in range(100))
+    for spec in ["gamma:1", "normal:1", "const:fast"]:
+        with pytest.raises(ValueError):
+            parse_distribution(spec)
+
+
+def test_mock_provider_is_selectable():
+    """Test that the mock provider is selected by llm.provider."""
+    assert isinstance(create_llm_client({"provider": "mock"}), MockLLMClient)
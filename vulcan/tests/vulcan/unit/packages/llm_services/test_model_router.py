@@ -0,0 +1,139 @@
+"""
+Unit tests for complexity-based model routing.
+"""
+import math
+
+import pytest
+
+from vulcan.core.vulcan_core.models import Requirements, TestCase, TestResult
+from vulcan.infra.interface.llm_agent.llm_client import LLMChunk, LLMClient
+from vulcan.llm_services.services.code_generator import CodeGenerator
+from vulcan.llm_services.services.model_router import (
+    ModelRouter,
+    ModelTier,
+    complexity_score,
+    parse_tiers,
+)
+from vulcan.testing_framework.services.test_runner import TestRunReport
+from vulcan.workflow_engine.concurrency import StageLimiter
+from vulcan.workflow_engine.state.workflow_state import WorkflowStateManager
+from vulcan.workflow_engine.workflows.code_generation_flow import CodeGenerationWorkflow
+
+
+TIERS = "small:3,medium:8,large"
+
+TRIVIAL = Requirements(description="Factorial function")
+COMPLEX = Requirements(
+    description="Build a REST service for orders with authentication and pagination",
+    constraints=["Use FastAPI", "Use SQLAlchemy", "Include tests", "Type hints"],
+    examples=["GET /orders -> 200", "POST /orders -> 201"],
+)
+
+
+class ModelEchoLLMClient(LLMClient):
+    """LLM client writing the requested model into the generated file."""
+
+    provider = "echo"
+
+    def __init__(self):
+        self.models = []
+
+    async def stream(self, request):
+        self.models.append(request.model)
+        yield LLMChunk(text=f"### File: app.py\n```python\nMODEL = {request.model!r}\n```\n")
+        yield LLMChunk(finish_reason="stop")
+
+
+class ModelTestRunner:
+    """Test runner passing only the code of the given model."""
+
+    def __init__(self, passing_model):
+        self.passing_model = passing_model
+        self.runs = 0
+
+    async def run(self, code_path, generate_coverage=False, token=None):
+        self.runs += 1
+        passed = repr(self.passing_model) in (code_path / "app.py").read_text()
+        return TestRunReport(
+            exit_code=0 if passed else 1,
+            test_results=[
+                TestResult(
+                    test_case=TestCase("test_app", "", {}, {}), passed=passed, actual_output={}
+                )
+            ],
+        )
+
+
+def make_generator(client):
+    """Create an uncached code generator routing to three tiers, without repairs."""
+    return CodeGenerator(
+        llm_client=client, config={"model_tiers": TIERS, "cache": False, "repair_iterations": 0}
+    )
+
+
+def test_complexity_score_counts_requirements():
+    """Test that constraints, examples and files raise the score."""
+    assert complexity_score(TRIVIAL) < 2
+    assert complexity_score(COMPLEX) > 5
+    assert complexity_score(TRIVIAL, ["a.py", "b.py"]) == complexity_score(TRIVIAL) + 2
+
+
+def test_parse_tiers():
+    """Test that tiers are parsed and the last one is unbounded."""
+    assert parse_tiers(TIERS) == [
+        ModelTier("small", 3), ModelTier("medium", 8), ModelTier("large", math.inf)
+    ]
+    assert parse_tiers("") == []
+    with pytest.raises(ValueError):
+        parse_tiers("small:8,large:3,huge")
+    with pytest.raises(ValueError):
+        parse_tiers("small:few,large")
+
+
+def test_route_and_escalate():
+    """Test that requests go to the smallest covering tier and escalate up."""
+    router = ModelRouter(parse_tiers(TIERS))
+
+    decision = router.route(TRIVIAL)
+    assert (decision.model, decision.tier) == ("small", 0)
+    assert router.route(COMPLEX).model == "medium"
+
+    decision = router.escalate(router.escalate(decision))
+    assert decision.model == "large"
+    assert router.escalate(decision) is None
+
+
+@pytest.mark.asyncio
+async def test_generator_uses_routed_model():
+    """Test that the routed model is requested and recorded."""
+    client = ModelEchoLLMClient()
+
+    generation = await make_generator(client).generate(TRIVIAL)
+
+    assert client.models == ["small"]
+    assert generation.metadata.model_used == "small"
+    assert generation.metadata.additional_info["model_tier"] == "0"
+
+
+@pytest.mark.asyncio
+async def test_failing_tests_escalate_to_larger_model(tmp_path):
+    """Test that code failing its tests is regenerated by the next tiers."""
+    client = ModelEchoLLMClient()
+    runner = ModelTestRunner(passing_model="large")
+    workflow = CodeGenerationWorkflow(
+        code_generator=make_generator(client),
+        state_manager=WorkflowStateManager(state_dir=tmp_path / "state"),
+        stage_limiter=StageLimiter({}),
+        test_runner=runner,
+        workspace_dir=tmp_path / "workspaces",
+    )
+
+    result = await workflow.execute_async(TRIVIAL, output_dir=tmp_path / "out", run_tests=True)
+
+    assert result.success
+    assert client.models == ["small", "medium", "large"]
+    assert runner.runs == 3
+    assert result.metadata.model_used == "large"
+    assert "'large'" in (tmp_path / "out" / "app.py").read_text()
+    state = workflow.state_manager.get_state(result.process_id)
+    assert [artifact["name"] for artifact in state.artifacts] == ["app.py"]
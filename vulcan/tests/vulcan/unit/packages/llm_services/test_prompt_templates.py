@@ -0,0 +1,81 @@
+"""
+Unit tests for the prompt templates and the prompt cache accounting.
+"""
+import os
+
+import pytest
+
+from vulcan.core.vulcan_core.models import Requirements
+from vulcan.infra.interface.llm_agent.mock_client import MockLLMClient
+from vulcan.llm_services.services.code_generator import (
+    CODE_GENERATION_TEMPLATE,
+    CodeGenerator,
+    build_prompt,
+    usage_metrics,
+)
+from vulcan.llm_services.services.prompt_templates import PromptSection, PromptTemplate
+
+
+CONTEXT = ["shop/orders.py (lines 1-2):\n```\nclass Order:\n    pass\n```"] * 20
+
+
+def test_render_orders_sections_and_skips_empty_ones():
+    """Test that sections follow the instructions in declaration order."""
+    template = PromptTemplate(
+        name="test",
+        version=1,
+        system="System",
+        instructions="Do it.",
+        sections=(PromptSection("code"), PromptSection("task", "Task")),
+    )
+
+    assert template.render(task="Sort", code="x = 1") == "Do it.\n\nx = 1\n\nTask:\nSort"
+    assert template.render(task="Sort", code="") == "Do it.\n\nTask:\nSort"
+    with pytest.raises(ValueError):
+        template.render(other="x")
+
+
+def test_key_follows_the_content():
+    """Test that editing a template changes its key even without a version bump."""
+    first = PromptTemplate(name="test", version=1, system="System", instructions="Do it.")
+    edited = PromptTemplate(name="test", version=1, system="System", instructions="Do it well.")
+
+    assert first.key.startswith("test-v1-")
+    assert first.key == PromptTemplate(name="test", version=1, system="System", instructions="Do it.").key
+    assert edited.key != first.key
+
+
+def test_generation_prompt_puts_volatile_parts_last():
+    """Test that requests on a repository share the prompt up to their requirements."""
+    orders = build_prompt(
+        Requirements(description="List the orders", context=CONTEXT), ["orders.py"]
+    )
+    invoices = build_prompt(
+        Requirements(description="Render the invoices", constraints=["No I/O"], context=CONTEXT)
+    )
+
+    assert orders.startswith(CODE_GENERATION_TEMPLATE.instructions)
+    shared = orders[: orders.index("Requirements:")]
+    assert "class Order" in shared
+    assert invoices.startswith(shared)
+    assert orders.endswith("Files to generate:\n- orders.py")
+
+
+@pytest.mark.asyncio
+async def test_cached_prompt_tokens_are_recorded(tmp_path):
+    """Test that prompt cache hits of the provider reach the metadata and metrics."""
+    generator = CodeGenerator(
+        llm_client=MockLLMClient(), config={"cache": False}, metrics_dir=tmp_path
+    )
+
+    first = await generator.generate(Requirements(description="List the orders", context=CONTEXT))
+    second = await generator.generate(Requirements(description="Render the invoices", context=CONTEXT))
+
+    assert "cached_prompt_tokens" not in first.metadata.additional_info
+    cached = int(second.metadata.additional_info["cached_prompt_tokens"])
+    assert 0 < cached < second.metadata.prompt_tokens
+    assert cached % 64 == 0
+    metrics = (tmp_path / f"llm_usage-{os.getpid()}.prom").read_text()
+    assert "vulcan_llm_cached_prompt_tokens_total" in metrics
+    labels = {"provider": "mock", "model": second.metadata.model_used, "pid": str(os.getpid())}
+    assert usage_metrics.get("vulcan_llm_cached_prompt_tokens_total", **labels) >= cached
@@ -0,0 +1,198 @@
+"""
+Unit tests for the LLM response cache.
+"""
+import asyncio
+import time
+
+import pytest
+
+from vulcan.core.vulcan_core.models import Requirements
+from vulcan.infra.interface.llm_agent.llm_client import LLMChunk, LLMClient, LLMResponse, LLMUsage
+from vulcan.llm_services.services.code_generator import CodeGenerator
+from vulcan.llm_services.services.response_cache import ResponseCache, cache_key
+
+
+COMPLETION = "### File: hello.py\n```python\nprint('hello')\n```\n"
+
+
+class CountingLLMClient(LLMClient):
+    """LLM client counting its calls and streaming a fixed completion slowly."""
+
+    provider = "counting"
+
+    def __init__(self, completion=COMPLETION, finish_reason="stop"):
+        self.calls = 0
+        self.completion = completion
+        self.finish_reason = finish_reason
+
+    async def stream(self, request):
+        self.calls += 1
+        await asyncio.sleep(0.05)
+        yield LLMChunk(text=self.completion)
+        yield LLMChunk(
+            usage=LLMUsage(prompt_tokens=5, completion_tokens=7), finish_reason=self.finish_reason
+        )
+
+
+def make_response(content="cached"):
+    """Create an LLM response."""
+    return LLMResponse(content=content, model="test-model", usage=LLMUsage(1, 2))
+
+
+def test_key_ignores_whitespace():
+    """Test that formatting-only differences share a key, other parameters do not."""
+    a = Requirements(description="Write  a\nhello world", constraints=["Use print ", ""])
+    b = Requirements(description=" Write a hello world ", constraints=["Use  print"])
+
+    assert cache_key(a, "gpt-4", 0.7, "1") == cache_key(b, "gpt-4", 0.7, "1")
+    assert cache_key(a, "gpt-4", 0.7, "1") != cache_key(a, "gpt-4", 0.2, "1")
+    assert cache_key(a, "gpt-4", 0.7, "1") != cache_key(a, "gpt-4", 0.7, "2")
+
+
+def test_disk_level_is_shared(tmp_path):
+    """Test that a response written by one cache is read by another."""
+    ResponseCache(tmp_path).put("abc", make_response())
+
+    response, level = ResponseCache(tmp_path).get("abc")
+
+    assert level == "disk"
+    assert response == make_response()
+
+
+def test_entries_expire(tmp_path):
+    """Test that entries are dropped from both levels after the TTL."""
+    cache = ResponseCache(tmp_path, ttl=0.01)
+    cache.put("abc", make_response())
+    time.sleep(0.02)
+
+    assert cache.get("abc") == (None, None)
+    assert not list(tmp_path.glob("*/*.json"))
+
+
+def test_size_eviction(tmp_path):
+    """Test that both levels are bounded, evicting the oldest entries."""
+    cache = ResponseCache(tmp_path, max_memory_entries=2, max_disk_bytes=600)
+    for index in range(4):
+        cache.put(f"key{index}", make_response("x" * 100))
+        time.sleep(0.01)
+
+    assert list(cache._memory) == ["key2", "key3"]
+    assert cache.get("key0") == (None, None)
+    assert cache.get("key3")[1] == "memory"
+
+
+def test_disk_size_is_tracked_between_scans(tmp_path):
+    """Test that writes below the size limit do not scan the cache directory."""
+    cache = ResponseCache(tmp_path, max_disk_bytes=10_000)
+    scans = []
+    evict_disk = cache._evict_disk
+    cache._evict_disk = lambda: (scans.append(1), evict_disk())
+    for index in range(10):
+        cache.put(f"key{index}", make_response("x" * 100))
+    cache.put("key0", make_response("x" * 200))
+
+    assert len(scans) == 1
+    assert cache._disk_bytes == sum(path.stat().st_size for path in tmp_path.glob("*/*.json"))
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_are_coalesced(tmp_path):
+    """Test that identical generations share one completion and later ones hit the cache."""
+    client = CountingLLMClient()
+    generator = CodeGenerator(
+        llm_client=client, config={"model": "test-model"}, cache=ResponseCache(tmp_path)
+    )
+
+    first, second = await asyncio.gather(
+        generator.generate(Requirements(description="Hello world")),
+        generator.generate(Requirements(description="Hello  world ")),
+    )
+    third = await generator.generate(Requirements(description="Hello world"))
+
+    assert client.calls == 1
+    assert first.metadata.additional_info == {"cache_hit": "false"}
+    assert second.metadata.additional_info["cache_source"] == "coalesced"
+    assert third.metadata.additional_info == {"cache_hit": "true", "cache_source": "memory"}
+    assert third.artifacts[0].file_path == "hello.py"
+
+
+@pytest.mark.asyncio
+async def test_responses_without_artifacts_are_not_cached(tmp_path):
+    """Test that unusable completions are requested again."""
+    client = CountingLLMClient(completion="Sorry, I cannot help with that.")
+    generator = CodeGenerator(
+        llm_client=client, config={"model": "test-model"}, cache=ResponseCache(tmp_path)
+    )
+
+    await generator.generate(Requirements(description="Hello world"))
+    await generator.generate(Requirements(description="Hello world"))
+
+    assert client.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_truncated_responses_are_not_cached(tmp_path):
+    """Test that a completion cut off after a complete file is requested again."""
+    client = CountingLLMClient(
+        completion=COMPLETION + "### File: other.py\n```python\nprint(", finish_reason="length"
+    )
+    generator = CodeGenerator(
+        llm_client=client, config={"model": "test-model"}, cache=ResponseCache(tmp_path)
+    )
+
+    first = await generator.generate(Requirements(description="Hello world"))
+    await generator.generate(Requirements(description="Hello world"))
+
+    assert first.metadata.truncated
+    assert [a.file_path for a in first.artifacts] == ["hello.py"]
+    assert client.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_cancelling_one_caller_keeps_shared_call(tmp_path):
+    """Test that the shared completion survives while another caller waits for it."""
+    cache = ResponseCache(tmp_path)
+    started = asyncio.Event()
+
+    async def compute():
+        started.set()
+        await asyncio.sleep(0.05)
+        return make_response()
+
+    first = asyncio.ensure_future(cache.get_or_compute("abc", compute))
+    await started.wait()
+    second = asyncio.ensure_future(cache.get_or_compute("abc", compute))
+    await asyncio.sleep(0)
+    first.cancel()
+
+    response, source = await second
+    assert response == make_response()
+    assert source == "coalesced"
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_stops_receiving_artifacts(tmp_path):
+    """Test that a shared completion delivers artifacts to the callers still waiting only."""
+    generator = CodeGenerator(
+        llm_client=CountingLLMClient(), config={"model": "test-model"}, cache=ResponseCache(tmp_path)
+    )
+    received = {"first": [], "second": []}
+
+    def collect(name):
+        async def on_artifact(artifact):
+            received[name].append(artifact.file_path)
+        return on_artifact
+
+    first = asyncio.ensure_future(
+        generator.generate(Requirements(description="Hello world"), on_artifact=collect("first"))
+    )
+    await asyncio.sleep(0.01)
+    second = asyncio.ensure_future(
+        generator.generate(Requirements(description="Hello world"), on_artifact=collect("second"))
+    )
+    await asyncio.sleep(0)
+    first.cancel()
+
+    generation = await second
+    assert generation.metadata.additional_info["cache_source"] == "coalesced"
+    assert received == {"first": [], "second": ["hello.py"]}
@@ -0,0 +1,199 @@
+"""
+Unit tests for the symbol index of repository code.
+"""
+import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from vulcan.core.vulcan_core.models import Requirements
+from vulcan.infra.interface.llm_agent.llm_client import LLMChunk, LLMClient
+from vulcan.llm_services.services import symbol_index
+from vulcan.llm_services.services.code_generator import CodeGenerator
+from vulcan.llm_services.services.symbol_index import SymbolIndex, parse_symbols, render_stubs
+from vulcan.workflow_engine.concurrency import StageLimiter
+from vulcan.workflow_engine.state.workflow_state import WorkflowStateManager
+from vulcan.workflow_engine.workflows.code_generation_flow import CodeGenerationWorkflow
+
+
+MODELS = (
+    "MAX_ITEMS = 50\n"
+    "\n"
+    "\n"
+    "class Order(Base):\n"
+    '    """An order of a customer."""\n'
+    "\n"
+    "    @property\n"
+    "    def total(self) -> int:\n"
+    "        return sum(self.items)\n"
+    "\n"
+    "    async def pay(self, amount: int, *, currency: str = 'EUR') -> None:\n"
+    "        await charge(amount)\n"
+)
+SERVICE = (
+    "from .models import Order\n"
+    "\n"
+    "\n"
+    "def create_order(items: list) -> Order:\n"
+    "    return Order(items)\n"
+)
+
+
+class RecordingLLMClient(LLMClient):
+    """LLM client recording the prompts it is sent."""
+
+    provider = "recording"
+
+    def __init__(self):
+        self.prompts = []
+
+    async def stream(self, request):
+        self.prompts.append(request.prompt)
+        yield LLMChunk(text="### File: main.py\n```python\nprint('hello')\n```\n", finish_reason="stop")
+
+
+def git(repository, *args):
+    subprocess.run(
+        ["git", "-c", "user.name=Test", "-c", "user.email=test@example.com", *args],
+        cwd=repository, check=True, capture_output=True,
+    )
+
+
+@pytest.fixture
+def repository(tmp_path):
+    root = tmp_path / "repository"
+    (root / "shop").mkdir(parents=True)
+    (root / "shop" / "__init__.py").write_text("")
+    (root / "shop" / "models.py").write_text(MODELS)
+    (root / "shop" / "service.py").write_text(SERVICE)
+    return root
+
+
+def test_parse_symbols():
+    """Test that definitions, imports and calls are extracted."""
+    file_symbols = parse_symbols("src/shop/models.py", MODELS)
+
+    signatures = {symbol.qualname: symbol.signature for symbol in file_symbols.symbols}
+    assert signatures == {
+        "MAX_ITEMS": "MAX_ITEMS = 50",
+        "Order": "class Order(Base)",
+        "Order.total": "def total(self) -> int",
+        "Order.pay": "async def pay(self, amount: int, *, currency: str='EUR') -> None",
+    }
+    assert file_symbols.symbols[1].summary == "An order of a customer."
+    assert file_symbols.symbols[2].decorators == ["property"]
+    assert file_symbols.calls == ["charge", "sum"]
+    assert parse_symbols("shop/service.py", SERVICE).imports == ["shop.models.Order"]
+    assert parse_symbols("broken.py", "def (").symbols == []
+
+
+def test_relevant_symbols_and_stubs(repository, tmp_path):
+    """Test that the symbols of the files and their imports are selected."""
+    index = SymbolIndex(repository, index_dir=tmp_path / "index")
+    index.update()
+
+    symbols = index.relevant("Add a discount", ["shop/service.py"])
+
+    assert [symbol.qualname for symbol in symbols] == [
+        "create_order", "Order", "Order.total", "Order.pay"
+    ]
+    assert [s.qualname for s in index.relevant("Cap orders at MAX_ITEMS")] == ["MAX_ITEMS"]
+    assert render_stubs(symbols[1:3]) == (
+        "# shop/models.py\n"
+        "class Order(Base):  # An order of a customer.\n"
+        "    @property\n"
+        "    def total(self) -> int: ..."
+    )
+    assert index.callers("Order") == ["shop/service.py"]
+    assert index.lookup("create_order")[0].line == 4
+
+
+def test_snapshots_per_commit(repository, tmp_path):
+    """Test that indexed commits are loaded and new ones parse changed files only."""
+    index = SymbolIndex(repository, index_dir=tmp_path / "index")
+    assert index.update("first") == (3, 0)
+
+    reloaded = SymbolIndex(repository, index_dir=tmp_path / "index")
+    assert reloaded.load("first")
+    assert reloaded.file_count == 3
+
+    (repository / "shop" / "service.py").unlink()
+    (repository / "shop" / "refunds.py").write_text("def refund(order):\n    pass\n")
+    restarted = SymbolIndex(repository, index_dir=tmp_path / "index")
+    assert not restarted.load("second")
+    assert restarted.commit_sha == "first"
+    assert restarted.update("second", ["shop/service.py", "shop/refunds.py", "README.md"]) == (1, 1)
+    assert restarted.lookup("create_order") == []
+    assert restarted.lookup("refund")[0].path == "shop/refunds.py"
+    assert sorted(p.stem for p in restarted.snapshot_dir.glob("*.json")) == ["first", "second"]
+
+
+def test_concurrent_snapshot_writers(repository, tmp_path):
+    """Test that indexes of one checkout store and prune the same snapshots concurrently."""
+    def index_commits(_):
+        index = SymbolIndex(repository, index_dir=tmp_path / "index", snapshots=1)
+        for number in range(20):
+            index.update(f"commit-{number}")
+        return index.file_count
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        assert list(pool.map(index_commits, range(4))) == [3, 3, 3, 3]
+
+    index = SymbolIndex(repository, index_dir=tmp_path / "index")
+    assert [p.name for p in index.snapshot_dir.iterdir()] == ["commit-19.json"]
+
+
+def test_lookups_do_not_wait_for_parsing(repository, tmp_path, monkeypatch):
+    """Test that the index is searched while an update parses files."""
+    index = SymbolIndex(repository, index_dir=tmp_path / "index")
+    index.update("first")
+    (repository / "shop" / "refunds.py").write_text("def refund(order):\n    pass\n")
+    parsing, release = threading.Event(), threading.Event()
+    parse = index._parse
+
+    def slow_parse(paths):
+        parsing.set()
+        release.wait(5)
+        return parse(paths)
+
+    monkeypatch.setattr(index, "_parse", slow_parse)
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        update = pool.submit(index.update, "second")
+        assert parsing.wait(5)
+        lookup = pool.submit(index.lookup, "Order")
+        try:
+            assert [symbol.path for symbol in lookup.result(timeout=1)] == ["shop/models.py"]
+        finally:
+            release.set()
+        assert update.result(timeout=5) == (1, 0)
+
+    assert index.lookup("refund")[0].path == "shop/refunds.py"
+
+
+@pytest.mark.asyncio
+async def test_workflow_adds_signatures(repository, tmp_path, monkeypatch):
+    """Test that the signatures of the symbols involved are added to the prompt."""
+    git(repository, "init", "-q")
+    git(repository, "add", "--all")
+    git(repository, "commit", "-q", "-m", "Initial commit")
+    index = SymbolIndex(repository, index_dir=tmp_path / "index")
+    monkeypatch.setitem(symbol_index._indexes, repository.resolve(), index)
+    client = RecordingLLMClient()
+    workflow = CodeGenerationWorkflow(
+        code_generator=CodeGenerator(llm_client=client, config={"cache": False}),
+        state_manager=WorkflowStateManager(state_dir=tmp_path / "state"),
+        stage_limiter=StageLimiter({}),
+        workspace_dir=tmp_path / "workspaces",
+    )
+
+    result = await workflow.execute_async(
+        Requirements(description="Add a refund method to Order"), context_dir=repository
+    )
+
+    assert result.success
+    assert "    async def pay(self, amount: int, *, currency: str='EUR') -> None: ..." in client.prompts[0]
+    state = workflow.state_manager.get_state(result.process_id)
+    metadata = state.steps[0].metadata
+    assert metadata["commit_sha"] == index.commit_sha
+    assert metadata["symbols"] == ["shop/models.py:Order", "shop/models.py:Order.total", "shop/models.py:Order.pay"]
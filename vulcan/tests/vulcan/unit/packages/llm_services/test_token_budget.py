@@ -0,0 +1,130 @@
+"""
+Unit tests for prompt token budgeting.
+"""
+import pytest
+
+from vulcan.core.vulcan_core.models import Requirements
+from vulcan.infra.interface.llm_agent.llm_client import LLMChunk, LLMClient
+from vulcan.llm_services.services.code_generator import CodeGenerator, build_prompt
+from vulcan.llm_services.services.token_budget import (
+    TokenBudgeter,
+    context_window,
+    count_tokens,
+    truncate_tokens,
+)
+
+
+REQUIREMENTS = Requirements(
+    description="Create a factorial function",
+    constraints=[f"Constraint number {index} with some explanation" for index in range(20)],
+    examples=[f"factorial({index}) -> some value" for index in range(20)],
+)
+
+
+class UsagelessLLMClient(LLMClient):
+    """LLM client recording requests and reporting no usage."""
+
+    provider = "usageless"
+
+    def __init__(self):
+        self.requests = []
+
+    async def stream(self, request):
+        self.requests.append(request)
+        yield LLMChunk(text="### File: main.py\n```python\nprint('hello')\n```\n", finish_reason="stop")
+
+
+def test_count_and_truncate_tokens():
+    """Test that counts grow with the text and truncation fits the budget."""
+    assert count_tokens("") == 0
+    assert 0 < count_tokens("hello world") < count_tokens("hello world, hello again")
+
+    text = "one two three four five six seven eight"
+    assert count_tokens(truncate_tokens(text, 3)) <= 3
+    assert text.startswith(truncate_tokens(text, 3))
+
+
+def test_context_window_of_known_models():
+    """Test that context windows are matched by the longest model prefix."""
+    assert context_window("gpt-4") == 8192
+    assert context_window("gpt-4o-mini") == 128000
+    assert context_window("unknown") == 8192
+
+
+def test_output_tokens_follow_expected_files():
+    """Test that max_tokens grows with the files and stays under the ceiling."""
+    budgeter = TokenBudgeter(
+        "gpt-4o", max_output_tokens=5000, output_tokens_per_file=1000, min_output_tokens=1500
+    )
+
+    assert budgeter.output_tokens() == 1500
+    assert budgeter.output_tokens(["a.py", "b.py", "c.py"]) == 3000
+    assert budgeter.output_tokens([f"{index}.py" for index in range(10)]) == 5000
+
+
+def test_prompt_fitting_budget_is_kept():
+    """Test that requirements within the budget are left untouched."""
+    budget = TokenBudgeter("gpt-4o").fit(REQUIREMENTS, build_prompt)
+
+    assert budget.requirements == REQUIREMENTS
+    assert budget.prompt_tokens == count_tokens(build_prompt(REQUIREMENTS), "gpt-4o")
+    assert not budget.dropped
+
+
+def test_examples_are_dropped_before_constraints():
+    """Test that trimming drops the last examples first."""
+    full = count_tokens(build_prompt(REQUIREMENTS))
+    budgeter = TokenBudgeter("model", window=full + 100 - 50, max_output_tokens=100)
+
+    budget = budgeter.fit(REQUIREMENTS, build_prompt)
+
+    assert budget.prompt_tokens <= full - 50
+    assert budget.requirements.constraints == REQUIREMENTS.constraints
+    assert budget.requirements.examples == REQUIREMENTS.examples[: len(budget.requirements.examples)]
+    assert budget.dropped == {"examples": 20 - len(budget.requirements.examples)}
+
+
+def test_context_is_trimmed_on_the_rendered_prompt():
+    """Test that context snippets are dropped just enough, counting their separators."""
+    snippets = [
+        f"shop/module_{index}.py:\n```\ndef handler_{index}():\n    pass\n```" for index in range(10)
+    ]
+    requirements = Requirements(description="Create a factorial function", context=snippets)
+    full = count_tokens(build_prompt(requirements))
+    budgeter = TokenBudgeter("model", window=full + 100 - 30, max_output_tokens=100)
+
+    budget = budgeter.fit(requirements, build_prompt)
+
+    kept = len(budget.requirements.context)
+    assert budget.dropped == {"context": 10 - kept}
+    assert budget.prompt_tokens == count_tokens(build_prompt(budget.requirements)) <= full - 30
+    one_more = Requirements(description=requirements.description, context=snippets[: kept + 1])
+    assert count_tokens(build_prompt(one_more)) > full - 30
+
+
+def test_description_is_truncated_as_last_resort():
+    """Test that the description is cut when dropping items is not enough."""
+    requirements = Requirements(description="word " * 500, constraints=["Use types"])
+    budgeter = TokenBudgeter("model", window=400, max_output_tokens=100)
+
+    budget = budgeter.fit(requirements, build_prompt)
+
+    assert budget.prompt_tokens <= 300
+    assert budget.truncated
+    assert budget.dropped == {"constraints": 1}
+
+
+@pytest.mark.asyncio
+async def test_generator_applies_budget_and_counts_tokens():
+    """Test that requests are budgeted and usage is counted when not reported."""
+    client = UsagelessLLMClient()
+    generator = CodeGenerator(
+        llm_client=client,
+        config={"cache": False, "model": "gpt-4", "max_tokens": 8000},
+    )
+
+    generation = await generator.generate(REQUIREMENTS, expected_files=["a.py", "b.py"])
+
+    assert client.requests[0].max_tokens == 3000
+    assert generation.metadata.prompt_tokens > count_tokens(client.requests[0].prompt, "gpt-4")
+    assert generation.metadata.completion_tokens > 0
@@ -0,0 +1,3 @@
+"""
+Unit tests for the testing_framework package.
+"""
\ No newline at end of file
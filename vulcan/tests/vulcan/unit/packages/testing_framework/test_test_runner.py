@@ -0,0 +1,74 @@
+"""
+Unit tests for the pytest-based test runner.
+"""
+import pytest
+
+from vulcan.core.vulcan_core.models import CodeStatus
+from vulcan.testing_framework.services.test_runner import TestRunReport
+from vulcan.workflow_engine.state.workflow_state import WorkflowStateManager
+from vulcan.workflow_engine.workflows.testing_flow import TestingWorkflow
+
+
+CODE_CONTENT = {
+    "factorial.py": "def factorial(n):\n    return 1 if n == 0 else n * factorial(n - 1)\n",
+    "test_factorial.py": (
+        "from factorial import factorial\n\n"
+        "def test_zero():\n    assert factorial(0) == 1\n\n"
+        "def test_five():\n    assert factorial(5) == 60\n"
+    ),
+}
+
+
+@pytest.mark.asyncio
+async def test_testing_workflow_runs_code_content(tmp_path):
+    """Test that the testing workflow runs the tests of code content."""
+    state_manager = WorkflowStateManager(state_dir=tmp_path / "state")
+    workflow = TestingWorkflow(state_manager=state_manager, workspace_dir=tmp_path / "workspaces")
+
+    result = await workflow.execute_async(code_content=CODE_CONTENT)
+
+    assert result.success
+    assert not result.all_passed
+    outcomes = {r.test_case.name: r.passed for r in result.test_results}
+    assert outcomes == {"test_zero": True, "test_five": False}
+    failed = next(r for r in result.test_results if not r.passed)
+    assert "assert" in failed.error_message
+
+    state = state_manager.get_state(result.process_id)
+    assert state.status == CodeStatus.COMPLETED
+    assert [step.name for step in state.steps] == ["Prepare workspace", "Run tests"]
+    assert list((tmp_path / "workspaces").iterdir()) == []
+
+
+@pytest.mark.asyncio
+async def test_testing_workflow_requires_code(tmp_path):
+    """Test that the testing workflow fails without code."""
+    state_manager = WorkflowStateManager(state_dir=tmp_path)
+    workflow = TestingWorkflow(state_manager=state_manager)
+
+    result = await workflow.execute_async()
+
+    assert not result.success
+    assert state_manager.get_state(result.process_id).status == CodeStatus.FAILED
+
+
+@pytest.mark.asyncio
+async def test_testing_workflow_without_tests_does_not_pass(tmp_path):
+    """Test that code without any collected test is not reported as passing."""
+    state_manager = WorkflowStateManager(state_dir=tmp_path / "state")
+    workflow = TestingWorkflow(state_manager=state_manager, workspace_dir=tmp_path / "workspaces")
+
+    result = await workflow.execute_async(
+        code_content={"factorial.py": CODE_CONTENT["factorial.py"]}
+    )
+
+    assert result.success
+    assert result.test_results == []
+    assert not result.all_passed
+
+
+def test_report_without_tests_does_not_pass():
+    """Test that a session collecting no test (exit code 5) is no pass."""
+    assert TestRunReport(exit_code=5).ran
+    assert not TestRunReport(exit_code=5).passed
+    assert not TestRunReport(exit_code=0).passed
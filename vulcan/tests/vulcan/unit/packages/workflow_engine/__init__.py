@@ -0,0 +1,3 @@
+"""
+Unit tests for the workflow_engine package.
+"""
\ No newline at end of file
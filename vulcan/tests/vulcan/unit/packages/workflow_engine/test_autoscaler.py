@@ -0,0 +1,138 @@
+"""
+Unit tests for the autoscaling of the worker pool.
+"""
+import asyncio
+import sys
+
+import pytest
+
+from vulcan.workflow_engine.autoscaler import Autoscaler
+from vulcan.workflow_engine.metrics import Metrics, collect_metrics
+from vulcan.workflow_engine.queue.job_queue import JobQueue
+from vulcan.workflow_engine.worker_pool import WorkerPool
+
+
+@pytest.fixture
+def autoscaler():
+    """Create an autoscaler between 1 and 4 workers."""
+    return Autoscaler(
+        min_size=1, max_size=4, target_depth=2, target_wait=30,
+        scale_up_cooldown=10, scale_down_delay=60,
+    )
+
+
+def test_scales_up_with_queue_depth(autoscaler):
+    """Test that the pool grows to absorb the waiting jobs, up to the maximum."""
+    decision = autoscaler.decide(queue_depth=5, oldest_wait=0, size=1, now=0)
+
+    assert decision.size == 3
+    assert decision.direction == "up"
+    assert autoscaler.decide(queue_depth=50, oldest_wait=0, size=3, now=5) is None
+    assert autoscaler.decide(queue_depth=50, oldest_wait=0, size=3, now=10).size == 4
+
+
+def test_scales_up_with_wait_time(autoscaler):
+    """Test that a long wait adds a worker even with a shallow queue."""
+    decision = autoscaler.decide(queue_depth=1, oldest_wait=45, size=2, now=0)
+
+    assert decision.size == 3
+    assert "waited" in decision.reason
+
+
+def test_scales_down_after_sustained_low_load(autoscaler):
+    """Test that the pool shrinks one worker at a time after the delay."""
+    assert autoscaler.decide(queue_depth=0, oldest_wait=0, size=3, now=0) is None
+    assert autoscaler.decide(queue_depth=0, oldest_wait=0, size=3, now=59) is None
+
+    decision = autoscaler.decide(queue_depth=0, oldest_wait=0, size=3, now=60)
+    assert decision.size == 2
+    assert decision.direction == "down"
+
+    assert autoscaler.decide(queue_depth=0, oldest_wait=0, size=2, now=61) is None
+
+
+def test_burst_resets_scale_down_delay(autoscaler):
+    """Test that load in the middle of a lull restarts the scale-down delay."""
+    autoscaler.decide(queue_depth=0, oldest_wait=0, size=3, now=0)
+    autoscaler.decide(queue_depth=6, oldest_wait=0, size=3, now=30)
+
+    assert autoscaler.decide(queue_depth=0, oldest_wait=0, size=3, now=61) is None
+    assert autoscaler.decide(queue_depth=0, oldest_wait=0, size=3, now=120) is None
+    assert autoscaler.decide(queue_depth=0, oldest_wait=0, size=3, now=121).size == 2
+
+
+def test_saturated_pool_is_not_shrunk(tmp_path):
+    """Test that workers busy with running jobs count in the desired size."""
+    queue = JobQueue(tmp_path / "jobs.sqlite3")
+    for index in range(11):
+        queue.enqueue("testing", f"p{index}", {})
+    for index in range(8):
+        queue.lease(f"worker-{index}")
+    autoscaler = Autoscaler(
+        min_size=1, max_size=10, target_depth=2, scale_down_delay=0, worker_concurrency=1,
+    )
+
+    assert (queue.running(), queue.depth()) == (8, 3)
+    assert autoscaler.desired_size(queue.depth(), 0, 8, queue.running()) == 10
+    decision = autoscaler.decide(queue.depth(), 0, 8, now=0, running=queue.running())
+    assert decision.direction == "up"
+    assert decision.running == 8
+    assert autoscaler.decide(queue_depth=0, oldest_wait=0, size=8, now=100, running=8) is None
+
+
+def test_metrics_render_prometheus_text(tmp_path):
+    """Test that metrics are rendered and collected from the metrics directory."""
+    metrics = Metrics()
+    metrics.set("vulcan_worker_pool_size", 3, help_text="Worker processes in the pool")
+    metrics.inc("vulcan_worker_pool_scaling_decisions_total", direction="up")
+    metrics.inc("vulcan_worker_pool_scaling_decisions_total", direction="up")
+    metrics.write("worker_pool", tmp_path)
+
+    text = collect_metrics(tmp_path)
+
+    assert "# HELP vulcan_worker_pool_size Worker processes in the pool" in text
+    assert "vulcan_worker_pool_size 3" in text
+    assert 'vulcan_worker_pool_scaling_decisions_total{direction="up"} 2' in text
+
+
+@pytest.mark.asyncio
+async def test_pool_follows_queue_depth(tmp_path):
+    """Test that the pool starts workers for the queued jobs and reports it."""
+    queue = JobQueue(tmp_path / "jobs.sqlite3")
+    for index in range(6):
+        queue.enqueue("testing", f"p{index}", {})
+
+    pool = WorkerPool(
+        size=1,
+        args=[sys.executable, "-c", "import time; time.sleep(30)"],
+        autoscaler=Autoscaler(min_size=1, max_size=3, target_depth=2),
+        queue=queue,
+        interval=0.05,
+        metrics_dir=tmp_path / "metrics",
+    )
+
+    async def stop_when_scaled():
+        while len(pool._processes) < 3:
+            await asyncio.sleep(0.05)
+        pool.stop()
+
+    await asyncio.wait_for(asyncio.gather(pool.run(), stop_when_scaled()), 30)
+
+    assert pool.size == 3
+    text = collect_metrics(tmp_path / "metrics")
+    assert "vulcan_worker_pool_size 3" in text
+    assert 'vulcan_worker_pool_scaling_decisions_total{direction="up"} 1' in text
+
+
+def test_metric_files_are_merged(tmp_path):
+    """Test that samples of a metric written by several processes share one header."""
+    for pid in ("1", "2"):
+        metrics = Metrics()
+        metrics.inc("vulcan_llm_requests_total", help_text="LLM requests", pid=pid)
+        metrics.write(f"llm_hedging-{pid}", tmp_path)
+
+    text = collect_metrics(tmp_path)
+
+    assert text.count("# TYPE vulcan_llm_requests_total counter") == 1
+    assert 'vulcan_llm_requests_total{pid="1"} 1' in text
+    assert 'vulcan_llm_requests_total{pid="2"} 1' in text
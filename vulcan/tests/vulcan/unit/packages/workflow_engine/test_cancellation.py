@@ -0,0 +1,140 @@
+"""
+Unit tests for the cancellation of running processes.
+"""
+import asyncio
+import sys
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+import pytest
+
+from vulcan.core.vulcan_core.models import CodeStatus
+from vulcan.workflow_engine.cancellation import (
+    CancellationToken,
+    ProcessCancelledError,
+    cancellation_registry,
+    run_subprocess,
+)
+from vulcan.workflow_engine.state.workflow_state import WorkflowStateManager
+from vulcan.workflow_engine.workflows.base import BaseWorkflow
+
+
+@dataclass
+class DummyResult:
+    """Result of the dummy workflow."""
+    success: bool
+    process_id: str
+    error_message: Optional[str] = None
+
+
+class SleepingWorkflow(BaseWorkflow):
+    """Workflow running a long subprocess."""
+
+    process_type = "testing"
+
+    def _failure_result(self, error_message):
+        return DummyResult(success=False, process_id=self.process_id, error_message=error_message)
+
+    async def _run(self):
+        async with self.step("Sleep"):
+            await run_subprocess(
+                [sys.executable, "-c", "import time; time.sleep(30)"], token=self.token
+            )
+        return DummyResult(success=True, process_id=self.process_id)
+
+
+def test_token_runs_callbacks_once():
+    """Test that cancelling a token runs its callbacks exactly once."""
+    token = CancellationToken("abcd1234")
+    calls = []
+    token.add_callback(lambda: calls.append("first"))
+    remove = token.add_callback(lambda: calls.append("removed"))
+    remove()
+
+    assert token.cancel()
+    assert not token.cancel()
+
+    assert calls == ["first"]
+    with pytest.raises(ProcessCancelledError):
+        token.raise_if_cancelled()
+
+
+def test_token_callback_added_after_cancel_runs_immediately():
+    """Test that a callback added to a cancelled token runs at once."""
+    token = CancellationToken("abcd1234")
+    token.cancel()
+    calls = []
+
+    token.add_callback(lambda: calls.append("late"))
+
+    assert calls == ["late"]
+
+
+@pytest.mark.asyncio
+async def test_run_subprocess_returns_output():
+    """Test that run_subprocess returns the exit code and output."""
+    exit_code, stdout, _ = await run_subprocess([sys.executable, "-c", "print('hello')"])
+
+    assert exit_code == 0
+    assert stdout.strip() == "hello"
+
+
+@pytest.mark.asyncio
+async def test_run_subprocess_killed_on_cancel():
+    """Test that cancelling the token kills the running subprocess."""
+    token = CancellationToken("abcd1234")
+    loop = asyncio.get_running_loop()
+    loop.call_later(0.2, token.cancel)
+
+    start = time.monotonic()
+    with pytest.raises(ProcessCancelledError):
+        await run_subprocess([sys.executable, "-c", "import time; time.sleep(30)"], token=token)
+
+    assert time.monotonic() - start < 10
+
+
+@pytest.mark.asyncio
+async def test_workflow_cancelled_from_registry(tmp_path):
+    """Test that a running workflow stops and records the cancelled state."""
+    state_manager = WorkflowStateManager(state_dir=tmp_path)
+    workflow = SleepingWorkflow(state_manager=state_manager)
+
+    async def cancel_when_started():
+        while workflow.process_id is None or cancellation_registry.get(workflow.process_id) is None:
+            await asyncio.sleep(0.01)
+        await asyncio.sleep(0.2)
+        state_manager.request_cancel(workflow.process_id)
+
+    canceller = asyncio.ensure_future(cancel_when_started())
+    start = time.monotonic()
+    result = await workflow.execute_async()
+    await canceller
+
+    assert time.monotonic() - start < 10
+    assert not result.success
+    assert result.error_message == "Process cancelled"
+    state = state_manager.get_state(workflow.process_id)
+    assert state.status == CodeStatus.CANCELLED
+    assert cancellation_registry.get(workflow.process_id) is None
+
+
+@pytest.mark.asyncio
+async def test_workflow_cancelled_by_marker(tmp_path, monkeypatch):
+    """Test that a workflow notices a cancellation requested by another process."""
+    monkeypatch.setattr("vulcan.workflow_engine.workflows.base.CANCEL_POLL_INTERVAL", 0.05)
+    state_manager = WorkflowStateManager(state_dir=tmp_path)
+    workflow = SleepingWorkflow(state_manager=state_manager)
+
+    async def leave_marker():
+        while workflow.process_id is None:
+            await asyncio.sleep(0.01)
+        await asyncio.sleep(0.2)
+        state_manager._cancel_path(workflow.process_id).touch()
+
+    marker = asyncio.ensure_future(leave_marker())
+    result = await workflow.execute_async()
+    await marker
+
+    assert result.error_message == "Process cancelled"
+    assert state_manager.get_state(workflow.process_id).status == CodeStatus.CANCELLED
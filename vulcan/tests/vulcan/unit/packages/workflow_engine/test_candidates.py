@@ -0,0 +1,132 @@
+"""
+Unit tests for best-of-N candidate racing in the code generation workflow.
+"""
+import asyncio
+
+import pytest
+
+from vulcan.core.vulcan_core.models import CodeStatus, Requirements, TestCase, TestResult
+from vulcan.infra.interface.llm_agent.llm_client import LLMChunk, LLMClient
+from vulcan.llm_services.services.code_generator import CodeGenerator
+from vulcan.testing_framework.services.test_runner import TestRunReport
+from vulcan.workflow_engine.concurrency import StageLimiter
+from vulcan.workflow_engine.state.workflow_state import WorkflowStateManager
+from vulcan.workflow_engine.workflows.code_generation_flow import (
+    CodeGenerationWorkflow,
+    candidate_variants,
+)
+
+
+# Seconds each temperature takes to answer
+DELAYS = {0.2: 0, 0.7: 5, 1.0: 0.1}
+
+
+class TemperatureLLMClient(LLMClient):
+    """LLM client writing the sampling temperature into the code."""
+
+    provider = "temperature"
+
+    def __init__(self):
+        self.closed = []
+
+    async def stream(self, request):
+        try:
+            await asyncio.sleep(DELAYS[request.temperature])
+            yield LLMChunk(text=f"### File: main.py\n```python\nVALUE = {request.temperature}\n```\n")
+            yield LLMChunk(finish_reason="stop")
+        finally:
+            self.closed.append(request.temperature)
+
+
+class ValueTestRunner:
+    """Test runner passing the code whose value is 1.0."""
+
+    async def run(self, code_path, generate_coverage=False, token=None):
+        passed = "VALUE = 1.0" in (code_path / "main.py").read_text()
+        return TestRunReport(
+            exit_code=0 if passed else 1,
+            test_results=[
+                TestResult(TestCase("test_value", "", {}, {}), passed=passed, actual_output={})
+            ],
+        )
+
+
+def test_candidate_variants_cycle():
+    """Test that temperatures and models are cycled over the candidates."""
+    assert candidate_variants(3, "0.2,0.8", "small,large") == [
+        ("small", 0.2), ("large", 0.8), ("small", 0.2)
+    ]
+    assert candidate_variants(2, "", "") == [(None, None), (None, None)]
+
+
+@pytest.mark.asyncio
+async def test_first_passing_candidate_wins(tmp_path):
+    """Test that the first candidate passing its tests wins and the others are cancelled."""
+    client = TemperatureLLMClient()
+    state_manager = WorkflowStateManager(state_dir=tmp_path / "state")
+    workflow = CodeGenerationWorkflow(
+        code_generator=CodeGenerator(
+            llm_client=client,
+            config={"candidate_temperatures": "0.2,0.7,1.0", "repair_iterations": 0},
+        ),
+        state_manager=state_manager,
+        stage_limiter=StageLimiter({}),
+        test_runner=ValueTestRunner(),
+        workspace_dir=tmp_path / "workspaces",
+    )
+
+    result = await asyncio.wait_for(
+        workflow.execute_async(
+            Requirements(description="Value"), output_dir=tmp_path / "out", candidates=3
+        ),
+        3,
+    )
+
+    assert result.success
+    assert result.metadata.additional_info["candidate"] == "3"
+    assert (tmp_path / "out" / "main.py").read_text() == "VALUE = 1.0\n"
+    assert 0.7 in client.closed
+
+    steps = {step.name: step.status for step in state_manager.get_state(result.process_id).steps}
+    assert steps["Test candidate 1"] == CodeStatus.COMPLETED
+    assert steps["Generate candidate 2"] == CodeStatus.CANCELLED
+    assert steps["Test candidate 3"] == CodeStatus.COMPLETED
+    states = [state_manager.get_state(process_id) for process_id in state_manager.iter_process_ids()]
+    testing = [state.status for state in states if state.process_type == "testing"]
+    assert testing == [CodeStatus.COMPLETED, CodeStatus.COMPLETED]
+
+
+class PathLLMClient(LLMClient):
+    """LLM client answering with a file at the given path."""
+
+    provider = "path"
+
+    def __init__(self, file_path):
+        self.file_path = file_path
+
+    async def stream(self, request):
+        yield LLMChunk(text=f"### File: {self.file_path}\n```python\nVALUE = 1\n```\n")
+        yield LLMChunk(finish_reason="stop")
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("file_path", ["/tmp/evil.py", "../../up.py"])
+async def test_artifact_outside_output_dir_rejected(tmp_path, file_path):
+    """Test that generated files are never written outside the output directory."""
+    workflow = CodeGenerationWorkflow(
+        code_generator=CodeGenerator(
+            llm_client=PathLLMClient(file_path), config={"repair_iterations": 0}
+        ),
+        state_manager=WorkflowStateManager(state_dir=tmp_path / "state"),
+        stage_limiter=StageLimiter({}),
+        workspace_dir=tmp_path / "workspaces",
+    )
+
+    result = await workflow.execute_async(
+        Requirements(description="Value"), output_dir=tmp_path / "a" / "b" / "out"
+    )
+
+    assert not result.success
+    assert "escapes the output directory" in result.error_message
+    assert not (tmp_path / "a" / "up.py").exists()
+    assert list((tmp_path / "a").rglob("*.py")) == []
@@ -0,0 +1,127 @@
+"""
+Unit tests for the stage-aware concurrency limits.
+"""
+import asyncio
+import threading
+from dataclasses import dataclass
+from typing import Optional
+
+import pytest
+
+from vulcan.workflow_engine.concurrency import StageLimiter
+from vulcan.workflow_engine.state.workflow_state import WorkflowStateManager
+from vulcan.workflow_engine.workflows.base import BaseWorkflow
+
+
+@dataclass
+class DummyResult:
+    """Result of the dummy workflow."""
+    success: bool
+    process_id: str
+    error_message: Optional[str] = None
+
+
+class LLMWorkflow(BaseWorkflow):
+    """Workflow holding an LLM slot for a while."""
+
+    process_type = "code_generation"
+
+    def _failure_result(self, error_message):
+        return DummyResult(success=False, process_id=self.process_id, error_message=error_message)
+
+    async def _run(self):
+        async with self.step("Generate code", stage="llm"):
+            await asyncio.sleep(0.1)
+        return DummyResult(success=True, process_id=self.process_id)
+
+
+async def _burst(limiter, stage, key, count, observed):
+    async def worker():
+        async with limiter.acquire(stage, key):
+            observed.append(limiter.in_use(stage, key))
+            await asyncio.sleep(0.02)
+
+    await asyncio.gather(*(worker() for _ in range(count)))
+
+
+@pytest.mark.asyncio
+async def test_stage_concurrency_is_saturated_not_exceeded():
+    """Test that a burst uses exactly the configured number of slots."""
+    limiter = StageLimiter({"sandbox": 3})
+    observed = []
+
+    await _burst(limiter, "sandbox", None, 10, observed)
+
+    assert max(observed) == 3
+    assert limiter.in_use("sandbox") == 0
+
+
+@pytest.mark.asyncio
+async def test_keyed_stage_limits_each_key():
+    """Test that keyed stages are limited per key."""
+    limiter = StageLimiter({"github_push": 1})
+    repo_a, repo_b = [], []
+
+    await asyncio.gather(
+        _burst(limiter, "github_push", "repo-a", 3, repo_a),
+        _burst(limiter, "github_push", "repo-b", 3, repo_b),
+    )
+
+    assert max(repo_a) == 1
+    assert max(repo_b) == 1
+
+
+@pytest.mark.asyncio
+async def test_unlimited_stage_does_not_wait():
+    """Test that stages without a limit are not throttled."""
+    limiter = StageLimiter({"llm": 0})
+
+    async with limiter.acquire("llm") as queue_time:
+        assert queue_time == 0.0
+
+
+@pytest.mark.asyncio
+async def test_queue_time_recorded_in_step_metadata(tmp_path):
+    """Test that the time spent waiting for a stage is recorded on the step."""
+    state_manager = WorkflowStateManager(state_dir=tmp_path)
+    limiter = StageLimiter({"llm": 1})
+
+    results = await asyncio.gather(
+        *(LLMWorkflow(state_manager=state_manager, stage_limiter=limiter).execute_async() for _ in range(2))
+    )
+
+    queue_times = sorted(
+        state_manager.get_state(result.process_id).steps[0].metadata["queue_time"]
+        for result in results
+    )
+    assert queue_times[0] < 0.05
+    assert queue_times[1] >= 0.08
+    step = state_manager.get_state(results[0].process_id).steps[0]
+    assert step.metadata["stage"] == "llm"
+
+
+class ThreadRecordingStateManager(WorkflowStateManager):
+    """State manager recording the threads its step records are written from."""
+
+    def __init__(self, state_dir):
+        super().__init__(state_dir=state_dir)
+        self.threads = set()
+
+    def _append(self, process_id, event):
+        if event["type"].startswith("step"):
+            self.threads.add(threading.current_thread())
+        return super()._append(process_id, event)
+
+
+@pytest.mark.asyncio
+async def test_steps_write_the_state_off_the_event_loop(tmp_path):
+    """Test that step records do not block the event loop on the state store."""
+    state_manager = ThreadRecordingStateManager(tmp_path)
+
+    workflow = LLMWorkflow(state_manager=state_manager, stage_limiter=StageLimiter({"llm": 1}))
+
+    result = await workflow.execute_async()
+
+    assert result.success
+    assert state_manager.threads
+    assert threading.current_thread() not in state_manager.threads
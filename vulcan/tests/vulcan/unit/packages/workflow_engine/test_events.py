@@ -0,0 +1,66 @@
+"""
+Unit tests for the process event bus.
+"""
+import asyncio
+import threading
+
+import pytest
+
+from vulcan.workflow_engine.events import EventBus
+
+
+@pytest.mark.asyncio
+async def test_events_reach_only_subscribers_of_the_process():
+    """Test that an event is delivered to the subscribers of its process only."""
+    bus = EventBus()
+    first = bus.subscribe(["p1"])
+    second = bus.subscribe(["p1", "p2"])
+    third = bus.subscribe(["p3"])
+
+    bus.publish({"process_id": "p1", "type": "error"})
+
+    assert [e["process_id"] for e in await first.get()] == ["p1"]
+    assert [e["process_id"] for e in await second.get()] == ["p1"]
+    assert bus.subscriber_count("p1") == 2
+    third.close()
+    assert bus.subscriber_count("p3") == 0
+
+
+@pytest.mark.asyncio
+async def test_slow_consumer_drops_oldest_events():
+    """Test that a full subscription drops its oldest events instead of blocking."""
+    bus = EventBus()
+    subscription = bus.subscribe(["p1"], maxsize=3)
+
+    for index in range(5):
+        bus.publish({"process_id": "p1", "index": index})
+
+    assert [e["index"] for e in await subscription.get()] == [2, 3, 4]
+    assert subscription.dropped == 2
+
+
+@pytest.mark.asyncio
+async def test_publish_from_another_thread():
+    """Test that events published from worker threads wake up the consumer."""
+    bus = EventBus()
+    subscription = bus.subscribe(["p1"])
+
+    thread = threading.Thread(target=bus.publish, args=({"process_id": "p1"},))
+    thread.start()
+    events = await asyncio.wait_for(subscription.get(), 5)
+    thread.join()
+
+    assert events == [{"process_id": "p1"}]
+
+
+@pytest.mark.asyncio
+async def test_unsubscribe_stops_delivery():
+    """Test that unsubscribed processes are no longer delivered."""
+    bus = EventBus()
+    subscription = bus.subscribe(["p1", "p2"])
+    subscription.unsubscribe(["p1"])
+
+    bus.publish({"process_id": "p1"})
+    bus.publish({"process_id": "p2"})
+
+    assert await subscription.get() == [{"process_id": "p2"}]
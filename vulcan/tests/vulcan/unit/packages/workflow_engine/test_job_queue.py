@@ -0,0 +1,85 @@
+"""
+Unit tests for the durable job queue.
+"""
+import time
+
+import pytest
+
+from vulcan.workflow_engine.queue.job_queue import DEAD, DONE, LEASED, QUEUED, JobQueue
+
+
+@pytest.fixture
+def queue(tmp_path):
+    """Create a queue with short timeouts."""
+    return JobQueue(tmp_path / "jobs.sqlite3", visibility_timeout=0.2, max_attempts=2, retry_delay=0)
+
+
+def test_lease_is_exclusive_and_fifo(queue):
+    """Test that jobs are leased once, oldest first."""
+    first = queue.enqueue("testing", "p1", {"code_path": "a"})
+    second = queue.enqueue("testing", "p2", {"code_path": "b"})
+
+    assert queue.depth() == 2
+    leased = queue.lease("worker-1")
+    assert leased.job_id == first.job_id
+    assert leased.payload == {"code_path": "a"}
+    assert leased.attempts == 1
+    assert queue.lease("worker-2").job_id == second.job_id
+    assert queue.lease("worker-3") is None
+
+
+def test_complete_requires_the_lease(queue):
+    """Test that only the lease holder can complete a job."""
+    job = queue.enqueue("testing", "p1", {})
+    queue.lease("worker-1")
+
+    assert not queue.complete(job.job_id, "worker-2")
+    assert queue.complete(job.job_id, "worker-1")
+    assert queue.get(job.job_id).status == DONE
+
+
+def test_expired_lease_is_retried_then_dead(queue):
+    """Test that a job whose worker vanished is retried up to the attempt limit."""
+    job = queue.enqueue("testing", "p1", {})
+    queue.lease("worker-1")
+    time.sleep(0.3)
+
+    retried = queue.lease("worker-2")
+    assert retried.job_id == job.job_id
+    assert retried.attempts == 2
+    assert not queue.heartbeat(job.job_id, "worker-1")
+    assert queue.heartbeat(job.job_id, "worker-2")
+
+    time.sleep(0.3)
+    assert queue.lease("worker-3") is None
+    dead = queue.reap_expired()
+    assert [j.job_id for j in dead] == [job.job_id]
+    assert queue.get(job.job_id).status == DEAD
+
+
+def test_fail_requeues_until_attempts_run_out(queue):
+    """Test that failed jobs are retried before being given up."""
+    job = queue.enqueue("testing", "p1", {})
+
+    queue.lease("worker-1")
+    assert queue.fail(job.job_id, "worker-1", "boom")
+    assert queue.get(job.job_id).status == QUEUED
+
+    queue.lease("worker-1")
+    assert queue.get(job.job_id).status == LEASED
+    assert not queue.fail(job.job_id, "worker-1", "boom")
+    assert queue.get(job.job_id).status == DEAD
+    assert queue.get(job.job_id).error == "boom"
+
+
+def test_depth_ignores_delayed_retries(tmp_path):
+    """Test that jobs waiting for their retry delay are not counted as waiting."""
+    queue = JobQueue(tmp_path / "jobs.sqlite3", retry_delay=60)
+    job = queue.enqueue("testing", "p1", {})
+    queue.lease("worker-1")
+    queue.fail(job.job_id, "worker-1", "boom")
+
+    assert queue.get(job.job_id).status == QUEUED
+    assert queue.depth() == 0
+    queue.enqueue("testing", "p2", {})
+    assert queue.depth() == 1
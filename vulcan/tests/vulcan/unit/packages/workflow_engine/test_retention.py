@@ -0,0 +1,132 @@
+"""
+Unit tests for the retention of process states.
+"""
+import gzip
+import json
+import os
+import time
+
+import pytest
+
+from vulcan.core.vulcan_core.models import CodeStatus
+from vulcan.workflow_engine.queue.job_queue import JobQueue
+from vulcan.workflow_engine.state.retention import StateCompactor
+from vulcan.workflow_engine.state.workflow_state import WorkflowStateManager
+
+
+@pytest.fixture
+def state_manager(tmp_path):
+    """Create a state manager in a temporary directory."""
+    return WorkflowStateManager(tmp_path / "state")
+
+
+def make_compactor(state_manager, tmp_path, **kwargs):
+    """Create a compactor expiring testing processes immediately."""
+    options = {
+        "archive_dir": tmp_path / "archive",
+        "retention_days": {"testing": 0, "deployment": 90},
+        "output_dir": tmp_path / "output",
+        "workspace_dir": tmp_path / "workspaces",
+        "workspace_retention_hours": 1,
+    }
+    options.update(kwargs)
+    return StateCompactor(state_manager, **options)
+
+
+def read_archive(path):
+    """Read the records of a gzip-compressed JSONL archive."""
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_expired_processes_are_archived(state_manager, tmp_path):
+    """Test that only terminal processes past their retention are archived."""
+    expired = state_manager.create_process("testing")
+    state_manager.add_error(expired.process_id, "boom")
+    state_manager.finish(expired.process_id, CodeStatus.FAILED)
+    running = state_manager.create_process("testing")
+    recent = state_manager.create_process("deployment")
+    state_manager.finish(recent.process_id, CodeStatus.COMPLETED)
+    time.sleep(0.01)
+
+    compactor = make_compactor(state_manager, tmp_path)
+    compactor.run_pass()
+
+    assert state_manager.get_state(expired.process_id) is None
+    assert state_manager.get_state(running.process_id) is not None
+    assert state_manager.get_state(recent.process_id) is not None
+    assert compactor.archived == 1
+
+    [archive] = (tmp_path / "archive").glob("testing-*.jsonl.gz")
+    [record] = read_archive(archive)
+    assert record["state"]["process_id"] == expired.process_id
+    assert record["state"]["errors"] == ["boom"]
+    assert [event["type"] for event in record["events"]] == ["created", "error", "status"]
+
+
+def test_compaction_runs_in_batches(state_manager, tmp_path):
+    """Test that each batch examines a bounded number of entries."""
+    for _ in range(5):
+        state = state_manager.create_process("testing")
+        state_manager.finish(state.process_id, CodeStatus.COMPLETED)
+    time.sleep(0.01)
+
+    compactor = make_compactor(state_manager, tmp_path, batch_size=2)
+    candidates = compactor._candidates()
+
+    assert compactor.run_batch(candidates)
+    assert compactor.archived == 2
+    while compactor.run_batch(candidates):
+        pass
+    assert compactor.archived == 5
+
+    # Successive batches append gzip members to the same archive
+    [archive] = (tmp_path / "archive").glob("testing-*.jsonl.gz")
+    assert len(read_archive(archive)) == 5
+
+
+def test_stale_directories_are_deleted(state_manager, tmp_path):
+    """Test that old generation outputs and workspaces are deleted."""
+    old = time.time() - 2 * 3600
+    stale_workspace = tmp_path / "workspaces" / "testing-abc"
+    fresh_workspace = tmp_path / "workspaces" / "testing-def"
+    stale_output = tmp_path / "output" / "generation_1234"
+    user_output = tmp_path / "output" / "my-project"
+    for path in (stale_workspace, fresh_workspace, stale_output, user_output):
+        path.mkdir(parents=True)
+    for path in (stale_workspace, stale_output, user_output):
+        os.utime(path, (old, old))
+
+    compactor = make_compactor(
+        state_manager, tmp_path, retention_days={"code_generation": 1 / 24}
+    )
+    compactor.run_pass()
+
+    assert not stale_workspace.exists()
+    assert not stale_output.exists()
+    assert fresh_workspace.exists()
+    assert user_output.exists()
+
+
+def test_finished_jobs_are_purged(state_manager, tmp_path):
+    """Test that the compactor deletes done and dead jobs past their retention."""
+    queue = JobQueue(tmp_path / "jobs.sqlite3", max_attempts=1)
+    done, dead, waiting = (queue.enqueue("testing", f"p{index}", {}) for index in range(3))
+    queue.lease("worker-1")
+    queue.complete(done.job_id, "worker-1")
+    queue.lease("worker-1")
+    queue.fail(dead.job_id, "worker-1", "boom")
+    time.sleep(0.01)
+
+    make_compactor(state_manager, tmp_path, queue=queue, job_retention_days=1).run_pass()
+    assert queue.get(done.job_id) is not None
+
+    compactor = make_compactor(
+        state_manager, tmp_path, queue=queue, job_retention_days=0, batch_size=1
+    )
+    compactor.run_pass()
+
+    assert compactor.purged_jobs == 2
+    assert queue.get(done.job_id) is None
+    assert queue.get(dead.job_id) is None
+    assert queue.get(waiting.job_id) is not None
@@ -0,0 +1,146 @@
+"""
+Unit tests for the delivery of completion webhooks.
+"""
+import json
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from vulcan.core.vulcan_core.models import CodeStatus
+from vulcan.workflow_engine.state.workflow_state import WorkflowStateManager
+from vulcan.infra.interface.http_retry import backoff_delay, parse_retry_after
+from vulcan.workflow_engine.webhooks import WebhookDispatcher, sign_payload
+
+
+URL = "https://hooks.example.com/vulcan"
+
+
+def make_dispatcher(tmp_path, responses, received):
+    """Create a dispatcher answering with the given responses in turn."""
+    responses = iter(responses)
+
+    def handler(request):
+        received.append(request)
+        response = next(responses)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    return WebhookDispatcher(
+        secret="secret",
+        max_attempts=3,
+        backoff_base=0,
+        log_path=tmp_path / "deliveries.jsonl",
+        transport=httpx.MockTransport(handler),
+    )
+
+
+def read_log(tmp_path):
+    """Read the delivery log."""
+    with open(tmp_path / "deliveries.jsonl", "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+@pytest.fixture
+def received():
+    """Collect the requests received by the mock transport."""
+    return []
+
+
+def test_delivery_is_signed(tmp_path, received):
+    """Test that the receiver can verify the signature of a delivery."""
+    dispatcher = make_dispatcher(tmp_path, [httpx.Response(204)], received)
+    try:
+        assert dispatcher.submit(URL, {"event": "process.finished", "process_id": "p1"}).result(5)
+    finally:
+        dispatcher.close()
+
+    [request] = received
+    timestamp = request.headers["X-Vulcan-Timestamp"]
+    assert request.headers["X-Vulcan-Event"] == "process.finished"
+    assert request.headers["X-Vulcan-Signature"] == sign_payload("secret", timestamp, request.content)
+    assert json.loads(request.content)["process_id"] == "p1"
+
+    [record] = read_log(tmp_path)
+    assert record["outcome"] == "delivered"
+    assert record["status_code"] == 204
+
+
+def test_delivery_is_retried(tmp_path, received):
+    """Test that network and server errors are retried with the same delivery ID."""
+    responses = [
+        httpx.ConnectError("refused"),
+        httpx.Response(503),
+        httpx.Response(200),
+    ]
+    dispatcher = make_dispatcher(tmp_path, responses, received)
+    try:
+        assert dispatcher.submit(URL, {"event": "process.finished"}).result(5)
+    finally:
+        dispatcher.close()
+
+    assert len({request.headers["X-Vulcan-Delivery"] for request in received}) == 1
+    assert [record["outcome"] for record in read_log(tmp_path)] == [
+        "retrying", "retrying", "delivered",
+    ]
+
+
+def test_delivery_is_abandoned(tmp_path, received):
+    """Test that client errors are final and retries are bounded."""
+    dispatcher = make_dispatcher(
+        tmp_path, [httpx.Response(404)] + [httpx.Response(500)] * 3, received
+    )
+    try:
+        assert not dispatcher.submit(URL, {"event": "process.finished"}).result(5)
+        assert not dispatcher.submit(URL, {"event": "process.finished"}).result(5)
+    finally:
+        dispatcher.close()
+
+    assert len(received) == 4
+    assert [record["outcome"] for record in read_log(tmp_path)] == [
+        "failed", "retrying", "retrying", "failed",
+    ]
+
+
+def test_delivery_requires_a_secret(tmp_path, received):
+    """Test that payloads are not delivered unsigned or with a guessable secret."""
+    dispatcher = make_dispatcher(tmp_path, [httpx.Response(200)], received)
+    dispatcher.secret = ""
+
+    assert dispatcher.submit(URL, {"event": "process.finished"}).result(5) is False
+    dispatcher.close(5)
+
+    assert received == []
+
+
+def test_retry_after_is_honoured():
+    """Test that a throttled delivery waits as requested by the receiver."""
+    assert parse_retry_after("7") == 7
+    assert parse_retry_after("soon") is None
+    assert backoff_delay(1, base=1, maximum=60, retry_after=7) == 7
+    assert backoff_delay(1, base=1, maximum=60, retry_after=3600) == 60
+    assert 0 <= backoff_delay(3, base=1, maximum=60) <= 4
+
+
+def test_finished_process_triggers_webhook(tmp_path):
+    """Test that a webhook is queued once, when the process reaches a terminal status."""
+    state_manager = WorkflowStateManager(tmp_path / "state")
+
+    with patch("vulcan.workflow_engine.webhooks.webhook_dispatcher") as dispatcher:
+        state = state_manager.create_process("testing", callback_url=URL)
+        state_manager.add_artifact(state.process_id, {"name": "report", "path": "report.xml"})
+        state_manager.finish(state.process_id, CodeStatus.COMPLETED)
+        state_manager.finish(state.process_id, CodeStatus.FAILED)
+        state_manager.record_resources(state.process_id, {"rss_peak": 1})
+
+        other = state_manager.create_process("testing")
+        state_manager.finish(other.process_id, CodeStatus.COMPLETED)
+
+    dispatcher.submit.assert_called_once()
+    url, payload = dispatcher.submit.call_args.args
+    assert url == URL
+    assert payload["process_id"] == state.process_id
+    assert payload["status"] == "completed"
+    assert payload["artifacts"] == [{"name": "report", "path": "report.xml"}]
+    assert state_manager.get_state(state.process_id).callback_url == URL
@@ -0,0 +1,149 @@
+"""
+Unit tests for the queue workers.
+"""
+import asyncio
+import sys
+
+import pytest
+
+from vulcan.core.vulcan_core.models import CodeStatus
+from vulcan.workflow_engine.queue.job_queue import LEASED, JobQueue
+from vulcan.workflow_engine.state.workflow_state import WorkflowStateManager
+from vulcan.workflow_engine.worker import JOB_WORKFLOWS, Worker, enqueue_workflow
+from vulcan.workflow_engine.workflows.base import BaseWorkflow
+from vulcan.workflow_engine.worker_pool import WorkerPool
+
+
+@pytest.fixture
+def queue(tmp_path):
+    """Create a queue in a temporary directory."""
+    return JobQueue(tmp_path / "jobs.sqlite3")
+
+
+@pytest.fixture
+def state_manager(tmp_path):
+    """Create a state manager in a temporary directory."""
+    return WorkflowStateManager(tmp_path / "state")
+
+
+def test_enqueue_creates_pending_process(queue, state_manager):
+    """Test that enqueueing a workflow records a process that has not started."""
+    process_id = enqueue_workflow(
+        "testing", queue=queue, state_manager=state_manager, code_content={"a.py": ""}
+    )
+
+    state = state_manager.get_state(process_id)
+    assert state.process_type == "testing"
+    assert state.status == CodeStatus.NOT_STARTED
+    assert queue.depth() == 1
+
+
+def test_enqueue_rejects_unknown_job_type(queue, state_manager):
+    """Test that unknown job types are rejected."""
+    with pytest.raises(ValueError):
+        enqueue_workflow("unknown", queue=queue, state_manager=state_manager)
+
+
+@pytest.mark.asyncio
+async def test_worker_runs_queued_process(queue, state_manager, tmp_path):
+    """Test that a worker runs a queued process under its original ID."""
+    code_content = {
+        "test_sample.py": "def test_ok():\n    assert True\n",
+    }
+    process_id = enqueue_workflow(
+        "testing", queue=queue, state_manager=state_manager, code_content=code_content
+    )
+
+    worker = Worker(queue=queue, state_manager=state_manager, poll_interval=0.05, max_jobs=1)
+    await worker.run()
+
+    state = state_manager.get_state(process_id)
+    assert state.status == CodeStatus.COMPLETED
+    assert [step.name for step in state.steps] == ["Prepare workspace", "Run tests"]
+    assert worker.jobs_completed == 1
+    assert queue.depth() == 0
+    assert state.resources["worker_id"] == worker.worker_id
+    assert state.resources["rss_peak"] >= state.resources["rss_start"] > 0
+
+
+@pytest.mark.asyncio
+async def test_worker_skips_cancelled_process(queue, state_manager):
+    """Test that a process cancelled while queued is not run."""
+    process_id = enqueue_workflow(
+        "testing", queue=queue, state_manager=state_manager, code_content={"a.py": ""}
+    )
+    state_manager.request_cancel(process_id)
+
+    worker = Worker(queue=queue, state_manager=state_manager, poll_interval=0.05, max_jobs=1)
+    await worker.run()
+
+    state = state_manager.get_state(process_id)
+    assert state.status == CodeStatus.CANCELLED
+    assert state.steps == []
+
+
+class SlowWorkflow(BaseWorkflow):
+    """Workflow running until cancelled."""
+
+    process_type = "testing"
+
+    async def _run(self, **kwargs):
+        await asyncio.sleep(30)
+
+    def _failure_result(self, error_message):
+        return None
+
+
+@pytest.mark.asyncio
+async def test_worker_abandons_job_after_losing_lease(state_manager, tmp_path, monkeypatch):
+    """Test that a job whose lease went to another worker is stopped and not completed."""
+    monkeypatch.setitem(JOB_WORKFLOWS, "testing", SlowWorkflow)
+    queue = JobQueue(tmp_path / "jobs.sqlite3", visibility_timeout=0.1)
+    process_id = enqueue_workflow("testing", queue=queue, state_manager=state_manager)
+    worker = Worker(
+        queue=queue, state_manager=state_manager, poll_interval=0.05,
+        heartbeat_interval=0.3, max_jobs=1,
+    )
+
+    async def steal_lease():
+        await asyncio.sleep(0.2)
+        return queue.lease("worker-2")
+
+    _, stolen = await asyncio.wait_for(asyncio.gather(worker.run(), steal_lease()), 10)
+
+    job = queue.get(stolen.job_id)
+    assert (job.status, job.leased_by) == (LEASED, "worker-2")
+    assert worker.jobs_completed == 0
+    assert state_manager.get_state(process_id).status == CodeStatus.IN_PROGRESS
+
+
+@pytest.mark.asyncio
+async def test_worker_recycles_above_memory_ceiling(queue, state_manager):
+    """Test that a worker above its memory ceiling drains and stops."""
+    for _ in range(2):
+        enqueue_workflow("testing", queue=queue, state_manager=state_manager, code_content={})
+
+    # Any real process is above a 1 MB ceiling
+    worker = Worker(
+        queue=queue, state_manager=state_manager, poll_interval=0.05, max_jobs=0, max_rss_mb=1
+    )
+    await asyncio.wait_for(worker.run(), 10)
+
+    assert worker.jobs_run == 1
+    assert worker.recycle_reason.startswith("RSS of")
+    assert queue.depth() == 1
+
+
+@pytest.mark.asyncio
+async def test_pool_replaces_exited_workers():
+    """Test that the pool restarts workers that exit until it is stopped."""
+    pool = WorkerPool(size=2, args=[sys.executable, "-c", "pass"], restart_delay=0.01)
+
+    async def stop_after_restarts():
+        while pool.restarts < 4:
+            await asyncio.sleep(0.01)
+        pool.stop()
+
+    await asyncio.wait_for(asyncio.gather(pool.run(), stop_after_restarts()), 30)
+
+    assert pool.restarts >= 4
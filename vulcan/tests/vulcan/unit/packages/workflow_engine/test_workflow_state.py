@@ -0,0 +1,173 @@
+"""
+Unit tests for the workflow state manager.
+"""
+import pytest
+
+from vulcan.core.vulcan_core.models import CodeStatus
+from vulcan.workflow_engine.cancellation import cancellation_registry
+from vulcan.workflow_engine.state.workflow_state import WorkflowStateManager
+
+
+@pytest.fixture
+def state_manager(tmp_path):
+    """Fixture to create a state manager writing to a temporary directory."""
+    return WorkflowStateManager(state_dir=tmp_path)
+
+
+def test_create_and_get_process(state_manager):
+    """Test that a created process can be read back."""
+    state = state_manager.create_process("code_generation")
+
+    loaded = state_manager.get_state(state.process_id)
+
+    assert loaded.process_id == state.process_id
+    assert loaded.process_type == "code_generation"
+    assert loaded.status == CodeStatus.IN_PROGRESS
+    assert loaded.end_time is None
+
+
+def test_get_state_unknown_process(state_manager):
+    """Test that get_state returns None for an unknown process."""
+    assert state_manager.get_state("unknown") is None
+
+
+def test_steps_are_recorded(state_manager):
+    """Test that step starts and ends are recorded."""
+    state = state_manager.create_process("testing")
+
+    state_manager.start_step(state.process_id, "Run tests")
+    state_manager.end_step(state.process_id, "Run tests", CodeStatus.FAILED)
+
+    loaded = state_manager.get_state(state.process_id)
+    assert len(loaded.steps) == 1
+    assert loaded.steps[0].name == "Run tests"
+    assert loaded.steps[0].status == CodeStatus.FAILED
+    assert loaded.steps[0].end_time is not None
+
+
+def test_finish_closes_open_steps(state_manager):
+    """Test that finishing a process closes its running steps."""
+    state = state_manager.create_process("deployment")
+    state_manager.start_step(state.process_id, "Push to repository")
+
+    state_manager.finish(state.process_id, CodeStatus.COMPLETED)
+
+    loaded = state_manager.get_state(state.process_id)
+    assert loaded.status == CodeStatus.COMPLETED
+    assert loaded.end_time is not None
+    assert loaded.steps[0].status == CodeStatus.COMPLETED
+
+
+def test_request_cancel_records_terminal_state(state_manager):
+    """Test that cancelling a process records the cancelled terminal state."""
+    state = state_manager.create_process("code_generation")
+    state_manager.start_step(state.process_id, "Generate code")
+    token = cancellation_registry.register(state.process_id)
+
+    try:
+        cancelled = state_manager.request_cancel(state.process_id)
+    finally:
+        cancellation_registry.unregister(state.process_id)
+
+    assert cancelled.status == CodeStatus.CANCELLED
+    assert cancelled.steps[0].status == CodeStatus.CANCELLED
+    assert token.cancelled
+    assert state_manager.is_cancel_requested(state.process_id)
+
+
+def test_terminal_state_is_final(state_manager):
+    """Test that late updates do not change a cancelled process."""
+    state = state_manager.create_process("code_generation")
+    state_manager.request_cancel(state.process_id)
+
+    state_manager.start_step(state.process_id, "Write files")
+    state_manager.finish(state.process_id, CodeStatus.COMPLETED)
+
+    loaded = state_manager.get_state(state.process_id)
+    assert loaded.status == CodeStatus.CANCELLED
+    assert loaded.steps == []
+
+
+def test_request_cancel_finished_process(state_manager):
+    """Test that cancelling a finished process leaves it unchanged."""
+    state = state_manager.create_process("testing")
+    state_manager.finish(state.process_id, CodeStatus.COMPLETED)
+
+    result = state_manager.request_cancel(state.process_id)
+
+    assert result.status == CodeStatus.COMPLETED
+    assert not state_manager.is_cancel_requested(state.process_id)
+
+
+def test_resources_are_recorded_after_finish(state_manager):
+    """Test that resource usage can be attached to a finished process."""
+    state = state_manager.create_process("testing")
+    state_manager.finish(state.process_id, CodeStatus.COMPLETED)
+
+    state_manager.record_resources(state.process_id, {"rss_peak": 1024})
+
+    loaded = state_manager.get_state(state.process_id)
+    assert loaded.status == CodeStatus.COMPLETED
+    assert loaded.resources == {"rss_peak": 1024}
+
+
+def test_updates_append_events_and_snapshot_periodically(tmp_path):
+    """Test that updates are appended to the log and folded into snapshots."""
+    state_manager = WorkflowStateManager(tmp_path, snapshot_interval=5)
+    state = state_manager.create_process("testing")
+    log_path = tmp_path / f"{state.process_id}.events.jsonl"
+    snapshot_path = tmp_path / f"{state.process_id}.json"
+
+    for index in range(3):
+        state_manager.add_artifact(state.process_id, {"name": f"f{index}.py", "path": "."})
+    assert len(log_path.read_text().splitlines()) == 4
+    assert not snapshot_path.exists()
+
+    state_manager.add_error(state.process_id, "boom")
+    assert snapshot_path.exists()
+
+    state_manager.finish(state.process_id, CodeStatus.FAILED)
+    loaded = state_manager.get_state(state.process_id)
+    assert loaded.status == CodeStatus.FAILED
+    assert [a["name"] for a in loaded.artifacts] == ["f0.py", "f1.py", "f2.py"]
+    assert loaded.errors == ["boom"]
+
+
+def test_timeline_records_transitions(state_manager):
+    """Test that the timeline lists the status and step transitions in order."""
+    state = state_manager.create_process("testing", status=CodeStatus.NOT_STARTED)
+    state_manager.start_process(state.process_id)
+    state_manager.start_step(state.process_id, "Run tests")
+    state_manager.update_step_metadata(state.process_id, "Run tests", {"stage": "sandbox"})
+    state_manager.finish(state.process_id, CodeStatus.COMPLETED)
+
+    timeline = state_manager.get_state(state.process_id).timeline
+    assert [(entry["event"], entry.get("step"), entry.get("status")) for entry in timeline] == [
+        ("created", None, "not_started"),
+        ("status", None, "in_progress"),
+        ("step_started", "Run tests", None),
+        ("step_ended", "Run tests", "completed"),
+        ("status", None, "completed"),
+    ]
+
+
+def test_get_state_ignores_partial_event(state_manager):
+    """Test that an event still being written is not read."""
+    state = state_manager.create_process("testing")
+    log_path = state_manager.state_dir / f"{state.process_id}.events.jsonl"
+    with open(log_path, "a") as f:
+        f.write('{"type": "error", "time": "2023-06-01T12:00:00Z", "err')
+
+    assert state_manager.get_state(state.process_id).errors == []
+
+
+def test_compact_covers_whole_log(tmp_path):
+    """Test that compaction writes a snapshot from which the state is rebuilt."""
+    state_manager = WorkflowStateManager(tmp_path, snapshot_interval=100)
+    state = state_manager.create_process("deployment")
+    state_manager.add_error(state.process_id, "boom")
+
+    state_manager.compact(state.process_id)
+    (tmp_path / f"{state.process_id}.events.jsonl").write_text("")
+
+    assert state_manager.get_state(state.process_id).errors == ["boom"]